@@ -0,0 +1,309 @@
+"""
+A pool of warm APSIM servers for the same model.
+
+Each server is a ``Models --server`` process started with :func:`~apsimNGpy._server.utils.start_apsim_server` that
+keeps the model loaded, and the pool holds one persistent socket to each of them. A run is sent to whichever server
+is idle, so repeated small runs, e.g., in a calibration loop, pay neither process startup nor file reload. Servers
+that crash or stop answering are replaced transparently. A job that APSIM rejects raises
+:class:`~apsimNGpy._server.utils.ApsimProtocolError` to the caller and its server stays in the pool.
+"""
+import asyncio
+import queue
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import c_double
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from apsimNGpy import logger
+from apsimNGpy._server.utils import (start_apsim_server, connect_to_remote_server, disconnect_from_server,
+                                     run_with_changes, read_output, ApsimProtocolError)
+
+__all__ = ['ServerPool']
+
+# failures after which a server is considered dead and replaced
+SERVER_ERRORS = (ConnectionError, TimeoutError, OSError)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('', 0))
+        return s.getsockname()[1]
+
+
+def _stop_process(process, timeout=5):
+    if process is None:
+        return
+    try:
+        process.terminate()
+        process.wait(timeout=timeout)
+    except Exception:
+        try:
+            process.kill()
+        except Exception:
+            pass
+
+
+class _Server:
+    __slots__ = ('slot', 'port', 'process', 'sock', 'runs', 'restarts')
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.port = None
+        self.process = None
+        self.sock = None
+        self.runs = 0
+        self.restarts = 0
+
+    def __repr__(self):
+        return f"_Server(slot={self.slot}, port={self.port}, runs={self.runs}, restarts={self.restarts})"
+
+
+class ServerPool:
+    """
+    Dispatches ``run_with_changes`` jobs across ``n_servers`` warm APSIM servers.
+
+    Parameters
+    ----------
+    model : str or pathlib.Path
+        ``.apsimx`` file served by every process, or the name of a default crop model such as ``'Maize'``.
+    n_servers : int, optional, default=2
+        Number of server processes.
+    server_path : str or pathlib.Path, optional
+        Directory holding the ``apsim-server`` executable. Defaults to the configured APSIM bin path.
+    use_dll : bool, optional, default=False
+        Start ``apsim-server.dll`` through ``dotnet``.
+    connect_timeout : float, optional, default=60
+        Seconds to wait for a new server to accept connections.
+    run_timeout : float, optional
+        Seconds without an answer after which a server is considered hung and restarted. ``None`` waits forever.
+    max_restarts : int, optional, default=3
+        Consecutive restarts allowed per server slot before the pool gives up on it. The count is reset by every
+        successful run.
+    launcher : callable, optional
+        ``launcher(port)`` returning a ``subprocess.Popen``-like object serving on ``port``. Replaces
+        :func:`start_apsim_server`, e.g., to use a local fake server in tests.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from ctypes import c_double
+        from apsimNGpy._server.pool import ServerPool
+        from apsimNGpy._server.utils import PROPERTY_TYPE_DOUBLE
+
+        with ServerPool('Maize', n_servers=4, run_timeout=300) as pool:
+            df = pool.run([{'path': '[Leaf].Photosynthesis.RUE.FixedValue', 'value': 1.4,
+                            'paramtype': PROPERTY_TYPE_DOUBLE}], outputs={'Yield': c_double})
+
+    Many runs are dispatched concurrently from asyncio:
+
+    .. code-block:: python
+
+        async def calibrate(pool, candidates):
+            return await asyncio.gather(*(pool.submit(changes, ['Yield']) for changes in candidates))
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, model: Union[str, Path, None] = None, n_servers: int = 2, *, server_path=None,
+                 use_dll: bool = False, connect_timeout: float = 60, run_timeout: Optional[float] = None,
+                 max_restarts: int = 3, launcher: Optional[Callable] = None):
+        if n_servers < 1:
+            raise ValueError(f'n_servers must be a positive integer got {n_servers}')
+        if launcher is None:
+            launcher = self._default_launcher(model, server_path, use_dll)
+        self.launcher = launcher
+        self.n_servers = n_servers
+        self.connect_timeout = connect_timeout
+        self.run_timeout = run_timeout
+        self.max_restarts = max_restarts
+        self.servers: List[_Server] = [_Server(i) for i in range(n_servers)]
+        self._idle: queue.Queue = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._alive = n_servers
+        self.closed = False
+        try:
+            # processes are launched together and load the model concurrently
+            for server in self.servers:
+                self._launch(server)
+            for server in self.servers:
+                self._connect(server)
+                self._idle.put(server)
+        except Exception:
+            self.close()
+            raise
+
+    def __repr__(self):
+        return f"{type(self).__name__}(n_servers={self.n_servers}, closed={self.closed})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _default_launcher(model, server_path, use_dll):
+        from apsimNGpy import configuration
+        server_path = Path(server_path or configuration.bin_path)
+        if model is None:
+            raise ValueError('model is required unless a launcher is given')
+        if not Path(model).is_file():
+            from apsimNGpy.config import load_crop_from_disk
+            out = Path(tempfile.mkdtemp(prefix='apsim_pool_')) / f'{model}.apsimx'
+            model = load_crop_from_disk(str(model), out=out, bin_path=str(server_path))
+
+        def launch(port):
+            return start_apsim_server(server_path, model, port=port, use_dll=use_dll)
+
+        return launch
+
+    def _launch(self, server: _Server):
+        server.port = _free_port()
+        server.process = self.launcher(server.port)
+        if server.process is None:
+            raise RuntimeError(f"Unable to start APSIM server on port {server.port}")
+
+    def _connect(self, server: _Server):
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            if server.process.poll() is not None:
+                raise RuntimeError(f"APSIM server on port {server.port} exited with code {server.process.poll()}")
+            try:
+                server.sock = connect_to_remote_server('127.0.0.1', server.port)
+                break
+            except ConnectionRefusedError:
+                # the server is still loading the model
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"APSIM server on port {server.port} did not start in "
+                                       f"{self.connect_timeout} seconds")
+                time.sleep(0.05)
+        server.sock.settimeout(self.run_timeout)
+
+    def _restart(self, server: _Server):
+        if server.sock is not None:
+            disconnect_from_server(server.sock)
+            server.sock = None
+        _stop_process(server.process)
+        server.restarts += 1
+        if server.restarts > self.max_restarts:
+            raise RuntimeError(f"APSIM server slot {server.slot} failed {server.restarts} times")
+        logger.info(f"restarting APSIM server slot {server.slot}, restart {server.restarts}")
+        self._launch(server)
+        self._connect(server)
+
+    def _reconnect(self, server: _Server):
+        # the answers of a rejected job may still be in flight, a new connection resynchronizes the protocol
+        disconnect_from_server(server.sock)
+        server.sock = None
+        self._connect(server)
+
+    def run(self, changes: Optional[list] = None, outputs: Union[Dict, List[str], None] = None,
+            table: str = 'Report') -> pd.DataFrame:
+        """
+        Runs the model with ``changes`` on the next idle server and reads ``outputs`` from ``table``.
+
+        Parameters
+        ----------
+        changes : list of dict, optional
+            Replacements with ``path``, ``value`` and ``paramtype`` keys, see
+            :func:`~apsimNGpy._server.utils.run_with_changes`.
+        outputs : dict or list of str, optional
+            ``{column: ctype}``, or column names read as doubles. If omitted, nothing is read.
+        table : str, optional, default='Report'
+            Report table holding ``outputs``.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One column per output, empty when no output is requested.
+
+        Raises
+        ------
+        ApsimProtocolError
+            If APSIM rejects the job, e.g., an invalid replacement path or a failed run. The job is not retried.
+        RuntimeError
+            If the pool is closed or a server keeps failing after ``max_restarts`` restarts.
+        """
+        if outputs is not None and not isinstance(outputs, dict):
+            outputs = {name: c_double for name in outputs}
+        server = self._acquire()
+        try:
+            while True:
+                try:
+                    run_with_changes(server.sock, changes)
+                    data = read_output(server.sock, table, outputs) if outputs else {}
+                    server.runs += 1
+                    server.restarts = 0
+                    return pd.DataFrame(data)
+                except ApsimProtocolError:
+                    # the job failed, not the server
+                    try:
+                        self._reconnect(server)
+                    except SERVER_ERRORS + (RuntimeError,) as e:
+                        logger.info(f"APSIM server slot {server.slot} failed: {e!r}")
+                        self._replace(server)
+                    raise
+                except SERVER_ERRORS as e:
+                    if self.closed:
+                        raise RuntimeError('ServerPool is closed') from e
+                    # crashed or hung, the job is retried on a fresh process in the same slot
+                    logger.info(f"APSIM server slot {server.slot} failed: {e!r}")
+                    self._replace(server)
+        finally:
+            if server.sock is not None:
+                self._idle.put(server)
+
+    def _replace(self, server: _Server):
+        try:
+            self._restart(server)
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+            _stop_process(server.process)
+            server.sock = None
+            raise
+
+    def _acquire(self) -> _Server:
+        while True:
+            if self.closed:
+                raise RuntimeError('ServerPool is closed')
+            if not self._alive:
+                raise RuntimeError('no APSIM server left in the pool')
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    async def submit(self, changes: Optional[list] = None, outputs: Union[Dict, List[str], None] = None,
+                     table: str = 'Report') -> pd.DataFrame:
+        """Awaitable :meth:`run`, at most ``n_servers`` runs are in flight at once."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.n_servers, thread_name_prefix='apsim-pool')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self.run, changes, outputs, table))
+
+    @property
+    def stats(self) -> list:
+        """Port, number of completed runs and restarts of every server slot."""
+        return [{'slot': s.slot, 'port': s.port, 'runs': s.runs, 'restarts': s.restarts} for s in self.servers]
+
+    def close(self):
+        """Closes the sockets and stops every server process."""
+        self.closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        for server in self.servers:
+            if server.sock is not None:
+                disconnect_from_server(server.sock)
+                server.sock = None
+            _stop_process(server.process)
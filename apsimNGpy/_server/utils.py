@@ -5,6 +5,7 @@ import subprocess
 from ctypes import c_int32, c_double, c_char
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 
@@ -189,71 +190,117 @@ def wait_for_fin(sock):
 
 
 # ---------------------------
-# RUN
+# PIPELINED FRAMES
 # ---------------------------
-def run_with_changes(sock, changes):
-    send_string(sock, COMMAND_RUN)
-    validate_response(sock, ACK)
-    if changes:
-        for change in changes:
-            send_replacement(sock, change)
+# replacements written before their ACKs are read, bounded so that neither side fills its socket buffer
+PIPELINE_DEPTH = 256
+COLUMN_DTYPES = {c_int32: np.dtype('<i4'), c_double: np.dtype('<f8')}
 
-    send_string(sock, FIN)
-    validate_response(sock, ACK)
 
-    # print(resp)
-    # if resp != FIN:
-    #     raise ApsimProtocolError(f"Command ran with errors: {resp}")
-    print("FIN ===", FIN)
-    validate_response(sock, FIN)
-    # wait_for_fin(sock=sock)
+def _frame_string(value: str) -> bytes:
+    """Length-prefixed string, the same bytes as ``send_string``."""
+    encoded = value.encode()
+    return struct.pack('<i', len(encoded)) + encoded
 
-    print("Run finished")
+
+def _frame_replacement(change) -> bytes:
+    """Path, type and value of one change, the same bytes as ``send_replacement``."""
+    value = change["value"]
+    if isinstance(value, (float, np.floating)):
+        encoded = struct.pack('<d', value)
+    elif isinstance(value, (int, np.integer)):
+        encoded = struct.pack('<i', value)
+    elif isinstance(value, str):
+        encoded = _frame_string(value)
+    else:
+        raise TypeError("Unsupported value type")
+    return _frame_string(change["path"]) + struct.pack('<i', change["paramtype"]) + encoded
 
 
-# ---------------------------
-# READ OUTPUT
-# ---------------------------
-def read_output(sock, tablename, param_list):
-    send_string(sock, COMMAND_READ)
-    validate_response(sock, ACK)
+def _recv_message(sock) -> bytearray:
+    """Reads one length-prefixed message straight into a buffer, without intermediate copies."""
+    header = bytearray(4)
+    _recv_into(sock, header)
+    buffer = bytearray(struct.unpack('<i', header)[0])
+    _recv_into(sock, buffer)
+    return buffer
 
-    send_string(sock, tablename)
-    validate_response(sock, ACK)
 
-    for param in param_list:
-        send_string(sock, param)
-        validate_response(sock, ACK)
+def _recv_into(sock, buffer):
+    view = memoryview(buffer)
+    while view:
+        n = sock.recv_into(view)
+        if not n:
+            raise ConnectionError("Socket connection lost")
+        view = view[n:]
 
-    send_string(sock, FIN)
-    # validate_response(sock, FIN)
 
-    results = {}
-    send_string(sock, ACK)
+def _expect_acks(sock, count, stage):
+    for _ in range(count):
+        resp = _recv_message(sock).decode(errors='replace')
+        if resp != ACK:
+            raise ApsimProtocolError(f"Expected '{ACK}' after {stage}, got '{resp}'")
 
-    for param, dtype in param_list.items():
-        results[param] = read_output_of_one(sock, dtype)
-        send_string(sock, ACK)
 
-    return results
+# ---------------------------
+# RUN
+# ---------------------------
+def run_with_changes(sock, changes):
+    """
+    Runs the loaded model once with ``changes`` applied.
+
+    Frames are pipelined: the command and up to ``PIPELINE_DEPTH`` replacements are written in a single call and
+    their acknowledgements are read afterwards, instead of one round trip per message. The bytes exchanged are the
+    same as with :func:`send_replacement`. After an :class:`ApsimProtocolError` the socket state is undefined and the
+    connection should be reopened.
+    """
+    changes = list(changes or [])
+    payload = [_frame_string(COMMAND_RUN)]
+    expected = 1
+    for i in range(0, len(changes), PIPELINE_DEPTH):
+        payload.extend(_frame_replacement(change) for change in changes[i:i + PIPELINE_DEPTH])
+        expected += 3 * len(changes[i:i + PIPELINE_DEPTH])
+        sock.sendall(b''.join(payload))
+        _expect_acks(sock, expected, 'sending changes')
+        payload, expected = [], 0
+    payload.append(_frame_string(FIN))
+    sock.sendall(b''.join(payload))
+    _expect_acks(sock, expected + 1, FIN)
+    while True:
+        resp = _recv_message(sock).decode(errors='replace')
+        if resp == FIN:
+            return
+        if resp != ACK:
+            raise ApsimProtocolError(f"Command ran with errors: {resp}")
 
 
-def read_output_of_one(sock, param_type):
-    size, data = read_from_socket(sock)
+# ---------------------------
+# READ OUTPUT
+# ---------------------------
+def read_output(sock, tablename, param_list):
+    """
+    Reads the columns ``param_list`` (``{name: ctype}``) of ``tablename``.
 
-    if param_type == c_int32:
-        fmt = f'{size // 4}i'
-        return struct.unpack(fmt, data)
+    The whole request, including the acknowledgements of every column, is written at once. Numeric columns are
+    returned as NumPy arrays decoded in place from the received bytes.
+    """
+    params = list(param_list)
+    payload = [_frame_string(COMMAND_READ), _frame_string(tablename), *map(_frame_string, params),
+               _frame_string(FIN), *[_frame_string(ACK)] * (len(params) + 1)]
+    sock.sendall(b''.join(payload))
+    _expect_acks(sock, len(params) + 2, f'requesting {tablename}')
+    return {param: read_output_of_one(sock, param_list[param]) for param in params}
 
-    elif param_type == c_double:
-        fmt = f'{size // 8}d'
-        return struct.unpack(fmt, data)
 
-    elif param_type == c_char:
+def read_output_of_one(sock, param_type):
+    data = _recv_message(sock)
+    if param_type == c_char:
         return data.decode()
-
-    else:
+    dtype = COLUMN_DTYPES.get(param_type)
+    if dtype is None:
         raise ValueError("Unknown param type")
+    # a view on the received buffer, no per-value boxing
+    return np.frombuffer(data, dtype=dtype)
 
 
 # ---------------------------
@@ -12,13 +12,13 @@ import pandas as pd
 from pandas import DataFrame
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 from apsimNGpy.core.apsim import ApsimModel
+from apsimNGpy.core_utils.aggregation import AGGS
 from apsimNGpy.core_utils.database_utils import write_df_to_sql, read_with_pandas, get_db_table_names
+from apsimNGpy.core_utils.parquet_sink import write_fragment
 from apsimNGpy.exceptions import ApsimRuntimeError
 from apsimNGpy.core_utils.utils import get_array_like
 from apsimNGpy.logger import logger
 
-AGGS = {'sum', 'mean', 'max', 'min', 'median', 'std'}
-
 counter = Value("i", 0)
 lock = Lock()
 IDENTIFICATION = 'ID'
@@ -30,6 +30,7 @@ TABLE_PREFIX = '__table'
 RETRY_INTERVAL = 1
 MODEL_KEY = 'model'
 ENCODING = "utf-8"
+SQL_SINK = 'sql'
 
 
 def process_id():
@@ -44,6 +45,11 @@ def schema_id(schema):
     return hashlib.md5(payload).hexdigest()
 
 
+def frame_schema_id(df) -> str:
+    """Schema hash of a frame from its column names and dtypes, frames sharing it can be stored together."""
+    return schema_id(tuple(f"{name}:{dtype}" for name, dtype in df.dtypes.items()))
+
+
 def auto_generate_schema_id(columns, prefix):
     table_id = f"{prefix}_{schema_id(columns)}"
     return table_id
@@ -163,7 +169,7 @@ def edit_to_folder(job, *, folder_path: str, prefix, db_or_conn, call_back=None)
             # metadata['ApsimReports'] = f"{reps}"
             out = pd.DataFrame.from_records([metadata])
 
-            schema_hash = schema_id(tuple(out.dtypes))
+            schema_hash = frame_schema_id(out)
             table_name = f"meta{prefix}{schema_hash}_{PID}"
             try:
                 write_df_to_sql(out, db_or_con=db_or_conn, table_name=table_name, if_exists='append',
@@ -176,6 +182,29 @@ def edit_to_folder(job, *, folder_path: str, prefix, db_or_conn, call_back=None)
             pass
 
 
+def _simulate(model, inputs, *, table, timeout, call_back=None, result_cache=None) -> DataFrame:
+    """Runs one model and returns its results, read from ``result_cache`` if the same run was cached before."""
+    # call backs are arbitrary code that the cache key cannot describe, so these runs are never cached
+    key = (result_cache.make_key(model, inputs, table=table, namespace='multi_core')
+           if result_cache is not None and not call_back else None)
+    if key:
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+    with ApsimModel(model) as _model:
+        if call_back and callable(call_back):
+            # there might be additional works that the user wants to enforce
+            call_back(_model)
+        if inputs:
+            # set before running
+            _ = [_model.set_params(**pt) for pt in inputs]
+        _model.run(timeout=timeout, cpu_count=1, report_name=table)
+        results = _model.results
+    if key:
+        result_cache.put(key, results)
+    return results
+
+
 def harmonise_groups(agg_func, index):
     if agg_func:
         if agg_func not in AGGS:
@@ -207,7 +236,12 @@ def single_runner(
         subset=None,
         call_back=None,
         ignore_runtime_errors=True,
-        retry_rate=RETRY_INTERVAL, table_name=None):
+        retry_rate=RETRY_INTERVAL, table_name=None,
+        result_sink: str = SQL_SINK,
+        dataset_dir=None,
+        result_queue=None,
+        result_cache=None,
+        result_key=None):
     """
     Execute a single APSIM simulation job and persist its results to a database.
 
@@ -256,13 +290,38 @@ def single_runner(
     retry_rate: int, optional default is 1
        Number of times to retry by tenacity if ApsimRunTimeError is encountered, this suspects
        that it is due to timeout errors. Other errors may be fatal, and after this retrial, they will be displayed
+    result_sink: str, optional default is 'sql'
+       ``'sql'`` appends the results to ``db_conn``. ``'parquet'`` or ``'arrow'`` write them as one
+       fragment of the columnar dataset at ``dataset_dir``, see :mod:`apsimNGpy.core_utils.parquet_sink`.
+
+       .. versionadded:: 1.5.7
+    dataset_dir: str or Path, optional
+       Root directory of the columnar dataset, required when ``result_sink`` is not ``'sql'``.
+    result_queue: queue, optional
+       Queue of a :class:`~apsimNGpy.parallel.result_writer.ResultWriter`. When provided, results are put on it
+       and written by the single writer process instead of opening ``db_conn`` in this worker.
+
+       .. versionadded:: 1.5.7
+    result_cache: apsimNGpy.core_utils.result_cache.ResultCache, optional
+       On-disk cache of simulated results. A job whose model, inputs, weather and APSIM version were simulated
+       before is not run again. Jobs with a ``call_back`` are never cached.
+
+       .. versionadded:: 1.5.7
+    result_key: str, optional
+       Sent with the results on ``result_queue``, the writer reports it through
+       :meth:`~apsimNGpy.parallel.result_writer.ResultWriter.committed` once the rows are committed.
+
+       .. versionadded:: 1.5.7
 
 
     Returns
     -------
-    None
-        Results are written to the database as a side effect. Failed jobs are
-        recorded in ``incomplete_jobs``.
+    bool
+        ``True`` once the results were handed to the result store, ``False`` if the job failed and the error was
+        ignored (``ignore_runtime_errors=True``). Results are written to the database as a side effect.
+
+        .. versionchanged:: 1.5.7
+           Returned ``True`` for ignored failures as well.
 
     Notes
     -----
@@ -291,75 +350,78 @@ def single_runner(
             model, metadata, inputs = _inspect_job(job)
 
             ID = metadata.get(IDENTIFICATION, None) if metadata else None
-            with (ApsimModel(model) as _model):
-                try:
-                    if call_back and callable(call_back):
-                        # there might be additional works that the user wants to enforce
-                        call_back(_model)
-                    if inputs:
-                        # set before running
-                        _ = [_model.set_params(**pt) for pt in inputs]
-                    _model.run(timeout=timeout, cpu_count=1, report_name=table_to_use)
-
-                    # Aggregate results if requested
-                    if agg_func:
-                        grp = harmonise_groups(agg_func=agg_func, index=index)
-                        grp = list(grp)
-                        dat = _model.results.groupby(grp)
-                        out = dat.agg(agg_func, numeric_only=True)
-                        out.reset_index(inplace=True, drop=False)
-                        out["source_name"] = Path(model).name
-                    else:
-                        out = _model.results
-
-                    if sub:
-                        sub = get_array_like(sub)
-                        if 'source_table' in out and 'source_table' not in sub:
-                            sub = [*sub, 'source_table']
-
-                        if set(sub).issubset(out.columns):
-                            out = out[[*sub]].copy()
-
-                    # Attach execution metadata
-                    PID = os.getpid()
-                    out["MetaProcessID"] = PID
-                    # avoid duplicates columns
-                    merged_inputs = merge_dict(inputs)
-                    metadata = {**metadata, **merged_inputs}
-                    out = out.assign(**metadata)
-                    schema_hash = schema_id(tuple(out.dtypes))
-                    out["MetaExecutionID"] = ID or schema_hash
-                    ##########################################################################################
-                    # Generate a unique table identifier based on schema and process ID that way they cannot be resource sharing of the same table
-                    ############################################################################################################
+            try:
+                results = _simulate(model, inputs, table=table_to_use, timeout=timeout, call_back=call_back,
+                                    result_cache=result_cache)
+
+                # Aggregate results if requested
+                if agg_func:
+                    grp = harmonise_groups(agg_func=agg_func, index=index)
+                    grp = list(grp)
+                    dat = results.groupby(grp)
+                    out = dat.agg(agg_func, numeric_only=True)
+                    out.reset_index(inplace=True, drop=False)
+                    out["source_name"] = Path(model).name
+                else:
+                    out = results
+
+                if sub:
+                    sub = get_array_like(sub)
+                    if 'source_table' in out and 'source_table' not in sub:
+                        sub = [*sub, 'source_table']
+
+                    if set(sub).issubset(out.columns):
+                        out = out[[*sub]].copy()
+
+                # Attach execution metadata
+                PID = os.getpid()
+                out["MetaProcessID"] = PID
+                # avoid duplicates columns
+                merged_inputs = merge_dict(inputs)
+                metadata = {**metadata, **merged_inputs}
+                out = out.assign(**metadata)
+                schema_hash = frame_schema_id(out)
+                out["MetaExecutionID"] = ID or schema_hash
+                ##########################################################################################
+                # Generate a unique table identifier based on schema and process ID that way they cannot be resource sharing of the same table
+                ############################################################################################################
+                if result_queue is not None:
+                    # the writer is the only process touching the database, so tables are shared per schema
+                    item = (f"{table_prefix}_{schema_hash}", out)
+                    result_queue.put(item if result_key is None else (*item, result_key))
+                elif result_sink == SQL_SINK:
                     table_name = f"{table_prefix}_{schema_hash}_{PID}"
                     write_df_to_sql(out, db_or_con=db_conn, table_name=table_name, if_exists=if_exists,
                                     chunk_size=chunk_size)
-                    del out, inputs, model, metadata, merged_inputs
-                    gc.collect()
-
-                except ApsimRuntimeError as apr:
-                    # Track failed jobs without interrupting the workflow
-                    if ignore_runtime_errors:
-                        logger.exception(f"error {apr} occurred while running\n {job}")
-                        return job
-                    else:
-                        raise ApsimRuntimeError(f"runtime errors occurred{apr} with {job}")
-                except TimeoutError as te:
-                    logger.exception(f"timeout occurred while running\n {job}")
-                    if ignore_runtime_errors:
-                        return job
-                    else:
-                        raise TimeoutError(f'time out occurred: {te}')
-                except sqlite3.OperationalError as oe:
-                    if ignore_runtime_errors:
-                        logger.exception(f"error {oe} occurred while running {job}")
-                        return job
-                    else:
-                        raise sqlite3.OperationalError(f"data base operation error occurred {oe}")
-
-        _inside_runner(subset)
-        return True
+                else:
+                    # one file per job, no lock is shared with the other workers
+                    write_fragment(out, dataset_dir, partition=f"{table_prefix}_{schema_hash}",
+                                   fmt=result_sink)
+                del out, results, inputs, model, metadata, merged_inputs
+                gc.collect()
+
+            except ApsimRuntimeError as apr:
+                # Track failed jobs without interrupting the workflow
+                if ignore_runtime_errors:
+                    logger.exception(f"error {apr} occurred while running\n {job}")
+                    return job
+                else:
+                    raise ApsimRuntimeError(f"runtime errors occurred{apr} with {job}")
+            except TimeoutError as te:
+                logger.exception(f"timeout occurred while running\n {job}")
+                if ignore_runtime_errors:
+                    return job
+                else:
+                    raise TimeoutError(f'time out occurred: {te}')
+            except sqlite3.OperationalError as oe:
+                if ignore_runtime_errors:
+                    logger.exception(f"error {oe} occurred while running {job}")
+                    return job
+                else:
+                    raise sqlite3.OperationalError(f"data base operation error occurred {oe}")
+
+        # _inside_runner returns the job when its failure was ignored
+        return _inside_runner(subset) is None
 
     rt = runner_it()
     return rt
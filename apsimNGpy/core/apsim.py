@@ -9,13 +9,13 @@ from contextlib import suppress
 from dataclasses import dataclass
 from functools import cache
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
 from typing import Optional, Tuple, Sequence
 from typing import Union
 from apsimNGpy.starter.starter import CLR
 import numpy as np
 import pandas as pd
-from apsimNGpy.core.core import CoreModel, ModelTools
+from apsimNGpy.core.core import CoreModel, ModelTools, _changes_tree
 from apsimNGpy.core_utils.utils import get_array_like
 
 Models = CLR.Models
@@ -23,10 +23,11 @@ CastHelper = CLR.CastHelper
 from apsimNGpy.core.model_loader import AUTO_PATH
 from apsimNGpy.core.model_loader import get_node_by_path
 from apsimNGpy.core.model_tools import find_child_of_class
-from apsimNGpy.core.soiler import SoilManager
+from apsimNGpy.core.soiler import SoilManager, inject_soil_profiles
 from apsimNGpy.core_utils.utils import get_array_like
 from apsimNGpy import logger, timer, NodeNotFoundError, is_scalar
 from apsimNGpy.soils.helpers import soil_water_param_fill
+from apsimNGpy.soils.profile_cache import as_soil_profile_cache
 from System.Collections.Generic import List
 from System.Collections.Generic import KeyValuePair
 from apsimNGpy.core.edit import edit_model_by_name
@@ -450,6 +451,9 @@ class ApsimModel(CoreModel):
         model optimization, calibration, or parameter sensitivity analysis workflows.
         In such cases, parameter sets can be programmatically generated, serialized,
         and reused without manual modification of code.
+
+        When the model was created with ``incremental_save=True``, the edit is not saved right away; it is written
+        by the next :meth:`run` or :meth:`save_edits` call, without reloading the model.
         """
         pa = params or kwargs
 
@@ -467,9 +471,11 @@ class ApsimModel(CoreModel):
             pa['commands'] = dict(zip(cmds, vals))
 
         self.edit_model_by_path(**pa)
-        self.save()
+        if not self.incremental_save:
+            self.save()
         return self
 
+    @_changes_tree
     def get_soil_from_web(self,
                           simulations: Union[str, tuple, None] = None,
                           *,
@@ -498,7 +504,8 @@ class ApsimModel(CoreModel):
                           top_urea=0,
                           top_nh3=0.5,
                           top_nh4=0.05,
-                          adjust_dul: bool = True, **soil_kwargs):
+                          adjust_dul: bool = True,
+                          cache=None, **soil_kwargs):
         """
         Download soil profiles for a given location and populate the APSIM NG
         soil sections in the current model.
@@ -545,6 +552,11 @@ class ApsimModel(CoreModel):
 
         adjust_dul : bool, optional
             If ``True``, adjust layer values where ``SAT`` exceeds ``DUL`` to prevent APSIM runtime errors.
+        cache : SoilProfileCache | str | Path | bool | None, optional
+            Reuse profiles built for other points on the same soil (SSURGO map unit or SoilGrids cell), see
+            :class:`~apsimNGpy.soils.profile_cache.SoilProfileCache`. ``True`` uses the default cache directory.
+
+            .. versionadded:: 1.5.7
         n_layers: int
            number of soil layers to generate a soil profile.
         source : str, optional default='isric'
@@ -734,6 +746,8 @@ class ApsimModel(CoreModel):
 
         simulation_name = simulations  # for backward compatibility
         simulations = self.find_simulations(simulations=simulations)
+        # one cache instance for all simulations
+        cache = as_soil_profile_cache(cache)
         for simulation in simulations:
             # Pre-attach requested sections (avoids "created but unreachable" inside editor)
             if attach_missing_sections:
@@ -783,7 +797,8 @@ class ApsimModel(CoreModel):
                 top_urea=top_urea,
                 top_nh3=top_nh3,
                 top_nh4=top_nh4,
-                swcon=swcon
+                swcon=swcon,
+                cache=cache
 
             )
             add_crop = additional_plants if additional_plants is not None else ()
@@ -809,7 +824,54 @@ class ApsimModel(CoreModel):
             soil_water_param_fill(self, **soil_kwargs)
         return self
 
+    @_changes_tree
+    def inject_soil_profiles(self, profiles: Mapping[str, Mapping], *, sections: Optional[Sequence[str]] = None,
+                             additional_plants: Sequence[str] = (), adjust_dul: bool = True):
+        """
+        Write soil profiles into many simulations at once.
+
+        The model tree is walked once to index the soil nodes of every simulation, then each layer array is copied
+        into a pre-allocated .NET ``double[]``. Use it instead of repeated :meth:`get_soil_from_web` or
+        :meth:`replace_soil_property_values` calls when one file holds many point simulations.
+
+        Parameters
+        ----------
+        profiles : Mapping[str, Mapping]
+            Simulation name to soil profile, e.g., the profiles returned by
+            :func:`~apsimNGpy.soils.profile_cache.soil_profiles_for_points` or
+            :meth:`~apsimNGpy.soils.batch.SoilProfileBatch.profile`. Simulations mapped to ``None`` (points
+            without soil data) keep their current soil.
+        sections : Sequence[str], optional
+            Sections to write, see :data:`~apsimNGpy.core.soiler.BULK_SOIL_SECTIONS`. All by default.
+        additional_plants : Sequence[str], optional
+            Plant names for which to add ``SoilCrop`` entries.
+        adjust_dul : bool, default True
+            Lower ``DUL`` below ``SAT`` where needed, as :meth:`adjust_dul` does.
+
+        Returns
+        -------
+        self
+            The same instance, to allow method chaining.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            profiles = soil_profiles_for_points(points, thickness_mm=[150, 150, 200, 300, 400], source='isric')
+            model.inject_soil_profiles(dict(zip(simulation_names, profiles)))
+
+        .. versionadded:: 1.5.7
+        """
+        inject_soil_profiles(self.Simulations, profiles, sections=sections, additional_plants=additional_plants,
+                             adjust_dul=adjust_dul)
+        if self.incremental_save:
+            self._dirty_nodes.update(f'{name}:Soil' for name, profile in profiles.items() if profile is not None)
+        else:
+            self.save()
+        return self
+
     @timer
+    @_changes_tree
     def remove_node(self, node):
         """
         Removes a node from the Simulating tree
@@ -1184,6 +1246,7 @@ class ApsimModel(CoreModel):
                 candidate.unlink(missing_ok=True)
 
 
+    @_changes_tree
     def clone_simulation(self, rename: str, base_simulation: Union[int, str] = 0) -> bool:
         """
         Clone an existing simulation and assign it a new name.
@@ -1375,6 +1438,7 @@ class ApsimModel(CoreModel):
         if rename:
             node_from_node.Name = rename
 
+    @_changes_tree
     def add_node_from_models(self, source, target: dict, replace=True, rename=None):
         """
         Add a new node constructed from the APSIM ``Models`` namespace.
@@ -1497,6 +1561,7 @@ class ApsimModel(CoreModel):
         ModelTools.ADD(node_from_node, node_to_loc)
         self.save()
 
+    @_changes_tree
     def add_new_model(self, *, parent_identifier, parent_type, source: dict, replace=True, rename=None):
         """
             Add a new APSIM model node to a specified parent node using a dictionary specification.
@@ -1682,6 +1747,7 @@ class ApsimModel(CoreModel):
         # save the model
         self.save()
 
+    @_changes_tree
     def add_model_from_apsimx(self, *, source: dict, target: dict, replace=True, rename=None):
         """
         Add a node from a source into a target location within the APSIM model.
@@ -2025,6 +2091,7 @@ class ApsimModel(CoreModel):
             self.base_simulations = base_sim
         return ModelTools.CLONER(self.base_simulations)
 
+    @_changes_tree
     def _create_new_simulation(self, sim_name, lonlat=None):
         _sim = self._get_base_simulations()
         _sim.Name = sim_name
@@ -17,7 +17,7 @@ import shutil
 import string
 import warnings
 from collections.abc import KeysView, ValuesView
-from functools import lru_cache, partial
+from functools import lru_cache, partial, wraps
 from typing import Any
 from typing import Union
 
@@ -45,9 +45,10 @@ from apsimNGpy.core.plotmanager import PlotManager
 from apsimNGpy.core.run_time_info import BASE_RELEASE_NO, GITHUB_RELEASE_NO
 from apsimNGpy.core.runner import run_model_externally, run_p, run_apsim_by_path
 from apsimNGpy.core.version_inspector import is_higher_apsim_version
-from apsimNGpy.core_utils.database_utils import read_db_table
+from apsimNGpy.core_utils.database_utils import read_db_table, read_db_tables, iter_db_tables, dispose_read_engine
 # prepare for the C# import
-from apsimNGpy.core_utils.utils import open_apsimx_file_in_window, is_scalar, timer
+from apsimNGpy.core_utils.node_index import NodeIndex
+from apsimNGpy.core_utils.utils import open_apsimx_file_in_window, is_scalar, timer, get_array_like
 from apsimNGpy.exceptions import ModelNotFoundError, NodeNotFoundError
 from apsimNGpy.manager.weather_loader import get_weather
 from apsimNGpy.settings import  MissingOption, SCRATCH
@@ -63,6 +64,35 @@ VERBOSE = False
 RELOAD = True
 
 
+def _tracks_edit(method):
+    """Records the node edited by ``method`` as dirty, see :meth:`CoreModel.save_edits`."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        out = method(self, *args, **kwargs)
+        if self.incremental_save:
+            names = list(args[:2]) or [kwargs.get('path') or kwargs.get('model_type'), kwargs.get('model_name')]
+            self._dirty_nodes.add(':'.join(str(n) for n in names if n is not None))
+        return out
+
+    return wrapper
+
+
+def _changes_tree(method):
+    """Drops the node index after ``method`` adds, removes, moves or renames nodes, see :attr:`CoreModel.node_index`."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            index = getattr(self, '_node_index', None)
+            if index is not None:
+                index.invalidate()
+
+    return wrapper
+
+
 def edit_cultivar(node, cultivar_name, commands):
     def validate_commands(cmds):
         valid = []
@@ -117,6 +147,14 @@ class CoreModel(PlotManager):
         If ``True``, initialize the model as an experiment.
     set_wd : str | Path, optional
         Working directory for scratch copies and outputs.
+    incremental_save : bool, optional, default=False
+        Track parameter edits made through :meth:`edit_model`, :meth:`edit_model_by_path` and ``set_params``.
+        Those edits are no longer saved one by one; :meth:`run` writes them to disk once through
+        :meth:`save_edits`, which skips the reload round trip of :meth:`save`. This is meant for tight loops
+        that change a few parameters between runs. Structural edits, e.g., adding or removing models, keep
+        doing a full save. Changes made directly on the .NET nodes must be followed by :meth:`save`.
+
+        .. versionadded:: 1.5.7
 
     Notes
     -----
@@ -137,6 +175,7 @@ class CoreModel(PlotManager):
             experiment=False,
             set_wd=None,
             copy=None,
+            incremental_save=False,
             **kwargs
     ):
         # User-specified configuration
@@ -173,6 +212,12 @@ class CoreModel(PlotManager):
         self.Start = MissingOption
         self.End = MissingOption
         self.run_method = None
+        self.output_query = {}
+        # nodes edited since the file at self.path was last written, used when incremental_save is on
+        self.incremental_save = incremental_save
+        self._dirty_nodes = set()
+        # path and type lookup tables over self.Simulations, built on first use, see node_index
+        self._node_index = None
 
         # Working directories
         self.work_space =SCRATCH
@@ -616,6 +661,9 @@ class CoreModel(PlotManager):
             else:
                 sm = getattr(self.Simulations, 'Node', self.Simulations)
                 save_model_to_file(sm, out=_path)
+            if reload or _path == os.path.realpath(self.path):
+                # the file now holds every pending edit
+                self._dirty_nodes.clear()
             # rest the reference path to the saved filename or path
             if reload:
                 model_info = recompile(self)
@@ -627,6 +675,56 @@ class CoreModel(PlotManager):
 
             pass
 
+    @property
+    def node_index(self) -> NodeIndex:
+        """
+        Path and type index of the model tree, see :class:`~apsimNGpy.core_utils.node_index.NodeIndex`.
+
+        It is built on first use with one walk of ``Simulations`` and rebuilt when the model is reloaded or a
+        structural method (``add_model``, ``remove_model``, ``move_model``, ``clone_model``, ``rename_model``) runs.
+        Path edits then resolve their nodes without walking the tree, which matters for sweeps with
+        ``incremental_save=True``. Call :meth:`invalidate_node_index` after changing the tree through the .NET
+        objects directly.
+
+        .. versionadded:: 1.5.7
+        """
+        index = getattr(self, '_node_index', None)
+        if index is None or index.root is not self.Simulations:
+            index = self._node_index = NodeIndex(self.Simulations, cast=cast_obj)
+        return index
+
+    def invalidate_node_index(self):
+        """Drops the node index, the next lookup walks the tree again."""
+        index = getattr(self, '_node_index', None)
+        if index is not None:
+            index.invalidate()
+        return self
+
+    @property
+    def dirty_nodes(self) -> tuple:
+        """Nodes edited since the model file was last written, only tracked when ``incremental_save`` is on."""
+        return tuple(sorted(self._dirty_nodes))
+
+    def save_edits(self):
+        """
+        Write pending parameter edits to the model file without reloading the model.
+
+        :meth:`save` serializes the tree, then serializes it again in ``recompile`` and deserializes it back into
+        a new ``Simulations`` object. After parameter edits the in-memory tree is already up to date, so only the
+        file write is needed. Nothing is written if no tracked edit is pending.
+
+        Returns
+        -------
+        self
+
+        .. versionadded:: 1.5.7
+        """
+        if not self._dirty_nodes:
+            return self
+        save_model_to_file(getattr(self.Simulations, 'Node', self.Simulations), os.path.realpath(self.path))
+        self._dirty_nodes.clear()
+        return self
+
     @property
     def results(self) -> pd.DataFrame:
         """
@@ -752,12 +850,12 @@ class CoreModel(PlotManager):
 
         db_path = Path(self.path).with_suffix('.db')
         if self.ran_ok:
-            return self._get_results(_reports, db_path, axis=0)
+            return self._get_results(_reports, db_path, axis=0, **self.output_query)
         else:
 
             logger.info(f"{self} not yet executed. Please call `run()`")
 
-    def _get_results(self, _reports, _db_path, axis=0):
+    def _get_results(self, _reports, _db_path, axis=0, columns=None, where=None, simulations=None):
         from collections.abc import Iterable
         # Normalize report_names to a list
         if isinstance(_reports, str):
@@ -768,29 +866,20 @@ class CoreModel(PlotManager):
             raise TypeError(f"report_names must be an iterable of strings, not {type(_reports)}.")
         if _reports:
             if self.ran_ok:
-                # lazy generator (adds a column with the report name)
-                if axis == 0:
-                    data = (
-                        df.assign(source_table=rep)
-                        for rep in reports
-                        for df in [read_db_table(_db_path, rep)]
-                        if isinstance(df, pd.DataFrame)
-                    )
-                else:
-                    data = (
-                        df
-                        for rep in reports
-                        for df in [read_db_table(_db_path, rep)]
-
-                        if isinstance(df, pd.DataFrame)
-                    )
-
-                return pd.concat(data, axis=axis)
+                # all report tables are read over one pooled connection (adds a column with the report name)
+                frames = read_db_tables(_db_path, reports, label='source_table' if axis == 0 else None,
+                                        columns=columns, where=where, simulations=simulations)
+                if not frames:
+                    # every report lacks a filtered column, so none contributes rows
+                    empty = get_array_like(columns) if columns is not None else []
+                    return pd.DataFrame(columns=[*empty, 'source_table'] if axis == 0 else empty)
+                return pd.concat(frames.values(), axis=axis)
             else:
                 logger.info('attempting to access results without calling bound method: `run()`')
                 raise RuntimeError(f"attempting to access results without executingg the model. Please call `run()`")
 
-    def get_simulated_output(self, report_names: Union[str, list], axis=0, **kwargs) -> pd.DataFrame:
+    def get_simulated_output(self, report_names: Union[str, list], axis=0, columns=None, where=None,
+                             simulations=None, **kwargs) -> pd.DataFrame:
         """
         Reads report data from CSV files generated by the simulation. More Advanced table-merging arguments will be introduced soon.
 
@@ -803,6 +892,21 @@ class CoreModel(PlotManager):
         axis: int, Optional. Default to 0
             concatenation axis numbers for multiple reports or database tables. if axis is 0, source_table column is populated to show source of the data for each row
 
+        columns: str or list of str, optional
+            Columns to read, the rest are never loaded from the database. Columns missing in a report are ignored.
+
+        where: str or dict, optional
+            Row filter evaluated by SQLite before any data is loaded. Either an SQL expression such as
+            ``'Yield > 1000'`` or a dict of filters combined with AND, e.g., ``{'Zone': 'Field', 'year': (1990, 2000)}``
+            where a tuple is an inclusive range with optional ``None`` bounds and a list is a set of allowed values.
+            Reports lacking a filtered column contribute no rows. If all of them lack it, an empty DataFrame with the
+            requested ``columns`` is returned.
+
+        simulations: str or list of str, optional
+            Names of the simulations to keep, matched against the ``_Simulations`` table of the database.
+
+            .. versionadded:: 1.5.7
+
         Returns:
         --------
         ``pd.DataFrame``
@@ -887,6 +991,11 @@ class CoreModel(PlotManager):
         10             1             1  ...            NaN             NaN
         [11 rows x 19 columns]
 
+        Only the needed columns and rows are read, which matters for long daily reports.
+
+        >>> model.get_simulated_output('Report', columns=['Yield', 'Maize.Grain.N'],
+        ...                            where={'Yield': (5000, None)}, simulations='Simulation')
+
         .. seealso::
 
            Related API: :attr:`results`.
@@ -894,10 +1003,64 @@ class CoreModel(PlotManager):
         db_path = Path(self.path).with_suffix('.db')
         _reports = report_names
         if self.ran_ok:
-            return self._get_results(_reports, db_path, axis=axis)
+            return self._get_results(_reports, db_path, axis=axis, columns=columns, where=where,
+                                     simulations=simulations)
         else:
             logger.info('Model not ran use other means to read data if that is the goal')
 
+    def iter_results(self, report_names: Union[str, list, None] = None, chunksize: int = 100_000, columns=None,
+                     where=None, simulations=None, arrow: bool = False):
+        """
+        Iterate over the simulated output in chunks of at most ``chunksize`` rows.
+
+        Unlike :attr:`results`, the report tables are never loaded as a whole: rows are streamed from a database
+        cursor, so long daily reports of many simulations can be post-processed in bounded memory.
+
+        Parameters
+        ----------
+        report_names : str or list of str, optional
+            Report tables to read. Defaults to ``report_names`` given at run time, or else all the reports.
+        chunksize : int, optional, default=100_000
+            Maximum number of rows per chunk.
+        columns, where, simulations : optional
+            Column projection and row filters applied by SQLite, see :meth:`get_simulated_output`.
+        arrow : bool, optional, default=False
+            Yield ``pyarrow.Table`` chunks instead of DataFrames.
+
+        Yields
+        ------
+        pandas.DataFrame or pyarrow.Table
+            Chunks with a ``source_table`` column holding the report name. Each column keeps the same dtype in every
+            chunk.
+
+        Raises
+        ------
+        RuntimeError
+            If the model has not been run.
+
+        Examples
+        --------
+        >>> from apsimNGpy.core.apsim import ApsimModel
+        >>> from apsimNGpy.core_utils.aggregation import aggregate_chunks
+        >>> model = ApsimModel('Maize')
+        >>> model.run()
+        >>> for chunk in model.iter_results(chunksize=10_000, columns=['SimulationID', 'Yield']):
+        ...     print(len(chunk))
+
+        ``agg_func`` style reductions are computed chunk by chunk.
+
+        >>> aggregate_chunks(model.iter_results(columns=['Yield']), 'mean', by='source_table')
+
+        .. versionadded:: 1.5.7
+        """
+        if not self.ran_ok:
+            raise RuntimeError("attempting to access results without executing the model. Please call `run()`")
+        _reports = report_names or self.report_names or self.inspect_model('Models.Report', fullpath=False)
+        reports = [_reports] if isinstance(_reports, str) else list(dict.fromkeys(_reports))
+        db_path = Path(self.path).with_suffix('.db')
+        return iter_db_tables(db_path, reports, chunksize=chunksize, label='source_table', columns=columns,
+                              where=where, simulations=simulations, arrow=arrow)
+
     def run(self, report_name: Union[tuple, list, str] = None,
             simulations: Union[tuple, list] = None,
             clean_up: bool = True,
@@ -932,6 +1095,10 @@ class CoreModel(PlotManager):
             added in 0.39.11.21+
         to_csv: bool dfault is False,
              If True, results are written to a csv file instantly at the location of the apsimx file.
+        columns: str or list of str, optional
+            Columns returned by :attr:`results`, see :meth:`get_simulated_output`.
+        where: str or dict, optional
+            Row filter applied in SQLite when :attr:`results` is read, see :meth:`get_simulated_output`.
 
         Warning:
         --------------
@@ -978,8 +1145,13 @@ class CoreModel(PlotManager):
                 pass
 
         try:
-
-            self.save()
+            if self.incremental_save and self._dirty_nodes:
+                # only tracked parameter edits happened since the last full save
+                self.save_edits()
+            else:
+                self.save()
+            # pooled read handles must not outlive the database APSIM is about to rewrite
+            dispose_read_engine(Path(self.path).with_suffix('.db'))
             if clean_up:
                 try:
                     dispose_db()
@@ -1004,12 +1176,14 @@ class CoreModel(PlotManager):
                 self.run_method = run_model_externally
             # report tables would be accessed in result attribute function
             self.report_names = report_name
+            self.output_query = {k: kwargs[k] for k in ('columns', 'where') if kwargs.get(k) is not None}
 
             return self
 
         finally:
             ...
 
+    @_changes_tree
     def rename_model(self, model_type, *, old_name, new_name):
         """
             Renames a model within the APSIM simulation tree.
@@ -1216,16 +1390,19 @@ class CoreModel(PlotManager):
 
             """
         model_type = validate_model_obj(model_type)
-        mtn = get_or_check_model(self.Simulations, model_type=model_type, model_name=old_name, action='get')
+        mtn = get_or_check_model(self.Simulations, model_type=model_type, model_name=old_name, action='get',
+                                 index=self.node_index)
         mtn.Name = f"{new_name}"
         self.save()
         return self
 
+    @_changes_tree
     def add_memo(self, memo_text):
         memo = Models.Memo()
         memo.set_Text(memo_text.strip())
         self.Simulations.Children.Add(memo)
 
+    @_changes_tree
     def clone_model(self, model_type, model_name, adoptive_parent_type, rename=None, adoptive_parent_name=None):
         """
         Clone an existing ``model`` and move it to a specified parent within the simulation structure.
@@ -1392,6 +1569,7 @@ class CoreModel(PlotManager):
         """
         return validate_model_obj(model_name)
 
+    @_changes_tree
     def add_model(self, model_type, adoptive_parent, rename=None,
                   adoptive_parent_name=None, verbose=False, source='Models', source_model_name=None, override=True,
                   **kwargs):
@@ -1649,10 +1827,12 @@ class CoreModel(PlotManager):
         if isinstance(model_instance, str):
             path = model_instance
 
-            try:
-                model = self.Simulations.FindByPath(path)
-            except AttributeError:
-                model = get_node_by_path(self.Simulations, path)
+            model = self.node_index.get(path)
+            if model is None:
+                try:
+                    model = self.Simulations.FindByPath(path)
+                except AttributeError:
+                    model = get_node_by_path(self.Simulations, path)
 
             if model is None:
                 raise ValueError(f"No model found for path: '{path}'")
@@ -1678,6 +1858,7 @@ class CoreModel(PlotManager):
         )
         return model_type if not full_name else model.GetType().FullName
 
+    @_tracks_edit
     def edit_model_by_path(self, path: str, clear_old=False, **kwargs):
         """
         Edit a model component located by an APSIM path, dispatching to type-specific editors.
@@ -1820,31 +2001,34 @@ class CoreModel(PlotManager):
         verbose = kwargs.get('verbose')
         for p in {'simulation', 'simulations', 'verbose'}:
             kwargs.pop(p, None)
-        if hasattr(self.Simulations, 'FindByPath'):
-            v_obj = self.Simulations.FindByPath(path)
-        else:
-            v_obj = get_node_by_path(self.Simulations, path, cast_as='auto')
-        if v_obj is None:
-            raise ValueError(f"Could not find model instance associated with path `{path}`")
-        try:
-            values = v_obj.Value
-        except AttributeError:
-            values = v_obj
-            # for model_class in {Models.Manager, Models.Climate.Weather,
-            #                     Models.PMF.Cultivar, Models.Clock, Models.Report,
-            #                     Models.Surface.SurfaceOrganicMatter,
-            #                     Models.Soils.Physical, Models.Soils.Chemical, Models.Soils.Organic, Models.Soils.Water,
-            #                     Models.Soils.Solute, Models.WaterModel.WaterBalance,
-            #                     }:
-            #     cast_model = CastHelper.CastAs[model_class](values)
-            #
-            #     if cast_model is not None:
-            #         values = cast_model
-            #         break
-
-            if not values:
-                raise ValueError(
-                    f"Could not find model instance associated with `{path}\n or {path} is not supported by this method")
+        # indexed nodes come back cast to their concrete type
+        values = self.node_index.get(path)
+        if values is None:
+            if hasattr(self.Simulations, 'FindByPath'):
+                v_obj = self.Simulations.FindByPath(path)
+            else:
+                v_obj = get_node_by_path(self.Simulations, path, cast_as='auto')
+            if v_obj is None:
+                raise ValueError(f"Could not find model instance associated with path `{path}`")
+            try:
+                values = v_obj.Value
+            except AttributeError:
+                values = v_obj
+                # for model_class in {Models.Manager, Models.Climate.Weather,
+                #                     Models.PMF.Cultivar, Models.Clock, Models.Report,
+                #                     Models.Surface.SurfaceOrganicMatter,
+                #                     Models.Soils.Physical, Models.Soils.Chemical, Models.Soils.Organic, Models.Soils.Water,
+                #                     Models.Soils.Solute, Models.WaterModel.WaterBalance,
+                #                     }:
+                #     cast_model = CastHelper.CastAs[model_class](values)
+                #
+                #     if cast_model is not None:
+                #         values = cast_model
+                #         break
+
+                if not values:
+                    raise ValueError(
+                        f"Could not find model instance associated with `{path}\n or {path} is not supported by this method")
 
         match type(values):
             case Models.Morris | Models.Sobol:
@@ -1907,6 +2091,7 @@ class CoreModel(PlotManager):
 
         return self
 
+    @_changes_tree
     def add_base_replacements(self):
         """
         Add base replacements with all available models of type Plants and then start from there to add more
@@ -1965,6 +2150,7 @@ class CoreModel(PlotManager):
                     f"{err}. Allowed {model_instance} attributes are:\n{accepted_text}"
                 ) from err
 
+    @_tracks_edit
     def edit_model(
             self,
             model_type: str,
@@ -2558,6 +2744,7 @@ class CoreModel(PlotManager):
 
         return self
 
+    @_changes_tree
     def remove_model(self, model_type: Models, model_name, verbose=False, missing_ok=True):
         """
         Remove one or more models from the APSIM ``Models.Simulations`` namespace.
@@ -2629,7 +2816,7 @@ class CoreModel(PlotManager):
         if isinstance(node, str):
             if len(node.split('.')) < 3:
                 raise ValueError('This operation can not be performed on the root')
-            _node = get_node_by_path(self.Simulations, node_path=node, cast_as='auto')
+            _node = get_node_by_path(self.Simulations, node_path=node, cast_as='auto', index=self.node_index)
             data['parent'] = _node.get_Parent()
             data['node'] = _node
         elif hasattr(node, 'get_Parent'):
@@ -2639,6 +2826,7 @@ class CoreModel(PlotManager):
             raise ValueError(f'type {type(node)} is not supported. Please try a valid str path or Models object')
         return data
 
+    @_changes_tree
     def remove_model_by_path(self, path, *, verbose=False, missing_ok=True):
         """
         Remove a model node from the APSIM simulation tree. Recomended is the simulation tree is nested with several simulations, which may have similar model names
@@ -2710,6 +2898,7 @@ class CoreModel(PlotManager):
                 #logger.exception('Node not found')
                 raise
 
+    @_changes_tree
     def move_model(self, model_type: Models, new_parent_type: Models, model_name: str = None,
                    new_parent_name: str = None, verbose: bool = False, simulations: Union[str, list] = None):
         """
@@ -2744,17 +2933,18 @@ class CoreModel(PlotManager):
             model_name = model_type().Name
 
         child_to_move = get_or_check_model(sims, model_type, model_name,
-                                           action='get')  # sims.FindInScope[model_class](model_name)
+                                           action='get', index=self.node_index)  # sims.FindInScope[model_class](model_name)
         if not new_parent_name:
             new_parent_name = new_parent_type().Name
 
-        new_parent = get_or_check_model(sims, new_parent_type, new_parent_name, action='get')
+        new_parent = get_or_check_model(sims, new_parent_type, new_parent_name, action='get', index=self.node_index)
 
         ModelTools.MOVE(child_to_move, new_parent)
         if verbose:
             logger.info(f"Moved {child_to_move.Name} to {new_parent.Name}")
         self.save()
 
+    @_changes_tree
     def _rename_model(self, model_type: Models, old_model_name: str, new_model_name: str, simulations=None):
         """
          give new name to a model in the simulations.
@@ -3519,6 +3709,7 @@ class CoreModel(PlotManager):
         old_method('exchange_model', new_method='replace_model_from')
         self.replace_model_from(model, model_type, model_name, target_model_name, simulations)
 
+    @_changes_tree
     def replace_model_from(
             self,
             model,
@@ -4151,7 +4342,7 @@ class CoreModel(PlotManager):
         # at
 
     def get_weather_from_web(self, lonlat: tuple, start: int, end: int, simulations=MissingOption, source='nasa',
-                             filename=None):
+                             filename=None, store=None):
         """
             Replaces the weather (met) file in the model using weather data fetched from an online source. Internally, calls get_weather_from_file after downloading the weather
            Parameters:
@@ -4174,6 +4365,13 @@ class CoreModel(PlotManager):
             filename: str default is generated using the base name of the apsimx file in use, and the start and
                     end years Name of the file to save the retrieved data. If None, a default name is generated.
 
+            store: WeatherStore | str | bool, optional
+                 Local weather store, or its directory, or ``True`` for the default store. Years already
+                 downloaded for the same grid cell are read from disk instead of the network,
+                 see :class:`apsimNGpy.manager.weather_store.WeatherStore`.
+
+                 .. versionadded:: 1.5.7
+
             Returns:
                model object with the corresponding file replaced with the fetched weather data.
 
@@ -4195,7 +4393,7 @@ class CoreModel(PlotManager):
         file_name = filename or f"{Path(self._model).stem}_{source}_{start}_{end}.met"
 
         name = filename or file_name
-        file = get_weather(lonlat, start=start, end=end, source=source, filename=name)
+        file = get_weather(lonlat, start=start, end=end, source=source, filename=name, store=store)
 
         self.get_weather_from_file(weather_file=file, simulations=simulations)
 
@@ -4465,16 +4663,19 @@ class CoreModel(PlotManager):
             obj = self.Simulations
             return obj.FullPath if fullpath else obj.Name
 
-        else:
+        if scope is _NOT_PROVIDED or scope is self.Simulations:
+            fpath = self.node_index.paths(model_type)
+            if fpath:
+                return fpath if fullpath else [p.rsplit('.', 1)[-1] for p in fpath]
 
-            if is_higher_apsim_version():
-                obj = ModelTools.find_all_in_scope(inspection_location, model_type)
-            else:
-                try:
-                    obj = inspection_location.FindAllDescendants[model_type]()
-                except AttributeError:
-                    logger.info(f"{_version} is not supported by this method install the appropriate APSIM version")
-                    raise
+        if is_higher_apsim_version():
+            obj = ModelTools.find_all_in_scope(inspection_location, model_type)
+        else:
+            try:
+                obj = inspection_location.FindAllDescendants[model_type]()
+            except AttributeError:
+                logger.info(f"{_version} is not supported by this method install the appropriate APSIM version")
+                raise
 
         if obj:
             # Should return an indexed iterable (e.g., list or tuple), not a set
@@ -4544,7 +4745,10 @@ class CoreModel(PlotManager):
         """
         if not kwargs:
             raise ValueError('No parameters are specified')
-        if hasattr(self.Simulations, 'FindByPath'):
+        _soil_child = self.node_index.get(node_path)
+        if _soil_child is not None:
+            pass
+        elif hasattr(self.Simulations, 'FindByPath'):
             _soil_child = self.Simulations.FindByPath(node_path)
         else:
             _soil_child = get_node_by_path(self.Simulations, node_path)
@@ -4817,6 +5021,7 @@ class CoreModel(PlotManager):
             clean_candidates = {bak, bak, db_wal, path, db_shm, *db_csv}
             if db:
                 clean_candidates.add(_db)
+                dispose_read_engine(_db)
             for candidate in clean_candidates:
                 try:
                     _exists = candidate.exists()
@@ -5139,6 +5344,7 @@ class CoreModel(PlotManager):
 
         self.add_replacements(*crops)
 
+    @_changes_tree
     def add_replacements(self, *args):
         """
         Add one or more Replacements nodes to the APSIM simulation tree.
@@ -5637,6 +5843,7 @@ class CoreModel(PlotManager):
         sm.sort_values(by='mean', ascending=False, inplace=True)
         return sm
 
+    @_changes_tree
     def create_experiment_for_node(self, permutation=True):
         def exp_refresher(mode):
             sim = mode.simulations[0]
@@ -5666,6 +5873,7 @@ class CoreModel(PlotManager):
         return exp_node
 
     # @timer
+    @_changes_tree
     def add_db_table(self, variable_spec: list = None, set_event_names: list = None, rename: str = None,
                      simulation_name: Union[str, list, tuple] = MissingOption):
         """
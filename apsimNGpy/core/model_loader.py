@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from typing import Any
 from pathlib import Path
 from apsimNGpy.settings import SCRATCH as _SCRATCH
+from apsimNGpy.core_utils.template_cache import template_cache
 get_apsim_file_writer = CLR.get_file_writer
 get_apsim_file_reader = CLR.get_file_reader
 Models = CLR.Models
@@ -170,6 +171,26 @@ def load_from_path(path2file, method='string'):
     return new_model
 
 
+def load_from_template(path2file, destination):
+    """
+    Load an apsimx file through the per-process template cache.
+
+    The normalized JSON of ``path2file`` is read from disk only once per process (or after the file changes) and
+    deserialized from memory. ``path2file`` is copied byte for byte to ``destination`` as the working copy.
+
+    Returns
+    -------
+    tuple
+        The path to the working copy and the loaded model.
+    """
+    json_string = template_cache.get(path2file, version=CLR.apsim_compiled_version)
+    dest_path = str(Path(destination).resolve().with_suffix('.apsimx'))
+    if realpath(path2file) != dest_path:
+        shutil.copyfile(path2file, dest_path)
+    _model_obj = to_model_from_string(json_string, file_name=dest_path)
+    return dest_path, covert_to_model(getattr(_model_obj, 'NewModel', _model_obj))
+
+
 def load_apsim_model(model=MODEL_NOT_PROVIDED, out_path=AUTO_PATH, file_load_method='string', met_file=None, wd=None,
                      tag='temp_',
                      **kwargs):
@@ -184,7 +205,9 @@ def load_apsim_model(model=MODEL_NOT_PROVIDED, out_path=AUTO_PATH, file_load_met
         file_load_method (str): How to load the file (e.g., 'string', 'json').
         met_file (str, optional): Path to the associated meteorological file.
         wd (str, optional): Working directory for temporary file operations.
-        **kwargs: Additional options (reserved for future use).
+        **kwargs: Additional options.
+            use_template_cache (bool): defaults to True, apsimx files loaded with the 'string' method are read through
+            the per-process template cache, see :mod:`apsimNGpy.core_utils.template_cache`.
 
     Returns:
         {ModelData}: A dataclass container with paths, model object, and metadata.
@@ -224,13 +247,16 @@ def load_apsim_model(model=MODEL_NOT_PROVIDED, out_path=AUTO_PATH, file_load_met
             # assumed models will be loaded from APSIM /Examples
             if not model_obj.endswith('.apsimx'):
                 copy_to = load_crop_from_disk(crop=model_obj, out=out_path)
-
+                Model = load_from_path(copy_to, file_load_method)
+            elif file_load_method == 'string' and kwargs.get('use_template_cache', True):
+                # repeated loads of the same base file are served from memory
+                copy_to, Model = load_from_template(model_obj, destination=out_path)
             else:
                 # the model is being loaded elsewhere on the computer
                 copy_to = copy_file(model_obj, destination=out_path)
+                Model = load_from_path(copy_to, file_load_method)
 
             out['path'] = copy_to
-            Model = load_from_path(copy_to, file_load_method)
 
         case None:
             raise ValueError("Model cannot be None")
@@ -400,15 +426,27 @@ def cast_obj(obj_instance):
     return n
 
 
-def get_node_by_path(node, node_path, cast_as=None):
+def get_node_by_path(node, node_path, cast_as=None, index=None):
     """
     get a node by path
     @param node: node object or APSIM.Core object
     @param node_path: node path
     @param cast_as: Models type
      if node_type is not none, the discovered node is converted to the specified type
+    @param index: optional NodeIndex built with an ``auto`` cast over the tree holding ``node``. It answers lookups
+     that request a cast without walking the tree.
     @return: node object if found. raise NodeNotFoundError
     """
+    if index is not None and cast_as is not None:
+        n = index.get(node_path)
+        if n is not None:
+            if isinstance(cast_as, str):
+                if cast_as.lower() == 'auto':
+                    return n
+            else:
+                cast = CastHelpers.CastAs[cast_as](n)
+                if cast:
+                    return cast
 
     if hasattr(node, 'Node'):
         node = node.Node
@@ -215,7 +215,7 @@ class NodeInfo:
         return self.parent_path.split('.')[-1]
 
 
-def get_or_check_model(search_scope, model_type, model_name, action='get', cache_size=300):
+def get_or_check_model(search_scope, model_type, model_name, action='get', cache_size=300, index=None):
     """
             Helper function to check if a model instance is found in the simulation
             and perform a specified action.
@@ -235,6 +235,13 @@ def get_or_check_model(search_scope, model_type, model_name, action='get', cache
                 The name of the model to find. If omitted, returns the first model of that type.
             action : str
                 One of 'get', 'delete', or 'check'.
+            cache_size : int
+                Unused, kept for backward compatibility. Pass ``index`` to avoid repeated tree walks.
+            index : NodeIndex, optional
+                A :class:`~apsimNGpy.core_utils.node_index.NodeIndex` over the tree holding ``search_scope``. The
+                model is looked up in it first, and the tree is walked only if it is not indexed.
+
+                .. versionadded:: 1.5.7
 
             Returns:
             --------
@@ -253,12 +260,19 @@ def get_or_check_model(search_scope, model_type, model_name, action='get', cache
     def _execute(search_scope, model_type, model_name, action):
         if action not in ModelTools.ACTIONS:
             raise ValueError(f'sorry action should be any of {ModelTools.ACTIONS} ')
-        # get bound methods based on model type
-        try:
-            finder = search_scope.FindIDescendant[model_type]
-            get_model = finder(model_name) if model_name else finder()
-        except AttributeError:
-            get_model = find_child(search_scope, child_class=model_type, child_name=model_name)
+        get_model = None
+        if index is not None and not isinstance(model_type, str):
+            scope = None if search_scope is index.root else search_scope.FullPath
+            get_model = index.first(model_type, model_name or None, scope=scope)
+            if get_model is not None:
+                get_model = CastHelper.CastAs[model_type](get_model) or get_model
+        if get_model is None:
+            # get bound methods based on model type
+            try:
+                finder = search_scope.FindIDescendant[model_type]
+                get_model = finder(model_name) if model_name else finder()
+            except AttributeError:
+                get_model = find_child(search_scope, child_class=model_type, child_name=model_name)
         if action == 'check':
             return True if get_model is not None else False
         if not get_model and action == 'get':
@@ -267,6 +281,8 @@ def get_or_check_model(search_scope, model_type, model_name, action='get', cache
             raise ValueError(f"{model_name} of type {model_type} not found")
 
         if action == 'delete' and get_model:
+            if index is not None:
+                index.remove(get_model.FullPath)
             ModelTools.DELETE(get_model)
 
         if get_model and action == 'get':
@@ -1278,10 +1294,23 @@ class ModelTools:
     edit_instance = edit_instance_attributes
 
 
-def find_all_model_type(parent, model_type, ignore_errors=False):
+def find_all_model_type(parent, model_type, ignore_errors=False, index=None):
+    """
+    Find all models of ``model_type`` under ``parent``.
+
+    ``index`` is an optional :class:`~apsimNGpy.core_utils.node_index.NodeIndex` over the tree holding ``parent``,
+    used instead of walking the tree when it holds models of that type.
+    """
     if not callable(model_type):
         model_type = getattr(Models, model_type)
 
+    if index is not None:
+        scope = None if parent is index.root else parent.FullPath
+        indexed = index.find(model_type, scope=scope)
+        if indexed:
+            cast_as = CastHelper.CastAs[model_type]
+            return tuple(cast_as(node) or node for node in indexed)
+
     # node_base = getattr(parent, "Node", parent)
 
     error_MSG = f"Failed to find models of type {model_type} under parent node {parent}"
@@ -9,7 +9,7 @@ import sqlite3
 import tempfile
 import time
 import uuid
-from contextlib import contextmanager
+from contextlib import contextmanager, closing
 # Database connection
 from functools import partial, cache
 from itertools import tee
@@ -25,10 +25,16 @@ from apsimNGpy.core.plotmanager import PlotManager
 from apsimNGpy.core._multi_core import edit_to_folder, IDENTIFICATION, single_runner, harmonise_groups
 from apsimNGpy.core.runner import _run_from_dir
 from apsimNGpy.core_utils.database_utils import (write_results_to_sql, drop_table,
-                                                 get_db_table_names, read_with_pandas, write_df_to_sql)
+                                                 get_db_table_names, read_with_pandas, write_df_to_sql,
+                                                 read_db_tables, iter_db_tables)
+from apsimNGpy.core_utils.aggregation import aggregate_chunks
+from apsimNGpy.core_utils.parquet_sink import (read_dataset, iter_dataset, list_partitions, clear_dataset,
+                                               PARTITION_KEY)
 from apsimNGpy.parallel.data_manager import chunker
 from apsimNGpy.parallel.process import custom_parallel
+from apsimNGpy.parallel.result_writer import ResultWriter
 from apsimNGpy.core_utils.utils import get_array_like, timer
+from apsimNGpy.durable.durable_utils import CheckPoint, job_key
 
 __all__ = ['MultiCoreManager']
 ID = 0
@@ -39,6 +45,8 @@ SOURCE_TABLE = 'source_table'
 AGGREGATE_TABLE = 'aggregate_table'
 CSHARP_ENGINE_MAX_CHUNK_SIZE = 1000
 DIR_PREFIX = 'mcp'
+SQL_SINK = 'sql'
+RESULT_SINKS = {SQL_SINK: '.db', 'parquet': '.parquet', 'arrow': '.arrow'}
 
 
 @contextmanager
@@ -117,6 +125,19 @@ def get_results(file_name, db_or_con, prefix, agg_func=None, sub=None):
                     chunk_size=None)
 
 
+def _job_key(job) -> str:
+    return job_key(job, id_key=IDENTIFICATION)
+
+
+def _run_keyed(job, worker):
+    """
+    Runs ``worker(job)`` and returns the job key with the worker's outcome, for checkpointed runs. The key travels
+    with the results to the single writer, which reports it once they are committed.
+    """
+    key = _job_key(job)
+    return key, worker(job, result_key=key)
+
+
 class MultiCoreManager(PlotManager):
     __slots__ = (
         "db_path",
@@ -128,7 +149,11 @@ class MultiCoreManager(PlotManager):
         'ran_ok',
         'cleared_db',
         'run_external',
-        'engine'
+        'engine',
+        'worker_pool',
+        'result_sink',
+        'single_writer',
+        'result_cache'
     )
 
     def __init__(self, db_path: Union[str, Path, None, sqlalchemy.engine.base.Engine, sqlite3.Connection] = None,
@@ -137,6 +162,10 @@ class MultiCoreManager(PlotManager):
                  default_db='manager_datastorage.db',
                  incomplete_jobs: list = None,
                  table_prefix: str = '__core_table__',
+                 worker_pool=None,
+                 result_sink: Literal['sql', 'parquet', 'arrow'] = SQL_SINK,
+                 single_writer: Union[bool, ResultWriter] = False,
+                 result_cache=None,
                  ):
         """
         Initialize the database, note that this database tables are cleaned up everytime the object is called, to avoid table name errors
@@ -169,6 +198,36 @@ class MultiCoreManager(PlotManager):
             running multiple workflows. This prefix is also used to avoid table name collisions by clearing all tables that exists with that prefix, for every fresh restart.
             Why this is critical is that we don't want to mixe results from previous session with the current session
 
+        worker_pool : apsimNGpy.parallel.warm_pool.WarmWorkerPool, optional
+            A long-lived pool of workers with the APSIM runtime already loaded. When provided, the python engine
+            submits jobs to it instead of creating a new process pool on every ``run_all_jobs`` call, so the
+            CLR start-up cost is paid once per worker. The pool is owned by the caller and is not shut down by this class.
+
+            .. versionadded:: 1.5.7
+
+        result_sink : {'sql', 'parquet', 'arrow'}, optional, default='sql'
+            Where the python engine workers write their results. With ``'parquet'`` or ``'arrow'`` every job writes its
+            own file into a dataset directory next to ``db_path`` (same name, ``.parquet`` or ``.arrow`` suffix) instead
+            of appending to the shared SQLite database, which removes the write-lock contention between workers.
+            Results are read back with :meth:`get_simulated_output`, loading only the requested columns. Requires pyarrow.
+
+            .. versionadded:: 1.5.7
+
+        single_writer : bool or apsimNGpy.parallel.result_writer.ResultWriter, optional, default=False
+            If ``True``, python engine workers send their results over a queue to one writer process, which commits
+            them to ``db_path`` in large batched transactions instead of every worker competing for the SQLite write
+            lock. Pass a :class:`~apsimNGpy.parallel.result_writer.ResultWriter` to tune its ``flush_interval`` and
+            ``flush_rows``; its ``db_path`` must be the same as this one. Only applies to the ``'sql'`` result sink.
+
+            .. versionadded:: 1.5.7
+
+        result_cache : apsimNGpy.core_utils.result_cache.ResultCache, optional
+            On-disk cache of simulated results shared by the python engine workers. Jobs whose model, inputs, weather
+            files and APSIM version match a previous run read the stored results instead of running APSIM again,
+            which makes retries and repeated samples cheap.
+
+            .. versionadded:: 1.5.7
+
         Attributes
         ----------
         tag : str
@@ -203,6 +262,16 @@ class MultiCoreManager(PlotManager):
         self.cleared_db = False
         self.run_external = False
         self.engine = PYTHON_ENGINE
+        self.worker_pool = worker_pool
+        if result_sink not in RESULT_SINKS:
+            raise ValueError(f"result_sink must be one of {tuple(RESULT_SINKS)} got {result_sink!r}")
+        self.result_sink = result_sink
+        if single_writer and result_sink != SQL_SINK:
+            raise ValueError(f"single_writer is only supported with the '{SQL_SINK}' result sink")
+        if isinstance(single_writer, ResultWriter) and Path(single_writer.db_path).resolve() != self.db_path:
+            raise ValueError(f"single_writer writes to {single_writer.db_path} but db_path is {self.db_path}")
+        self.single_writer = single_writer
+        self.result_cache = result_cache
 
     def __enter__(self):
         return self
@@ -234,13 +303,24 @@ class MultiCoreManager(PlotManager):
             tuple(self.incomplete_jobs),
         ))
 
+    @property
+    def dataset_dir(self):
+        """Directory of the columnar result dataset, ``None`` when results are written to SQLite."""
+        if self.result_sink == SQL_SINK:
+            return None
+        return Path(self.db_path).with_suffix(RESULT_SINKS[self.result_sink])
+
     @property
     def tables(self):
         """
-        Returns a list of tables that were created during multiprocessing
+        Returns a list of tables that were created during multiprocessing.
+        For a columnar ``result_sink``, these are the dataset partitions.
 
         """
         from apsimNGpy.core_utils.database_utils import get_db_table_names
+        if self.result_sink != SQL_SINK:
+            prefix = f"{PARTITION_KEY}={self.table_prefix}"
+            return tuple(p for p in list_partitions(self.dataset_dir) if p.startswith(prefix))
         # "Summarizes all the tables that have been created from the simulations"
         if isinstance(self.db_path, (str, Path)):
             if not os.path.exists(self.db_path) and os.path.isfile(self.db_path) and self.ran_ok:
@@ -250,24 +330,27 @@ class MultiCoreManager(PlotManager):
         return tuple(tables)
 
     @cache
-    def _get_simulated_results(self, axis, tables):
+    def _get_simulated_results(self, axis, tables, columns=None):
 
         if axis not in {0, 1}:
             # Errors should not go silently
             raise ValueError('Wrong value for axis should be either 0 or 1')
 
-        read_db = partial(read_with_pandas, db_or_con=self.db_path)
-        if len(tables) > 16:
-            frames = list(
-                custom_parallel(read_db, tables, void=False, progress_message='loading data', unit='table',
-                                display_failures=True))
-        else:
-            frames = (read_db(i) for i in tables)
-        # data = (read_db_table(self.db_path, report_name=rp) for rp in self.tables)
-
-        return pd.concat(frames, axis=axis)
-
-    def get_simulated_output(self, axis=0):
+        if self.result_sink != SQL_SINK:
+            # fragments are memory-mapped and only the requested columns are decoded
+            if axis == 0:
+                return read_dataset(self.dataset_dir, columns=columns, fmt=self.result_sink, partitions=tables)
+            frames = [read_dataset(self.dataset_dir, columns=columns, fmt=self.result_sink, partitions=[t])
+                      for t in tables]
+            return pd.concat(frames, axis=axis)
+
+        if axis == 0:
+            # schema-compatible tables are fetched with one UNION ALL query over a single pooled connection
+            return read_db_tables(self.db_path, sorted(tables), union=True, columns=columns)
+        frames = read_db_tables(self.db_path, sorted(tables), columns=columns)
+        return pd.concat(frames.values(), axis=axis)
+
+    def get_simulated_output(self, axis=0, columns=None):
         """
         Get simulated output from the API.
 
@@ -279,6 +362,10 @@ class MultiCoreManager(PlotManager):
             Specifies how simulation outputs are concatenated.
             If ``axis=0``, outputs are concatenated along rows.
             If ``axis=1``, outputs are concatenated along columns.
+        columns : str or list of str, optional
+            Load only these columns. Columns absent from a table are skipped.
+
+            .. versionadded:: 1.5.7
 
         Notes
         -----
@@ -296,8 +383,9 @@ class MultiCoreManager(PlotManager):
         These identifiers facilitate traceability and reproducibility across serial
         and parallel execution workflows.
         """
+        columns = tuple(get_array_like(columns)) if columns is not None else None
         if self.engine == PYTHON_ENGINE:
-            df = self._get_simulated_results(axis=axis, tables=self.tables)
+            df = self._get_simulated_results(axis=axis, tables=tuple(sorted(self.tables)), columns=columns)
 
         elif self.engine == CSHARP_ENGINE:
             df = self._merged_simulated(axis=axis)
@@ -307,6 +395,84 @@ class MultiCoreManager(PlotManager):
             df.sort_values(by=['ID'], ascending=True, inplace=True)
         return df
 
+    def iter_results(self, chunksize: int = 100_000, columns=None, arrow: bool = False):
+        """
+        Iterate over the simulated output in chunks of at most ``chunksize`` rows.
+
+        Rows are streamed from a database cursor, or record batch by record batch for a columnar ``result_sink``,
+        so outputs larger than the available memory can be post-processed. Unlike :meth:`get_simulated_output`,
+        rows are not sorted by ``ID``.
+
+        Parameters
+        ----------
+        chunksize : int, optional, default=100_000
+            Maximum number of rows per chunk.
+        columns : str or list of str, optional
+            Load only these columns. Columns absent from a table are skipped.
+        arrow : bool, optional, default=False
+            Yield ``pyarrow.Table`` chunks instead of DataFrames.
+
+        Yields
+        ------
+        pandas.DataFrame or pyarrow.Table
+
+        Examples
+        --------
+        .. code-block:: python
+
+            for chunk in Parallel.iter_results(chunksize=50_000, columns=['ID', 'Yield', 'source_table']):
+                chunk.to_csv('out.csv', mode='a', header=False)
+
+        .. versionadded:: 1.5.7
+        """
+        if self.engine != PYTHON_ENGINE:
+            raise NotImplementedError(f'method not supported when engine is  {self.engine}')
+        columns = tuple(get_array_like(columns)) if columns is not None else None
+        tables = sorted(self.tables)
+        if self.result_sink != SQL_SINK:
+            return iter_dataset(self.dataset_dir, columns=columns, fmt=self.result_sink, partitions=tables,
+                                chunksize=chunksize, arrow=arrow)
+        return iter_db_tables(self.db_path, tables, chunksize=chunksize, columns=columns, arrow=arrow)
+
+    def aggregate_results(self, agg_func: Union[str, None] = None, by=None, chunksize: int = 100_000,
+                          columns=None):
+        """
+        Reduce the simulated output with ``agg_func`` one chunk at a time.
+
+        The result equals ``results.groupby(by).agg(agg_func, numeric_only=True)`` while only one chunk of
+        ``chunksize`` rows is held in memory, see :class:`~apsimNGpy.core_utils.aggregation.ChunkAggregator`.
+
+        Parameters
+        ----------
+        agg_func : str, optional
+            One of ``'sum'``, ``'mean'``, ``'max'``, ``'min'``, ``'median'`` and ``'std'``. Defaults to the
+            ``agg_func`` of this instance.
+        by : str or list of str, optional
+            Grouping columns, ``source_table`` is always added as in :meth:`run_all_jobs`.
+        chunksize : int, optional, default=100_000
+            Maximum number of rows read at once.
+        columns : str or list of str, optional
+            Numeric columns to aggregate. Defaults to all of them.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+        Examples
+        --------
+        >>> Parallel.aggregate_results('mean', by='ID', columns=['Yield'])  # doctest: +SKIP
+
+        .. versionadded:: 1.5.7
+        """
+        agg_func = agg_func or self.agg_func
+        if not agg_func:
+            raise ValueError("agg_func is required when the instance was created without one")
+        grp = list(harmonise_groups(agg_func=agg_func, index=by))
+        if columns is not None:
+            columns = [*dict.fromkeys([*get_array_like(columns), *grp])]
+        out = aggregate_chunks(self.iter_results(chunksize=chunksize, columns=columns), agg_func, by=grp)
+        return out.reset_index(drop=False)
+
     def run(self):
         self.ran_ok = True
 
@@ -329,6 +495,8 @@ class MultiCoreManager(PlotManager):
 
     def clear_db(self):
         """Clears the database before any simulations."""
+        if self.result_sink != SQL_SINK:
+            clear_dataset(self.dataset_dir)
         if isinstance(self.db_path, (Path, str)):
             if not str(self.db_path).endswith('.db'):
                 self.db_path = Path(self.db_path).with_suffix('.db')
@@ -448,7 +616,8 @@ class MultiCoreManager(PlotManager):
 
     def run_all_jobs(self, jobs, *, n_cores=-2, threads=False, clear_db=True, retry_rate=1, subset=None,
                      ignore_runtime_errors=True, engine='python', progressbar: bool = True, table_name=None,
-                     chunk_size: int = 100, total_chunks=10, callback=None, **kwargs):
+                     chunk_size: int = 100, total_chunks=10, callback=None, checkpoint=None, resume=False,
+                     **kwargs):
         """
 
         This method executes a collection of APSIM simulation jobs in parallel,
@@ -569,6 +738,19 @@ class MultiCoreManager(PlotManager):
               A function to be called before model run, can me an intermediate function
         total_chunks: int
             @deprecated
+        checkpoint: str, Path or CheckPoint, optional
+            Directory of a :class:`~apsimNGpy.durable.durable_utils.CheckPoint` recording the IDs of the finished
+            jobs (the ``ID`` entry of a job, its model path for plain jobs, or a digest of the job) and the location
+            of the result store. With the python engine a job is recorded once its results were written, with the
+            csharp engine once its chunk was collected.
+
+            .. versionadded:: 1.5.7
+        resume: bool, optional. Default is False
+            Continue the run recorded in ``checkpoint``: finished jobs are skipped and the results in the database
+            are kept (``clear_db`` is ignored). The database must be the one of the interrupted run. Without
+            ``resume``, an existing checkpoint is cleared.
+
+            .. versionadded:: 1.5.7
 
         Returns
         -------
@@ -738,11 +920,20 @@ class MultiCoreManager(PlotManager):
 
         """
         n_cores = core_count(n_cores, threads=threads)
+        # table names repeat across calls when workers are re-used, so results read before must not be served again
+        type(self)._get_simulated_results.cache_clear()
+        checkpoint = CheckPoint.coerce(checkpoint)
+        if checkpoint is not None:
+            jobs, clear_db = self._checkpointed_jobs(jobs, checkpoint, resume=resume, clear_db=clear_db)
+        elif resume:
+            raise ValueError('resume=True requires a checkpoint')
         ch_size = chunk_size
         if ch_size > CSHARP_ENGINE_MAX_CHUNK_SIZE and engine=='csharp':
             raise ValueError(f'Chunk size must be less than {CSHARP_ENGINE_MAX_CHUNK_SIZE}')
 
         if engine.lower() == CSHARP_ENGINE:
+            if self.result_sink != SQL_SINK:
+                raise ValueError(f"result_sink {self.result_sink!r} is only supported by the python engine")
             # update engine on main
             self.engine = engine.lower()
             if clear_db:
@@ -767,23 +958,73 @@ class MultiCoreManager(PlotManager):
                     for counter, sub_jobs in enumerate(iter_CKS):
                         self._run_jobs_external(jobs=sub_jobs, n_cores=n_cores, threads=threads, subset=subset,
                                                 call_back=callback)
+                        if checkpoint is not None:
+                            self._mark_stored_jobs(checkpoint, sub_jobs)
                         pbar.update(1)
             else:
                 for sub in chunker(jobs, chunk_size=ch_size):
                     self._run_jobs_external(jobs=sub, n_cores=n_cores, threads=threads, subset=subset,
                                             call_back=callback)
+                    if checkpoint is not None:
+                        self._mark_stored_jobs(checkpoint, sub)
 
         elif engine.lower() == 'python':
             self._run_all_jobs(jobs=jobs, n_cores=n_cores, threads=threads, subset=subset, table_name=table_name,
                                clear_db=clear_db, retry_rate=retry_rate, ignore_runtime_errors=ignore_runtime_errors,
                                n_chunks=total_chunks, batch_size=chunk_size,
-                               call_back=callback)
+                               call_back=callback, checkpoint=checkpoint)
         else:
             raise ValueError(f"Unsupported engine expected str as (python or csharp) got {engine}")
+
+    def _stored_job_ids(self, ids) -> set:
+        """IDs among ``ids`` with rows in the result tables of the csharp engine, see :func:`get_results`."""
+        ids = list(dict.fromkeys(ids))
+        if not ids or not Path(self.db_path).exists():
+            return set()
+        found = set()
+        column = '"' + IDENTIFICATION.replace('"', '""') + '"'
+        with closing(sqlite3.connect(self.db_path)) as con:
+            tables = [name for (name,) in con.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                      if name.startswith(f"{self.table_prefix}_pid_")]
+            for table in tables:
+                quoted = '"' + table.replace('"', '""') + '"'
+                sql = f"SELECT DISTINCT {column} FROM {quoted} WHERE {column} IN ({', '.join('?' * len(ids))})"
+                found.update(str(value) for (value,) in con.execute(sql, ids))
+        return {i for i in ids if str(i) in found}
+
+    def _mark_stored_jobs(self, checkpoint, jobs):
+        """
+        Records the jobs of a csharp engine chunk whose results reached the database. APSIM does not report
+        failures per job, so the others are left pending and run again on resume.
+        """
+        jobs = list(jobs)
+        ids = [job.get(IDENTIFICATION) for job in jobs]
+        stored = self._stored_job_ids(i for i in ids if i is not None)
+        done = [_job_key(job) for job, i in zip(jobs, ids) if i in stored]
+        if len(done) < len(jobs):
+            logger.warning(f"{len(jobs) - len(done)} of {len(jobs)} jobs left no results, they stay pending")
+        checkpoint.mark_done(*done)
+
+    def _checkpointed_jobs(self, jobs, checkpoint, *, resume, clear_db):
+        """Filters the finished jobs out of ``jobs`` on resume, or starts a new checkpoint."""
+        store = {'db_path': str(self.db_path), 'result_sink': self.result_sink,
+                 'dataset_dir': str(self.dataset_dir) if self.dataset_dir else None,
+                 'table_prefix': self.table_prefix}
+        if resume and checkpoint.exists:
+            saved = checkpoint.load()
+            if saved.get('store', store) != store:
+                raise ValueError(f"checkpoint {checkpoint.directory} belongs to a run writing to {saved['store']}, "
+                                 f"this manager writes to {store}")
+            logger.info(f'resuming from {checkpoint.directory}, {len(checkpoint.completed)} jobs are done')
+            return checkpoint.pending(jobs, key=_job_key), False
+        checkpoint.clear()
+        checkpoint.save(store=store)
+        return jobs, clear_db
+
     @timer
     def _run_all_jobs(self, jobs, *, n_cores=-2, threads=False, clear_db=True, retry_rate=1, progressbar: bool = True,
                       subset=None, index=None, table_name=None,
-                      ignore_runtime_errors=True, batch_size=100, n_chunks=10, **kwargs):
+                      ignore_runtime_errors=True, batch_size=100, n_chunks=10, checkpoint=None, **kwargs):
         """
         Run all provided jobs using multiprocessing or multithreading.
 
@@ -945,23 +1186,51 @@ class MultiCoreManager(PlotManager):
         if self.cleared_db:
             self.clear_db()  # each simulation is fresh,
 
+        writer = None
+        if self.single_writer:
+            writer = self.single_writer if isinstance(self.single_writer, ResultWriter) else ResultWriter(self.db_path)
+            writer.start()
         worker = partial(single_runner, agg_func=self.agg_func, index=index, call_back=kwargs.get('call_back'),
                          ignore_runtime_errors=ignore_runtime_errors, retry_rate=retry_rate, table_name=table_name,
-                         db_conn=self.db_path, table_prefix=self.table_prefix, subset=subset)
+                         db_conn=self.db_path, table_prefix=self.table_prefix, subset=subset,
+                         result_sink=self.result_sink, dataset_dir=self.dataset_dir,
+                         result_queue=writer.queue if writer else None, result_cache=self.result_cache)
+        finished = []  # keys of finished jobs whose results are stored
+        if checkpoint is not None:
+            worker = partial(_run_keyed, worker=worker)
+
+        def _record():
+            # with the single writer a job is stored once the writer committed its rows, not when the worker returns
+            ready = writer.committed() if writer is not None else finished
+            if ready:
+                checkpoint.mark_done(*ready)
+                finished.clear()
+
         try:
             from apsimNGpy.parallel.process import custom_parallel_chunks, parallelize_chunks, batch
             from apsimNGpy.core.tiny_core import save_batch_simulations
             from itertools import batched
             batches = batched(jobs, batch_size)
-            for _ in parallelize_chunks(func=worker, iterable=batches, ncores=n_cores, use_threads=threads,
-                                        progress_message=f'APSIM running', unit='chunk',
-                                        void=True, n_chunks=n_chunks,
-                                        progressbar=progressbar,
-                                       ):
-                pass
+            for out in parallelize_chunks(func=worker, iterable=batches, ncores=n_cores, use_threads=threads,
+                                          progress_message=f'APSIM running', unit='chunk',
+                                          void=checkpoint is None, n_chunks=n_chunks,
+                                          progressbar=progressbar, executor=self.worker_pool,
+                                          ):
+                key, ok = out
+                if ok and writer is None:
+                    finished.append(key)
+                _record()
 
         finally:
-            gc.collect()
+            try:
+                if writer is not None:
+                    # commits the remaining buffered results, raises if the writer failed
+                    writer.close()
+            finally:
+                if checkpoint is not None:
+                    # only committed jobs are recorded, the others run again on resume
+                    _record()
+                gc.collect()
         self.ran_ok = True
 
     @property
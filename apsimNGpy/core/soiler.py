@@ -1,6 +1,6 @@
 import datetime as dt
-from dataclasses import dataclass
-from typing import Optional, Sequence, Tuple, Mapping, Any
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple, Mapping, Any, Dict, List
 
 import numpy as np
 from pandas import DataFrame
@@ -11,11 +11,15 @@ from apsimNGpy.starter.starter import CLR
 from apsimNGpy.core_utils.soil_lay_calculator import auto_gen_thickness_layers
 from apsimNGpy.logger import logger
 from apsimNGpy.soils.helpers import _is_within_USA_mainland
+from apsimNGpy.soils.profile_cache import (as_soil_profile_cache, profile_key, soilgrids_cell, ssurgo_mukeys,
+                                           localise_profile)
 from apsimNGpy.soils.soilgrid import get_soil_profile_soil_grid
 from apsimNGpy.soils.soilmanager import DownloadsurgoSoiltables, OrganiseSoilProfile
 
 Models = CLR.Models
 Array, Double = CLR.System.Array, CLR.System.Double
+IntPtr, Int64, String = CLR.System.IntPtr, CLR.System.Int64, CLR.System.String
+Marshal = CLR.System.Runtime.InteropServices.Marshal
 
 
 # -------------------------------------------------------------------
@@ -40,6 +44,22 @@ def _to_net_double_array(values) -> Array[Double]:
     return net_arr
 
 
+def _fill_net_double_array(values) -> Array[Double]:
+    """
+    Copy a 1D numeric sequence into a pre-allocated .NET double[] with one block copy.
+
+    Falls back to list marshaling when the runtime cannot expose the numpy buffer as a pointer.
+    """
+    a = np.ascontiguousarray(values, dtype=np.float64).ravel()
+    net_arr = Array[Double](a.size)
+    if a.size:
+        try:
+            Marshal.Copy(IntPtr.__overloads__[Int64](a.ctypes.data), net_arr, 0, a.size)
+        except Exception:
+            net_arr = Array[Double](a.tolist())
+    return net_arr
+
+
 def fill_in_meta_info(*,
                       record_number=0,
                       asc_order=None,
@@ -108,6 +128,8 @@ class SoilManager:
     top_nh3: float = 0.5,
     top_nh4: float = 0.05
     swcon:float =0.3,
+    cache: Any = None  # SoilProfileCache, path or bool
+    mukey: Optional[str] = field(default=None, init=False, repr=False, compare=False)  # looked up by _profile_key
 
     # ------------------------ Profile prep ------------------------
     def __post_init__(self):
@@ -126,6 +148,42 @@ class SoilManager:
         if self.soil_profile is not None:
             return
 
+        if self.lonlat is not None:
+            cache = as_soil_profile_cache(self.cache)
+            key = self._profile_key() if cache is not None else None
+            if key is not None:
+                profile = cache.get(key)
+                if profile is not None:
+                    self.soil_profile = localise_profile(profile, self.lonlat)
+                    return
+            self._build_soil_profile()
+            if key is not None:
+                cache.put(key, self.soil_profile)
+
+        # Fallback to provided tables (dict-like expected)
+        if isinstance(self.soil_tables, dict):
+            self.soil_profile = self.soil_tables
+            self.thickness_sequence = self.soil_tables.get('Thickness', self.thickness_sequence)
+            return
+
+    def _profile_key(self):
+        """Key of the profile in a :class:`~apsimNGpy.soils.profile_cache.SoilProfileCache`, ``None`` if unknown."""
+        source = self.source.lower()
+        if source == 'ssurgo':
+            # kept for the download on a miss, which then skips the spatial query
+            self.mukey = ssurgo_mukeys([self.lonlat])[0]
+            if self.mukey is None:
+                return None
+            soil_id = (self.mukey, self.soil_series)
+        else:
+            soil_id = soilgrids_cell(self.lonlat)
+        return profile_key(source, soil_id, self.thickness_sequence, None, engine='SoilManager',
+                           thickness_value=self.thickness_value, n_layers=self.n_layers, max_depth=self.max_depth,
+                           top_finert=self.top_finert, top_fom=self.top_fom, top_fbiom=self.top_fbiom,
+                           fom_cnr=self.fom_cnr, soil_cnr=self.soil_cnr, top_urea=self.top_urea,
+                           top_nh3=self.top_nh3, top_nh4=self.top_nh4, swcon=self.swcon)
+
+    def _build_soil_profile(self) -> None:
         if self.lonlat is not None:
             if self.source.lower() == 'ssurgo':
                 if not _is_within_USA_mainland(self.lonlat):
@@ -137,6 +195,7 @@ class SoilManager:
                     max_depth=self.max_depth,
                     soil_series=self.soil_series,
                     thickness_sequence=self.thickness_sequence,
+                    mukey=self.mukey,
                 )
             elif self.source.lower() == 'isric':
                 self.soil_profile = get_soil_profile_soil_grid(lonlat=self.lonlat,
@@ -156,12 +215,6 @@ class SoilManager:
                 raise NotImplementedError(
                     f' source `{self.source}` not supported. Please choose from `isric` or `ssurgo`')
 
-        # Fallback to provided tables (dict-like expected)
-        if isinstance(self.soil_tables, dict):
-            self.soil_profile = self.soil_tables
-            self.thickness_sequence = self.soil_tables.get('Thickness', self.thickness_sequence)
-            return
-
     # @staticmethod
     def get_soil_profile_from_lonlat_ssurgo(self,
                                             lonlat,
@@ -170,7 +223,8 @@ class SoilManager:
                                             soil_series=None,
                                             thickness=None,
                                             max_depth=2400,
-                                            n_layers=10, ):
+                                            n_layers=10,
+                                            mukey=None):
         assert any([thickness_sequence, thickness]), \
             "both thickness_sequence and thickness must not be None"
         if all([thickness_sequence, thickness]):
@@ -180,7 +234,8 @@ class SoilManager:
 
         date_str = dt.datetime.now().isoformat(timespec="seconds")
 
-        sdf = DownloadsurgoSoiltables(lonlat=lonlat, select_componentname=soil_series, summarytable=False)
+        sdf = DownloadsurgoSoiltables(lonlat=lonlat, select_componentname=soil_series, summarytable=False,
+                                      mukey=mukey)
         if soil_series in sdf.componentname.unique():
             sdf = sdf[sdf['componentname'] == soil_series]
         elif soil_series is None:
@@ -383,6 +438,246 @@ class SoilManager:
         pass
 
 
+# -------------------------------------------------------------------
+# Bulk injection
+# -------------------------------------------------------------------
+
+# node type -> attribute of SoilNodes holding it
+_SOIL_NODE_TYPES = {
+    'Models.Soils.Soil': 'soil',
+    'Models.Soils.Physical': 'physical',
+    'Models.Soils.Organic': 'organic',
+    'Models.Soils.Chemical': 'chemical',
+    'Models.Soils.Water': 'water',
+    'Models.WaterModel.WaterBalance': 'soil_water',
+    'Models.Soils.SoilCrop': 'soil_crops',
+    'Models.Soils.Solute': 'solutes',
+}
+# subtrees that never hold soil nodes, skipped by index_soil_nodes
+_PRUNED_NODE_TYPES = ('Models.PMF.', 'Models.Manager', 'Models.Report', 'Models.Storage.', 'Models.Climate.',
+                      'Models.Clock', 'Models.Summary', 'Models.Graph', 'Models.Surface.', 'Models.Operations',
+                      'Models.Fertiliser', 'Models.Irrigation', 'Models.Memo')
+# profile section -> SoilNodes attribute
+BULK_SOIL_SECTIONS = {
+    'physical': 'physical',
+    'organic': 'organic',
+    'chemical': 'chemical',
+    'water': 'water',
+    'soil_water': 'soil_water',
+    'soil_crop': 'soil_crops',
+    'solutes': 'solutes',
+    'meta_info': 'soil',
+}
+
+
+@dataclass(slots=True)
+class SoilNodes:
+    """Soil nodes of one simulation, cast to their concrete types."""
+    soil: Any = None
+    physical: Any = None
+    organic: Any = None
+    chemical: Any = None
+    water: Any = None
+    soil_water: Any = None
+    soil_crops: List[Any] = field(default_factory=list)
+    solutes: List[Any] = field(default_factory=list)
+
+
+def index_soil_nodes(root) -> Dict[str, SoilNodes]:
+    """
+    Index the soil nodes of every simulation under ``root`` in a single pass over the tree.
+
+    Parameters
+    ----------
+    root : Models.Core.Simulations | Models.Core.IModel
+        Node to walk, usually ``model.Simulations``.
+
+    Returns
+    -------
+    dict[str, SoilNodes]
+        Simulation name to its soil nodes. The first node of each section found under a simulation is kept,
+        all ``SoilCrop`` and ``Solute`` nodes are collected.
+
+    Notes
+    -----
+    Plant, manager, report, weather and similar subtrees are not entered, and only the matched soil nodes are cast,
+    so the walk touches a small part of large multi-simulation files.
+
+    .. versionadded:: 1.5.7
+    """
+    root = getattr(getattr(root, 'Node', None), 'Model', root)
+    index = {}
+    casts = {}
+    stack = [(root, None)]
+    while stack:
+        node, nodes = stack.pop()
+        type_name = node.GetType().FullName
+        if type_name == 'Models.Core.Simulation':
+            nodes = index.setdefault(node.Name, SoilNodes())
+        elif type_name.startswith(_PRUNED_NODE_TYPES):
+            continue
+        elif nodes is not None and type_name in _SOIL_NODE_TYPES:
+            if type_name not in casts:
+                model_type = Models
+                for part in type_name.split('.')[1:]:
+                    model_type = getattr(model_type, part)
+                casts[type_name] = CastHelper.CastAs[model_type]
+            name = _SOIL_NODE_TYPES[type_name]
+            cast = casts[type_name](node)
+            if name in ('soil_crops', 'solutes'):
+                getattr(nodes, name).append(cast)
+            elif getattr(nodes, name) is None:
+                setattr(nodes, name, cast)
+        children = node.Children
+        if children is not None:
+            stack.extend((child, nodes) for child in reversed(list(children)))
+    return index
+
+
+def _profile_columns(df) -> Dict[str, Any]:
+    """Columns of one profile section as float64 arrays, ``Depth`` as strings."""
+    if isinstance(df, dict):
+        df = DataFrame.from_dict(df)
+    columns = {}
+    for prop in df.columns:
+        col = df[prop]
+        if isinstance(col, DataFrame):  # duplicated column names, keep the first as the single editors do
+            col = col.iloc[:, 0]
+        if prop == 'Depth':
+            if 'Thickness' not in df.columns:
+                columns[prop] = [str(v) for v in col]
+        else:
+            columns[prop] = col.to_numpy(dtype=np.float64, copy=False)
+    return columns
+
+
+def _prepared_profile(profile: Mapping, adjust_dul: bool) -> Dict[str, Any]:
+    prepared = {}
+    for key, value in profile.items():
+        if key == 'meta_info' or value is None or not hasattr(value, '__getitem__') or isinstance(value, str):
+            continue
+        try:
+            prepared[key] = _profile_columns(value)
+        except (TypeError, ValueError, AttributeError):
+            continue
+    physical = prepared.get('physical')
+    if adjust_dul and physical and 'DUL' in physical and 'SAT' in physical:
+        dul, sat = physical['DUL'], physical['SAT']
+        physical['DUL'] = np.where(dul >= sat, sat - 0.02, dul)
+    return prepared
+
+
+def _write_columns(node, columns: Mapping[str, Any], attributes: Dict[str, frozenset]) -> None:
+    type_name = node.GetType().FullName
+    settable = attributes.get(type_name)
+    if settable is None:
+        settable = attributes[type_name] = frozenset(dir(node))
+    for prop, values in columns.items():
+        if prop not in settable:
+            continue
+        if prop == 'Depth':
+            setattr(node, prop, Array[String](values))
+        else:
+            setattr(node, prop, _fill_net_double_array(values))
+
+
+def inject_soil_profiles(root, profiles: Mapping[str, Mapping], *, sections: Optional[Sequence[str]] = None,
+                         additional_plants: Sequence[str] = (), adjust_dul: bool = True,
+                         index: Optional[Mapping[str, SoilNodes]] = None) -> Dict[str, SoilNodes]:
+    """
+    Write soil profiles into many simulations with one pass over the model tree.
+
+    Parameters
+    ----------
+    root : Models.Core.Simulations
+        The model tree, usually ``model.Simulations``.
+    profiles : Mapping[str, Mapping]
+        Simulation name to a soil profile in the layout of :func:`apsimNGpy.soils.soilgrid.aggregate_data`, i.e.,
+        ``physical``, ``organic``, ``chemical``, ``water``, ``soil_water``, ``soil_crop`` tables, solute tables keyed
+        by solute name (``NO3``, ``NH4``, ``Urea``) and a ``meta_info`` dict. Profiles shared by several simulations
+        are converted once. Simulations mapped to ``None``, e.g. points without soil data in
+        :func:`~apsimNGpy.soils.profile_cache.soil_profiles_for_points`, keep their soil and are logged.
+    sections : Sequence[str], optional
+        Sections to write, defaults to all keys of :data:`BULK_SOIL_SECTIONS`.
+    additional_plants : Sequence[str], optional
+        Plant names for which a ``SoilCrop`` is added under ``Physical`` when missing.
+    adjust_dul : bool, default True
+        Lower ``DUL`` to ``SAT - 0.02`` where it is not below ``SAT``.
+    index : Mapping[str, SoilNodes], optional
+        Result of a previous :func:`index_soil_nodes` call on the same, unchanged tree.
+
+    Returns
+    -------
+    dict[str, SoilNodes]
+        The soil node index, which can be passed back through ``index`` for later injections.
+
+    Raises
+    ------
+    ValueError
+        If a simulation name is not in the tree, a section is unknown, or a simulation has no soil node for a
+        requested section.
+
+    .. versionadded:: 1.5.7
+    """
+    sections = tuple(sections or BULK_SOIL_SECTIONS)
+    unknown = set(sections) - set(BULK_SOIL_SECTIONS)
+    if unknown:
+        raise ValueError(f"unknown soil section(s) {sorted(unknown)}, choose from {list(BULK_SOIL_SECTIONS)}")
+    index = index_soil_nodes(root) if index is None else index
+    missing = [name for name in profiles if name not in index]
+    if missing:
+        raise ValueError(f"simulation(s) {missing[:10]} not found, available: {list(index)[:10]}")
+
+    skipped = [name for name, profile in profiles.items() if profile is None]
+    if skipped:
+        logger.warning(f"no soil profile for simulation(s) {skipped[:10]}, their soil is left unchanged")
+
+    prepared = {}  # id(profile) -> columns, shared profiles are converted once
+    attributes = {}
+    for name, profile in profiles.items():
+        if profile is None:
+            continue
+        nodes = index[name]
+        key = id(profile)
+        if key not in prepared:
+            prepared[key] = _prepared_profile(profile, adjust_dul)
+        columns = prepared[key]
+        for section in sections:
+            target = getattr(nodes, BULK_SOIL_SECTIONS[section])
+            if section == 'solutes':
+                for solute in target:
+                    if solute.Name in columns:
+                        _write_columns(solute, columns[solute.Name], attributes)
+                continue
+            if section == 'meta_info':
+                meta_info = profile.get('meta_info')
+                if meta_info and target is not None:
+                    for prop, value in meta_info.items():
+                        if value is None or not hasattr(target, prop):
+                            continue
+                        setattr(target, prop, int(value) if prop == 'RecordNumber' else value)
+                continue
+            if section not in columns:
+                continue
+            if not target and section != 'soil_crop':
+                raise ValueError(f"simulation '{name}' has no {section} soil node")
+            if section == 'soil_crop':
+                present = {crop.Name for crop in target}
+                for crop in additional_plants or ():
+                    if crop in present or nodes.physical is None:
+                        continue
+                    soil_crop = Models.Soils.SoilCrop()
+                    soil_crop.Name = crop
+                    nodes.physical.Children.Add(soil_crop)
+                    target.append(soil_crop)
+                    present.add(crop)
+                for soil_crop in target:
+                    _write_columns(soil_crop, columns[section], attributes)
+            else:
+                _write_columns(target, columns[section], attributes)
+    return index
+
+
 if __name__ == "__main__":
     from apsimNGpy.core.apsim import ApsimModel
 
@@ -0,0 +1,167 @@
+"""
+Incremental group-by reductions over chunks of simulated output.
+
+:class:`ChunkAggregator` folds DataFrame chunks, e.g., from :func:`apsimNGpy.core_utils.database_utils.iter_db_tables`,
+into per-group partial statistics, so the ``agg_func`` reductions of the parallel runners can be computed over
+outputs that do not fit in memory. The result is the same as
+``pd.concat(chunks).groupby(by).agg(agg_func, numeric_only=True)``.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from apsimNGpy.core_utils.utils import get_array_like
+
+__all__ = ['AGGS', 'ChunkAggregator', 'aggregate_chunks']
+
+AGGS = {'sum', 'mean', 'max', 'min', 'median', 'std'}
+# partial states are merged once this many chunks are pending
+COMPACT_EVERY = 32
+_GROUP = '__group__'
+
+
+class ChunkAggregator:
+    """
+    Group-by reduction that is updated one chunk at a time.
+
+    ``sum``, ``mean``, ``min``, ``max`` and ``std`` keep, per group and column, the count, sum, minimum, maximum and
+    sum of squared deviations, merged with the pairwise update of Chan et al., so memory grows with the number of
+    groups and not with the number of rows. ``median`` has no such summary: the numeric columns of every chunk are
+    kept until :meth:`result` is called.
+
+    Parameters
+    ----------
+    agg_func : str
+        One of ``'sum'``, ``'mean'``, ``'max'``, ``'min'``, ``'median'`` and ``'std'``.
+    by : str or list of str, optional
+        Grouping columns. If omitted, every row belongs to one group and :meth:`result` returns a Series.
+
+    Examples
+    --------
+    >>> agg = ChunkAggregator('mean', by='source_table')
+    >>> agg.update(pd.DataFrame({'source_table': ['a', 'b'], 'Yield': [1.0, 3.0]}))
+    >>> agg.update(pd.DataFrame({'source_table': ['a'], 'Yield': [2.0]}))
+    >>> agg.result()['Yield'].tolist()
+    [1.5, 3.0]
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, agg_func: str, by: Union[str, Iterable[str], None] = None):
+        if agg_func not in AGGS:
+            raise ValueError(f"Unsupported aggregation function '{agg_func}'")
+        self.agg_func = agg_func
+        self.by = list(get_array_like(by)) if by is not None else None
+        self.rows = 0
+        self._columns: dict = {}
+        self._partials: list = []
+
+    def __repr__(self):
+        return f"{type(self).__name__}(agg_func={self.agg_func!r}, by={self.by!r}, rows={self.rows})"
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Folds ``chunk`` into the running statistics."""
+        if chunk.empty:
+            return
+        keys = self.by or []
+        missing = [k for k in keys if k not in chunk.columns]
+        if missing:
+            raise KeyError(f"Grouping columns {missing} are missing from the chunk")
+        for c in chunk.columns:
+            if c not in keys and c not in self._columns and is_numeric_dtype(chunk[c]):
+                self._columns[c] = None
+        values = [c for c in self._columns if c in chunk.columns]
+        self.rows += len(chunk)
+        if not keys:
+            chunk = chunk.assign(**{_GROUP: 0})
+            keys = [_GROUP]
+        data = chunk[[*keys, *values]]
+        if self.agg_func == 'median':
+            self._partials.append(data)
+            return
+        grouped = data.groupby(keys, sort=False)
+        count = grouped.count()
+        total = grouped.sum()
+        state = {'count': count, 'sum': total, 'min': grouped.min(), 'max': grouped.max()}
+        if self.agg_func == 'std':
+            state['m2'] = grouped.var(ddof=0).astype('float64') * count
+        self._partials.append(state)
+        if len(self._partials) >= COMPACT_EVERY:
+            self._partials = [self._merge()]
+
+    def _merge(self) -> dict:
+        stats = {s: pd.concat([p[s] for p in self._partials]) for s in self._partials[0]}
+        levels = list(range(stats['count'].index.nlevels))
+        merged = {
+            'count': stats['count'].groupby(level=levels).sum(),
+            'sum': stats['sum'].groupby(level=levels).sum(),
+            'min': stats['min'].groupby(level=levels).min(),
+            'max': stats['max'].groupby(level=levels).max(),
+        }
+        if 'm2' in stats:
+            count = stats['count'].astype('float64')
+            mean = stats['sum'].astype('float64') / count
+            overall = merged['sum'].astype('float64') / merged['count'].astype('float64')
+            # M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2)
+            deviation = count * (mean - overall.reindex(mean.index).to_numpy()) ** 2
+            merged['m2'] = (stats['m2'] + deviation.fillna(0)).groupby(level=levels).sum()
+        return merged
+
+    def result(self) -> Union[pd.DataFrame, pd.Series]:
+        """
+        Reduction of all the chunks seen so far.
+
+        Returns
+        -------
+        pandas.DataFrame or pandas.Series
+            Indexed by the grouping columns, or a Series of the numeric columns when ``by`` is omitted.
+        """
+        columns = list(self._columns)
+        keys = self.by or [_GROUP]
+        if not self._partials:
+            out = pd.DataFrame(columns=columns, index=pd.MultiIndex.from_tuples([], names=keys)
+                               if len(keys) > 1 else pd.Index([], name=keys[0]))
+        elif self.agg_func == 'median':
+            data = pd.concat(self._partials, ignore_index=True)
+            out = data.groupby(keys).median()
+        else:
+            state = self._merge()
+            self._partials = [state]
+            if self.agg_func in {'sum', 'min', 'max'}:
+                out = state[self.agg_func]
+            elif self.agg_func == 'mean':
+                out = state['sum'].astype('float64') / state['count'].astype('float64')
+            else:
+                count = state['count'].astype('float64')
+                out = np.sqrt(state['m2'] / (count - 1).where(count > 1))
+            out = out.sort_index()
+        out = out.reindex(columns=columns)
+        if self.by is None:
+            return out.iloc[0] if len(out) else pd.Series(np.nan, index=columns, dtype='float64')
+        return out
+
+
+def aggregate_chunks(chunks: Iterable[pd.DataFrame], agg_func: str,
+                     by: Union[str, Iterable[str], None] = None) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Reduces an iterable of DataFrame chunks with :class:`ChunkAggregator`.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from apsimNGpy.core_utils.aggregation import aggregate_chunks
+
+        mean_yield = aggregate_chunks(model.iter_results(columns=['SimulationID', 'Yield']), 'mean',
+                                      by='SimulationID')
+
+    .. versionadded:: 1.5.7
+    """
+    aggregator = ChunkAggregator(agg_func, by=by)
+    for chunk in chunks:
+        aggregator.update(chunk)
+    return aggregator.result()
@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import gc
 import os
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from functools import wraps
 from os.path import exists
 from typing import Union, Mapping, Any
@@ -21,8 +21,12 @@ from typing import Iterable, Iterator, Optional, TypeVar, Callable
 import pandas as pd
 from typing import Dict, Tuple, Hashable, List
 from apsimNGpy.logger import logger
+from apsimNGpy.core_utils.utils import get_array_like
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+import threading
+from urllib.parse import quote
 
 T = TypeVar("T")
 
@@ -261,12 +265,9 @@ def read_db_table(db: Union[str, Path], report_name: str = None, sql_query=None)
         ENGINE = db
     else:
         db = str(Path(db).with_suffix('.db'))
-        DB = f'sqlite:///{db}'
-        ENGINE = create_engine(DB)
-        with ENGINE.begin() as connect:
-            df= rsq(query, connect)
-            ENGINE.dispose()
-            return df
+        # pooled read-only engine, created once per database instead of on every call
+        with get_read_engine(db).connect() as connect:
+            return rsq(query, connect)
 
     try:
         df = rsq(query, ENGINE)
@@ -360,6 +361,345 @@ def read_with_pandas(table: str, db_or_con):
     )
 
 
+# ______________________ pooled read-only access _____________________________
+READ_PRAGMAS = (
+    'PRAGMA query_only = ON',
+    'PRAGMA mmap_size = 268435456',  # 256 MB memory mapped I/O
+    'PRAGMA cache_size = -65536',  # 64 MB page cache
+    'PRAGMA temp_store = MEMORY',
+)
+MAX_COMPOUND_SELECT = 400
+MAX_READ_ENGINES = 32  # least recently used engines past this are disposed
+_READ_ENGINES: 'OrderedDict[Tuple, Engine]' = OrderedDict()
+_READ_ENGINES_LOCK = threading.Lock()
+
+
+def _read_engine_key(db) -> Tuple:
+    # the inode makes a database deleted and recreated by APSIM a different key, so no stale handles are reused
+    path = os.path.realpath(db)
+    st = os.stat(path)
+    return path, st.st_dev, st.st_ino
+
+
+def get_read_engine(db: Union[str, Path]) -> Engine:
+    """
+    Return a pooled, read-only SQLAlchemy engine for the SQLite database ``db``.
+
+    Engines are created once per database file and re-used by all subsequent reads in the process; past
+    :data:`MAX_READ_ENGINES` databases, the least recently used engine is disposed. Connections
+    are opened in read-only URI mode (``mode=ro``), so a wrong path raises instead of creating an empty database,
+    and each connection applies :data:`READ_PRAGMAS` (memory mapped I/O, larger page cache and in-memory temp
+    storage). Databases already in WAL journal mode are read without blocking the writers.
+
+    Parameters
+    ----------
+    db : str | Path
+        Path to the SQLite database file.
+
+    Returns
+    -------
+    sqlalchemy.engine.Engine
+
+    .. seealso::
+
+       :func:`dispose_read_engine`, :func:`read_db_tables`
+    """
+    key = _read_engine_key(db)
+    with _READ_ENGINES_LOCK:
+        engine = _READ_ENGINES.get(key)
+        if engine is not None:
+            _READ_ENGINES.move_to_end(key)
+        else:
+            uri = f"file:{quote(Path(key[0]).as_posix(), safe='/:')}?mode=ro"
+
+            def _connect():
+                return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+            engine = create_engine('sqlite://', creator=_connect, poolclass=QueuePool, pool_size=4, max_overflow=8,
+                                   pool_pre_ping=False)
+
+            @sqlalchemy.event.listens_for(engine, 'connect')
+            def _apply_pragmas(dbapi_con, _):
+                cursor = dbapi_con.cursor()
+                for pragma in READ_PRAGMAS:
+                    cursor.execute(pragma)
+                cursor.close()
+
+            # engines of a replaced file at the same path, then the least recently used ones
+            for stale in [k for k in _READ_ENGINES if k[0] == key[0]]:
+                _READ_ENGINES.pop(stale).dispose()
+            while len(_READ_ENGINES) >= MAX_READ_ENGINES:
+                _READ_ENGINES.popitem(last=False)[1].dispose()
+            _READ_ENGINES[key] = engine
+        return engine
+
+
+def dispose_read_engine(db: Union[str, Path, None] = None) -> None:
+    """
+    Close the pooled read connections of ``db``, or of all databases if ``db`` is None.
+
+    Call it before a database is deleted or replaced, since open handles block file removal on Windows.
+    """
+    path = os.path.realpath(db) if db is not None else None
+    with _READ_ENGINES_LOCK:
+        for key in [k for k in _READ_ENGINES if path is None or k[0] == path]:
+            _READ_ENGINES.pop(key).dispose()
+
+
+def _table_schema(con, table) -> Tuple:
+    info = con.exec_driver_sql(f'PRAGMA table_info({_quote(table)})').fetchall()
+    # (name, declared type) in column order
+    return tuple((row[1], row[2]) for row in info)
+
+
+def _quote(identifier: str) -> str:
+    return '"{}"'.format(str(identifier).replace('"', '""'))
+
+
+def _where_clause(where: Union[str, Mapping, None], available: Iterable[str]) -> Optional[Tuple[List[str], List]]:
+    """
+    Translate ``where`` into SQL conditions with bound parameters.
+
+    Returns None if a filtered column is missing in the table, i.e., no row of that table can match.
+    """
+    if where is None:
+        return [], []
+    if isinstance(where, str):
+        # a raw SQL expression supplied by the user
+        return [f'({where})'], []
+    if not isinstance(where, Mapping):
+        raise TypeError(f"where must be a SQL expression string or a dict of filters, got {type(where)}")
+    available = set(available)
+    conditions, params = [], []
+    for column, value in where.items():
+        if column not in available:
+            return None
+        col = _quote(column)
+        if isinstance(value, tuple):
+            if len(value) != 2:
+                raise ValueError(f"range filter for {column} must be a (low, high) tuple got {value}")
+            low, high = value
+            if low is not None:
+                conditions.append(f'{col} >= ?')
+                params.append(low)
+            if high is not None:
+                conditions.append(f'{col} <= ?')
+                params.append(high)
+        elif isinstance(value, (list, set, frozenset)):
+            value = list(value)
+            conditions.append(f"{col} IN ({', '.join('?' * len(value))})" if value else '0')
+            params.extend(value)
+        elif value is None:
+            conditions.append(f'{col} IS NULL')
+        else:
+            conditions.append(f'{col} = ?')
+            params.append(value)
+    return conditions, params
+
+
+def build_select(table: str, table_columns: Iterable[str], *, columns: Optional[Iterable[str]] = None,
+                 where: Union[str, Mapping, None] = None, simulations: Optional[Iterable[str]] = None,
+                 label: Optional[str] = None) -> Optional[Tuple[str, List, Tuple[str, ...]]]:
+    """
+    Build a ``SELECT`` statement that pushes column projection and row filters down to SQLite.
+
+    Parameters
+    ----------
+    table : str
+        Table to read.
+    table_columns : iterable of str
+        Columns present in ``table``, in order.
+    columns : iterable of str, optional
+        Columns to keep, those missing in ``table`` are ignored. Defaults to all columns.
+    where : str or dict, optional
+        Either a SQL expression, e.g., ``'Yield > 1000 AND year >= 2000'``, or a dict of filters combined with
+        ``AND``: ``{'Zone': 'Field'}`` for equality, ``{'year': (1990, 2000)}`` for an inclusive range, where any
+        bound may be None, and ``{'ID': [1, 2, 3]}`` for membership.
+    simulations : iterable of str, optional
+        Keep only rows of these simulation names, resolved through the APSIM ``_Simulations`` table.
+    label : str, optional
+        Name of a column holding the table name.
+
+    Returns
+    -------
+    tuple or None
+        ``(sql, params, selected_columns)``, or None if no row of ``table`` can satisfy the filters.
+    """
+    table_columns = list(table_columns)
+    keep = set(get_array_like(columns)) if columns is not None else None
+    selected = [c for c in table_columns if keep is None or c in keep]
+    if not selected:
+        return None
+    clause = _where_clause(where, table_columns)
+    if clause is None:
+        return None
+    conditions, params = clause
+    if simulations is not None:
+        if 'SimulationID' not in table_columns:
+            return None
+        simulations = list(get_array_like(simulations))
+        conditions.append(
+            f"SimulationID IN (SELECT ID FROM _Simulations WHERE Name IN ({', '.join('?' * len(simulations))}))")
+        params.extend(simulations)
+    projection = ', '.join(_quote(c) for c in selected)
+    if label:
+        literal = table.replace("'", "''")
+        projection = f"{projection}, '{literal}' AS {_quote(label)}"
+    sql = f'SELECT {projection} FROM {_quote(table)}'
+    if conditions:
+        sql = f"{sql} WHERE {' AND '.join(conditions)}"
+    return sql, params, tuple(selected)
+
+
+def read_db_tables(db: Union[str, Path, Engine], tables: Iterable[str], *, union: bool = False,
+                   label: Optional[str] = None, columns: Optional[Iterable[str]] = None,
+                   where: Union[str, Mapping, None] = None,
+                   simulations: Optional[Iterable[str]] = None) -> Union[Dict[str, DataFrame], DataFrame]:
+    """
+    Read several tables of a SQLite database over a single pooled connection.
+
+    Parameters
+    ----------
+    db : str | Path | sqlalchemy.engine.Engine
+        Database path, read through :func:`get_read_engine`, or an existing engine.
+    tables : iterable of str
+        Table names to read. Missing tables are logged and skipped.
+    union : bool, optional, default=False
+        If ``True``, return one DataFrame. Tables sharing the same column names and types are fetched with a single
+        ``UNION ALL`` query, the remaining groups are concatenated along the rows.
+    label : str, optional
+        Name of a column added to every row with the name of its source table, e.g. ``'source_table'``.
+    columns, where, simulations : optional
+        Column projection and row filters evaluated by SQLite, see :func:`build_select`. Tables lacking a filtered
+        column have no matching rows and are left out.
+
+    Returns
+    -------
+    dict[str, pandas.DataFrame] or pandas.DataFrame
+        ``{table: DataFrame}`` in the order requested, or a single DataFrame when ``union=True``.
+
+    Raises
+    ------
+    ValueError
+        If none of the requested ``columns`` exists in any of the tables.
+
+    Examples
+    --------
+    >>> frames = read_db_tables('maize.db', ['Report', 'soc'])  # doctest: +SKIP
+    >>> df = read_db_tables('runs.db', tables, union=True, label='source_table')  # doctest: +SKIP
+    """
+    engine = db if isinstance(db, Engine) else get_read_engine(Path(db).with_suffix('.db'))
+    tables = list(dict.fromkeys(tables))
+    with engine.connect() as con:
+        existing = {r[0] for r in con.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")}
+        missing = [t for t in tables if t not in existing]
+        if missing:
+            logger.error(f"Tables {missing} not found in the database.")
+        tables = [t for t in tables if t in existing]
+        schemas = {t: _table_schema(con, t) for t in tables}
+        if columns is not None:
+            columns = get_array_like(columns)
+            found = {c for schema in schemas.values() for c, _ in schema}
+            if not found.intersection(columns):
+                raise ValueError(f"None of the columns {columns} exists in tables {tables}")
+        statements = {}
+        for t in tables:
+            statement = build_select(t, [c for c, _ in schemas[t]], columns=columns, where=where,
+                                     simulations=simulations, label=label)
+            if statement is not None:
+                statements[t] = statement
+
+        if not union:
+            return {t: rsq(sql, con, params=tuple(params)) for t, (sql, params, _) in statements.items()}
+        if not statements:
+            return DataFrame()
+        groups: Dict[Tuple, List[str]] = {}
+        for t, (_, _, selected) in statements.items():
+            types = dict(schemas[t])
+            groups.setdefault(tuple((c, types[c]) for c in selected), []).append(t)
+        frames = []
+        for group in groups.values():
+            # SQLite caps the number of terms in a compound SELECT (500 by default)
+            for i in range(0, len(group), MAX_COMPOUND_SELECT):
+                part = [statements[t] for t in group[i:i + MAX_COMPOUND_SELECT]]
+                sql = ' UNION ALL '.join(sql for sql, _, _ in part)
+                frames.append(rsq(sql, con, params=tuple(p for _, params, _ in part for p in params)))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def _declared_dtypes(schema, selected) -> Dict[str, str]:
+    # stable dtypes across chunks, otherwise a chunk with NULLs turns an integer column into float
+    types = dict(schema)
+    dtypes = {}
+    for c in selected:
+        declared = (types.get(c) or '').upper()
+        if 'INT' in declared:
+            dtypes[c] = 'Int64'
+        elif any(t in declared for t in ('REAL', 'FLOA', 'DOUB')):
+            dtypes[c] = 'float64'
+    return dtypes
+
+
+def iter_db_tables(db: Union[str, Path, Engine], tables: Iterable[str], *, chunksize: int = 100_000,
+                   label: Optional[str] = None, columns: Optional[Iterable[str]] = None,
+                   where: Union[str, Mapping, None] = None, simulations: Optional[Iterable[str]] = None,
+                   arrow: bool = False) -> Iterator:
+    """
+    Stream rows of several tables as chunks of at most ``chunksize`` rows.
+
+    Rows are fetched lazily from a cursor on one pooled read connection, so memory is bounded by the chunk size
+    whatever the size of the tables. Arguments are the same as :func:`read_db_tables`.
+
+    Parameters
+    ----------
+    chunksize : int, optional, default=100_000
+        Maximum number of rows per chunk.
+    arrow : bool, optional, default=False
+        Yield ``pyarrow.Table`` chunks instead of DataFrames. Requires pyarrow.
+
+    Yields
+    ------
+    pandas.DataFrame or pyarrow.Table
+        Chunks in table order. Columns declared as INTEGER or REAL keep the same dtype in every chunk
+        (``Int64`` and ``float64``).
+
+    Examples
+    --------
+    >>> for chunk in iter_db_tables('runs.db', ['Report'], chunksize=50_000, columns=['Yield']):  # doctest: +SKIP
+    ...     total += chunk['Yield'].sum()
+    """
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be a positive integer got {chunksize}')
+    if arrow:
+        try:
+            import pyarrow as pa
+        except ModuleNotFoundError as mnf:
+            raise ModuleNotFoundError("arrow chunks require pyarrow, install it with `pip install pyarrow`") from mnf
+    engine = db if isinstance(db, Engine) else get_read_engine(Path(db).with_suffix('.db'))
+    tables = list(dict.fromkeys(tables))
+    with engine.connect() as con:
+        existing = {r[0] for r in con.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")}
+        missing = [t for t in tables if t not in existing]
+        if missing:
+            logger.error(f"Tables {missing} not found in the database.")
+        schemas = {t: _table_schema(con, t) for t in tables if t in existing}
+        if columns is not None:
+            columns = get_array_like(columns)
+            found = {c for schema in schemas.values() for c, _ in schema}
+            if not found.intersection(columns):
+                raise ValueError(f"None of the columns {columns} exists in tables {list(schemas)}")
+        con = con.execution_options(stream_results=True)
+        for t, schema in schemas.items():
+            statement = build_select(t, [c for c, _ in schema], columns=columns, where=where,
+                                     simulations=simulations, label=label)
+            if statement is None:
+                continue
+            sql, params, selected = statement
+            for chunk in rsq(sql, con, params=tuple(params), chunksize=chunksize,
+                             dtype=_declared_dtypes(schema, selected)):
+                yield pa.Table.from_pandas(chunk, preserve_index=False) if arrow else chunk
+
+
 def load_database(path):
     assert exists(path), "error from__ (database_utils module) file path does not exist try a different=========="
     assert path.endswith(
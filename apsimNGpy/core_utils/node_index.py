@@ -0,0 +1,242 @@
+"""
+Path and type index of an APSIM model tree.
+
+Looking a node up by path or by type walks the .NET tree (``FindByPath``, ``FindAllDescendants``, or the Python
+``Children`` recursion of :mod:`apsimNGpy.core.model_tools`), so every lookup costs O(tree). Parameter sweeps
+that edit thousands of paths in a large multi-simulation file spend most of their time in these walks.
+:class:`NodeIndex` walks the tree once, on first use, and then answers
+
+- full path -> node,
+- (type, name) -> nodes, and
+- type -> nodes
+
+from dictionaries. A node is indexed under its own type full name and under every ``Models.*`` base class and
+interface of that type, so ``Models.Core.IPlant`` finds ``Models.PMF.Plant`` nodes as ``CastAs`` would.
+
+The index does not observe the tree. Code that adds, removes, moves or renames nodes calls :meth:`NodeIndex.invalidate`
+(or :meth:`NodeIndex.remove`/:meth:`NodeIndex.rename` to update it in place), which :class:`~apsimNGpy.core.core.CoreModel`
+does for its structural methods. As a safety net every hit, of :meth:`NodeIndex.get` as well as of the type lookups,
+is checked against the node's current ``FullPath``; a mismatch means the tree changed behind the index's back, and
+the index is rebuilt before the lookup is answered, so a stale path is never returned.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+__all__ = ['NodeIndex', 'type_key']
+
+_INDEXED_NAMESPACE = 'Models.'
+
+
+def type_key(model_type) -> str:
+    """Full name of a model type given as a ``Models`` class or a fully qualified string."""
+    if isinstance(model_type, str):
+        return model_type
+    full_name = getattr(model_type, 'FullName', None)  # System.Type
+    if isinstance(full_name, str):
+        return full_name
+    return f"{model_type.__module__}.{model_type.__name__}"
+
+
+class NodeIndex:
+    """
+    Lazily built lookup tables over an APSIM model tree.
+
+    Parameters
+    ----------
+    root : Models.Core.Simulations | Models.Core.IModel
+        Root of the tree. Nodes are reached through ``Children``.
+    cast : callable, optional
+        Applied to a node found by :meth:`get` before it is returned, e.g., a cast to its concrete type. The
+        result is memoized per path.
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, root, cast: Optional[Callable[[Any], Any]] = None):
+        self.root = root
+        self._cast = cast
+        self._paths: Optional[Dict[str, Any]] = None
+        self._order: Dict[str, int] = {}
+        self._by_type: Dict[str, List[str]] = {}
+        self._by_key: Dict[Tuple[str, str], List[str]] = {}
+        self._type_names: Dict[str, Tuple[str, ...]] = {}
+        self._cast_nodes: Dict[str, Any] = {}
+        self.stats = {'builds': 0, 'hits': 0, 'misses': 0}
+
+    # ------------------------------------------------------------------ building
+
+    @property
+    def built(self) -> bool:
+        return self._paths is not None
+
+    def _ancestry(self, node) -> Tuple[str, ...]:
+        net_type = node.GetType()
+        full_name = net_type.FullName
+        names = self._type_names.get(full_name)
+        if names is None:
+            found = [full_name]
+            base = net_type.BaseType
+            while base is not None and base.FullName.startswith(_INDEXED_NAMESPACE):
+                found.append(base.FullName)
+                base = base.BaseType
+            found.extend(i.FullName for i in net_type.GetInterfaces() if i.FullName.startswith(_INDEXED_NAMESPACE))
+            names = self._type_names[full_name] = tuple(dict.fromkeys(found))
+        return names
+
+    def build(self) -> 'NodeIndex':
+        """Walks the tree once and fills the lookup tables."""
+        self._paths, self._order, self._by_type, self._by_key, self._cast_nodes = {}, {}, {}, {}, {}
+        self.stats['builds'] += 1
+        root_path = f".{self.root.Name}"
+        stack = [(self.root, root_path)]
+        paths, order, by_type, by_key = self._paths, self._order, self._by_type, self._by_key
+        while stack:
+            node, path = stack.pop()
+            paths[path] = node
+            order[path] = len(order)
+            name = node.Name
+            for type_name in self._ancestry(node):
+                by_type.setdefault(type_name, []).append(path)
+                by_key.setdefault((type_name, name), []).append(path)
+            children = node.Children
+            if children:
+                stack.extend((child, f"{path}.{child.Name}") for child in reversed(list(children)))
+        return self
+
+    def _ensure(self):
+        if self._paths is None:
+            self.build()
+
+    def invalidate(self) -> None:
+        """Drops the tables, the next lookup walks the tree again."""
+        self._paths = None
+        self._order, self._by_type, self._by_key, self._cast_nodes = {}, {}, {}, {}
+
+    # ------------------------------------------------------------------ lookups
+
+    def get(self, path: str, default=None):
+        """
+        Node at ``path``, e.g. ``'.Simulations.Simulation.Field.Soil.Physical'``, or ``default`` if not indexed.
+
+        The node's ``FullPath`` is compared with ``path`` before it is returned, and the index is rebuilt if they
+        differ.
+        """
+        self._ensure()
+        node = self._paths.get(path)
+        if node is not None and not self._is_current(path):
+            node = self.build()._paths.get(path)
+        if node is None:
+            self.stats['misses'] += 1
+            return default
+        self.stats['hits'] += 1
+        if self._cast is None:
+            return node
+        cast = self._cast_nodes.get(path)
+        if cast is None:
+            cast = self._cast_nodes[path] = self._cast(node)
+        return cast
+
+    def _is_current(self, path: str) -> bool:
+        """Whether the node indexed under ``path`` still has that ``FullPath``."""
+        return getattr(self._paths[path], 'FullPath', path) == path
+
+    def __contains__(self, path) -> bool:
+        self._ensure()
+        return path in self._paths
+
+    def __len__(self) -> int:
+        self._ensure()
+        return len(self._paths)
+
+    def paths(self, model_type, name: Optional[str] = None, scope: Optional[str] = None) -> List[str]:
+        """
+        Paths of the nodes of ``model_type`` (and optionally ``name``) in tree order.
+
+        Parameters
+        ----------
+        model_type : type | str
+            A ``Models`` class or its full name. Subclasses and implementations are included.
+        name : str, optional
+            Node name to match.
+        scope : str, optional
+            Only return descendants of the node at this path. The scope node itself is excluded, as in
+            :func:`~apsimNGpy.core.model_tools.find_all_in_scope`. Defaults to the descendants of the root.
+
+        Every hit is checked against its node's ``FullPath``; on a mismatch the index is rebuilt and the lookup
+        repeated.
+        """
+        self._ensure()
+        key = type_key(model_type)
+        prefix = f"{scope or f'.{self.root.Name}'}."
+
+        def lookup():
+            found = self._by_type.get(key, ()) if name is None else self._by_key.get((key, name), ())
+            return [path for path in found if path.startswith(prefix)]
+
+        hits = lookup()
+        if not all(map(self._is_current, hits)):
+            self.build()
+            hits = lookup()
+        return hits
+
+    def find(self, model_type, name: Optional[str] = None, scope: Optional[str] = None) -> List[Any]:
+        """Nodes of ``model_type`` (and optionally ``name``) in tree order, validated as in :meth:`paths`."""
+        return [self._paths[path] for path in self.paths(model_type, name, scope)]
+
+    def first(self, model_type, name: Optional[str] = None, scope: Optional[str] = None):
+        """First node of ``model_type`` (and optionally ``name``) in tree order, or ``None``, see :meth:`paths`."""
+        found = self.paths(model_type, name, scope)
+        if not found:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return self._paths[found[0]]
+
+    # ------------------------------------------------------------------ in-place updates
+
+    def _subtree(self, path: str) -> List[str]:
+        prefix = f"{path}."
+        return [p for p in self._paths if p == path or p.startswith(prefix)]
+
+    def remove(self, path: str) -> None:
+        """Drops the node at ``path`` and its descendants, for a node that was removed from the tree."""
+        if self._paths is None:
+            return
+        gone = set(self._subtree(path))
+        if not gone:
+            return
+        for p in gone:
+            del self._paths[p]
+            del self._order[p]
+            self._cast_nodes.pop(p, None)
+        for table in (self._by_type, self._by_key):
+            for key in list(table):
+                kept = [p for p in table[key] if p not in gone]
+                if kept:
+                    table[key] = kept
+                else:
+                    del table[key]
+
+    def rename(self, path: str, new_name: str) -> None:
+        """Re-keys the node at ``path`` and its descendants after the node was renamed to ``new_name``."""
+        if self._paths is None or path not in self._paths:
+            return
+        new_path = f"{path.rsplit('.', 1)[0]}.{new_name}"
+        moved = {p: new_path + p[len(path):] for p in self._subtree(path)}
+        for old, new in moved.items():
+            self._paths[new] = self._paths.pop(old)
+            self._order[new] = self._order.pop(old)
+            if old in self._cast_nodes:
+                self._cast_nodes[new] = self._cast_nodes.pop(old)
+        for type_name, paths in self._by_type.items():
+            self._by_type[type_name] = [moved.get(p, p) for p in paths]
+        by_key = {}
+        for (type_name, name), paths in self._by_key.items():
+            for p in paths:
+                node_name = new_name if p == path else name
+                by_key.setdefault((type_name, node_name), []).append(moved.get(p, p))
+        for key, paths in by_key.items():
+            if len(paths) > 1:
+                paths.sort(key=self._order.__getitem__)
+        self._by_key = by_key
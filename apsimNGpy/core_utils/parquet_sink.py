@@ -0,0 +1,172 @@
+"""
+Columnar result sink for parallel runs.
+
+Instead of many processes appending to one SQLite database, each job writes its own Parquet (or Arrow IPC)
+fragment into a directory partitioned by result schema. A fragment is first written under a temporary name and
+then renamed, so readers never see partially written files. Reading the dataset back is a memory-mapped,
+column-pruned scan through :mod:`pyarrow.dataset`.
+
+pyarrow is an optional dependency, install it with ``pip install pyarrow``.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from uuid import uuid4
+
+import pandas as pd
+
+__all__ = ['write_fragment', 'read_dataset', 'iter_dataset', 'list_partitions', 'clear_dataset', 'PARQUET', 'ARROW']
+
+PARQUET = 'parquet'
+ARROW = 'arrow'
+_FORMATS = {PARQUET: ('parquet', '.parquet'), ARROW: ('ipc', '.arrow')}
+PARTITION_KEY = 'schema'
+TMP_PREFIX = '.tmp-'
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ModuleNotFoundError as mnf:
+        raise ModuleNotFoundError("the parquet/arrow result sink requires pyarrow, install it with "
+                                  "`pip install pyarrow`") from mnf
+    return pyarrow
+
+
+def _check_format(fmt):
+    if fmt not in _FORMATS:
+        raise ValueError(f"Unsupported result sink format {fmt!r} expected one of {tuple(_FORMATS)}")
+    return _FORMATS[fmt]
+
+
+def write_fragment(df: pd.DataFrame, dataset_dir: Union[str, Path], partition: str, fmt: str = PARQUET) -> Path:
+    """
+    Atomically write ``df`` as one fragment of the dataset.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Results of one job.
+    dataset_dir : str | Path
+        Root directory of the dataset, created if missing.
+    partition : str
+        Partition name, usually the schema hash of ``df`` so that every partition holds one schema.
+    fmt : {'parquet', 'arrow'}, optional
+        File format of the fragment.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the committed fragment.
+    """
+    pa = _require_pyarrow()
+    _, suffix = _check_format(fmt)
+    folder = Path(dataset_dir) / f"{PARTITION_KEY}={partition}"
+    folder.mkdir(parents=True, exist_ok=True)
+    name = f"part-{os.getpid()}-{uuid4().hex}{suffix}"
+    tmp, final = folder / f"{TMP_PREFIX}{name}", folder / name
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    try:
+        if fmt == PARQUET:
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, tmp, compression='uncompressed')
+        # the rename is the commit, readers ignore files starting with the temporary prefix
+        os.replace(tmp, final)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return final
+
+
+def list_partitions(dataset_dir: Union[str, Path]) -> tuple:
+    """Names of the committed partitions in the dataset."""
+    root = Path(dataset_dir)
+    if not root.is_dir():
+        return ()
+    return tuple(sorted(p.name for p in root.iterdir() if p.is_dir() and p.name.startswith(f"{PARTITION_KEY}=")))
+
+
+def _scan_partitions(dataset_dir, columns, fmt, partitions):
+    """Yields ``(dataset, selected_columns)`` for each non-empty partition, memory-mapped."""
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+    from pyarrow.fs import LocalFileSystem
+    file_format, _ = _check_format(fmt)
+    mmap_fs = LocalFileSystem(use_mmap=True)
+    keep = set(columns) if columns is not None else None
+    root = Path(dataset_dir)
+    for part in partitions or list_partitions(root):
+        files = [str(p) for p in sorted((root / part).iterdir())
+                 if p.is_file() and not p.name.startswith(TMP_PREFIX)]
+        if not files:
+            continue
+        file_formats = {'parquet': ds.ParquetFileFormat, 'ipc': ds.IpcFileFormat}
+        factory = ds.FileSystemDatasetFactory(mmap_fs, files, file_formats[file_format]())
+        # every fragment is inspected, a partition may hold frames with different columns (e.g., written by older
+        # versions that partitioned on dtypes only); the dataset schema is their union
+        dataset = factory.finish(factory.inspect(promote_options='permissive'))
+        names = dataset.schema.names
+        selected = names if keep is None else [c for c in names if c in keep]
+        if selected:
+            yield dataset, selected
+
+
+def read_dataset(dataset_dir: Union[str, Path], columns: Optional[Iterable[str]] = None, fmt: str = PARQUET,
+                 partitions: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Read the dataset back as one DataFrame, loading only ``columns``.
+
+    Each partition is scanned lazily with memory-mapped I/O. Partitions are concatenated along the rows,
+    columns absent from a partition or from some of its fragments are filled with missing values.
+
+    Parameters
+    ----------
+    dataset_dir : str | Path
+        Root directory of the dataset.
+    columns : iterable of str, optional
+        Columns to read, columns missing in a partition are ignored. Defaults to all columns.
+    fmt : {'parquet', 'arrow'}, optional
+        File format of the fragments.
+    partitions : iterable of str, optional
+        Partitions to read, defaults to all.
+    """
+    frames = [dataset.to_table(columns=selected).to_pandas()
+              for dataset, selected in _scan_partitions(dataset_dir, columns, fmt, partitions)]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def iter_dataset(dataset_dir: Union[str, Path], columns: Optional[Iterable[str]] = None, fmt: str = PARQUET,
+                 partitions: Optional[Iterable[str]] = None, chunksize: int = 100_000, arrow: bool = False):
+    """
+    Stream the dataset in chunks of at most ``chunksize`` rows.
+
+    Record batches are decoded one at a time, so memory is bounded by the chunk size. Arguments are the same as
+    :func:`read_dataset`.
+
+    Yields
+    ------
+    pandas.DataFrame or pyarrow.Table
+        One chunk per group of record batches, partitions in order.
+    """
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be a positive integer got {chunksize}')
+    _require_pyarrow()
+    import pyarrow as pa
+    for dataset, selected in _scan_partitions(dataset_dir, columns, fmt, partitions):
+        for batch in dataset.to_batches(columns=selected, batch_size=chunksize):
+            if batch.num_rows:
+                table = pa.Table.from_batches([batch])
+                yield table if arrow else table.to_pandas()
+
+
+def clear_dataset(dataset_dir: Union[str, Path]) -> None:
+    """Remove all fragments of the dataset."""
+    shutil.rmtree(dataset_dir, ignore_errors=True)
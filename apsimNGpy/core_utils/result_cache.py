@@ -0,0 +1,327 @@
+"""
+On-disk cache of simulation results.
+
+Calibration and sensitivity workflows often simulate exactly the same parameter vector more than once: repeated
+members of a differential evolution population, restarts, or retries of pending jobs. :class:`ResultCache` stores
+the report frames of each run under a content-addressed key, so a repeated evaluation costs a file read instead of
+an APSIM run. The key is a SHA-256 digest of
+
+- the base model file content (or the name of a default template),
+- the edits applied to it, serialized canonically,
+- the content of every weather file referenced by the model or the edits,
+- the requested report tables, and
+- the APSIM version that produced the results.
+
+The cache directory can be shared by several processes. Entries are written atomically, and the least recently used
+entries are evicted once the cache grows beyond ``max_bytes``. Each instance keeps a running total of the cache size,
+so a write only scans the directory when it pushes that total over the budget; the eviction then frees space down
+to ``EVICT_TARGET`` of the budget and refreshes the total from disk, which accounts for writes of other processes.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Optional, Union
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.logger import logger
+
+__all__ = ['ResultCache']
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# share of max_bytes kept after an eviction triggered by a write, so the next writes do not evict again
+EVICT_TARGET = 0.9
+SUFFIX = '.pkl'
+WEATHER_SUFFIX = '.met'
+_FILE_DIGESTS: dict = {}
+_MODEL_WEATHER: dict = {}
+
+
+def _default_dir() -> Path:
+    from apsimNGpy.settings import META_Dir
+    return META_Dir / 'result_cache'
+
+
+def _file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, memoized per process by path, modification time and size."""
+    st = os.stat(path)
+    key = (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+    digest = _FILE_DIGESTS.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = _FILE_DIGESTS[key] = h.hexdigest()
+    return digest
+
+
+def _canonical(obj: Any):
+    """
+    Converts edits into plain, order independent JSON values.
+
+    Raises
+    ------
+    TypeError
+        For values without a canonical form. Falling back to ``repr`` is not safe, e.g. pandas truncates the
+        representation of long frames, so two different edits could share a key.
+    """
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted((_canonical(v) for v in obj), key=repr)
+    if isinstance(obj, pd.DataFrame):
+        return {'__frame__': {'columns': _canonical(obj.columns.tolist()),
+                              'dtypes': [str(t) for t in obj.dtypes],
+                              'index': _canonical(obj.index.tolist()),
+                              'data': [_canonical(obj.iloc[:, i].tolist()) for i in range(obj.shape[1])]}}
+    if isinstance(obj, pd.Series):
+        return {'__series__': {'name': _canonical(obj.name), 'dtype': str(obj.dtype),
+                               'index': _canonical(obj.index.tolist()), 'data': _canonical(obj.tolist())}}
+    if isinstance(obj, pd.Index):
+        return _canonical(obj.tolist())
+    if isinstance(obj, np.ndarray):
+        return _canonical(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _canonical(obj.item())
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        # pandas.Timestamp and pandas.NaT included
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return {'__timedelta__': obj.total_seconds()}
+    if obj is None or obj is pd.NA or isinstance(obj, (str, int, float, bool)):
+        return None if obj is pd.NA else obj
+    raise TypeError(f"Cannot derive a cache key from a value of type {type(obj).__name__}: {obj!r:.80}")
+
+
+def _weather_files(node, found: set):
+    """Collects the weather file names referenced in a model JSON tree or in edits."""
+    if isinstance(node, dict):
+        if 'Weather' in str(node.get('$type', '')) and node.get('FileName'):
+            found.add(node['FileName'])
+        for v in node.values():
+            _weather_files(v, found)
+    elif isinstance(node, (list, tuple)):
+        for v in node:
+            _weather_files(v, found)
+    elif isinstance(node, (str, Path)) and str(node).lower().endswith(WEATHER_SUFFIX):
+        found.add(str(node))
+    return found
+
+
+def _apsim_version() -> str:
+    from apsimNGpy.starter.starter import CLR
+    return str(CLR.apsim_compiled_version)
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of simulated report frames.
+
+    Parameters
+    ----------
+    cache_dir : str or pathlib.Path, optional
+        Directory of the cache. Defaults to ``result_cache`` in the apsimNGpy metadata directory.
+    max_bytes : int, optional
+        Size bound of the cache directory. Least recently used entries are evicted when it is exceeded.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from apsimNGpy.core_utils.result_cache import ResultCache
+
+        cache = ResultCache('calibration_cache', max_bytes=500 * 1024 ** 2)
+        key = cache.make_key('maize.apsimx', edits=[{'path': '.Simulations.Simulation.Field.Fertilise at sowing',
+                                                    'Amount': 150}])
+        df = cache.get(key)
+        if df is None:
+            df = simulate()
+            cache.put(key, df)
+        cache.stats
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError(f'max_bytes must be a positive integer got {max_bytes}')
+        self.cache_dir = Path(cache_dir or _default_dir()).resolve()
+        self.max_bytes = max_bytes
+        self._bytes: Optional[int] = None  # running total of the entry sizes, read from disk on first use
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(cache_dir={str(self.cache_dir)!r}, max_bytes={self.max_bytes})"
+
+    def __contains__(self, key: str):
+        return self._path(key).exists()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{SUFFIX}"
+
+    def make_key(self, model, edits=None, *, table=None, version: Optional[str] = None,
+                 weather: Union[str, Path, list, None] = None, namespace: str = '') -> Optional[str]:
+        """
+        Canonical key of a simulation.
+
+        Parameters
+        ----------
+        model : str or pathlib.Path
+            Path of the ``.apsimx`` file, or the name of a default template such as ``'Maize'``.
+        edits : list of dict or dict, optional
+            Edits applied to the model before running it, e.g., the ``inputs`` or ``payload`` of a job.
+        table : str or list of str, optional
+            Report tables that are returned.
+        version : str, optional
+            APSIM version. Defaults to the version of the loaded APSIM binaries.
+        weather : str, pathlib.Path or list, optional
+            Extra weather files to include in the key. Weather files referenced by the model or by ``edits`` are
+            found automatically.
+        namespace : str, optional
+            Name of the code storing the entry, e.g. ``'multi_core'``. Consumers that read or post-process the
+            results differently use different namespaces, so they never receive each other's frames from a shared
+            cache directory.
+
+        Returns
+        -------
+        str or None
+            Hex digest, or ``None`` if the run cannot be cached: ``model`` is not a path or a template name, or
+            ``edits`` hold values without a canonical form (see :func:`_canonical`).
+        """
+        if not isinstance(model, (str, Path)):
+            return None
+        try:
+            edits_id, table_id = _canonical(edits), _canonical(table)
+        except TypeError as e:
+            logger.debug(f"simulation not cached: {e}")
+            return None
+        weather_files = set()
+        if os.path.isfile(model):
+            model_path = Path(model).resolve()
+            model_id = _file_digest(model_path)
+            if model_id not in _MODEL_WEATHER:
+                found = set()
+                if model_path.suffix == '.apsimx':
+                    _weather_files(json.loads(model_path.read_text(encoding='utf-8')), found)
+                _MODEL_WEATHER[model_id] = found
+            weather_files.update(_MODEL_WEATHER[model_id])
+            base_dir = model_path.parent
+        else:
+            model_id, base_dir = f"template:{model}", Path.cwd()
+        _weather_files(edits, weather_files)
+        _weather_files(weather, weather_files)
+        digests = {}
+        for name in weather_files:
+            path = Path(name) if Path(name).is_absolute() else base_dir / name
+            # a missing file makes the run fail, the name alone is enough to tell keys apart
+            digests[str(name)] = _file_digest(path) if path.is_file() else None
+        payload = {
+            'namespace': namespace,
+            'model': model_id,
+            'edits': edits_id,
+            'weather': digests,
+            'table': table_id,
+            'version': version if version is not None else _apsim_version(),
+        }
+        text = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[pd.DataFrame]:
+        """Returns the cached results of ``key``, or ``None`` on a miss."""
+        path = self._path(key) if key else None
+        try:
+            df = pd.read_pickle(path) if path else None
+        except (FileNotFoundError, EOFError):
+            df = None
+        if df is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            # the modification time is the recency used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return df
+
+    def put(self, key: Optional[str], df: pd.DataFrame):
+        """Stores ``df`` under ``key``, then evicts old entries if the cache is too big."""
+        if not key:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._bytes is None:
+            self._bytes = sum(size for _, size, _ in self._entries())
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        tmp = path.with_name(f".tmp-{uuid4().hex}")
+        try:
+            df.to_pickle(tmp)
+            size = tmp.stat().st_size
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.writes += 1
+        self._bytes += size - replaced
+        if self._bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_TARGET))
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        entries = []
+        for p in self.cache_dir.glob(f'*/*{SUFFIX}'):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Removes the least recently used entries until the cache fits ``max_bytes``, returns the number removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._bytes = total
+        self.evictions += removed
+        return removed
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._bytes = 0
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+    @property
+    def stats(self) -> dict:
+        """Counters of this instance together with the current number of entries and size on disk."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'writes': self.writes, 'evictions': self.evictions, 'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries)}
@@ -0,0 +1,132 @@
+"""
+Per-process cache of ``.apsimx`` templates.
+
+Parallel workflows often build thousands of models from the same base file. Reading and normalizing the JSON
+for every job is wasted work, so the normalized JSON string is kept in memory, keyed by the resolved file path,
+its modification time and size, and the APSIM version. Each load returns the cached string, which is
+immutable, so handing it out is the cheap equivalent of a deep clone; the caller deserializes it into a new
+``Simulations`` tree.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Union
+
+__all__ = ['TemplateCache', 'template_cache']
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TemplateCache:
+    """
+    LRU cache of normalized ``.apsimx`` JSON strings.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of templates held in memory.
+    max_bytes : int, optional
+        Upper bound of the total UTF-8 size of the cached strings. Least recently used templates are evicted first.
+        A single template bigger than this bound is returned but never cached.
+
+    Examples
+    --------
+    >>> cache = TemplateCache(max_entries=4)
+    >>> text = cache.get('maize.apsimx', version='2025.8.7844.0')  # doctest: +SKIP
+    >>> cache.stats  # doctest: +SKIP
+    {'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 120532}
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError('max_entries and max_bytes must be positive integers')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        # key -> (text, size in bytes)
+        self._store: OrderedDict[tuple, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.stats})"
+
+    @staticmethod
+    def make_key(path: Union[str, Path], version: str = '') -> tuple:
+        """Cache key: the file identity plus the APSIM version that will deserialize it."""
+        resolved = os.path.realpath(path)
+        st = os.stat(resolved)
+        return resolved, st.st_mtime_ns, st.st_size, str(version)
+
+    @staticmethod
+    def _read(path) -> str:
+        # normalization matches what model_loader.load_from_path sends to the APSIM reader
+        return json.dumps(json.loads(Path(path).read_text(encoding='utf-8')))
+
+    def get(self, path: Union[str, Path], version: str = '') -> str:
+        """
+        Return the normalized JSON string of ``path``, reading the file only on a cache miss.
+
+        A file modified on disk gets a new key, so stale templates are never returned.
+        """
+        if not self.enabled:
+            return self._read(path)
+        key = self.make_key(path, version)
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                self._store.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        text = self._read(path)
+        self._put(key, text)
+        return text
+
+    def _put(self, key, text):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._store:
+                return
+            self._store[key] = text, size
+            self._bytes += size
+            while len(self._store) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._store.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, path: Union[str, Path]):
+        """Drop every cached version of ``path``."""
+        resolved = os.path.realpath(path)
+        with self._lock:
+            for key in [k for k in self._store if k[0] == resolved]:
+                self._bytes -= self._store.pop(key)[1]
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._store), 'bytes': self._bytes}
+
+
+# one cache per process, worker processes get their own
+template_cache = TemplateCache()
@@ -1,12 +1,231 @@
-import inspect
-from apsimNGpy.core.mult_cores import MultiCoreManager
+"""
+Durable checkpoints for long calibration, sensitivity and batch runs.
 
-code = inspect.getsource(MultiCoreManager.run_all_jobs)
+A :class:`CheckPoint` is a directory holding
+
+- ``state.pkl``, the latest state of a run (e.g., the optimizer population, fitness, RNG state and iteration, or
+  the sample matrix and the path of the result database), replaced atomically on every save, and
+- ``completed.log``, an append-only journal of the IDs of finished jobs, one per line, flushed to disk as jobs
+  finish.
+
+A process killed at any point leaves either the previous or the new state file, never a partial one, and at most
+loses the journal line being written. Entry points such as
+:meth:`~apsimNGpy.core.mult_cores.MultiCoreManager.run_all_jobs`,
+:meth:`~apsimNGpy.optimizer.minimize.single_mixed.MixedVariableOptimizer.minimize_with_de` and
+:func:`~apsimNGpy.sensitivity.sensitivity.run_sensitivity` take a ``checkpoint`` directory and ``resume=True`` to
+continue from it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Union
+
+__all__ = ['CheckPoint', 'atomic_write', 'job_key']
+
+STATE_FILE = 'state.pkl'
+JOURNAL_FILE = 'completed.log'
+
+
+def atomic_write(path: Union[str, os.PathLike], data: bytes) -> None:
+    """Writes ``data`` to ``path`` through a synced temporary file and an atomic rename."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # persist the rename itself, not available on Windows
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def job_key(job, id_key: str = 'ID') -> str:
+    """
+    Stable identifier of a job across processes and sessions.
+
+    A model path for plain jobs, ``'<id_key>=<value>'`` for jobs carrying an ``id_key`` entry, and a digest of the
+    job specification otherwise.
+    """
+    if isinstance(job, (str, os.PathLike)):
+        return os.fspath(job)
+    if isinstance(job, dict) and job.get(id_key) is not None:
+        return f"{id_key}={job[id_key]}"
+    spec = json.dumps(job, sort_keys=True, default=str)
+    return hashlib.sha1(spec.encode()).hexdigest()
 
 
 class CheckPoint:
-    def __init__(self):
+    """
+    State and completed jobs of a run, kept in ``directory``.
+
+    Parameters
+    ----------
+    directory : str or PathLike
+        Checkpoint directory, created when needed.
+    every : int, default 1
+        :meth:`maybe_save` writes the state on every ``every``-th call.
+    interval : float, optional
+        Minimum number of seconds between two writes of :meth:`maybe_save`.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        checkpoint = CheckPoint('runs/calibration')
+        state = checkpoint.load()
+        start = state.get('iteration', 0)
+        for iteration in range(start, 100):
+            ...
+            checkpoint.maybe_save(iteration=iteration + 1, population=population)
+
+        for job in checkpoint.pending(jobs):
+            run(job)
+            checkpoint.mark_done(job_key(job))
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], *, every: int = 1, interval: Optional[float] = None):
+        if every < 1:
+            raise ValueError(f'every must be a positive integer got {every}')
+        self.directory = Path(directory)
+        self.every = every
+        self.interval = interval
         self.epoch = 0
+        self._calls = 0
+        self._last_save = 0.0
+        self._completed: Optional[Set[str]] = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.directory)!r}, epoch={self.epoch})"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_completed'] = None
+        return state
+
+    @classmethod
+    def coerce(cls, checkpoint) -> Optional['CheckPoint']:
+        """``checkpoint`` as a :class:`CheckPoint`, a directory path is wrapped, ``None`` stays ``None``."""
+        if checkpoint is None or isinstance(checkpoint, cls):
+            return checkpoint
+        return cls(checkpoint)
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / STATE_FILE
+
+    @property
+    def journal_path(self) -> Path:
+        return self.directory / JOURNAL_FILE
+
+    @property
+    def exists(self) -> bool:
+        """Whether a state or a journal was written."""
+        return self.state_path.exists() or self.journal_path.exists()
+
+    def child(self, name: str) -> 'CheckPoint':
+        """Checkpoint in a subdirectory, for a nested run."""
+        return type(self)(self.directory / name, every=self.every, interval=self.interval)
+
+    # ------------------------------------------------------------------ state
+
+    def load(self) -> Dict[str, Any]:
+        """Last saved state, empty if nothing was saved."""
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, 'rb') as f:
+            payload = pickle.load(f)
+        self.epoch = payload.get('epoch', 0)
+        return payload['state']
+
+    def save(self, **state) -> None:
+        """Replaces the saved state with ``state`` atomically."""
+        payload = {'epoch': self.epoch + 1, 'time': time.time(), 'state': state}
+        atomic_write(self.state_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        self.epoch += 1
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Whether :meth:`maybe_save` would write now."""
+        if (self._calls + 1) % self.every:
+            return False
+        return self.interval is None or time.monotonic() - self._last_save >= self.interval
+
+    def maybe_save(self, **state) -> bool:
+        """Saves ``state`` if it is :meth:`due`, returns whether it was written."""
+        written = self.due()
+        self._calls += 1
+        if written:
+            self.save(**state)
+        return written
+
+    # ------------------------------------------------------------------ completed jobs
+
+    @property
+    def completed(self) -> Set[str]:
+        """IDs recorded by :meth:`mark_done`."""
+        if self._completed is None:
+            self._completed = set()
+            if self.journal_path.exists():
+                with open(self.journal_path, encoding='utf-8') as f:
+                    for line in f:
+                        # a line without newline was cut off by a crash
+                        if line.endswith('\n'):
+                            self._completed.add(line[:-1])
+        return self._completed
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed
 
+    def mark_done(self, *keys: str) -> None:
+        """Appends ``keys`` to the journal and syncs it."""
+        keys = [str(k) for k in keys if str(k) not in self.completed]
+        if not keys:
+            return
+        for key in keys:
+            if '\n' in key:
+                raise ValueError(f'job IDs can not contain new lines: {key!r}')
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a+b') as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # drop a line cut off by a crash, a truncated ID could match another job
+                    f.seek(0)
+                    f.truncate(f.read().rfind(b'\n') + 1)
+            f.write(''.join(f'{k}\n' for k in keys).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.update(keys)
 
+    def pending(self, jobs: Iterable, key: Callable[[Any], str] = job_key) -> Iterator:
+        """Lazily drops the jobs whose ``key`` is completed."""
+        done = self.completed
+        return (job for job in jobs if key(job) not in done)
 
+    def clear(self) -> None:
+        """Deletes the state and the journal, keeping other files of the directory."""
+        for path in (self.state_path, self.journal_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        for child in self.directory.glob('*'):
+            # nested checkpoints, see child()
+            if child.is_dir() and ((child / STATE_FILE).exists() or (child / JOURNAL_FILE).exists()):
+                shutil.rmtree(child, ignore_errors=True)
+        self._completed = None
+        self.epoch = self._calls = 0
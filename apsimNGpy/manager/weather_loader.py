@@ -22,7 +22,7 @@ from io import BytesIO
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Literal, Mapping, Sequence
+from typing import Callable, Iterable, Literal, Mapping, Sequence, TextIO
 
 import numpy as np
 import pandas as pd
@@ -45,6 +45,12 @@ NASA_PARAMETERS = (
     "PRECTOTCORR",
 )
 NASA_MISSING = -999.0
+# the column header of a .met file is expected within this many lines
+HEADER_SCAN_LINES = 500
+WRITE_CHUNK_ROWS = 10_000
+MET_CACHE_FORMATS = {"npz": ".npz", "parquet": ".parquet"}
+_MET_HEADER = frozenset(APSIM_COLUMNS)
+_C_SEPARATORS = {r"\s+", " ", ",", "\t", ";"}
 
 
 class WeatherError(RuntimeError):
@@ -312,13 +318,15 @@ def _replace_with_retry(
             delay *= 2
 
 
-def _atomic_write_text(path: Path, text: str) -> Path:
+def _atomic_write(path: Path, write: Callable[[TextIO], None]) -> Path:
+    """Write through ``write(stream)`` into a temporary file, then replace *path*."""
+
     path = path.expanduser().resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, temporary = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent, text=True)
     try:
         with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as stream:
-            stream.write(text)
+            write(stream)
             stream.flush()
             os.fsync(stream.fileno())
         _replace_with_retry(temporary, path)
@@ -331,6 +339,18 @@ def _atomic_write_text(path: Path, text: str) -> Path:
     return path
 
 
+def _atomic_write_text(path: Path, text: str) -> Path:
+    return _atomic_write(path, lambda stream: stream.write(text))
+
+
+def _write_rows(stream: TextIO, frame: pd.DataFrame) -> None:
+    # rows are formatted and written in blocks, the body is never held as one string
+    frame.to_csv(
+        stream, sep=" ", index=False, header=False, na_rep="?", float_format="%.6g",
+        chunksize=WRITE_CHUNK_ROWS,
+    )
+
+
 def write_apsim_met(
     data: pd.DataFrame,
     filename: str | Path,
@@ -361,14 +381,15 @@ def write_apsim_met(
     values = frame.loc[:, APSIM_COLUMNS].copy()
     values["year"] = values["year"].astype("int64")
     values["day"] = values["day"].astype("int64")
-    body = values.to_csv(
-        sep=" ", index=False, header=False, na_rep="?", float_format="%.6g"
-    )
-    text = "\n".join(metadata) + "\n"
-    text += " ".join(APSIM_COLUMNS) + "\n"
-    text += " ".join(APSIM_UNITS) + "\n"
-    text += body
-    return str(_atomic_write_text(Path(filename), text))
+    header = "\n".join(metadata) + "\n"
+    header += " ".join(APSIM_COLUMNS) + "\n"
+    header += " ".join(APSIM_UNITS) + "\n"
+
+    def write(stream: TextIO) -> None:
+        stream.write(header)
+        _write_rows(stream, values)
+
+    return str(_atomic_write(Path(filename), write))
 
 
 def _coerce_weather_frame(data: pd.DataFrame) -> pd.DataFrame:
@@ -477,6 +498,192 @@ def validate_met(met: pd.DataFrame, *, strict: bool = False) -> ValidationReport
     return report
 
 
+_ERROR_CHECKS = (
+    ("radn", "lt", 0, "negative_radiation"),
+    ("rain", "lt", 0, "negative_rain"),
+)
+_WARNING_CHECKS = (
+    ("radn", "gt", 45, "high_radiation"),
+    ("rain", "gt", 500, "high_rain"),
+    ("mint", "lt", -80, "low_mint"),
+    ("maxt", "gt", 60, "high_maxt"),
+)
+_ERROR_CODES = (
+    "missing_value", "non_integer_date", "invalid_date", "duplicate_date", "date_order", "date_gaps",
+    "negative_radiation", "negative_rain", "temperature_order",
+)
+_WARNING_CODES = tuple(code for *_, code in _WARNING_CHECKS)
+
+
+def _iter_site_frames(data, site: str) -> Iterable[pd.DataFrame]:
+    """Yield long-format frames with a *site* column from any accepted input.
+
+    An empty input yields one empty frame, so the reports built from it keep
+    their columns.
+    """
+
+    if isinstance(data, pd.DataFrame):
+        data = [data]
+    elif isinstance(data, Mapping):
+        data = [frame.assign(**{site: key}) for key, frame in data.items()]
+    empty = True
+    for frame in data:
+        empty = False
+        if not isinstance(frame, pd.DataFrame):
+            raise TypeError("weather data must be pandas DataFrames")
+        if site not in frame.columns:
+            raise KeyError(f"weather data have no {site!r} column")
+        missing = set(APSIM_COLUMNS).difference(frame.columns)
+        if missing:
+            raise WeatherValidationError(f"missing APSIM columns: {sorted(missing)}")
+        yield frame
+    if empty:
+        yield pd.DataFrame(columns=[site, *APSIM_COLUMNS])
+
+
+def _site_arrays(frame: pd.DataFrame, site: str):
+    """Site codes, numeric APSIM columns and day ordinals of a long frame."""
+
+    codes, sites = pd.factorize(frame[site], sort=False)
+    values = {
+        column: pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype="float64")
+        for column in APSIM_COLUMNS
+    }
+    year, day = values["year"], values["day"]
+    finite = np.isfinite(year) & np.isfinite(day)
+    integer = finite & np.isclose(year, np.round(year)) & np.isclose(day, np.round(day))
+    ordinal = np.full(len(frame), np.iinfo("int64").min, dtype="int64")
+    years = np.round(year[integer]).astype("int64")
+    days = np.round(day[integer]).astype("int64")
+    start = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype("int64")
+    year_length = ((years + 1 - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype("int64")) - start
+    in_year = (days >= 1) & (days <= year_length)
+    valid_date = np.zeros(len(frame), dtype=bool)
+    valid_date[np.flatnonzero(integer)[in_year]] = True
+    ordinal[valid_date] = (start + days - 1)[in_year]
+    return codes, sites, values, finite, integer, valid_date, ordinal
+
+
+def _validate_chunk(frame: pd.DataFrame, site: str) -> pd.DataFrame:
+    codes, sites, values, finite, integer, valid_date, ordinal = _site_arrays(frame, site)
+    k = len(sites)
+
+    def count(mask):
+        return np.bincount(codes[mask], minlength=k)
+
+    out = {"rows": np.bincount(codes, minlength=k)}
+    missing = np.zeros(len(frame), dtype="int64")
+    for column in APSIM_COLUMNS:
+        missing += np.isnan(values[column])
+    out["missing_value"] = np.bincount(codes, weights=missing, minlength=k).astype("int64")
+    out["non_integer_date"] = count(finite & ~integer)
+    out["invalid_date"] = count(integer & ~valid_date)
+
+    # continuity: each site's valid dates, in file order and sorted, compared with their neighbours
+    rows = np.flatnonzero(valid_date)
+    in_file_order = rows[np.argsort(codes[rows], kind="stable")]
+    c, o = codes[in_file_order], ordinal[in_file_order]
+    same = c[1:] == c[:-1]
+    out["date_order"] = np.bincount(c[1:][same & (np.diff(o) < 0)], minlength=k)
+    by_date = in_file_order[np.lexsort((o, c))]
+    c, o = codes[by_date], ordinal[by_date]
+    same = c[1:] == c[:-1]
+    step = np.diff(o)
+    repeated = np.zeros(len(c), dtype=bool)
+    repeated[1:] |= same & (step == 0)
+    repeated[:-1] |= same & (step == 0)
+    out["duplicate_date"] = np.bincount(c[repeated], minlength=k)
+    out["date_gaps"] = np.bincount(c[1:][same], weights=np.maximum(step[same] - 1, 0), minlength=k).astype("int64")
+    first = np.r_[True, ~same] if len(c) else np.zeros(0, dtype=bool)
+    last = np.r_[~same, True] if len(c) else np.zeros(0, dtype=bool)
+    start = np.full(k, np.datetime64("NaT"), dtype="datetime64[D]")
+    end = start.copy()
+    start[c[first]] = o[first].astype("datetime64[D]")
+    end[c[last]] = o[last].astype("datetime64[D]")
+
+    def beyond(checks):
+        for column, op, limit, code in checks:
+            out[code] = count(values[column] < limit if op == "lt" else values[column] > limit)
+
+    with np.errstate(invalid="ignore"):
+        beyond(_ERROR_CHECKS)
+        out["temperature_order"] = count(values["mint"] > values["maxt"])
+        beyond(_WARNING_CHECKS)
+
+    report = pd.DataFrame(out, index=pd.Index(sites, name=site))
+    report.insert(1, "start", pd.to_datetime(start))
+    report.insert(2, "end", pd.to_datetime(end))
+    report["errors"] = (report[list(_ERROR_CODES)] > 0).sum(axis=1)
+    report["warnings"] = (report[list(_WARNING_CODES)] > 0).sum(axis=1)
+    report["is_valid"] = report["errors"].eq(0) & report["rows"].gt(0)
+    return report
+
+
+def validate_many(
+    data: pd.DataFrame | Mapping[object, pd.DataFrame] | Iterable[pd.DataFrame],
+    *,
+    site: str = "site",
+    strict: bool = False,
+) -> pd.DataFrame:
+    """Validate the weather of many sites at once and return one row per site.
+
+    *data* is a long-format frame with a *site* column, an iterable of such
+    frames where each frame holds complete sites (e.g., read chunk by chunk),
+    or a mapping ``{site: frame}``. The checks are those of
+    :func:`validate_met`, evaluated with grouped NumPy operations over all
+    sites in one pass instead of a Python loop per site.
+
+    The report holds the number of ``rows``, the first and last valid date,
+    one count per check (missing values, affected rows, or missing days for
+    ``date_gaps``), the number of failed error and warning checks, and
+    ``is_valid``. Unlike :func:`validate_met`, checks are also evaluated on the
+    complete rows of a site with missing values.
+
+    With ``strict=True`` a :class:`WeatherValidationError` naming the invalid
+    sites is raised.
+    """
+
+    report = pd.concat([_validate_chunk(frame, site) for frame in _iter_site_frames(data, site)])
+    if strict and not report["is_valid"].all():
+        invalid = report.index[~report["is_valid"]]
+        preview = ", ".join(map(str, invalid[:10]))
+        raise WeatherValidationError(f"{len(invalid)} sites have invalid weather data ({preview})")
+    return report
+
+
+def tav_amp_many(
+    data: pd.DataFrame | Mapping[object, pd.DataFrame] | Iterable[pd.DataFrame],
+    *,
+    site: str = "site",
+) -> pd.DataFrame:
+    """Calculate APSIM ``tav`` and ``amp`` for many sites in one grouped pass.
+
+    Accepts the same inputs as :func:`validate_many` and returns a frame
+    indexed by site with ``tav`` and ``amp`` columns, equal to
+    :func:`calculate_tav_amp` applied site by site. Rows with missing
+    temperatures or impossible dates are ignored; sites without any remaining
+    observation get ``NaN``.
+    """
+
+    results = []
+    for frame in _iter_site_frames(data, site):
+        codes, sites, values, _, _, valid_date, ordinal = _site_arrays(frame, site)
+        mean_temp = (values["maxt"] + values["mint"]) / 2.0
+        keep = valid_date & np.isfinite(mean_temp)
+        dates = ordinal[keep].astype("datetime64[D]")
+        year = dates.astype("datetime64[Y]").astype("int64") + 1970
+        month = dates.astype("datetime64[M]").astype("int64") % 12
+        daily = pd.DataFrame({"code": codes[keep], "year": year, "month": month, "t": mean_temp[keep]})
+        tav = daily.groupby("code")["t"].mean()
+        monthly = daily.groupby(["code", "year", "month"])["t"].mean()
+        annual = monthly.groupby(level=["code", "year"])
+        amp = (annual.max() - annual.min()).groupby(level="code").mean()
+        result = pd.DataFrame({"tav": tav, "amp": amp}).reindex(range(len(sites))).round(3)
+        result.index = pd.Index(sites, name=site)
+        results.append(result)
+    return pd.concat(results)
+
+
 def get_nasa_data(
     lonlat: Sequence[float],
     start: int,
@@ -655,6 +862,24 @@ def impute_data(
     return frame
 
 
+def _from_store(
+    store: object,
+    lonlat: Sequence[float],
+    start: int,
+    end: int,
+    source: str,
+    download: Callable[[int, int], pd.DataFrame],
+) -> pd.DataFrame:
+    """Serve a download through a :class:`~apsimNGpy.manager.weather_store.WeatherStore` when one is given."""
+
+    from apsimNGpy.manager.weather_store import as_weather_store
+
+    weather_store = as_weather_store(store)  # type: ignore[arg-type]
+    if weather_store is None:
+        return download(start, end)
+    return weather_store.fetch(lonlat, start, end, source, download)
+
+
 def get_met_from_day_met(
     lonlat: Sequence[float],
     start: int,
@@ -667,29 +892,43 @@ def get_met_from_day_met(
     timeout: float = 60.0,
     wait: float | None = None,
     site: str | None = None,
+    store: object = None,
     **_: object,
 ) -> str:
     """Download Daymet weather and write an APSIM ``.met`` file.
 
     Daymet radiation is retained by default. Set ``radiation_source='nasa'``
     only when a documented harmonization decision requires NASA POWER.
+    ``store`` is a :class:`~apsimNGpy.manager.weather_store.WeatherStore`, a
+    directory for one, or ``True`` for the default store; years already in
+    the store are not downloaded again.
     """
 
     retries = 0 if retry_number is None else int(retry_number)
-    frame, detected_site = _download_daymet(
-        lonlat, start, end, timeout=timeout, retries=retries
-    )
-    dates = _daymet_dates(frame)
-    frame.index = dates
-    expected = daterange(start, end)
-    frame = frame.reindex(expected)
-    frame["year"] = expected.year
-    frame["day"] = expected.dayofyear
-    frame.reset_index(drop=True, inplace=True)
-    if radiation_source == "nasa":
-        frame["radn"] = get_nasa_data(lonlat, start, end, timeout=timeout, retries=retries)["radn"]
-    elif radiation_source != "daymet":
+    if radiation_source not in {"daymet", "nasa"}:
         raise ValueError("radiation_source must be 'daymet' or 'nasa'")
+
+    def download(first: int, last: int) -> pd.DataFrame:
+        frame, detected_site = _download_daymet(
+            lonlat, first, last, timeout=timeout, retries=retries
+        )
+        dates = _daymet_dates(frame)
+        frame.index = dates
+        expected = daterange(first, last)
+        frame = frame.reindex(expected)
+        frame["year"] = expected.year
+        frame["day"] = expected.dayofyear
+        frame.reset_index(drop=True, inplace=True)
+        frame.attrs["site"] = detected_site
+        return frame
+
+    frame = _from_store(store, lonlat, start, end, "daymet", download)
+    detected_site = frame.attrs.get("site")
+    if radiation_source == "nasa":
+        frame["radn"] = _from_store(
+            store, lonlat, start, end, "nasa",
+            lambda first, last: get_nasa_data(lonlat, first, last, timeout=timeout, retries=retries),
+        )["radn"]
     if fill_method:
         frame = impute_data(frame, method=fill_method)  # type: ignore[arg-type]
     return write_apsim_met(frame, filename, lonlat, site=site or detected_site)
@@ -705,8 +944,12 @@ def get_met_nasa_power(
     impute_method: str | None = None,
     timeout: float = 60.0,
     retries: int = 3,
+    store: object = None,
 ) -> str:
-    frame = get_nasa_data(lonlat, start, end, timeout=timeout, retries=retries)
+    frame = _from_store(
+        store, lonlat, start, end, "nasa",
+        lambda first, last: get_nasa_data(lonlat, first, last, timeout=timeout, retries=retries),
+    )
     if impute_method:
         frame = impute_data(frame, method=impute_method)  # type: ignore[arg-type]
     return write_apsim_met(frame, fname, lonlat, site=site or "NASA POWER")
@@ -727,7 +970,11 @@ def get_weather(
     filename: str | Path = "__met_.met",
     **kwargs: object,
 ) -> str:
-    """Acquire weather from a supported source and return the output path."""
+    """Acquire weather from a supported source and return the output path.
+
+    Pass ``store=`` (see :mod:`apsimNGpy.manager.weather_store`) to keep
+    downloads on disk and serve repeated requests offline.
+    """
 
     source = source.lower()  # type: ignore[assignment]
     if source in {"nasa", "nasapower"}:
@@ -848,36 +1095,124 @@ def get_iem_by_lonlat(
     return {"station": station, "filepath": filepath}
 
 
+def _find_met_header(path: Path) -> tuple[int, bool]:
+    """Return the index of the column-header row and whether a units row follows.
+
+    Only the first ``HEADER_SCAN_LINES`` lines are scanned, the data rows are
+    never read twice.
+    """
+
+    with path.open(encoding="utf-8-sig") as stream:
+        for index, line in enumerate(stream):
+            if index >= HEADER_SCAN_LINES:
+                break
+            if _MET_HEADER.issubset(line.lower().split()):
+                units = next(stream, "").lstrip()
+                return index, units.startswith("(")
+    raise WeatherValidationError("could not locate APSIM weather column header")
+
+
+def _met_sidecar(path: Path, cache: bool | str) -> Path:
+    fmt = "npz" if cache is True else cache
+    if fmt not in MET_CACHE_FORMATS:
+        raise ValueError(f"cache must be True or one of {sorted(MET_CACHE_FORMATS)}, got {cache!r}")
+    return path.with_name(path.name + MET_CACHE_FORMATS[fmt])
+
+
+def _load_met_sidecar(sidecar: Path, signature: str) -> pd.DataFrame | None:
+    try:
+        if sidecar.suffix == ".npz":
+            with np.load(sidecar, allow_pickle=False) as stored:
+                if str(stored["__signature__"]) != signature:
+                    return None
+                columns = [str(c) for c in stored["__columns__"]]
+                return pd.DataFrame({c: stored[f"c{i}"] for i, c in enumerate(columns)}, columns=columns)
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(sidecar)
+        if (table.schema.metadata or {}).get(b"apsimNGpy.signature", b"").decode() != signature:
+            return None
+        return table.to_pandas()
+    except (OSError, KeyError, ValueError):
+        # missing, partially written or foreign sidecars are rebuilt
+        return None
+
+
+def _store_met_sidecar(sidecar: Path, signature: str, frame: pd.DataFrame) -> None:
+    fd, temporary = tempfile.mkstemp(prefix=f".{sidecar.name}.", dir=sidecar.parent)
+    os.close(fd)
+    try:
+        if sidecar.suffix == ".npz":
+            arrays = {f"c{i}": frame[c].to_numpy() for i, c in enumerate(frame.columns)}
+            with open(temporary, "wb") as stream:
+                np.savez(stream, __signature__=signature, __columns__=np.array(frame.columns, dtype=str), **arrays)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"apsimNGpy.signature": signature})
+            pq.write_table(table, temporary)
+        _replace_with_retry(temporary, sidecar)
+    except (OSError, ImportError) as exc:
+        LOGGER.debug("weather cache %s not written: %s", sidecar, exc)
+    finally:
+        try:
+            os.unlink(temporary)
+        except FileNotFoundError:
+            pass
+
+
 def read_apsim_met(
     met_path: str | Path,
     skip: int | None = None,
     index_drop: int | Sequence[int] | None = None,
     separator: str = r"\s+",
+    cache: bool | Literal["npz", "parquet"] = False,
 ) -> pd.DataFrame:
-    """Read an APSIM weather file, detecting the column-header row by default."""
+    """Read an APSIM weather file, detecting the column-header row by default.
+
+    Rows are parsed by pandas' C engine and numeric columns are typed during
+    parsing. With ``cache`` set, the parsed frame is also stored in a sidecar
+    file next to *met_path* (``<name>.met.npz``, or ``<name>.met.parquet``
+    which requires pyarrow). The sidecar is used by later reads until the
+    modification time or size of *met_path* changes.
+
+    *index_drop* labels count the units row below the column header as
+    label 0, so the first data row is label 1.
+    """
 
     path = Path(met_path)
     if not path.is_file():
         raise FileNotFoundError(path)
+    sidecar = signature = None
+    if cache:
+        sidecar = _met_sidecar(path, cache)
+        stat = path.stat()
+        signature = repr((stat.st_mtime_ns, stat.st_size, skip, index_drop, separator))
+        cached = _load_met_sidecar(sidecar, signature)
+        if cached is not None:
+            return cached
+    units_row = False
     if skip is None:
-        lines = path.read_text(encoding="utf-8-sig").splitlines()
-        try:
-            header_index = next(
-                i for i, line in enumerate(lines)
-                if {"year", "day", "radn", "maxt", "mint", "rain"}.issubset(line.lower().split())
-            )
-        except StopIteration as exc:
-            raise WeatherValidationError("could not locate APSIM weather column header") from exc
-        skip = header_index
-    frame = pd.read_csv(path, skiprows=skip, sep=separator, engine="python")
-    if len(frame) and all(str(value).startswith("(") for value in frame.iloc[0].astype(str)):
+        skip, units_row = _find_met_header(path)
+    engine = "c" if separator in _C_SEPARATORS else "python"
+    skiprows = [*range(skip), skip + 1] if units_row else skip
+    frame = pd.read_csv(path, skiprows=skiprows, sep=separator, engine=engine, encoding="utf-8-sig")
+    if units_row:
+        # labels as if the units row had been read, label 0, so index_drop refers to the same rows as before
+        frame.index = pd.RangeIndex(1, len(frame) + 1)
+    elif len(frame) and all(str(value).startswith("(") for value in frame.iloc[0].astype(str)):
         frame = frame.iloc[1:]
     if index_drop is not None:
         labels = [index_drop] if isinstance(index_drop, int) else list(index_drop)
         frame = frame.drop(index=labels, errors="ignore")
     frame.reset_index(drop=True, inplace=True)
     for column in frame.columns:
-        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+        if not pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    if sidecar is not None:
+        _store_met_sidecar(sidecar, signature, frame)
     return frame
 
 
@@ -896,9 +1231,13 @@ def write_edited_met(
         raise WeatherValidationError("source file has no recognizable column header") from exc
     units_index = column_index + 1
     header = "\n".join(lines[: units_index + 1]) + "\n"
-    data = daf.to_csv(sep=" ", index=False, header=False, na_rep="?", float_format="%.6g")
     destination = old_path.parent / filename
-    return str(_atomic_write_text(destination, header + data))
+
+    def write(stream: TextIO) -> None:
+        stream.write(header)
+        _write_rows(stream, daf)
+
+    return str(_atomic_write(destination, write))
 
 
 def merge_columns(
@@ -1004,6 +1343,8 @@ __all__ = [
     "nearest_iem_station",
     "read_apsim_met",
     "separate_date",
+    "tav_amp_many",
+    "validate_many",
     "validate_met",
     "write_apsim_met",
     "write_edited_met",
@@ -257,6 +257,260 @@ def propagate_weather(
     )
 
 
+def propagate_weather_many(
+        observed: pd.DataFrame,
+        gridded: pd.DataFrame,
+        *,
+        station_column: str = "station",
+        calibration_variables: Sequence[str] = ("maxt", "mint"),
+        pass_through: Sequence[str] = ("radn", "rain"),
+        observed_columns: Mapping[str, str] | None = None,
+        gridded_columns: Mapping[str, str] | None = None,
+        date_column: str = "date",
+        calibration: CalibrationMode = "annual",
+        correct: CorrectionMode = "auto",
+        min_calibration_years: int = 3,
+        min_samples: int = 365,
+        minimum_r2: float = 0.70,
+        maximum_relative_rmse: float = 0.30,
+        acceptable_slope: tuple[float, float] = (0.80, 1.20),
+        maximum_intercept_fraction: float = 0.02,
+        preserve_observed_overlap: bool = False,
+        enforce_temperature_order: bool = True,
+        output: Literal["long", "objects"] = "long",
+        n_jobs: int = 1,
+) -> PropagatedWeather | dict[object, PropagatedWeather]:
+    """
+    Propagate the weather of many stations at once.
+
+    Equivalent to calling :func:`propagate_weather` for every station, but
+    all regressions of all stations, variables and calibration periods are
+    fitted together with grouped closed-form least squares, and corrections
+    are applied with one vectorized pass over the gridded data.
+
+    Parameters
+    ----------
+    observed, gridded
+        Long-format tables holding the records of all stations, keyed by
+        ``station_column`` and the date column. Stations absent from
+        ``observed`` are not propagated.
+    station_column
+        Column identifying the station in both tables.
+    output
+        ``long`` returns one :class:`PropagatedWeather` whose ``data`` and
+        ``statistics`` carry the station column. ``objects`` returns a
+        ``{station: PropagatedWeather}`` mapping shaped like the results of
+        :func:`propagate_weather`.
+    n_jobs
+        Number of worker processes. Stations are split into ``n_jobs``
+        shards, which only pays off for very large inputs.
+
+    Other parameters are those of :func:`propagate_weather`. A
+    ``ValueError`` lists every station that fails a data requirement.
+    """
+
+    if min_calibration_years < 1:
+        raise ValueError("min_calibration_years must be at least 1.")
+    if output not in ("long", "objects"):
+        raise ValueError("output must be 'long' or 'objects'.")
+    # an empty or single-station input is propagated in this process, with the same empty or serial result
+    stations = pd.unique(observed[station_column]) if n_jobs > 1 else ()
+    if len(stations) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        shards = [s for s in np.array_split(stations, min(n_jobs, len(stations))) if len(s)]
+        worker = partial(
+            _propagate_shard,
+            station_column=station_column, calibration_variables=calibration_variables,
+            pass_through=pass_through, observed_columns=observed_columns, gridded_columns=gridded_columns,
+            date_column=date_column, calibration=calibration, correct=correct,
+            min_calibration_years=min_calibration_years, min_samples=min_samples, minimum_r2=minimum_r2,
+            maximum_relative_rmse=maximum_relative_rmse, acceptable_slope=acceptable_slope,
+            maximum_intercept_fraction=maximum_intercept_fraction,
+            preserve_observed_overlap=preserve_observed_overlap,
+            enforce_temperature_order=enforce_temperature_order,
+        )
+        pairs = [
+            (observed[observed[station_column].isin(shard)], gridded[gridded[station_column].isin(shard)])
+            for shard in shards
+        ]
+        with ProcessPoolExecutor(len(pairs)) as pool:
+            parts = list(pool.map(worker, *zip(*pairs)))
+        result = PropagatedWeather(
+            data=pd.concat([part.data for part in parts]).sort_values([station_column, "date"]),
+            statistics=pd.concat([part.statistics for part in parts]).sort_values(station_column, kind="stable"),
+        )
+        result.data.reset_index(drop=True, inplace=True)
+        result.statistics.reset_index(drop=True, inplace=True)
+        return _split_by_station(result, station_column) if output == "objects" else result
+
+    calibration_variables = list(calibration_variables)
+    keys = [station_column, "date"]
+    obs = _prepare_weather_frame(
+        observed, date_column=date_column, column_map=observed_columns,
+        required=calibration_variables, frame_name="observed", key=station_column,
+    )
+    grid = _prepare_weather_frame(
+        gridded, date_column=date_column, column_map=gridded_columns,
+        required=tuple(calibration_variables) + tuple(pass_through), frame_name="gridded", key=station_column,
+    )
+    stations = pd.Index(pd.unique(obs[station_column]))
+    grid = grid[stations.get_indexer(grid[station_column]) >= 0].reset_index(drop=True)
+
+    overlap = obs[[*keys, *calibration_variables]].merge(
+        grid[[*keys, *calibration_variables]],
+        on=keys,
+        how="inner",
+        suffixes=("_observed", "_gridded"),
+        validate="one_to_one",
+    )
+    years = overlap["date"].dt.year.groupby(overlap[station_column]).nunique()
+    years = years.reindex(stations, fill_value=0)
+    short = years[years < min_calibration_years]
+    if len(short):
+        raise ValueError(
+            "Insufficient overlapping calibration years for stations "
+            f"{list(short.index[:10])}: at least {min_calibration_years} are required."
+        )
+
+    periods, labels = _period_codes(calibration)
+    n_periods = len(labels)
+    output_frame = grid[[*keys, *calibration_variables, *pass_through]].copy()
+    output_frame["year"] = output_frame["date"].dt.year
+    output_frame["day"] = output_frame["date"].dt.dayofyear
+    overlap_group = stations.get_indexer(overlap[station_column]) * n_periods + periods(overlap["date"])
+    output_group = stations.get_indexer(output_frame[station_column]) * n_periods + periods(output_frame["date"])
+    n_groups = len(stations) * n_periods
+    required_samples = min_samples_for_period(min_samples, calibration)
+
+    tables = []
+    for variable in calibration_variables:
+        y = overlap[f"{variable}_observed"].to_numpy(dtype=float)
+        x = overlap[f"{variable}_gridded"].to_numpy(dtype=float)
+        valid = np.isfinite(x) & np.isfinite(y)
+        fit = _grouped_least_squares(overlap_group[valid], x[valid], y[valid], n_groups)
+        present = np.bincount(overlap_group, minlength=n_groups) > 0
+        too_few = present & (fit["n"] < required_samples)
+        if too_few.any():
+            bad = [(stations[g // n_periods], labels[g % n_periods]) for g in np.flatnonzero(too_few)[:10]]
+            raise ValueError(
+                f"Insufficient data to calibrate {variable!r} for (station, period) {bad}: "
+                f"at least {required_samples} valid observations are required."
+            )
+        fit["corrected"] = present & _should_correct_many(
+            mode=correct, fit=fit, minimum_r2=minimum_r2, maximum_relative_rmse=maximum_relative_rmse,
+            acceptable_slope=acceptable_slope, maximum_intercept_fraction=maximum_intercept_fraction,
+        )
+        values = output_frame[variable].to_numpy(dtype=float)
+        apply = fit["corrected"][output_group]
+        output_frame[variable] = np.where(
+            apply, fit["slope"][output_group] * values + fit["intercept"][output_group], values
+        )
+        rows = np.flatnonzero(present)
+        table = pd.DataFrame({name: column[rows] for name, column in fit.items()})
+        table.insert(0, station_column, stations[rows // n_periods])
+        table.insert(1, "variable", variable)
+        table.insert(2, "period", [labels[i] for i in rows % n_periods])
+        tables.append(table)
+
+    if preserve_observed_overlap:
+        output_frame = _insert_observed_values(output_frame, obs, calibration_variables, on=keys)
+
+    if enforce_temperature_order:
+        _validate_temperature_order(output_frame, station_column=station_column)
+
+    columns = [station_column, "variable", "period", "slope", "intercept", "r2", "rmse", "observed_mean",
+               "relative_rmse", "corrected", "n"]
+    # one block per station, ordered by variable then period as in propagate_weather
+    statistics = pd.concat(tables).sort_values(station_column, kind="stable").reset_index(drop=True)[columns]
+    statistics["n"] = statistics["n"].astype(int)
+    result = PropagatedWeather(
+        data=output_frame.sort_values(keys).reset_index(drop=True),
+        statistics=statistics,
+    )
+    return _split_by_station(result, station_column) if output == "objects" else result
+
+
+def _propagate_shard(observed: pd.DataFrame, gridded: pd.DataFrame, **kwargs) -> PropagatedWeather:
+    return propagate_weather_many(observed, gridded, **kwargs)
+
+
+def _split_by_station(result: PropagatedWeather, station_column: str) -> dict[object, PropagatedWeather]:
+    statistics = dict(tuple(result.statistics.groupby(station_column, sort=False)))
+    return {
+        station: PropagatedWeather(
+            data=data.drop(columns=station_column).reset_index(drop=True),
+            statistics=statistics[station].drop(columns=station_column).reset_index(drop=True),
+        )
+        for station, data in result.data.groupby(station_column, sort=False)
+    }
+
+
+def _period_codes(mode: CalibrationMode):
+    """Integer period of each date and the label of every period, see :func:`_calibration_period`."""
+
+    if mode == "annual":
+        return (lambda dates: np.zeros(len(dates), dtype=np.int64)), ["annual"]
+    if mode == "monthly":
+        return (lambda dates: dates.dt.month.to_numpy(dtype=np.int64) - 1), list(range(1, 13))
+    if mode == "seasonal":
+        return (lambda dates: (dates.dt.month.to_numpy(dtype=np.int64) - 1) // 3), [1, 2, 3, 4]
+    raise ValueError(
+        "calibration must be 'annual', 'seasonal', or 'monthly'."
+    )
+
+
+def _grouped_least_squares(group: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int) -> dict:
+    """Ordinary least squares ``y = slope * x + intercept`` of every group, from centered grouped sums."""
+
+    n = np.bincount(group, minlength=n_groups).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.bincount(group, weights=x, minlength=n_groups) / n
+        y_mean = np.bincount(group, weights=y, minlength=n_groups) / n
+        dx = x - x_mean[group]
+        dy = y - y_mean[group]
+        sxx = np.bincount(group, weights=dx * dx, minlength=n_groups)
+        sxy = np.bincount(group, weights=dx * dy, minlength=n_groups)
+        syy = np.bincount(group, weights=dy * dy, minlength=n_groups)
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        ss_res = np.maximum(syy - slope * sxy, 0.0)
+        rmse = np.sqrt(ss_res / n)
+        r2 = np.where(syy > 0, 1.0 - ss_res / syy, np.nan)
+        relative_rmse = rmse / np.maximum(np.abs(y_mean), np.finfo(float).eps)
+    return {"slope": slope, "intercept": intercept, "r2": r2, "rmse": rmse, "observed_mean": y_mean,
+            "relative_rmse": relative_rmse, "n": n}
+
+
+def _should_correct_many(
+        *,
+        mode: CorrectionMode,
+        fit: dict,
+        minimum_r2: float,
+        maximum_relative_rmse: float,
+        acceptable_slope: tuple[float, float],
+        maximum_intercept_fraction: float,
+) -> np.ndarray:
+    """Vectorized :func:`_should_correct` over the groups of ``fit``."""
+
+    size = len(fit["slope"])
+    if mode == "always":
+        return np.ones(size, dtype=bool)
+    if mode == "never":
+        return np.zeros(size, dtype=bool)
+    if mode != "auto":
+        raise ValueError("correct must be 'auto', 'always', or 'never'.")
+    slope = fit["slope"]
+    slope_is_biased = ~((acceptable_slope[0] <= slope) & (slope <= acceptable_slope[1]))
+    intercept_limit = maximum_intercept_fraction * np.maximum(np.abs(fit["observed_mean"]), np.finfo(float).eps)
+    intercept_is_biased = np.abs(fit["intercept"]) > intercept_limit
+    agreement_is_poor = fit["relative_rmse"] > maximum_relative_rmse
+    r2 = fit["r2"]
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(r2) & (r2 >= minimum_r2) & (agreement_is_poor | slope_is_biased | intercept_is_biased)
+
+
 def _prepare_weather_frame(
         frame: pd.DataFrame,
         *,
@@ -264,8 +518,13 @@ def _prepare_weather_frame(
         column_map: Mapping[str, str] | None,
         required: Sequence[str],
         frame_name: str,
+        key: str | None = None,
 ) -> pd.DataFrame:
     data = frame.copy()
+    keys = ["date"] if key is None else [key, "date"]
+
+    if key is not None and key not in data:
+        raise KeyError(f"{frame_name!r} data do not contain station column {key!r}.")
 
     if date_column not in data:
         raise KeyError(
@@ -292,9 +551,10 @@ def _prepare_weather_frame(
 
     data["date"] = pd.to_datetime(data["date"], errors="raise").dt.normalize()
 
-    if data["date"].duplicated().any():
+    duplicated = data.duplicated(keys)
+    if duplicated.any():
         duplicate_dates = (
-            data.loc[data["date"].duplicated(), "date"]
+            data.loc[duplicated, "date"]
             .dt.strftime("%Y-%m-%d")
             .tolist()
         )
@@ -306,7 +566,7 @@ def _prepare_weather_frame(
     for variable in required:
         data[variable] = pd.to_numeric(data[variable], errors="coerce")
 
-    return data.sort_values("date").reset_index(drop=True)
+    return data.sort_values(keys).reset_index(drop=True)
 
 
 def _calibration_period(
@@ -390,12 +650,14 @@ def _insert_observed_values(
         propagated: pd.DataFrame,
         observed: pd.DataFrame,
         variables: Sequence[str],
+        on: str | Sequence[str] = "date",
 ) -> pd.DataFrame:
-    replacement = observed[["date", *variables]].copy()
+    keys = [on] if isinstance(on, str) else list(on)
+    replacement = observed[[*keys, *variables]].copy()
 
     merged = propagated.merge(
         replacement,
-        on="date",
+        on=keys,
         how="left",
         suffixes=("", "_observed"),
         validate="one_to_one",
@@ -411,7 +673,7 @@ def _insert_observed_values(
     return merged
 
 
-def _validate_temperature_order(data: pd.DataFrame) -> None:
+def _validate_temperature_order(data: pd.DataFrame, station_column: str | None = None) -> None:
     if not {"mint", "maxt"}.issubset(data.columns):
         return
 
@@ -424,6 +686,8 @@ def _validate_temperature_order(data: pd.DataFrame) -> None:
             .head()
             .tolist()
         )
+        if station_column is not None:
+            dates = list(zip(data.loc[invalid, station_column].head(), dates))
         raise ValueError(
             "Temperature propagation produced mint > maxt on "
             f"{invalid.sum()} days. Example dates: {dates}. "
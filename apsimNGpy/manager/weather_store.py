@@ -0,0 +1,270 @@
+"""Persistent local store of downloaded daily weather.
+
+Downloads made through :mod:`apsimNGpy.manager.weather_loader` can be kept in
+a :class:`WeatherStore`, so repeated requests for nearby points and
+overlapping years are served from disk instead of the network. Points are
+snapped to a regular longitude/latitude grid whose spacing matches the
+resolution of each source; all points in a grid cell share one record. Each
+``(source, cell, year)`` tile is a ``.npz`` file holding one array per
+weather variable, indexed by day of year.
+
+Tiles are permanent, so only complete years are stored: a year must have
+ended at least ``SETTLE_DAYS`` ago, giving the sources time to publish their
+latest records, and the download must hold a row for every day of it. The
+current year and partial downloads are returned to the caller but requested
+again on the next fetch.
+
+The store is a plain directory tree, so it can be pre-filled on a connected
+machine and copied to compute nodes without network access, where
+``offline=True`` turns any cache miss into an error instead of a download.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.manager.weather_loader import (
+    APSIM_COLUMNS,
+    WeatherDownloadError,
+    _replace_with_retry,
+    _validate_lonlat,
+    _validate_years,
+    daterange,
+)
+
+# grid spacing in degrees, close to the native grid of each source
+DEFAULT_RESOLUTION = {"nasa": 0.5, "daymet": 0.01}
+SOURCE_ALIASES = {"nasapower": "nasa"}
+VARIABLES = tuple(c for c in APSIM_COLUMNS if c not in {"year", "day"})
+TILE_SUFFIX = ".npz"
+# days after the end of a year before its records are considered final
+SETTLE_DAYS = 30
+
+
+def _runs(years: Sequence[int]) -> list[tuple[int, int]]:
+    """Inclusive ``(first, last)`` spans of consecutive *years*."""
+
+    runs: list[tuple[int, int]] = []
+    for year in years:
+        if runs and year == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], year)
+        else:
+            runs.append((year, year))
+    return runs
+
+
+def _is_settled(year: int) -> bool:
+    return pd.Timestamp(year + 1, 1, 1) + pd.Timedelta(days=SETTLE_DAYS) <= pd.Timestamp.today()
+
+
+def _default_root() -> Path:
+    from apsimNGpy.settings import META_Dir
+
+    return META_Dir / "weather_store"
+
+
+class WeatherStore:
+    """Daily weather tiles on disk, indexed by grid cell and year.
+
+    Parameters
+    ----------
+    root : str or pathlib.Path, optional
+        Directory of the store, defaults to ``weather_store`` in the apsimNGpy
+        metadata directory.
+    resolution : float or mapping, optional
+        Grid spacing in degrees, either for all sources or per source.
+        Defaults to ``DEFAULT_RESOLUTION``.
+    offline : bool, optional
+        Raise :class:`WeatherDownloadError` on a miss instead of downloading.
+
+    Examples
+    --------
+    >>> from apsimNGpy.manager.weather_loader import get_weather
+    >>> store = WeatherStore('weather_tiles')  # doctest: +SKIP
+    >>> get_weather((-93.6, 42.0), 1990, 2020, source='nasa', filename='ames.met', store=store)  # doctest: +SKIP
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        *,
+        resolution: float | Mapping[str, float] | None = None,
+        offline: bool = False,
+    ) -> None:
+        self.root = Path(root or _default_root()).expanduser().resolve()
+        if resolution is None:
+            resolution = DEFAULT_RESOLUTION
+        self.resolution = dict(resolution) if isinstance(resolution, Mapping) else resolution
+        self.offline = offline
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(root={str(self.root)!r}, offline={self.offline})"
+
+    @staticmethod
+    def _source(source: str) -> str:
+        source = source.lower()
+        return SOURCE_ALIASES.get(source, source)
+
+    def _spacing(self, source: str) -> float:
+        if isinstance(self.resolution, dict):
+            return float(self.resolution.get(source, min(self.resolution.values())))
+        return float(self.resolution)
+
+    def cell(self, lonlat: Sequence[float], source: str) -> tuple[int, int]:
+        """Grid cell of *lonlat* for *source*."""
+
+        lon, lat = _validate_lonlat(lonlat)
+        spacing = self._spacing(self._source(source))
+        return int(np.floor(lon / spacing + 0.5)), int(np.floor(lat / spacing + 0.5))
+
+    def _cell_dir(self, lonlat: Sequence[float], source: str) -> Path:
+        ix, iy = self.cell(lonlat, source)
+        return self.root / self._source(source) / f"{ix}_{iy}"
+
+    def years(self, lonlat: Sequence[float], source: str) -> list[int]:
+        """Years stored for the cell of *lonlat*."""
+
+        directory = self._cell_dir(lonlat, source)
+        if not directory.is_dir():
+            return []
+        return sorted(int(p.stem) for p in directory.glob(f"*{TILE_SUFFIX}") if p.stem.isdigit())
+
+    def missing_years(self, lonlat: Sequence[float], start: int, end: int, source: str) -> list[int]:
+        stored = set(self.years(lonlat, source))
+        return [year for year in range(start, end + 1) if year not in stored]
+
+    def put(self, lonlat: Sequence[float], frame: pd.DataFrame, source: str, *, site: str | None = None) -> int:
+        """Store the complete years of *frame*, one tile per year; return the number of tiles written.
+
+        Years that are not settled yet or lack rows for some days are skipped,
+        see the module documentation.
+        """
+
+        directory = self._cell_dir(lonlat, source)
+        directory.mkdir(parents=True, exist_ok=True)
+        site = site or frame.attrs.get("site") or ""
+        lon, lat = _validate_lonlat(lonlat)
+        years = pd.to_numeric(frame["year"], errors="raise").to_numpy(dtype="int64")
+        days = pd.to_numeric(frame["day"], errors="raise").to_numpy(dtype="int64")
+        written = 0
+        for year in np.unique(years):
+            rows = years == year
+            length = 366 if pd.Timestamp(int(year), 12, 31).dayofyear == 366 else 365
+            if not _is_settled(int(year)) or len(np.unique(days[rows])) < length:
+                continue
+            arrays = {}
+            for variable in VARIABLES:
+                values = np.full(length, np.nan)
+                values[days[rows] - 1] = pd.to_numeric(frame.loc[rows, variable], errors="coerce").to_numpy()
+                arrays[variable] = values
+            fd, temporary = tempfile.mkstemp(prefix=".tile.", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as stream:
+                    np.savez(stream, __site__=site, __lonlat__=np.array([lon, lat]), **arrays)
+                _replace_with_retry(temporary, directory / f"{year}{TILE_SUFFIX}")
+            finally:
+                try:
+                    os.unlink(temporary)
+                except FileNotFoundError:
+                    pass
+            written += 1
+        return written
+
+    def get(self, lonlat: Sequence[float], start: int, end: int, source: str) -> pd.DataFrame | None:
+        """Daily records of *start* to *end*, or ``None`` if any year is missing."""
+
+        _validate_years(start, end)
+        directory = self._cell_dir(lonlat, source)
+        columns: dict[str, list[np.ndarray]] = {variable: [] for variable in VARIABLES}
+        site = None
+        for year in range(start, end + 1):
+            try:
+                with np.load(directory / f"{year}{TILE_SUFFIX}", allow_pickle=False) as tile:
+                    for variable in VARIABLES:
+                        columns[variable].append(tile[variable])
+                    site = site or str(tile["__site__"]) or None
+            except (FileNotFoundError, ValueError, KeyError, OSError):
+                return None
+        dates = daterange(start, end)
+        frame = pd.DataFrame({"year": dates.year, "day": dates.dayofyear})
+        for variable in VARIABLES:
+            frame[variable] = np.concatenate(columns[variable])
+        frame.attrs["site"] = site
+        return frame
+
+    def fetch(
+        self,
+        lonlat: Sequence[float],
+        start: int,
+        end: int,
+        source: str,
+        download: Callable[[int, int], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Return *start* to *end* from the store, downloading only the missing years.
+
+        ``download(first, last)`` must return daily APSIM columns for an
+        inclusive span of years; it is called once per run of consecutive
+        missing years, and the complete years of its result are stored.
+        """
+
+        missing = self.missing_years(lonlat, start, end, source)
+        if not missing:
+            frame = self.get(lonlat, start, end, source)
+            if frame is None:
+                raise WeatherDownloadError(f"weather store {self.root} has unreadable tiles for {tuple(lonlat)}")
+            return frame
+        if self.offline:
+            raise WeatherDownloadError(
+                f"{len(missing)} years of {source} weather for {tuple(lonlat)} are not in the offline store "
+                f"{self.root}"
+            )
+        downloaded = []
+        for first, last in _runs(missing):
+            frame = download(first, last)
+            self.put(lonlat, frame, source)
+            downloaded.append(frame)
+        recent = pd.concat(downloaded, ignore_index=True)
+        recent_years = pd.to_numeric(recent["year"], errors="raise")
+        pieces = []
+        site = None
+        for year in range(start, end + 1):
+            piece = self.get(lonlat, year, year, source)
+            if piece is None and year in missing:
+                # a year too recent or incomplete to be stored is served from the download
+                piece = recent.loc[recent_years == year, ["year", "day", *VARIABLES]]
+            elif piece is None:
+                raise WeatherDownloadError(f"weather store {self.root} has an unreadable tile for {year}")
+            site = site or piece.attrs.get("site")
+            pieces.append(piece)
+        frame = pd.concat(pieces, ignore_index=True)
+        frame.attrs["site"] = site or next((f.attrs["site"] for f in downloaded if f.attrs.get("site")), None)
+        return frame
+
+    def clear(self, source: str | None = None) -> None:
+        """Remove every tile, or only those of *source*."""
+
+        shutil.rmtree(self.root / self._source(source) if source else self.root, ignore_errors=True)
+
+
+def as_weather_store(store: WeatherStore | str | Path | bool | None) -> WeatherStore | None:
+    """Interpret the ``store`` argument of the download functions."""
+
+    if store is None or store is False:
+        return None
+    if store is True:
+        return WeatherStore()
+    if isinstance(store, WeatherStore):
+        return store
+    return WeatherStore(store)
+
+
+__all__ = ["DEFAULT_RESOLUTION", "SETTLE_DAYS", "WeatherStore", "as_weather_store"]
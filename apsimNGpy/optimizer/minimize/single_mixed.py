@@ -1,7 +1,12 @@
+import inspect
+import os
 import subprocess
+import numpy as np
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from apsimNGpy.settings import logger
 from apsimNGpy.optimizer._one_obj import SING_OBJ_MIXED_VAR
+from apsimNGpy.durable.durable_utils import CheckPoint
+from apsimNGpy.parallel.warm_pool import WarmWorkerPool
 from scipy.optimize import minimize, differential_evolution, NonlinearConstraint
 from tqdm import tqdm
 
@@ -309,6 +314,9 @@ class MixedVariableOptimizer:
             *,
             integrality=None,
             vectorized=False,
+            pool=None,
+            checkpoint=None,
+            resume=False,
     ):
         """
         Run differential evolution on the wrapped APSIM objective function.
@@ -557,6 +565,31 @@ class MixedVariableOptimizer:
 
             .. versionadded:: 1.9.0
 
+            In apsimNGpy, ``vectorized=True`` hands each generation to
+            :meth:`~apsimNGpy.optimizer.problems.smp.MixedProblem.evaluate_population`, which runs the
+            simulations of the whole population as one parallel batch on ``workers`` processes
+            (``-1`` for all CPUs) instead of one after the other.
+
+            .. versionchanged:: 1.5.7
+
+        pool : WarmWorkerPool, optional
+            Running pool used for the population batches when ``vectorized=True``. By default a
+            :class:`~apsimNGpy.parallel.warm_pool.WarmWorkerPool` with ``workers`` processes is started for the
+            run and shut down afterwards.
+
+            .. versionadded:: 1.5.7
+        checkpoint : str, Path or CheckPoint, optional
+            Directory of a :class:`~apsimNGpy.durable.durable_utils.CheckPoint`. After every generation the
+            population, its fitness, the random generator state and the iteration count are saved atomically.
+
+            .. versionadded:: 1.5.7
+        resume : bool, default False
+            Continue from the state saved in ``checkpoint``. The saved population is used as ``init`` (its fitness is
+            evaluated once more), the random generator continues from its saved state and only the remaining
+            ``maxiter - nit`` generations are run. Without ``resume``, an existing checkpoint is cleared.
+
+            .. versionadded:: 1.5.7
+
         Returns
         -------
         res : OptimizeResult
@@ -668,54 +701,185 @@ class MixedVariableOptimizer:
 
         wrapped_obj, x0, bounds = self._submit_objective()
         initial_guess = self.problem_desc.start_values
-
-        if disp:
-            logger.info(f"[DE] Starting optimization with {len(bounds)} variables,\n mutation: {mutation}," \
-                        f" seed={seed}, popsize={popsize}, strategy: {strategy}, starting values: {initial_guess}")
-
-        if isinstance(constraints, tuple) and constraints:
-            if len(constraints) != 2:
-                raise ValueError(f"constraints must be a tuple of length 2, got {len(constraints)}")
-            upper_constraint = constraints[1]
-            lower_constraint = constraints[0]
-
-            if upper_constraint < lower_constraint:
-                raise ValueError(
-                    f'Upper constraint `{upper_constraint}` at index 1 is less than the lower constraint `{lower_constraint}` at index 0')
-            constraints = self.problem_desc.define_nlc(lower_constraint, upper_constraint, )
-        popsize = popsize or self.problem_desc.n_factors * 10
-        if popsize < 4:
-            logger.error(f"[DE] Population size {popsize}, is too loo")
-
-        # x=1
-        pbar = self.pbar(iterations=maxiter)
-        if not callback and not disp:
-            def callback(xk, convergence):
-                pbar.update(1)
-
-        from functools import partial
-        def de_runner(worker, updating=updating):
-            return partial(differential_evolution, bounds=bounds, args=args, strategy=strategy,
-                           maxiter=maxiter, popsize=popsize, tol=tol, mutation=mutation,
-                           recombination=recombination, disp=disp,
-                           polish=polish, init=init, rng=rng,
-                           atol=atol, updating=updating, callback=callback,
-                           workers=worker, constraints=constraints, x0=x0, integrality=integrality,
-                           vectorized=vectorized,
-                           )
-
-        if workers == 1:
-            de_algorithm = de_runner(1)
-            result = de_algorithm(
-                wrapped_obj)
-        else:
-            select_process = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
-            with select_process(max_workers=workers) as executor:
-                workers = executor.map
-                de_algorithm = de_runner(worker=workers, updating="deferred")
+        own_pool = None
+        try:
+            if vectorized:
+                n_jobs = (os.cpu_count() or 1) if workers == -1 else int(workers)
+                if pool is None and n_jobs > 1 and not use_threads:
+                    pool = own_pool = WarmWorkerPool(n_workers=n_jobs)
+                wrapped_obj = self.problem_desc.population_objective(n_jobs=n_jobs, pool=pool, threads=use_threads)
+                # the population batch replaces scipy's workers
+                workers, updating = 1, 'deferred'
+
+            checkpoint = CheckPoint.coerce(checkpoint)
+            nit_done = 0
+            if checkpoint is not None:
+                # a generator whose state can be saved and restored
+                rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+                state = checkpoint.load() if resume else {}
+                if state:
+                    if (not np.array_equal(state['bounds'], np.asarray(bounds, dtype=float))
+                            or state['var_names'] != list(self.problem_desc.var_names)):
+                        raise ValueError(f"checkpoint {checkpoint.directory} was saved for other variables: "
+                                         f"{state['var_names']}")
+                    init, x0 = state['population'], None
+                    rng.bit_generator.state = state['rng_state']
+                    nit_done = state['nit']
+                    maxiter = max(maxiter - nit_done, 0)
+                    logger.info(f"[DE] Resuming from generation {nit_done} (best fun={state['fun']})")
+                else:
+                    checkpoint.clear()
+            elif resume:
+                raise ValueError('resume=True requires a checkpoint')
+
+            if disp:
+                logger.info(f"[DE] Starting optimization with {len(bounds)} variables,\n mutation: {mutation}," \
+                            f" seed={seed}, popsize={popsize}, strategy: {strategy}, starting values: {initial_guess}")
+
+            if isinstance(constraints, tuple) and constraints:
+                if len(constraints) != 2:
+                    raise ValueError(f"constraints must be a tuple of length 2, got {len(constraints)}")
+                upper_constraint = constraints[1]
+                lower_constraint = constraints[0]
+
+                if upper_constraint < lower_constraint:
+                    raise ValueError(
+                        f'Upper constraint `{upper_constraint}` at index 1 is less than the lower constraint `{lower_constraint}` at index 0')
+                constraints = self.problem_desc.define_nlc(lower_constraint, upper_constraint,
+                                                           func=wrapped_obj if vectorized else None)
+            popsize = popsize or self.problem_desc.n_factors * 10
+            if popsize < 4:
+                logger.error(f"[DE] Population size {popsize}, is too loo")
+
+            # x=1
+            pbar = self.pbar(iterations=maxiter)
+            if not callback and not disp:
+                def callback(xk, convergence):
+                    pbar.update(1)
+            if checkpoint is not None:
+                callback = self._checkpointed_callback(callback, checkpoint, rng, nit_done, bounds)
+
+            from functools import partial
+            def de_runner(worker, updating=updating):
+                return partial(differential_evolution, bounds=bounds, args=args, strategy=strategy,
+                               maxiter=maxiter, popsize=popsize, tol=tol, mutation=mutation,
+                               recombination=recombination, disp=disp,
+                               polish=polish, init=init, rng=rng,
+                               atol=atol, updating=updating, callback=callback,
+                               workers=worker, constraints=constraints, x0=x0, integrality=integrality,
+                               vectorized=vectorized,
+                               )
+
+            if workers == 1:
+                de_algorithm = de_runner(1)
                 result = de_algorithm(
                     wrapped_obj)
+            else:
+                select_process = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+                with select_process(max_workers=workers) as executor:
+                    workers = executor.map
+                    de_algorithm = de_runner(worker=workers, updating="deferred")
+                    result = de_algorithm(
+                        wrapped_obj)
+        finally:
+            # also reached when the checkpoint or the constraints are rejected
+            if own_pool is not None:
+                own_pool.shutdown()
+
+        return self._extract_solution(result)
 
+    def _checkpointed_callback(self, callback, checkpoint, rng, nit_done, bounds):
+        """DE callback saving the solver state to ``checkpoint`` before calling ``callback``."""
+        pass_result = callback is not None and 'intermediate_result' in inspect.signature(callback).parameters
+        var_names = list(self.problem_desc.var_names)
+        bounds = np.asarray(bounds, dtype=float)
+
+        def checkpointed(intermediate_result):
+            checkpoint.maybe_save(population=intermediate_result.population,
+                                  population_energies=intermediate_result.population_energies,
+                                  nit=nit_done + intermediate_result.nit, x=intermediate_result.x,
+                                  fun=intermediate_result.fun, rng_state=rng.bit_generator.state, bounds=bounds,
+                                  var_names=var_names)
+            if callback is None:
+                return None
+            if pass_result:
+                return callback(intermediate_result=intermediate_result)
+            return callback(intermediate_result.x, convergence=intermediate_result.convergence)
+
+        return checkpointed
+
+    def minimize_with_surrogate(self, max_evaluations=100, n_initial=None, batch_size=1, surrogate='gp',
+                                archive=None, xi=0.01, n_candidates=2048, workers=1, pool=None, use_threads=False,
+                                rng=42, callback=None):
+        """
+        Calibrate with a surrogate model when every evaluation is an expensive APSIM run.
+
+        A Latin hypercube design is simulated first, then a Gaussian process (or a random forest) is fitted to all
+        evaluations and the candidate with the highest expected improvement is simulated next, until
+        ``max_evaluations`` simulations were spent. This usually needs an order of magnitude fewer simulations than
+        :meth:`minimize_with_de`. Mixed variable types are searched through their ``wrapdisc`` encoding, see
+        :func:`~apsimNGpy.optimizer.minimize.surrogate.surrogate_minimize`.
+
+        Parameters
+        ----------
+        max_evaluations : int, default 100
+            Simulation budget, including the evaluations found in ``archive``.
+        n_initial : int, optional
+            Size of the initial Latin hypercube design, defaults to ``max(2 * n_factors + 1, 8)``.
+        batch_size : int, default 1
+            Candidates proposed per iteration. They are simulated as one parallel batch, so set it to ``workers``.
+        surrogate : {'gp', 'rf'}, default 'gp'
+            ``'rf'`` requires scikit-learn.
+        archive : str or PathLike, optional
+            CSV file holding every evaluation. An interrupted run resumes from it.
+        xi : float, default 0.01
+            Exploration margin of the expected improvement.
+        n_candidates : int, default 2048
+            Candidates scored by the surrogate per proposal.
+        workers : int, default 1
+            Worker processes for the simulation batches, ``-1`` for all CPUs.
+        pool : WarmWorkerPool, optional
+            Running pool for the simulation batches, by default one is started when ``workers > 1``.
+        use_threads : bool, default False
+            Run the batches on threads instead of processes.
+        rng : int, optional
+            Seed of the design and the candidate search.
+        callback : callable, optional
+            Called as ``callback(best_x, best_fun)`` with the encoded best point after every batch.
+
+        Returns
+        -------
+        scipy.optimize.OptimizeResult
+            Decoded solution with the same extra attributes as :meth:`minimize_with_de`, plus ``x_archive`` and
+            ``fun_archive`` holding every (encoded) evaluation.
+
+        .. versionadded:: 1.5.7
+        """
+        from apsimNGpy.optimizer.minimize.surrogate import surrogate_minimize
+        wrapped_obj, x0, bounds = self._submit_objective()
+        decode = None if self.problem_desc._detect_pure_vars() else wrapped_obj.decode
+        n_jobs = (os.cpu_count() or 1) if workers == -1 else int(workers)
+        own_pool = pbar = None
+        try:
+            if pool is None and n_jobs > 1 and not use_threads:
+                pool = own_pool = WarmWorkerPool(n_workers=n_jobs)
+            pbar = self.pbar(iterations=max_evaluations, unit=' simulations')
+
+            def evaluate(population):
+                values = self.problem_desc.evaluate_population(population, n_jobs=n_jobs, pool=pool,
+                                                               threads=use_threads)
+                pbar.update(len(population))
+                return values
+
+            result = surrogate_minimize(evaluate, bounds, decode=decode, var_names=self.problem_desc.var_names,
+                                        n_initial=n_initial, max_evaluations=max_evaluations, batch_size=batch_size,
+                                        surrogate=surrogate, archive=archive, xi=xi, n_candidates=n_candidates,
+                                        x0=x0, rng=rng, callback=callback)
+        finally:
+            if pbar is not None:
+                pbar.close()
+            if own_pool is not None:
+                own_pool.shutdown()
         return self._extract_solution(result)
 
     # tests
@@ -0,0 +1,324 @@
+"""
+Surrogate-assisted minimization for expensive objectives.
+
+Every objective evaluation of an APSIM calibration is a full simulation. :func:`surrogate_minimize` spends them
+carefully instead of feeding thousands of candidates to a population based solver:
+
+1. a Latin hypercube design seeds the evaluation archive,
+2. a surrogate (a Gaussian process, or a random forest when scikit-learn is installed) is fitted to the archive,
+3. the candidate with the highest expected improvement under the surrogate is simulated, and
+4. steps 2 and 3 repeat until the evaluation budget is spent.
+
+The search runs in the encoded space of the problem, so the mixed variable types of
+:mod:`apsimNGpy.optimizer.problems.variables` (wrapdisc integer, quantized and choice variables) are handled through
+their continuous encoding and decoded only for evaluation. Evaluations are appended to an optional CSV archive after
+every batch, and a run pointed at an existing archive resumes from it.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import OptimizeResult, minimize
+from scipy.stats import norm, qmc
+
+try:
+    from sklearn.ensemble import RandomForestRegressor
+except ModuleNotFoundError:
+    RandomForestRegressor = None
+
+__all__ = ['GaussianProcess', 'RandomForestSurrogate', 'EvaluationArchive', 'expected_improvement',
+           'surrogate_minimize']
+
+OBJECTIVE = 'objective'
+
+
+class GaussianProcess:
+    """
+    Gaussian process regression with an ARD Matérn 5/2 kernel on inputs scaled to the unit cube.
+
+    The targets are standardized, and the length scales and noise variance are fitted by maximizing the log
+    marginal likelihood.
+    """
+
+    def __init__(self, length_scale_bounds=(1e-2, 1e2), noise_bounds=(1e-8, 1e-1), n_restarts: int = 2,
+                 rng=None):
+        self.length_scale_bounds = length_scale_bounds
+        self.noise_bounds = noise_bounds
+        self.n_restarts = n_restarts
+        self.rng = np.random.default_rng(rng)
+        self.theta = None
+
+    @staticmethod
+    def _kernel(a, b, length_scale):
+        d = np.sqrt(np.maximum(((a[:, None, :] - b[None, :, :]) / length_scale) ** 2, 0).sum(-1)) * np.sqrt(5)
+        return (1 + d + d ** 2 / 3) * np.exp(-d)
+
+    def _neg_log_likelihood(self, theta, x, y):
+        length_scale, noise = np.exp(theta[:-1]), np.exp(theta[-1])
+        k = self._kernel(x, x, length_scale) + (noise + 1e-10) * np.eye(len(x))
+        try:
+            c, low = cho_factor(k, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e25
+        alpha = cho_solve((c, low), y)
+        return 0.5 * y @ alpha + np.log(np.diag(c)).sum() + 0.5 * len(x) * np.log(2 * np.pi)
+
+    def fit(self, x, y, optimize: bool = True) -> 'GaussianProcess':
+        x, y = np.asarray(x, float), np.asarray(y, float)
+        self._mean, self._scale = y.mean(), y.std() or 1.0
+        ys = (y - self._mean) / self._scale
+        d = x.shape[1]
+        bounds = [tuple(np.log(self.length_scale_bounds))] * d + [tuple(np.log(self.noise_bounds))]
+        if optimize or self.theta is None:
+            starts = [np.r_[np.full(d, np.log(0.3)), np.log(1e-4)]] if self.theta is None else [self.theta]
+            for _ in range(self.n_restarts):
+                starts.append(np.array([self.rng.uniform(lo, hi) for lo, hi in bounds]))
+            best = None
+            for start in starts:
+                res = minimize(self._neg_log_likelihood, start, args=(x, ys), method='L-BFGS-B', bounds=bounds)
+                if best is None or res.fun < best.fun:
+                    best = res
+            self.theta = best.x
+        length_scale, noise = np.exp(self.theta[:-1]), np.exp(self.theta[-1])
+        k = self._kernel(x, x, length_scale) + (noise + 1e-10) * np.eye(len(x))
+        self._chol = cho_factor(k, lower=True)
+        self._alpha = cho_solve(self._chol, ys)
+        self._x, self._length_scale = x, length_scale
+        return self
+
+    def predict(self, x) -> Tuple[np.ndarray, np.ndarray]:
+        """Posterior mean and standard deviation at ``x``."""
+        x = np.asarray(x, float)
+        ks = self._kernel(x, self._x, self._length_scale)
+        mean = ks @ self._alpha
+        v = cho_solve(self._chol, ks.T)
+        var = np.maximum(1.0 - np.einsum('ij,ji->i', ks, v), 1e-12)
+        return mean * self._scale + self._mean, np.sqrt(var) * self._scale
+
+
+class RandomForestSurrogate:
+    """Random forest surrogate, the spread of the tree predictions is used as the uncertainty."""
+
+    def __init__(self, n_estimators: int = 200, min_samples_leaf: int = 2, rng=None):
+        if RandomForestRegressor is None:
+            raise ImportError("surrogate='rf' requires scikit-learn, install it with `pip install scikit-learn`")
+        seed = None if rng is None else int(np.random.default_rng(rng).integers(2 ** 31))
+        self.model = RandomForestRegressor(n_estimators=n_estimators, min_samples_leaf=min_samples_leaf,
+                                           random_state=seed)
+
+    def fit(self, x, y, optimize: bool = True) -> 'RandomForestSurrogate':
+        self.model.fit(np.asarray(x, float), np.asarray(y, float))
+        return self
+
+    def predict(self, x) -> Tuple[np.ndarray, np.ndarray]:
+        trees = np.stack([tree.predict(np.asarray(x, float)) for tree in self.model.estimators_])
+        return trees.mean(0), np.maximum(trees.std(0), 1e-12)
+
+
+def expected_improvement(mean, std, best: float, xi: float = 0.0) -> np.ndarray:
+    """Expected improvement below ``best`` for a minimization problem."""
+    improvement = best - np.asarray(mean) - xi
+    z = improvement / std
+    return improvement * norm.cdf(z) + std * norm.pdf(z)
+
+
+class EvaluationArchive:
+    """
+    Evaluated points of a surrogate run, optionally kept in a CSV file.
+
+    Each row holds the encoded vector (``x0``, ``x1``, ...), the decoded variables and the objective value. The file
+    is rewritten atomically after every batch, so an interrupted run loses at most the batch in flight.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike, None], n_dims: int, var_names: Sequence[str] = ()):
+        self.path = Path(path) if path is not None else None
+        self.encoded_columns = [f'x{i}' for i in range(n_dims)]
+        self.var_names = list(var_names)
+        self.frame = pd.DataFrame(columns=[*self.encoded_columns, *self.var_names, OBJECTIVE])
+        if self.path is not None and self.path.exists():
+            frame = pd.read_csv(self.path)
+            missing = set(self.frame.columns) - set(frame.columns)
+            if missing or len([c for c in frame.columns if c.startswith('x') and c[1:].isdigit()]) != n_dims:
+                raise ValueError(f"archive {self.path} does not match this problem, missing columns {sorted(missing)}")
+            self.frame = frame[self.frame.columns]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.frame[self.encoded_columns].to_numpy(float)
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.frame[OBJECTIVE].to_numpy(float)
+
+    def add(self, encoded, decoded, values) -> None:
+        rows = pd.DataFrame(np.asarray(encoded, float), columns=self.encoded_columns)
+        for i, name in enumerate(self.var_names):
+            rows[name] = [d[i] for d in decoded]
+        rows[OBJECTIVE] = np.asarray(values, float)
+        self.frame = rows if self.frame.empty else pd.concat([self.frame, rows], ignore_index=True)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+            self.frame.to_csv(tmp, index=False)
+            os.replace(tmp, self.path)
+
+
+def _key(decoded) -> tuple:
+    return tuple(np.asarray(decoded, dtype=object).ravel().tolist())
+
+
+def surrogate_minimize(evaluate: Callable[[List[Any]], Sequence[float]], bounds: Sequence[Tuple[float, float]], *,
+                       decode: Optional[Callable[[np.ndarray], Any]] = None, var_names: Sequence[str] = (),
+                       n_initial: Optional[int] = None, max_evaluations: int = 100, batch_size: int = 1,
+                       surrogate: str = 'gp', archive: Union[str, os.PathLike, None] = None, xi: float = 0.01,
+                       n_candidates: int = 2048, x0: Optional[Sequence[float]] = None, rng=None,
+                       callback: Optional[Callable[[np.ndarray, float], Any]] = None) -> OptimizeResult:
+    """
+    Minimize an expensive objective with a surrogate model and expected improvement.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Evaluates a list of decoded candidates and returns their objective values, e.g.,
+        :meth:`~apsimNGpy.optimizer.problems.smp.MixedProblem.evaluate_population`. Failed evaluations may return
+        ``inf``, they are kept in the archive and fitted at the worst finite value.
+    bounds : sequence of (float, float)
+        Bounds of the encoded search space.
+    decode : callable, optional
+        Maps an encoded vector to the values passed to ``evaluate``. Identity by default.
+    var_names : sequence of str, optional
+        Names of the decoded values, used as archive columns.
+    n_initial : int, optional
+        Size of the Latin hypercube design, defaults to ``max(2 * n_dims + 1, 8)``, capped by ``max_evaluations``.
+    max_evaluations : int, default 100
+        Total evaluation budget, including evaluations already in ``archive``.
+    batch_size : int, default 1
+        Candidates proposed per iteration. Batches are built with the kriging believer heuristic and evaluated
+        together, so ``evaluate`` can run them in parallel.
+    surrogate : {'gp', 'rf'}, default 'gp'
+        Gaussian process, or a scikit-learn random forest (better for many categorical variables).
+    archive : str or PathLike, optional
+        CSV file of evaluated points. An existing archive is resumed.
+    xi : float, default 0.01
+        Exploration margin of the expected improvement, relative to the objective's standard deviation.
+    n_candidates : int, default 2048
+        Random candidates scored by the acquisition function per proposal, half of them drawn around the best
+        evaluated points.
+    x0 : sequence of float, optional
+        Encoded starting point evaluated with the initial design.
+    rng : int or numpy.random.Generator, optional
+        Seed of the design and the candidate sampling.
+    callback : callable, optional
+        Called as ``callback(best_x, best_fun)`` after every batch.
+
+    Returns
+    -------
+    scipy.optimize.OptimizeResult
+        ``x`` (encoded best point), ``fun``, ``nfev`` (evaluations made by this call), ``nit``, plus ``x_archive``
+        and ``fun_archive`` with all evaluated points.
+
+    .. versionadded:: 1.5.7
+    """
+    bounds = np.asarray(bounds, float)
+    lower, span = bounds[:, 0], bounds[:, 1] - bounds[:, 0]
+    span = np.where(span > 0, span, 1.0)
+    n_dims = len(bounds)
+    decode = decode or (lambda v: v)
+    rng = np.random.default_rng(rng)
+    if n_initial is None:
+        n_initial = max(2 * n_dims + 1, 8)
+    n_initial = min(n_initial, max_evaluations)
+    if surrogate == 'gp':
+        model = GaussianProcess(rng=rng)
+    elif surrogate == 'rf':
+        model = RandomForestSurrogate(rng=rng)
+    else:
+        raise ValueError(f"surrogate must be 'gp' or 'rf', got {surrogate!r}")
+
+    store = EvaluationArchive(archive, n_dims, var_names)
+    seen = {_key(decode(x)) for x in store.x}
+    nfev = nit = 0
+
+    def _evaluate(unit_points):
+        nonlocal nfev
+        encoded = lower + np.asarray(unit_points) * span
+        decoded = [decode(x) for x in encoded]
+        values = np.asarray(evaluate(decoded), float)
+        seen.update(_key(d) for d in decoded)
+        store.add(encoded, decoded, values)
+        nfev += len(encoded)
+        if callback is not None:
+            best = int(np.argmin(store.y))
+            callback(store.x[best], store.y[best])
+
+    def _new(unit_points):
+        """Drops points that decode to an evaluated candidate."""
+        kept, keys = [], set()
+        for p in unit_points:
+            key = _key(decode(lower + p * span))
+            if key not in seen and key not in keys:
+                keys.add(key)
+                kept.append(p)
+        return np.array(kept).reshape(-1, n_dims)
+
+    missing = n_initial - len(store)
+    if missing > 0:
+        design = qmc.LatinHypercube(d=n_dims, seed=rng).random(missing)
+        if x0 is not None and len(store) == 0:
+            design[0] = np.clip((np.asarray(x0, float) - lower) / span, 0, 1)
+        design = _new(design)
+        if len(design):
+            _evaluate(design)
+
+    while len(store) < max_evaluations:
+        x_unit = (store.x - lower) / span
+        y = store.y
+        finite = np.isfinite(y)
+        if not finite.any():
+            raise RuntimeError('all evaluations failed, the surrogate can not be fitted')
+        y_fit = np.where(finite, y, y[finite].max())
+        model.fit(x_unit, y_fit, optimize=True)
+        best = y_fit.min()
+        scale = y_fit.std() or 1.0
+
+        q = min(batch_size, max_evaluations - len(store))
+        batch, believer_x, believer_y = [], x_unit, y_fit
+        for _ in range(q):
+            top = x_unit[np.argsort(y_fit)[:5]]
+            local = top[rng.integers(len(top), size=n_candidates // 2)] + rng.normal(0, 0.05, (n_candidates // 2,
+                                                                                            n_dims))
+            candidates = _new(np.clip(np.vstack([rng.random((n_candidates - n_candidates // 2, n_dims)), local]),
+                                      0, 1))
+            if batch:
+                candidates = np.array([c for c in candidates
+                                       if not any(np.allclose(c, b) for b in batch)]).reshape(-1, n_dims)
+            if not len(candidates):
+                break
+            mean, std = model.predict(candidates)
+            ei = expected_improvement(mean, std, best, xi * scale)
+            choice = candidates[int(np.argmax(ei))]
+            batch.append(choice)
+            if len(batch) < q:
+                # kriging believer: pretend the choice returned its predicted mean and refit without re-tuning
+                believer_x = np.vstack([believer_x, choice])
+                believer_y = np.append(believer_y, model.predict(choice[None])[0])
+                model.fit(believer_x, believer_y, optimize=False)
+        if not batch:
+            break
+        _evaluate(np.array(batch))
+        nit += 1
+
+    y = store.y
+    best = int(np.argmin(y))
+    return OptimizeResult(x=store.x[best], fun=float(y[best]), nfev=nfev, nit=nit, success=bool(np.isfinite(y[best])),
+                          message='evaluation budget reached' if len(store) >= max_evaluations
+                          else 'no new candidates left to evaluate',
+                          x_archive=store.x, fun_archive=y)
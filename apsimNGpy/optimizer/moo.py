@@ -1,17 +1,40 @@
+import os
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import numpy as np
 from pymoo.algorithms.moo.nsga2 import NSGA2
 from pymoo.config import Config
-from pymoo.core.problem import ElementwiseProblem
+from pymoo.core.problem import ElementwiseProblem, Problem
 from pymoo.optimize import minimize
 
+from apsimNGpy.core.apsim import ApsimModel
 from apsimNGpy.core.cal import OptimizationBase as Runner
+from apsimNGpy.exceptions import ApsimRuntimeError
 from apsimNGpy.optimizer.base import AbstractProblem
 from apsimNGpy.optimizer.optutils import edit_runner
+from apsimNGpy.optimizer.problems.population import evaluate_population
+from apsimNGpy.parallel.warm_pool import WarmWorkerPool
 
 # Disable compilation warning
 Config.warnings['not_compiled'] = False
 
 
+def simulate_decisions(model, decision_vars, x):
+    """
+    Runs one individual of a multi-objective population on a fresh copy of ``model`` and returns its results.
+
+    Module level so process pools can pickle it.
+    """
+    with ApsimModel(model) as clone:
+        for val, spec in zip(x, decision_vars):
+            edit_runner(clone, decision_specs=spec, x_values=val)
+        return clone.run().results
+
+
 class MultiObjectiveProblem(AbstractProblem):
 
     def __init__(self, apsim_model: Runner, objectives: list, *, decision_vars: list = None, cache_size=100):
@@ -43,6 +66,73 @@ class MultiObjectiveProblem(AbstractProblem):
         df = self.apsim_model.run().results
         return np.array([obj(df) for obj in self.objectives])
 
+    def _score(self, df):
+        return [obj(df) for obj in self.objectives]
+
+    def snapshot(self):
+        """
+        Writes the current state of ``apsim_model`` to a temporary ``.apsimx`` file and returns its path.
+
+        Batch evaluations start every individual from a fresh copy of this file, so edits made to ``apsim_model``
+        afterwards (e.g., new report variables) are only seen by the next snapshot, see :meth:`get_problem`.
+        Snapshots live in a scratch directory of this instance: a new snapshot deletes the previous one, and the
+        directory is removed when the instance is garbage collected or the interpreter exits.
+
+        .. versionadded:: 1.5.7
+        """
+        scratch = getattr(self, '_scratch', None)
+        if scratch is None:
+            scratch = self._scratch = tempfile.mkdtemp(prefix='moo_snapshot_')
+            weakref.finalize(self, shutil.rmtree, scratch, ignore_errors=True)
+        previous = getattr(self, '_snapshot', None)
+        if previous:
+            # the model file and the .db written next to it
+            for path in Path(previous).parent.glob(f"{Path(previous).stem}.*"):
+                path.unlink(missing_ok=True)
+        fd, path = tempfile.mkstemp(suffix='.apsimx', dir=scratch)
+        os.close(fd)
+        self.apsim_model.save(path, reload=False)
+        self._snapshot = path
+        return path
+
+    def evaluate_population(self, X, *, n_jobs: int = 1, pool=None, threads: bool = False, penalty: float = 1e20):
+        """
+        Evaluate the objectives of a whole population with one batch of independent simulations.
+
+        Each individual is simulated on its own copy of the model snapshot, with its decision vector applied
+        through :func:`~apsimNGpy.optimizer.optutils.edit_runner`, so the jobs share no model and run in parallel.
+        The objectives are computed in the calling process from each job's result frame, they do not need to
+        be picklable.
+
+        Parameters
+        ----------
+        X : array-like
+            Decision vectors, shape ``(n_individuals, n_var)``.
+        n_jobs : int, default 1
+            Worker processes used when ``pool`` is not given.
+        pool : WarmWorkerPool | concurrent.futures.Executor, optional
+            A running pool reused across generations, see :class:`~apsimNGpy.parallel.warm_pool.WarmWorkerPool`.
+        threads : bool, default False
+            Use threads instead of processes when ``pool`` is not given.
+        penalty : float, default 1e20
+            Value of every objective of an individual whose simulation failed. It is finite, because NSGA-II's
+            crowding distance is undefined for infinite objectives.
+
+        Returns
+        -------
+        numpy.ndarray
+            Objective values, shape ``(n_individuals, n_obj)``.
+
+        .. versionadded:: 1.5.7
+        """
+        self._check_numeric_vars()
+        snapshot = getattr(self, '_snapshot', None) or self.snapshot()
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return evaluate_population(list(X), simulate_decisions, self._score,
+                                   lambda x: (snapshot, self.decision_vars, list(x)),
+                                   n_jobs=n_jobs, pool=pool, threads=threads, errors=(ApsimRuntimeError,),
+                                   penalty=penalty, shape=(len(self.objectives),))
+
     def optimization_type(self):
         return 'multi-objective'
 
@@ -64,6 +154,62 @@ class MultiObjectiveProblem(AbstractProblem):
         def _evaluate(self, x, out, *args, **kwargs):
             out["F"] = self.core_problem.evaluate_objectives(x, args, kwargs)
 
+    class SetUpBatchProblem(Problem):
+        """
+        Population-wise counterpart of :class:`SetUpProblem`, pymoo hands it the whole offspring population and it is
+        evaluated as one parallel batch by :meth:`MultiObjectiveProblem.evaluate_population`.
+
+        Without a ``pool`` and with ``n_jobs > 1``, the problem starts one pool on the first generation and keeps it
+        for the following ones: a :class:`~apsimNGpy.parallel.warm_pool.WarmWorkerPool`, or a thread pool when
+        ``threads`` is true. Use the problem as a context manager, or call :meth:`close`, to shut it down after the
+        run; it is also shut down when the problem is garbage collected.
+
+        .. versionadded:: 1.5.7
+        """
+
+        def __init__(self, core_problem, n_jobs=1, pool=None, threads=False, **kwargs):
+            self.core_problem = core_problem
+            self.n_jobs, self.pool, self.threads = n_jobs, pool, threads
+            self._own_pool = self._shutdown = None
+            xl, xu = core_problem.extract_bounds()
+            super().__init__(
+                n_var=len(core_problem.decision_vars),
+                n_obj=len(core_problem.objectives),
+                n_ieq_constr=0,
+                xl=np.array(xl),
+                xu=np.array(xu), **kwargs
+            )
+
+        def __getstate__(self):
+            state = self.__dict__.copy()
+            state['pool'] = state['_own_pool'] = state['_shutdown'] = None
+            return state
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            self.close()
+
+        def _pool(self):
+            if self.pool is not None or self.n_jobs <= 1:
+                return self.pool
+            if self._own_pool is None:
+                pool = ThreadPoolExecutor(max_workers=self.n_jobs) if self.threads else WarmWorkerPool(
+                    n_workers=self.n_jobs)
+                self._own_pool, self._shutdown = pool, weakref.finalize(self, pool.shutdown)
+            return self._own_pool
+
+        def close(self):
+            """Shuts down the pool started by this problem, a later evaluation starts a new one."""
+            shutdown, self._own_pool, self._shutdown = self._shutdown, None, None
+            if shutdown is not None:
+                shutdown()
+
+        def _evaluate(self, X, out, *args, **kwargs):
+            out["F"] = self.core_problem.evaluate_population(X, n_jobs=self.n_jobs, pool=self._pool(),
+                                                            threads=self.threads)
+
     def extract_bounds(self):
         xl, xu = [], []
         for var in self.decision_vars:
@@ -73,13 +219,56 @@ class MultiObjectiveProblem(AbstractProblem):
             xu.append(var['bounds'][1])
         return xl, xu
 
-    def get_problem(self):
-        return self.SetUpProblem(self)
+    def get_problem(self, batch=False, n_jobs=1, pool=None, threads=False):
+        """
+        pymoo problem for this instance.
+
+        Parameters
+        ----------
+        batch : bool, default False
+            Return a :class:`SetUpBatchProblem`, which simulates each generation as one batch of independent jobs
+            on fresh copies of the model instead of editing and running ``apsim_model`` once per individual. A new
+            model snapshot is taken on each call.
+        n_jobs : int, default 1
+            Worker processes for the batches, ``-1`` for all CPUs.
+        pool : WarmWorkerPool, optional
+            Running pool for the batches, left running. Without it, the problem starts its own pool on the first
+            generation, see :class:`SetUpBatchProblem`.
+        threads : bool, default False
+            Use threads instead of processes for the pool started by the problem.
+
+        Raises
+        ------
+        ValueError
+            With ``batch=True`` if a decision variable is not of type ``'int'`` or ``'float'``: populations are
+            evaluated as numeric arrays.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            with problem.get_problem(batch=True, n_jobs=8) as batch_problem:
+                result = minimize(batch_problem, NSGA2(pop_size=40), ('n_gen', 20), seed=1)
+
+        .. versionchanged:: 1.5.7
+           Added ``batch``, ``n_jobs``, ``pool`` and ``threads``.
+        """
+        if not batch:
+            return self.SetUpProblem(self)
+        self._check_numeric_vars()
+        self.snapshot()
+        n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else int(n_jobs)
+        return self.SetUpBatchProblem(self, n_jobs=n_jobs, pool=pool, threads=threads)
 
     def is_mixed_type_vars(self):
         """Detect if decision vars contain types other than float or int."""
         return any(var['v_type'] not in {'int', 'float'} for var in self.decision_vars)
 
+    def _check_numeric_vars(self):
+        if self.is_mixed_type_vars():
+            kinds = sorted({str(var['v_type']) for var in self.decision_vars} - {'int', 'float'})
+            raise ValueError(f"batch evaluation supports 'int' and 'float' decision variables only, got {kinds}")
+
     def minimize(self, **kwargs):
         """ Minimization of function of one or more variables, objectives and constraints. wraps around Pymoo
 
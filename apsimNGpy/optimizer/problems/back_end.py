@@ -11,54 +11,15 @@ from tenacity import wait_fixed
 from apsimNGpy.core.apsim import ApsimModel
 from apsimNGpy.core_utils.utils import is_scalar
 from apsimNGpy.exceptions import ApsimRuntimeError
+from apsimNGpy.optimizer.problems.observed import ObservedEvaluator, metric_bounds, metric_direction
 from apsimNGpy.validation.evaluator import Validate
 from apsimNGpy.settings import logger
 
-__all__ = ['runner', 'eval_observed']
+__all__ = ['runner', 'eval_observed', 'ObservedEvaluator']
 
 obs_suffix = '_obs'
 pred_suffix = '_pred'
 
-metric_direction = {
-    "rmse": 1,
-    "mae": 1,
-    "mse": 1,
-    "rrmse": 1,
-    "bias": 1,
-    "me": -1,
-    "wia": -1,
-    "r2": -1,
-    "ccc": -1,
-    "slope": -1,
-}
-
-metric_bounds = {
-    "rmse": (0.0, np.inf),  # RMSE ≥ 0
-    "mae": (0.0, np.inf),  # MAE ≥ 0
-    "mse": (0.0, np.inf),  # MSE ≥ 0
-
-    # RRMSE can exceed 1 for poor models → upper bound should be ∞
-    "rrmse": (0.0, np.inf),
-
-    # Bias is unbounded in both directions
-    "bias": (-np.inf, np.inf),
-
-    # Mean error (ME) is signed → can be negative or positive
-    "me": (-np.inf, np.inf),
-
-    # Willmott’s index of agreement: 0–1
-    "wia": (-1, 0.0),
-
-    # R² is between 0 and 1
-    "r2": (-1, 0.0),
-
-    # Lin’s CCC ranges from -1 to 1
-    "ccc": (-1.0, 1.0),
-
-    # Regression slope can be negative, positive, or >1
-    "slope": (-np.inf, np.inf),
-}
-
 
 def detect_range(metric: str, bounds: tuple):
     """
@@ -249,6 +210,10 @@ def eval_observed(
     -------
     float
         Metric value multiplied by the optimization direction.
+
+    See Also
+    --------
+    ObservedEvaluator : compiles ``obs`` once, for scoring many predictions against the same observations.
     """
     # Metric validation
     if method.lower() not in metric_direction:
@@ -322,8 +287,14 @@ def get_table(reports, table):
 
 
 @retry(stop=stop_after_attempt(2), retry=retry_if_exception_type(ApsimRuntimeError))
-def runner(model, params, table=None):
+def runner(model, params, table=None, cache=None):
     # Ideally out_path not needed, as ApsimNGpy generate random temporal files automatically when out_path is not provided
+    # cache is an optional apsimNGpy.core_utils.result_cache.ResultCache, a hit skips the simulation
+    key = cache.make_key(model, params, table=table, namespace='optimizer') if cache is not None else None
+    if key:
+        df = cache.get(key)
+        if df is not None:
+            return df
     with ApsimModel(model) as model:
         try:
             for p in params:
@@ -344,7 +315,8 @@ def runner(model, params, table=None):
             df["year"] = df["date"].dt.year
             df["month"] = df["date"].dt.month
             df["day"] = df["date"].dt.day
-
+        if key:
+            cache.put(key, df)
         return df
     # all transient files are deleted after exiting this block
 
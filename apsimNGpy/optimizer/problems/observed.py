@@ -0,0 +1,240 @@
+"""
+Pre-aligned scoring of simulated output against fixed observations.
+
+:func:`~apsimNGpy.optimizer.problems.back_end.eval_observed` validates both frames, casts the join keys, merges them
+with pandas and builds a :class:`~apsimNGpy.validation.evaluator.Validate` on every objective call. During a
+calibration the observations and the join keys never change, so :class:`ObservedEvaluator` does that work once:
+
+- the observations are cleaned and grouped by join key, the sorted unique keys are kept together with the row
+  positions of every key,
+- each prediction is aligned with one ``searchsorted`` over those keys and integer ``take`` calls instead of a
+  merge (the pairs are those of the inner merge), and
+- all metrics are computed from one pass over the residuals.
+
+The metric values and their optimization directions are the ones of :class:`Validate` and
+:func:`~apsimNGpy.optimizer.problems.back_end.eval_observed`.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+__all__ = ['ObservedEvaluator', 'ObservedEvaluatorMixin', 'metric_direction', 'metric_bounds']
+
+metric_direction = {
+    "rmse": 1,
+    "mae": 1,
+    "mse": 1,
+    "rrmse": 1,
+    "bias": 1,
+    "me": -1,
+    "wia": -1,
+    "r2": -1,
+    "ccc": -1,
+    "slope": -1,
+}
+
+metric_bounds = {
+    "rmse": (0.0, np.inf),  # RMSE ≥ 0
+    "mae": (0.0, np.inf),  # MAE ≥ 0
+    "mse": (0.0, np.inf),  # MSE ≥ 0
+
+    # RRMSE can exceed 1 for poor models → upper bound should be ∞
+    "rrmse": (0.0, np.inf),
+
+    # Bias is unbounded in both directions
+    "bias": (-np.inf, np.inf),
+
+    # Mean error (ME) is signed → can be negative or positive
+    "me": (-np.inf, np.inf),
+
+    # Willmott’s index of agreement: 0–1
+    "wia": (-1, 0.0),
+
+    # R² is between 0 and 1
+    "r2": (-1, 0.0),
+
+    # Lin’s CCC ranges from -1 to 1
+    "ccc": (-1.0, 1.0),
+
+    # Regression slope can be negative, positive, or >1
+    "slope": (-np.inf, np.inf),
+}
+
+_KEY_SEP = '\x1f'
+
+
+def _join_keys(frame: pd.DataFrame, index: Sequence[str]) -> np.ndarray:
+    """Join keys as strings, the same casting as the merge in ``back_end._prepare_eval_data``."""
+    keys = frame[index[0]].astype(str)
+    if len(index) > 1:
+        keys = keys.str.cat([frame[c].astype(str) for c in index[1:]], sep=_KEY_SEP)
+    return keys.to_numpy(dtype=str)
+
+
+class ObservedEvaluator:
+    """
+    Observations compiled once for fast repeated scoring of predictions.
+
+    Parameters
+    ----------
+    obs : pandas.DataFrame
+        Observed values with the ``index`` columns and ``obs_col``. The frame is not modified.
+    index : str or sequence of str
+        Join columns, e.g. ``'year'`` or ``['year', 'site']``.
+    obs_col : str
+        Observed column.
+    pred_col : str
+        Predicted column of the frames passed to :meth:`align`, :meth:`metrics` and :meth:`__call__`.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        evaluator = ObservedEvaluator(obs, index='year', obs_col='observed', pred_col='Yield')
+        for predicted in simulations:
+            loss = evaluator(predicted, 'rmse')
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, obs: pd.DataFrame, index: Union[str, Sequence[str]], obs_col: str, pred_col: str):
+        index = [index] if isinstance(index, str) else list(dict.fromkeys(index))
+        missing = {*index, obs_col} - set(obs.columns)
+        if missing:
+            raise ValueError(f"Missing required columns in observed DataFrame: {missing}")
+        self.index, self.obs_col, self.pred_col = index, obs_col, pred_col
+
+        values = pd.to_numeric(obs[obs_col], errors="coerce").to_numpy(dtype=float)
+        keep = ~np.isnan(values)
+        keys = _join_keys(obs, index)[keep]
+        self._obs_frame = obs.loc[keep, index].astype(str).reset_index(drop=True)
+        self.values = values[keep]
+
+        # sorted unique keys; the rows of key k are rows[offsets[k]:offsets[k + 1]]
+        self.keys, codes, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        self.rows = np.argsort(codes, kind='stable')
+        self.counts = counts
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        if not len(self.keys):
+            raise ValueError(f"No numeric observations in column '{obs_col}'")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def align(self, pred: pd.DataFrame):
+        """
+        Pairs of observed and predicted values, the pairs of an inner merge on the index columns.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Observed values, predicted values, and the observation row of every pair.
+        """
+        missing = {*self.index, self.pred_col} - set(pred.columns)
+        if missing:
+            raise ValueError(f"Missing required columns in predicted DataFrame: {missing}")
+        predicted = pd.to_numeric(pred[self.pred_col], errors="coerce").to_numpy(dtype=float)
+        keys = _join_keys(pred, self.index)
+        pos = np.searchsorted(self.keys, keys)
+        pos_clipped = np.minimum(pos, len(self.keys) - 1)
+        found = (pos < len(self.keys)) & (self.keys[pos_clipped] == keys) & ~np.isnan(predicted)
+        pred_rows = np.flatnonzero(found)
+        codes = pos_clipped[pred_rows]
+
+        # every predicted row pairs with all observations of its key
+        reps = self.counts[codes]
+        total = int(reps.sum())
+        start = np.repeat(self.offsets[codes] - (np.cumsum(reps) - reps), reps)
+        obs_rows = self.rows[np.arange(total) + start]
+        return self.values[obs_rows], predicted[np.repeat(pred_rows, reps)], obs_rows
+
+    def frame(self, pred: pd.DataFrame) -> pd.DataFrame:
+        """Aligned pairs as a frame with the index columns, ``obs_col`` and ``pred_col``."""
+        actual, predicted, rows = self.align(pred)
+        data = self._obs_frame.take(rows).reset_index(drop=True)
+        data[self.obs_col] = actual
+        data[self.pred_col] = predicted
+        return data
+
+    @staticmethod
+    def compute(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
+        """
+        All metrics of :class:`~apsimNGpy.validation.evaluator.Validate` from one pass over the residuals.
+
+        Raises
+        ------
+        ValueError
+            If there are no pairs.
+        """
+        n = len(actual)
+        if n == 0:
+            raise ValueError("Empty arrays provided to Validate().")
+        residual = predicted - actual
+        obs_mean, pred_mean = actual.mean(), predicted.mean()
+        da, dp = actual - obs_mean, predicted - pred_mean
+        sse, ssa, ssp, sap = residual @ residual, da @ da, dp @ dp, da @ dp
+        mse = sse / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = sap / np.sqrt(ssa * ssp)
+            ddof = max(n - 1, 1)
+            sx2, sy2 = ssa / ddof, ssp / ddof
+            return {
+                'BIAS': float(residual.mean()),
+                'CCC': float(2 * sap / ddof / (sx2 + sy2 + (pred_mean - obs_mean) ** 2)) if n >= 3 else np.nan,
+                'MAE': float(np.abs(residual).mean()),
+                'ME': float(1 - sse / ssa),
+                'MSE': float(mse),
+                'R2': float(r ** 2),
+                'RMSE': float(np.sqrt(mse)),
+                'RRMSE': float(np.sqrt(mse) / obs_mean),
+                'SLOPE': float(sap / ssa),
+                'WIA': float(1 - sse / ((np.abs(predicted - obs_mean) + np.abs(da)) ** 2).sum()),
+            }
+
+    def metrics(self, pred: pd.DataFrame) -> Dict[str, float]:
+        """All metrics of ``pred`` against the observations."""
+        return self.compute(*self.align(pred)[:2])
+
+    def __call__(self, pred: pd.DataFrame, method: str = 'rmse', exp: Optional[str] = None) -> float:
+        """
+        Loss of ``pred`` for ``method``, signed for minimization as in
+        :func:`~apsimNGpy.optimizer.problems.back_end.eval_observed`.
+        """
+        key = method.lower()
+        if key not in metric_direction:
+            raise ValueError(f"Unsupported metric method: '{method}'. Choose from {list(metric_direction.keys())}")
+        if exp:
+            data = self.frame(pred)
+            data.eval(exp, inplace=True)
+            actual = data[self.obs_col].to_numpy(dtype=float)
+            predicted = data[self.pred_col].to_numpy(dtype=float)
+        else:
+            actual, predicted, _ = self.align(pred)
+        if key == 'ccc' and len(actual) < 3:
+            raise ValueError("Insufficient data to compute CCC (minimum 3 pairs required).")
+        out = metric_direction[key] * self.compute(actual, predicted)[key.upper()]
+        return abs(out) if key == 'bias' else out
+
+
+class ObservedEvaluatorMixin:
+    """
+    Cached :class:`ObservedEvaluator` of an optimization problem with ``obs``, ``index``, ``obs_column`` and
+    ``predicted_col`` attributes.
+
+    .. versionadded:: 1.5.7
+    """
+
+    def _observed_evaluator(self) -> ObservedEvaluator:
+        """
+        Observations compiled for scoring, built on first use and rebuilt if ``obs``, ``index`` or the compared
+        columns were reassigned.
+        """
+        index = tuple([self.index] if isinstance(self.index, str) else self.index)
+        spec = (self.obs, index, self.obs_column, self.predicted_col)
+        evaluator = getattr(self, '_evaluator', None)
+        if evaluator is None or evaluator[0] is not spec[0] or evaluator[1:-1] != spec[1:]:
+            self._evaluator = spec + (ObservedEvaluator(self.obs, list(index), self.obs_column, self.predicted_col),)
+        return self._evaluator[-1]
@@ -0,0 +1,151 @@
+"""
+Batched evaluation of optimizer populations.
+
+Population based solvers such as differential evolution score ``popsize × N`` candidates per generation. Calling
+the objective once per candidate runs the simulations one after the other. :func:`evaluate_population` takes the
+whole population instead: duplicated candidates are simulated once, the simulations are submitted together to a
+process pool (e.g., a :class:`~apsimNGpy.parallel.warm_pool.WarmWorkerPool`) and the scores come back in population
+order. A generation then costs about one simulation of wall time when there are as many workers as candidates.
+
+Nothing in this module touches APSIM, the simulation and scoring steps are passed in as callables.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ['unique_candidates', 'map_candidates', 'evaluate_population']
+
+
+def _key(candidate) -> tuple:
+    return tuple(np.asarray(candidate, dtype=object).ravel().tolist())
+
+
+def unique_candidates(candidates: Sequence[Sequence[Any]]) -> Tuple[List[Any], np.ndarray]:
+    """
+    Drop repeated candidates.
+
+    Returns
+    -------
+    tuple
+        The unique candidates in order of first appearance, and for every input candidate the position of its
+        unique candidate.
+    """
+    positions, unique, inverse = {}, [], np.empty(len(candidates), dtype=np.intp)
+    for i, candidate in enumerate(candidates):
+        key = _key(candidate)
+        pos = positions.get(key)
+        if pos is None:
+            pos = positions[key] = len(unique)
+            unique.append(candidate)
+        inverse[i] = pos
+    return unique, inverse
+
+
+def map_candidates(simulate: Callable, jobs: Sequence[tuple], *, n_jobs: int = 1, pool=None, threads: bool = False,
+                   errors: Tuple[type, ...] = ()) -> List[Any]:
+    """
+    Run ``simulate(*job)`` for every job, in parallel when ``pool`` is given or ``n_jobs > 1``.
+
+    Parameters
+    ----------
+    simulate : callable
+        Module-level (picklable) function run for each job.
+    jobs : sequence of tuple
+        Positional arguments of each call.
+    n_jobs : int, default 1
+        Workers of the temporary pool created when ``pool`` is ``None``.
+    pool : Executor | WarmWorkerPool, optional
+        Object with a ``submit`` method, reused across calls and left running.
+    threads : bool, default False
+        Use threads instead of processes for the temporary pool.
+    errors : tuple of exception types
+        Exceptions returned in place of the result instead of being raised.
+
+    Returns
+    -------
+    list
+        Results (or caught exceptions) in job order.
+    """
+
+    def _collect(futures):
+        out = []
+        for future in futures:
+            try:
+                out.append(future.result())
+            except errors as e:
+                out.append(e)
+        return out
+
+    if pool is not None:
+        return _collect([pool.submit(simulate, *job) for job in jobs])
+    if n_jobs <= 1 or len(jobs) <= 1:
+        out = []
+        for job in jobs:
+            try:
+                out.append(simulate(*job))
+            except errors as e:
+                out.append(e)
+        return out
+    executor = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with executor(max_workers=min(n_jobs, len(jobs))) as ex:
+        return _collect([ex.submit(simulate, *job) for job in jobs])
+
+
+def evaluate_population(candidates: Sequence[Sequence[Any]], simulate: Callable, score: Callable,
+                        make_job: Callable[[Any], tuple], *, n_jobs: int = 1, pool=None, threads: bool = False,
+                        errors: Tuple[type, ...] = (), penalty: float = np.inf,
+                        on_error: Optional[Callable[[Any, BaseException], None]] = None,
+                        shape: Optional[Tuple[int, ...]] = None) -> np.ndarray:
+    """
+    Score a whole population with one batch of simulations.
+
+    Parameters
+    ----------
+    candidates : sequence
+        Decoded parameter vectors, one per population member.
+    simulate : callable
+        Picklable function that runs one simulation, called as ``simulate(*make_job(candidate))``.
+    score : callable
+        Turns one simulation result into a scalar fitness, or into a vector of objective values, runs in the calling
+        process.
+    make_job : callable
+        Builds the ``simulate`` arguments of a candidate.
+    n_jobs, pool, threads :
+        See :func:`map_candidates`.
+    errors : tuple of exception types
+        Simulation failures scored as ``penalty`` instead of aborting the generation.
+    penalty : float, default inf
+        Fitness (of every objective) of failed candidates.
+    on_error : callable, optional
+        Called as ``on_error(candidate, exception)`` for each failed candidate.
+    shape : tuple of int, optional
+        Shape of one score, e.g. ``(n_objectives,)``. Without it, the shape is taken from the first successful
+        candidate, which is not possible when every candidate failed or the population is empty; scalar scores
+        are assumed then.
+
+    Returns
+    -------
+    numpy.ndarray
+        Fitness of every candidate in population order, shape ``(len(candidates),)`` for scalar scores and
+        ``(len(candidates), n_objectives)`` for vector scores.
+    """
+    unique, inverse = unique_candidates(candidates)
+    if not unique:
+        return np.empty((0, *(shape or ())))
+    results = map_candidates(simulate, [make_job(c) for c in unique], n_jobs=n_jobs, pool=pool, threads=threads,
+                             errors=errors)
+    scores = []
+    for candidate, result in zip(unique, results):
+        if isinstance(result, BaseException):
+            if on_error is not None:
+                on_error(candidate, result)
+            scores.append(None)
+        else:
+            scores.append(np.asarray(score(result), dtype=float))
+    if shape is None:
+        shape = next((s.shape for s in scores if s is not None), ())
+    fitness = np.stack([np.full(shape, penalty) if s is None else s for s in scores])
+    return fitness[inverse]
@@ -24,13 +24,14 @@ from apsimNGpy.optimizer.problems.variables import (
     filter_apsim_params, validate_user_params_cont, BaseParamsContinuous
 )
 from apsimNGpy.optimizer.problems.back_end import runner, eval_observed
+from apsimNGpy.optimizer.problems.observed import ObservedEvaluatorMixin
 from wrapdisc import Objective
 from wrapdisc.var import UniformVar  # can be generalized for other variable types
 
 __all__ = ['ContinuousProblem']
 
 
-class ContinuousProblem:
+class ContinuousProblem(ObservedEvaluatorMixin):
     """
     Defines a single-objective mixed-variable optimization problem for APSIM models.
 
@@ -95,6 +96,7 @@ class ContinuousProblem:
         self.accuracy_indicator = metric
         self.table = table
         self.func = func
+        self._evaluator = None
         self.inputs_ok = False
 
         # internal containers
@@ -701,13 +703,7 @@ class ContinuousProblem:
             predicted = runner(self.model, params=self._insert_x_vars(x), table=self.table)
             if callable(self.func):
                 return self.func(predicted)
-            eval_out = eval_observed(
-                self.obs,
-                predicted,
-                pred_col=self.predicted_col,
-                obs_col=self.obs_column,
-                index=self.index,
-                method=self.accuracy_indicator)
+            eval_out = self._observed_evaluator()(predicted, self.accuracy_indicator)
 
             return eval_out
         except ApsimRuntimeError as ape:
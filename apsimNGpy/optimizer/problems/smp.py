@@ -27,13 +27,15 @@ from apsimNGpy.optimizer.problems.variables import (
     BaseParamsContinuous,
 )
 from apsimNGpy.optimizer.problems.back_end import runner, eval_observed
+from apsimNGpy.optimizer.problems.observed import ObservedEvaluatorMixin
+from apsimNGpy.optimizer.problems.population import evaluate_population
 from wrapdisc import Objective
 from wrapdisc.var import UniformVar  # can be generalized for other variable types
 
 __all__ = ['MixedProblem']
 
 
-class MixedProblem:
+class MixedProblem(ObservedEvaluatorMixin):
     """
     Defines a single-objective mixed-variable optimization problem for APSIM models.
 
@@ -59,6 +61,11 @@ class MixedProblem:
         APSIM output table name (if applicable).
     func : callable or None, optional
         Custom evaluation function to override the built-in validation workflow. if provided should leave room for predicted argument
+    cache : apsimNGpy.core_utils.result_cache.ResultCache or None, optional
+        On-disk result cache. Parameter vectors that were already simulated, e.g., repeated members of a differential
+        evolution population or a restarted calibration, are read from the cache instead of re-running APSIM.
+
+        .. versionadded:: 1.5.7
 
     Notes
     -----
@@ -78,6 +85,7 @@ class MixedProblem:
             metric: str = "RMSE",
             table: Optional[str] = None,
             func: Optional[Any] = None,
+            cache=None,
 
     ):
 
@@ -99,6 +107,8 @@ class MixedProblem:
         self.accuracy_indicator = metric
         self.table = table
         self.func = func
+        self._evaluator = None
+        self.cache = cache
         self.inputs_ok = False
 
         # internal containers
@@ -140,8 +150,9 @@ class MixedProblem:
         """Number of submitted optimization factors."""
         return len(self.var_names)
 
-    def define_nlc(self, lower_bound: float, upper_bound: float):
-        constraints = NonlinearConstraint(self.evaluate_objectives, lb=lower_bound,
+    def define_nlc(self, lower_bound: float, upper_bound: float, func=None):
+        """``func`` replaces :meth:`evaluate_objectives`, e.g., with :meth:`population_objective` for vectorized solvers."""
+        constraints = NonlinearConstraint(func or self.evaluate_objectives, lb=lower_bound,
                                           ub=upper_bound)
         return constraints
 
@@ -816,41 +827,98 @@ class MixedProblem:
             self.inputs_ok = passed
         try:
 
-            predicted = runner(self.model, params=self._insert_x_vars(x), table=self.table)
-
-            if callable(self.func):
-                return self.func(predicted)
-            eval_out = eval_observed(
-                self.obs,
-                predicted,
-                pred_col=self.predicted_col,
-                obs_col=self.obs_column,
-                index=self.index,
-                method=self.accuracy_indicator)
+            predicted = runner(self.model, params=self._insert_x_vars(x), table=self.table, cache=self.cache)
 
-            return eval_out
+            return self._score(predicted)
         except ApsimRuntimeError as ape:
             # Not all sampled x inputs will be APSIM-compatible
-            from apsimNGpy.optimizer.problems.back_end import metric_direction
-            from apsimNGpy.settings import logger
-            penalty = np.inf
-            logger.warning(
-                f"Simulation failed for x variables {x} using metric '{self.accuracy_indicator}'. "
-                f"Returning a penalty value ({penalty})."
-            )
-            # regardless of the direction  np.inf is always a good penalty for incompatible values
+            return self._failed_candidate(x, ape)
+
+    def _score(self, predicted):
+        """Objective value of one simulation output."""
+        if callable(self.func):
+            return self.func(predicted)
+        return self._observed_evaluator()(predicted, self.accuracy_indicator)
+
+    def _failed_candidate(self, x, error):
+        from apsimNGpy.settings import logger
+        penalty = np.inf
+        logger.warning(
+            f"Simulation failed for x variables {x} using metric '{self.accuracy_indicator}'. "
+            f"Returning a penalty value ({penalty})."
+        )
+        # regardless of the direction  np.inf is always a good penalty for incompatible values
+
+        self.invalid_fx.append(penalty)
 
-            self.invalid_fx.append(penalty)
+        # If too many failures occur, stop the process
+        if len(self.invalid_fx) > 15:
+            raise RuntimeError(
+                "Repeated simulation failures detected. "
+                "Something may be fundamentally wrong; restarting the session may help. "
+                f"Original error: {error}"
+            ) from error
+
+        return penalty
+
+    def _population_job(self, x):
+        return self.model, list(self._insert_x_vars(x)), self.table, self.cache
+
+    def evaluate_population(self, population, *, n_jobs: int = 1, pool=None, threads: bool = False) -> np.ndarray:
+        """
+        Evaluate the objective for a whole population of parameter vectors with one batch of simulations.
+
+        Repeated vectors are simulated once, and the simulations run in parallel on ``pool`` or on ``n_jobs``
+        temporary worker processes. Failed simulations are scored ``np.inf``, as in :meth:`evaluate_objectives`.
+
+        Parameters
+        ----------
+        population : sequence of array-like
+            Decoded parameter vectors, one per row, in the order of :attr:`var_names`.
+        n_jobs : int, default 1
+            Number of worker processes used when ``pool`` is not given.
+        pool : WarmWorkerPool | concurrent.futures.Executor, optional
+            A running pool reused across generations, see :class:`~apsimNGpy.parallel.warm_pool.WarmWorkerPool`.
+        threads : bool, default False
+            Use threads instead of processes when ``pool`` is not given.
+
+        Returns
+        -------
+        numpy.ndarray
+            Objective values with shape ``(len(population),)`` in population order.
+
+        .. versionadded:: 1.5.7
+        """
+        population = list(population)
+        if not population:
+            return np.empty(0)
+        if not self.inputs_ok:
+            from apsimNGpy.optimizer.problems.back_end import test_inputs
+
+            self.inputs_ok = test_inputs(model=self.model, x=population[0], insert_x_vars=self._insert_x_vars,
+                                         runner=runner, table=self.table, verbose=False)
+        return evaluate_population(population, runner, self._score, self._population_job, n_jobs=n_jobs,
+                                   pool=pool, threads=threads, errors=(ApsimRuntimeError,),
+                                   on_error=self._failed_candidate)
+
+    def population_objective(self, *, n_jobs: int = 1, pool=None, threads: bool = False):
+        """
+        Objective for ``scipy.optimize.differential_evolution(..., vectorized=True)``.
+
+        The returned callable takes the solver's ``(N, S)`` array of (encoded) candidates, decodes them when the
+        factors define ``vtype`` and returns the ``(S,)`` objective values from :meth:`evaluate_population`.
+
+        .. versionadded:: 1.5.7
+        """
+        wrapper = None if self._detect_pure_vars() else (self.wrapped_objectives or self.wrap_objectives())
 
-            # If too many failures occur, stop the process
-            if len(self.invalid_fx) > 15:
-                raise RuntimeError(
-                    "Repeated simulation failures detected. "
-                    "Something may be fundamentally wrong; restarting the session may help. "
-                    f"Original error: {ape}"
-                ) from ape
+        def objective(x, *args):
+            x = np.asarray(x)
+            columns = x.reshape(len(x), -1).T
+            population = [wrapper.decode(c) for c in columns] if wrapper is not None else list(columns)
+            return self.evaluate_population(population, n_jobs=n_jobs, pool=pool, threads=threads)
 
-            return penalty
+        return objective
 
     def _test_inputs(self, x, verbose=False) -> None:
         """
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import time
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-from itertools import batched
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from itertools import batched, islice
 from multiprocessing import cpu_count
 from pathlib import Path
 from typing import Any, Callable, Iterable, List, Sequence, Optional
@@ -25,10 +27,41 @@ def batch(iterable, k=10):
 CPU = int(int(cpu_count()) * 0.5)
 
 
-def select_type(use_thread: bool, n_cores: int):
+def select_type(use_thread: bool, n_cores: int, executor=None):
+    # a user-supplied executor, e.g., WarmWorkerPool, is owned by the caller and must not be shut down here
+    if executor is not None:
+        return nullcontext(executor)
     return ThreadPoolExecutor(n_cores) if use_thread else ProcessPoolExecutor(n_cores)
 
 
+def _bounded_submit(pool, func, iterable: Iterable, args: Sequence[Any], max_in_flight: int,
+                    ordered: bool = False):
+    """
+    Submit jobs from ``iterable`` to ``pool`` while keeping at most ``max_in_flight`` futures pending.
+
+    The iterable is consumed lazily, the next job is pulled only when a running one completes,
+    so memory stays flat regardless of the number of jobs. Completed futures are yielded either
+    as they finish (``ordered=False``) or in the submission order (``ordered=True``).
+    """
+    jobs = iter(iterable)
+    pending = deque(pool.submit(func, i, *args) for i in islice(jobs, max_in_flight))
+    if ordered:
+        while pending:
+            future = pending.popleft()
+            # wait on the head only, then refill the window with one job
+            future.result()
+            for i in islice(jobs, 1):
+                pending.append(pool.submit(func, i, *args))
+            yield future
+    else:
+        pending = set(pending)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for i in islice(jobs, len(done)):
+                pending.add(pool.submit(func, i, *args))
+            yield from done
+
+
 def custom_parallel(func, iterable: Iterable, *args, **kwargs):
     """
     Run a function in parallel using threads or processes.
@@ -67,6 +100,20 @@ def custom_parallel(func, iterable: Iterable, *args, **kwargs):
         if ``True``, func must return False or True. For simulations written to a database, this adquate
         .. versionadded:: 1.0.0
     progressbar : bool, optional, default=True
+    max_in_flight : int, optional, default=None
+        Enables streaming submission. At most ``max_in_flight`` jobs are queued on the pool at any time and the next
+        job is pulled from ``iterable`` only when a running one completes, so generators with millions of jobs are
+        never materialized. A window of 2-4 times ``ncores`` keeps all workers busy. If ``None``, all jobs are
+        submitted upfront.
+        .. versionadded:: 1.5.7
+    ordered : bool, optional, default=False
+        Only used with ``max_in_flight``. If ``True``, results are yielded in the order of ``iterable``;
+        otherwise, they are yielded as they complete.
+        .. versionadded:: 1.5.7
+    executor : concurrent.futures.Executor or WarmWorkerPool, optional
+        An already running pool to submit the jobs to, instead of creating a new one. It is left running on exit,
+        ``use_thread`` and ``ncores`` are ignored.
+        .. versionadded:: 1.5.7
 
     Examples
     --------
@@ -74,6 +121,11 @@ def custom_parallel(func, iterable: Iterable, *args, **kwargs):
 
     >>> list(run_parallel(work, range(5), use_thread=False, ncores=4))
 
+    Stream a very large generator of jobs with a bounded window of pending jobs:
+
+    >>> for result in custom_parallel(work, job_generator(), ncores=8, max_in_flight=24):
+    ...     pass
+
     Run with threads (I/O-bound):
 
     >>> for _ in run_parallel(download, urls, use_thread=True, verbose=True):
@@ -91,12 +143,22 @@ def custom_parallel(func, iterable: Iterable, *args, **kwargs):
     unit = kwargs.get('unit', 'iteration')
     bar_color= kwargs.get('bar_color', 'green')
     progressbar = kwargs.get('progressbar', True)
+    max_in_flight = kwargs.get('max_in_flight', None)
+    ordered = kwargs.get('ordered', False)
     selection = select_type(use_thread=use_thread,
-                            n_cores=cpu_cores)
+                            n_cores=cpu_cores, executor=kwargs.get('executor'))
 
     with selection as pool:
-        futures = [pool.submit(func, i, *args) for i in iterable]
-        total = len(futures)
+        if max_in_flight:
+            if int(max_in_flight) < 1:
+                raise ValueError('max_in_flight must be a positive integer')
+            # total is only known for sized iterables, generators are never materialized
+            total = len(iterable) if hasattr(iterable, '__len__') else None
+            completed = _bounded_submit(pool, func, iterable, args, int(max_in_flight), ordered=ordered)
+        else:
+            futures = [pool.submit(func, i, *args) for i in iterable]
+            total = len(futures)
+            completed = as_completed(futures)
         if progressbar:
             with tqdm(
                     total=total,
@@ -107,12 +169,14 @@ def custom_parallel(func, iterable: Iterable, *args, **kwargs):
                     mininterval=0.05,
                     ascii=SMOOTH_BLOCKS,
                     bar_format=("{desc} {bar} {percentage:3.0f}% "
-                                "({n_fmt}/{total}) >> completed (elapsed=>{elapsed}, eta=>{remaining}) {postfix}"),
+                                "({n_fmt}/{total}) >> completed (elapsed=>{elapsed}, eta=>{remaining}) {postfix}"
+                                if total is not None else
+                                "{desc} {n_fmt} {unit}s >> completed (elapsed=>{elapsed}, rate=>{rate_fmt}) {postfix}"),
                     dynamic_ncols=True,
                     miniters=1,
             ) as pbar:
 
-                for future in as_completed(futures):
+                for future in completed:
                     result = future.result()
                     pbar.update(1)
                     # commented out bcause they're maybe introducing additional computation cost
@@ -125,7 +189,7 @@ def custom_parallel(func, iterable: Iterable, *args, **kwargs):
                     if not void:
                         yield result
         else:
-            for future in as_completed(futures):
+            for future in completed:
                 result = future.result()
                 if not void:
                     yield result
@@ -173,6 +237,10 @@ def parallelize_chunks(func, iterable: Iterable, *args, **kwargs):
         if ``True``, func must return False or True. For simulations written to a database, this adquate
         .. versionadded:: 1.0.0
     progressbar : bool, optional, default=True
+    executor : concurrent.futures.Executor or WarmWorkerPool, optional
+        An already running pool to submit the jobs to, instead of creating a new one. It is left running on exit,
+        ``use_thread`` and ``ncores`` are ignored.
+        .. versionadded:: 1.5.7
 
     Examples
     --------
@@ -198,7 +266,7 @@ def parallelize_chunks(func, iterable: Iterable, *args, **kwargs):
     progressbar = kwargs.get('progressbar', True)
     bar_color = kwargs.get('bar_color', 'green')
     selection = select_type(use_thread=use_thread,
-                            n_cores=cpu_cores)
+                            n_cores=cpu_cores, executor=kwargs.get('executor'))
 
     def fmt_tqdm(total=0):
         return tqdm(
@@ -0,0 +1,289 @@
+"""
+Single-writer aggregation of results produced by parallel workers.
+
+When many workers append to one SQLite database, every insert competes for the database write lock and pays for its
+own commit, so throughput drops as workers are added. :class:`ResultWriter` starts one dedicated process that owns
+the database. Workers only put ``(table_name, DataFrame)`` items on a queue. The writer buffers them and commits them
+in large transactions, either every ``flush_interval`` seconds or as soon as ``flush_rows`` rows are buffered,
+whichever comes first. Items may carry a key, e.g., a job ID. :meth:`ResultWriter.committed` returns the keys whose
+rows are committed, so a checkpoint can record a job only once its results are on disk.
+
+The queue is bounded, so a writer that falls behind slows the workers down instead of filling the memory. A writer
+that fails reports its error at once and keeps draining the queue, so workers never block on it; the next
+:meth:`ResultWriter.put` or :meth:`ResultWriter.committed` in the parent raises the error.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue as _queue
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from apsimNGpy.logger import logger
+
+__all__ = ['ResultWriter']
+
+# pragmas applied on the single writer connection, safe because no other process writes at the same time
+WRITER_PRAGMAS = ('PRAGMA journal_mode=WAL', 'PRAGMA synchronous=NORMAL', 'PRAGMA temp_store=MEMORY')
+_STOP = None
+DEFAULT_MAX_QUEUE_SIZE = 256
+# seconds a blocked put waits before it checks the writer again
+_PUT_POLL = 1.0
+
+
+def _flush(engine, buffer, stats):
+    from apsimNGpy.core_utils.database_utils import write_df_to_sql
+    with engine.begin() as conn:
+        for table_name, frames in buffer.items():
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            write_df_to_sql(df, db_or_con=conn, table_name=table_name, if_exists='append', chunk_size=None)
+            stats['rows'] += len(df)
+    stats['flushes'] += 1
+    buffer.clear()
+
+
+def _writer_loop(items, status, committed, db_path, flush_interval, flush_rows):
+    """Target of the writer process: drains ``items`` until the stop sentinel is received."""
+    from sqlalchemy import create_engine, event
+    stats = {'rows': 0, 'frames': 0, 'flushes': 0, 'error': None}
+    engine = create_engine(f'sqlite:///{db_path}')
+
+    @event.listens_for(engine, 'connect')
+    def _pragmas(dbapi_conn, _):
+        cur = dbapi_conn.cursor()
+        for pragma in WRITER_PRAGMAS:
+            cur.execute(pragma)
+        cur.close()
+
+    buffer, buffered_rows, keys = defaultdict(list), 0, []
+
+    def _commit():
+        _flush(engine, buffer, stats)
+        if keys:
+            # reported only after the transaction succeeded
+            committed.put(list(keys))
+            keys.clear()
+
+    deadline = time.monotonic() + flush_interval
+    stopped = reported = False
+    try:
+        while True:
+            try:
+                item = items.get(timeout=max(0.0, deadline - time.monotonic()))
+            except _queue.Empty:
+                pass
+            else:
+                if item is _STOP:
+                    stopped = True
+                    break
+                table_name, df, *key = item
+                buffer[table_name].append(df)
+                keys.extend(key)
+                buffered_rows += len(df)
+                stats['frames'] += 1
+            if buffered_rows >= flush_rows or time.monotonic() >= deadline:
+                if buffer:
+                    _commit()
+                buffered_rows, deadline = 0, time.monotonic() + flush_interval
+        if buffer:
+            _commit()
+    except Exception as e:
+        stats['error'] = f'{type(e).__name__}: {e}'
+        # report at once, then discard the remaining items so workers never block on a full queue
+        status.put(stats)
+        reported = True
+        while not stopped:
+            stopped = items.get() is _STOP
+    finally:
+        engine.dispose()
+        if not reported:
+            status.put(stats)
+
+
+class ResultWriter:
+    """
+    One process that writes all results of a parallel run to a SQLite database.
+
+    Parameters
+    ----------
+    db_path : str or pathlib.Path
+        SQLite database receiving the results.
+    flush_interval : float, optional, default=2.0
+        Maximum number of seconds a result stays buffered before it is committed.
+    flush_rows : int, optional, default=50_000
+        Commit as soon as this many rows are buffered.
+    max_queue_size : int, optional, default=256
+        Upper bound of the frames waiting in the queue, workers block on ``put`` when it is reached. ``0`` means
+        unbounded.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from apsimNGpy.core.mult_cores import MultiCoreManager
+        from apsimNGpy.parallel.result_writer import ResultWriter
+
+        if __name__ == '__main__':
+            manager = MultiCoreManager(db_path='results.db', single_writer=True)
+            manager.run_all_jobs(jobs, n_cores=32)
+
+            # or with explicit settings
+            manager.single_writer = ResultWriter('results.db', flush_interval=5, flush_rows=200_000)
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, db_path: Union[str, Path], *, flush_interval: float = 2.0, flush_rows: int = 50_000,
+                 max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE):
+        if flush_interval <= 0:
+            raise ValueError(f'flush_interval must be positive got {flush_interval}')
+        if flush_rows < 1:
+            raise ValueError(f'flush_rows must be a positive integer got {flush_rows}')
+        if max_queue_size < 0:
+            raise ValueError(f'max_queue_size must be a non-negative integer got {max_queue_size}')
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_queue_size = max_queue_size
+        self.stats: Optional[dict] = None
+        self._manager = None
+        self._queue = None
+        self._status = None
+        self._committed = None
+        self._committed_keys: list = []
+        self._process: Optional[mp.Process] = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(db_path={str(self.db_path)!r}, flush_interval={self.flush_interval}, "
+                f"flush_rows={self.flush_rows}, running={self.is_running})")
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None
+
+    @property
+    def queue(self):
+        """
+        Queue consumed by the writer. It is a manager proxy, so it can be pickled and sent to pool workers, which
+        put ``(table_name, DataFrame)`` or ``(table_name, DataFrame, key)`` items on it.
+        """
+        if self._queue is None:
+            raise RuntimeError(f'{type(self).__name__} is not running, call start() first')
+        return self._queue
+
+    def start(self) -> 'ResultWriter':
+        """Starts the writer process if it is not running."""
+        if self._process is None:
+            self.stats = None
+            self._manager = mp.Manager()
+            self._queue = self._manager.Queue(self.max_queue_size)
+            self._status = self._manager.Queue()
+            self._committed = self._manager.Queue()
+            self._committed_keys = []
+            self._process = mp.Process(target=_writer_loop, name='apsimNGpy-result-writer', daemon=True,
+                                       args=(self._queue, self._status, self._committed, str(self.db_path),
+                                             self.flush_interval, self.flush_rows))
+            self._process.start()
+        return self
+
+    def _check(self):
+        """Raises the error of a writer that failed or died while running."""
+        if self._process is None:
+            return
+        if self.stats is None:
+            try:
+                self.stats = self._status.get_nowait()
+            except _queue.Empty:
+                if not self._process.is_alive():
+                    self.stats = {'error': f'writer process exited with code {self._process.exitcode}'}
+        if self.stats and self.stats.get('error'):
+            raise RuntimeError(f'writing results to {self.db_path} failed: {self.stats["error"]}')
+
+    def put(self, table_name: str, df: pd.DataFrame, key: Optional[str] = None):
+        """
+        Queue ``df`` to be appended to ``table_name``, ``key`` is reported by :meth:`committed` afterwards.
+
+        Blocks while the queue is full.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer failed.
+        """
+        item = (table_name, df) if key is None else (table_name, df, key)
+        while True:
+            self._check()
+            try:
+                self.queue.put(item, timeout=_PUT_POLL)
+                return
+            except _queue.Full:
+                pass
+
+    def _drain_committed(self):
+        if self._committed is None:
+            return
+        while True:
+            try:
+                self._committed_keys.extend(self._committed.get_nowait())
+            except _queue.Empty:
+                return
+
+    def committed(self) -> list:
+        """
+        Keys of the items whose rows were committed since the last call.
+
+        Keys committed before :meth:`close` are still returned after it, including when the writer failed later.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer failed while running. The keys committed before the failure are returned by the next call.
+        """
+        self._drain_committed()
+        self._check()
+        keys, self._committed_keys = self._committed_keys, []
+        return keys
+
+    def close(self, timeout: Optional[float] = None) -> dict:
+        """
+        Flush the buffered results, stop the writer and return its statistics.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer failed to write the results.
+        """
+        if self._process is None:
+            return self.stats or {}
+        process = self._process
+        try:
+            if process.is_alive():
+                self._queue.put(_STOP)
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                raise TimeoutError(f'{type(self).__name__} did not finish writing within {timeout} seconds')
+            if self.stats is None:
+                try:
+                    self.stats = self._status.get(timeout=1)
+                except _queue.Empty:
+                    self.stats = {'error': f'writer process exited with code {process.exitcode}'}
+        finally:
+            self._drain_committed()
+            self._process = self._queue = self._status = self._committed = None
+            self._manager.shutdown()
+            self._manager = None
+        if self.stats.get('error'):
+            raise RuntimeError(f'writing results to {self.db_path} failed: {self.stats["error"]}')
+        logger.debug(f'{type(self).__name__} wrote {self.stats["rows"]} rows in {self.stats["flushes"]} transactions')
+        return self.stats
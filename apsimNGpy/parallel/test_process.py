@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from apsimNGpy.parallel.process import custom_parallel
+
+
+def square(x):
+    return x * x
+
+
+def sleepy(x):
+    # later jobs finish first, so completion order differs from input order
+    time.sleep(0.001 * (20 - x % 20))
+    return x
+
+
+class CustomParallelStreamingTests(unittest.TestCase):
+    def setUp(self):
+        self.consumed = 0
+
+    def jobs(self, n):
+        for i in range(n):
+            self.consumed += 1
+            yield i
+
+    def test_bounded_window_does_not_materialize_jobs(self):
+        results = custom_parallel(square, self.jobs(1000), use_thread=True, ncores=2, max_in_flight=4,
+                                  progressbar=False)
+        next(results)
+        # only the window plus the refill of the completed job should have been pulled
+        self.assertLessEqual(self.consumed, 4 + 4)
+        rest = list(results)
+        self.assertEqual(len(rest), 999)
+        self.assertEqual(self.consumed, 1000)
+
+    def test_unordered_results(self):
+        out = list(custom_parallel(square, self.jobs(100), use_thread=True, ncores=4, max_in_flight=8,
+                                   progressbar=False))
+        self.assertEqual(sorted(out), [i * i for i in range(100)])
+
+    def test_ordered_results(self):
+        out = list(custom_parallel(sleepy, self.jobs(60), use_thread=True, ncores=4, max_in_flight=8, ordered=True,
+                                   progressbar=False))
+        self.assertEqual(out, list(range(60)))
+
+    def test_ordered_with_progressbar_on_sized_iterable(self):
+        out = list(custom_parallel(square, range(30), use_thread=True, ncores=2, max_in_flight=3, ordered=True))
+        self.assertEqual(out, [i * i for i in range(30)])
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            list(custom_parallel(square, range(3), use_thread=True, max_in_flight=-1, progressbar=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import sqlite3
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+
+from apsimNGpy.parallel.result_writer import ResultWriter
+
+
+def produce(result_queue, i):
+    result_queue.put((f'table_{i % 2}', pd.DataFrame({'job': [i] * 10, 'value': range(10)})))
+    return i
+
+
+def count_rows(db, table):
+    with sqlite3.connect(db) as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+
+class ResultWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.db = Path(self.tmp.name) / 'results.db'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_workers_send_frames_to_one_writer(self):
+        with ResultWriter(self.db, flush_rows=100) as writer:
+            with ProcessPoolExecutor(4) as pool:
+                list(pool.map(produce, [writer.queue] * 40, range(40)))
+        stats = writer.stats
+        self.assertEqual(stats['frames'], 40)
+        self.assertEqual(stats['rows'], 400)
+        # 400 rows with a 100 rows threshold are committed in a handful of transactions, not 40
+        self.assertLess(stats['flushes'], 10)
+        self.assertEqual(count_rows(self.db, 'table_0') + count_rows(self.db, 'table_1'), 400)
+
+    def test_flush_interval_commits_while_running(self):
+        writer = ResultWriter(self.db, flush_interval=0.2).start()
+        try:
+            writer.put('results', pd.DataFrame({'a': [1, 2, 3]}))
+            time.sleep(1.5)
+            self.assertEqual(count_rows(self.db, 'results'), 3)
+        finally:
+            writer.close()
+
+    def test_committed_keys_follow_transactions(self):
+        writer = ResultWriter(self.db, flush_interval=60, flush_rows=5).start()
+        try:
+            writer.put('results', pd.DataFrame({'a': [1, 2, 3]}), key='job-1')
+            writer.put('results', pd.DataFrame({'a': [4]}))
+            time.sleep(0.5)
+            # buffered, not committed yet
+            self.assertEqual(writer.committed(), [])
+            writer.put('results', pd.DataFrame({'a': [5, 6]}), key='job-2')
+            writer.put('results', pd.DataFrame({'a': [7]}), key='job-3')
+            deadline = time.monotonic() + 10
+            keys = []
+            while len(keys) < 2 and time.monotonic() < deadline:
+                keys += writer.committed()
+                time.sleep(0.05)
+            self.assertEqual(keys, ['job-1', 'job-2'])
+            self.assertEqual(count_rows(self.db, 'results'), 6)
+        finally:
+            writer.close()
+        self.assertEqual(writer.committed(), ['job-3'])
+
+    def test_writer_errors_are_raised_on_close(self):
+        # every frame is committed on its own, so the second one hits a table without its column
+        writer = ResultWriter(self.db, flush_rows=1).start()
+        writer.put('results', pd.DataFrame({'a': [1]}))
+        writer.put('results', pd.DataFrame({'b': [1]}))
+        with self.assertRaises(RuntimeError):
+            writer.close()
+        self.assertFalse(writer.is_running)
+
+    def test_writer_errors_are_raised_while_running(self):
+        writer = ResultWriter(self.db, flush_rows=1, max_queue_size=2).start()
+        keys = []
+        try:
+            writer.put('results', pd.DataFrame({'a': [1]}), key='job-1')
+            writer.put('results', pd.DataFrame({'b': [1]}))
+            deadline = time.monotonic() + 10
+            with self.assertRaises(RuntimeError):
+                while time.monotonic() < deadline:
+                    keys += writer.committed()
+                    time.sleep(0.05)
+            # the failed writer keeps draining its queue, workers do not block on it
+            for _ in range(5):
+                writer.queue.put(('results', pd.DataFrame({'a': [1]})), timeout=5)
+            with self.assertRaises(RuntimeError):
+                writer.put('results', pd.DataFrame({'a': [1]}))
+        finally:
+            with self.assertRaises(RuntimeError):
+                writer.close()
+        self.assertEqual(keys + writer.committed(), ['job-1'])
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            ResultWriter(self.db, flush_rows=0)
+        with self.assertRaises(ValueError):
+            ResultWriter(self.db, max_queue_size=-1)
+        with self.assertRaises(RuntimeError):
+            _ = ResultWriter(self.db).queue
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from apsimNGpy.parallel.warm_pool import WarmWorkerPool
+
+
+def mark_worker(directory):
+    Path(directory, str(os.getpid())).touch()
+
+
+def get_pid():
+    return os.getpid()
+
+
+class WarmWorkerPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_status_reports_each_worker_once(self):
+        with WarmWorkerPool(3, load_apsim=False, initializer=mark_worker, initargs=(self.tmp.name,)) as pool:
+            pids = sorted(st['pid'] for st in pool.status(timeout=60))
+            self.assertEqual(len(set(pids)), 3)
+            self.assertEqual(sorted(int(p.name) for p in Path(self.tmp.name).iterdir()), pids)
+            self.assertEqual(sorted(st['pid'] for st in pool.status()), pids)
+            self.assertTrue(pool.health_check())
+            self.assertEqual((pool.jobs_submitted, pool.restarts), (0, 0))
+
+    def test_status_does_not_count_as_jobs(self):
+        # one spawned worker, recycled after two jobs
+        with WarmWorkerPool(1, max_jobs_per_worker=2, load_apsim=False) as pool:
+            pid = pool.status(timeout=120)[0]['pid']
+            for _ in range(4):
+                self.assertEqual([st['pid'] for st in pool.status()], [pid])
+            self.assertEqual(pool.submit(get_pid).result(timeout=60), pid)
+            self.assertEqual([(st['pid'], st['jobs']) for st in pool.status()], [(pid, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
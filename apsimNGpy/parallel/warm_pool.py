@@ -0,0 +1,284 @@
+"""
+Long-lived process pool whose workers load pythonnet and the APSIM ``Models`` assembly once.
+
+Creating a new process pool for every batch of simulations means that each worker pays the CLR start-up
+cost again. :class:`WarmWorkerPool` keeps its workers alive between calls, so they can be handed to
+:class:`~apsimNGpy.core.mult_cores.MultiCoreManager` and re-used across hundreds of ``run_all_jobs`` calls,
+e.g., in calibration loops.
+
+Workers report their state to the pool on a queue, once warmed up and then with every job. :meth:`WarmWorkerPool.status`
+reads these reports instead of submitting probe tasks, which could reach one worker several times and miss another,
+and would count toward ``max_jobs_per_worker``.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue as _queue
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from apsimNGpy.logger import logger
+
+__all__ = ['WarmWorkerPool']
+
+# per-process state, populated by the pool initializer inside each worker
+_worker_state = {'pid': None, 'clr_loaded': False, 'jobs': 0, 'started': None, 'apsim_version': None}
+# queue of the pool receiving the worker state
+_reports = None
+# seconds between two reads of the reports while status() waits for workers
+_POLL = 0.05
+
+
+def _warm_up_worker(bin_path=None, initializer=None, initargs=(), reports=None, load_apsim=True):
+    """Runs once in every worker process: pins the APSIM bin path, loads the CLR and reports the worker state."""
+    global _reports
+    if load_apsim:
+        if bin_path is not None:
+            from apsimNGpy.config import configuration
+            configuration.set_temporal_bin_path(bin_path)
+        # importing apsim loads pythonnet, the Models assembly and caches them at module level
+        import apsimNGpy.core.apsim  # noqa: F401
+        from apsimNGpy.starter.starter import CLR
+        _worker_state.update(clr_loaded=bool(CLR.clr_loaded), apsim_version=CLR.apsim_compiled_version)
+    _worker_state.update(pid=os.getpid(), jobs=0, started=time.time())
+    if initializer is not None:
+        initializer(*initargs)
+    _reports = reports
+    _report()
+
+
+def _report():
+    if _reports is not None:
+        _reports.put(_worker_status())
+
+
+def _run_counted(fn, *args, **kwargs):
+    _worker_state['jobs'] += 1
+    _report()
+    return fn(*args, **kwargs)
+
+
+def _worker_status():
+    """Returns a snapshot of the worker state, used by the health checks."""
+    return dict(_worker_state)
+
+
+def _launch_workers(executor):
+    """
+    Starts the processes of a new executor at once. They would otherwise start with the first submissions, and
+    :meth:`WarmWorkerPool.status` must not submit anything.
+    """
+    launch = getattr(executor, '_launch_processes', None)
+    if launch is not None:
+        with executor._shutdown_lock:
+            launch()
+
+
+def _terminate_workers(executor):
+    for proc in list((getattr(executor, '_processes', None) or {}).values()):
+        if proc.is_alive():
+            proc.terminate()
+
+
+class WarmWorkerPool:
+    """
+    A persistent pool of worker processes with the APSIM runtime already loaded.
+
+    Parameters
+    ----------
+    n_workers : int, optional
+        Number of worker processes. Defaults to the machine CPU count minus 2.
+    max_jobs_per_worker : int, optional
+        Recycle each worker after it has executed this many jobs. This bounds the growth of the .NET heap in
+        long-lived workers. ``None`` keeps the workers alive until :meth:`shutdown` is called.
+    bin_path : str or pathlib.Path, optional
+        APSIM bin path to pin in the workers. Defaults to the globally configured bin path.
+    initializer : callable, optional
+        Additional initializer called once in every worker after the CLR is loaded.
+    initargs : tuple, optional
+        Arguments passed to ``initializer``.
+    load_apsim : bool, optional, default=True
+        Load the APSIM runtime in the workers. ``False`` gives a plain warm pool, e.g., for tasks that do not run
+        APSIM.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from apsimNGpy.core.mult_cores import MultiCoreManager
+        from apsimNGpy.parallel.warm_pool import WarmWorkerPool
+
+        if __name__ == '__main__':
+            with WarmWorkerPool(n_workers=8, max_jobs_per_worker=500) as pool:
+                manager = MultiCoreManager(db_path='calibration.db', worker_pool=pool)
+                for params in candidates:
+                    manager.run_all_jobs(make_jobs(params))
+                    df = manager.results
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, n_workers: Optional[int] = None, *, max_jobs_per_worker: Optional[int] = None,
+                 bin_path: Union[str, Path, None] = None, initializer: Optional[Callable] = None,
+                 initargs: tuple = (), load_apsim: bool = True):
+        if n_workers is None:
+            n_workers = max(1, (os.cpu_count() or 1) - 2)
+        if n_workers < 1:
+            raise ValueError(f'n_workers must be a positive integer, got {n_workers}')
+        if max_jobs_per_worker is not None and max_jobs_per_worker < 1:
+            raise ValueError(f'max_jobs_per_worker must be a positive integer, got {max_jobs_per_worker}')
+        self.n_workers = n_workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.bin_path = str(bin_path) if bin_path is not None else None
+        self.initializer = initializer
+        self.initargs = initargs
+        self.load_apsim = load_apsim
+        self.jobs_submitted = 0
+        self.restarts = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._reports = None
+        self._states: dict[int, dict[str, Any]] = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def __repr__(self):
+        state = 'running' if self.is_running else 'stopped'
+        return (f"{type(self).__name__}(n_workers={self.n_workers}, max_jobs_per_worker={self.max_jobs_per_worker},"
+                f" state={state}, jobs_submitted={self.jobs_submitted}, restarts={self.restarts})")
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> 'WarmWorkerPool':
+        """Starts the workers if they are not running. Worker warm-up happens asynchronously."""
+        if self._executor is None:
+            # recycling workers requires spawned processes, as ProcessPoolExecutor itself chooses by default
+            context = mp.get_context('spawn') if self.max_jobs_per_worker else mp.get_context()
+            self._reports, self._states = context.Queue(), {}
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=context,
+                initializer=_warm_up_worker,
+                initargs=(self.bin_path, self.initializer, self.initargs, self._reports, self.load_apsim),
+                max_tasks_per_child=self.max_jobs_per_worker,
+            )
+            _launch_workers(self._executor)
+        return self
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit ``fn(*args, **kwargs)`` to a warm worker.
+
+        The pool is started on first use and transparently restarted once if it was broken by a crashed worker.
+        """
+        self.start()
+        try:
+            future = self._executor.submit(_run_counted, fn, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.warning(f'{type(self).__name__} is broken, restarting the workers')
+            self.recycle()
+            future = self._executor.submit(_run_counted, fn, *args, **kwargs)
+        self.jobs_submitted += 1
+        return future
+
+    def map(self, fn: Callable, *iterables, timeout=None, chunksize=1):
+        """Same as :meth:`concurrent.futures.Executor.map` but on the warm workers."""
+        self.start()
+        return self._executor.map(fn, *iterables, timeout=timeout, chunksize=chunksize)
+
+    def status(self, timeout: Optional[float] = 60) -> list[dict[str, Any]]:
+        """
+        Return the state of every live worker.
+
+        Each entry reports the worker ``pid``, whether the CLR is loaded, the number of jobs it has run since it was
+        (re)started, and the compiled APSIM version. The states are reported by the workers themselves, once warmed
+        up and at the start of every job, so busy workers are included and the call does not count as a job.
+
+        Raises
+        ------
+        TimeoutError
+            If some workers have not finished warming up within ``timeout`` seconds.
+        concurrent.futures.process.BrokenProcessPool
+            If a worker died abruptly.
+        """
+        self.start()
+        executor = self._executor
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            while True:
+                try:
+                    state = self._reports.get_nowait()
+                except _queue.Empty:
+                    break
+                self._states[state['pid']] = state
+            broken = getattr(executor, '_broken', False)
+            if broken:
+                raise BrokenProcessPool(broken)
+            processes = dict(getattr(executor, '_processes', None) or {})
+            crashed = [pid for pid, proc in processes.items() if proc.exitcode not in (None, 0)]
+            if crashed:
+                raise BrokenProcessPool(f'worker(s) {crashed} died abruptly')
+            # workers that exited after max_jobs_per_worker jobs are being replaced
+            live = [pid for pid, proc in processes.items() if proc.exitcode is None]
+            self._states = {pid: self._states[pid] for pid in processes if pid in self._states}
+            waiting = [pid for pid in live if pid not in self._states]
+            if live and not waiting:
+                return [self._states[pid] for pid in live]
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f'{len(waiting) or self.n_workers} worker(s) did not respond within {timeout} '
+                                   f'seconds')
+            time.sleep(_POLL)
+
+    def health_check(self, timeout: Optional[float] = 60, restart: bool = True) -> bool:
+        """
+        Check that the workers are alive, warmed up and, unless ``load_apsim`` is false, have the CLR loaded.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for the workers to respond.
+        restart : bool, optional, default=True
+            Recycle the workers if the check fails.
+
+        Returns
+        -------
+        bool
+            ``True`` if all probed workers are healthy.
+        """
+        try:
+            healthy = all(st['clr_loaded'] or not self.load_apsim for st in self.status(timeout=timeout))
+        except (BrokenProcessPool, TimeoutError) as e:
+            logger.warning(f'{type(self).__name__} health check failed: {e}')
+            healthy = False
+        if not healthy and restart:
+            self.recycle()
+        return healthy
+
+    def recycle(self):
+        """Terminates all workers and starts fresh ones, releasing their .NET heaps."""
+        if self._executor is not None:
+            # hung workers never return from shutdown, so they are terminated explicitly
+            _terminate_workers(self._executor)
+        self.shutdown(wait=False)
+        self.restarts += 1
+        return self.start()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers, after this call the pool can be started again with :meth:`start`."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            if getattr(executor, '_executor_manager_thread', True) is None:
+                # launched by start() but never used, nothing would tell the workers to exit
+                _terminate_workers(executor)
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._reports.close()
+            self._reports = None
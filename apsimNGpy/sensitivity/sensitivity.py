@@ -17,6 +17,7 @@ from pydantic import BaseModel
 from apsimNGpy import is_scalar, timer
 from apsimNGpy.core.apsim import ApsimModel
 from apsimNGpy.core.model_loader import get_node_by_path, Models
+from apsimNGpy.durable.durable_utils import CheckPoint
 from apsimNGpy.sensitivity.helpers import (default_n, define_problem,
                                            generate_default_db_path)
 from apsimNGpy.settings import logger
@@ -32,6 +33,7 @@ warnings.warn(
     stacklevel=2,
 )
 dataError = sqlalchemy.exc.OperationalError
+SENSITIVITY_DB = 'results.db'
 
 __all__ = ['ConfigProblem', 'run_sensitivity']
 
@@ -114,6 +116,7 @@ class ConfigProblem:
             dist: list[str] | None = None,
             groups: list[int] | None = None,
             index_id: str = "ID",
+            result_cache=None,
 
     ):
         self.X = None
@@ -125,6 +128,8 @@ class ConfigProblem:
         self.index_id = index_id
         self.incomplete_jobs = []
         self.NewXVars = None
+        # optional apsimNGpy.core_utils.result_cache.ResultCache, repeated samples and retries skip APSIM
+        self.result_cache = result_cache
 
         self.problem = define_problem(
             params,
@@ -215,18 +220,28 @@ class ConfigProblem:
             groupings: list | None = None,
             tables: list | None = None,
             total_chunks: int = 10,
+            checkpoint: CheckPoint | None = None,
+            resume: bool = False,
     ):
         """
         Run APSIM simulations and return outputs and raw results.
+
+        With a ``checkpoint``, the results are kept in its directory and the finished simulations are recorded, so
+        a run continued with ``resume=True`` only simulates the missing samples.
         """
         table_prefix = '__sens__'
         from apsimNGpy.core.mult_cores import MultiCoreManager, core_count
-        db_path = generate_default_db_path(table_prefix)
+        if checkpoint is not None:
+            db_path = str(checkpoint.directory / SENSITIVITY_DB)
+            jobs_checkpoint = checkpoint.child('jobs')
+        else:
+            db_path = generate_default_db_path(table_prefix)
+            jobs_checkpoint = None
         n_cores = core_count(n_cores, threads=threads)
         PROB_NAMES = self.problem.get('names')
 
         @timer
-        def run_in_multi_core(data_db, sample_matrix, pending_retry=None, chunks=total_chunks):
+        def run_in_multi_core(data_db, sample_matrix, pending_retry=None, chunks=total_chunks, resume_jobs=False):
             from apsimNGpy.parallel.batched import run_multiple_simulations, load_all_results
             # send the grouping to the subset variables
             group = list(get_list_like(groupings))
@@ -248,7 +263,8 @@ class ConfigProblem:
             # if not set(PROB_NAMES).issubset(df.columns):
             #     df = merged(df)
             # return df
-            mc = MultiCoreManager(agg_func=agg_func, db_path=data_db, table_prefix=table_prefix)
+            mc = MultiCoreManager(agg_func=agg_func, db_path=data_db, table_prefix=table_prefix,
+                                  result_cache=self.result_cache)
             mc.run_all_jobs(
                 self.job_maker(sample_matrix, pending=pending_retry),
                 n_cores=n_cores,
@@ -262,12 +278,14 @@ class ConfigProblem:
                 chunk_size=chunk_size,
                 table_name=tables,
                 total_chunks=chunks,
+                checkpoint=jobs_checkpoint,
+                resume=resume_jobs,
             )
             return mc
 
         try:
 
-            manager = run_in_multi_core(data_db=db_path, sample_matrix=X)
+            manager = run_in_multi_core(data_db=db_path, sample_matrix=X, resume_jobs=resume)
             df = manager.get_simulated_output(axis=0)
             completed = [df, ]
             logger.info('Checking incomplete outputs')
@@ -280,11 +298,15 @@ class ConfigProblem:
                 man = run_in_multi_core(
                     data_db=db_path,
                     sample_matrix=sub_x, pending_retry=pending,
-                    chunks=1,
+                    chunks=1, resume_jobs=checkpoint is not None,
                 )
                 dif = man.get_simulated_output(axis=0)
 
-                completed.append(dif)
+                if checkpoint is not None:
+                    # the checkpointed database is not cleared, dif holds all results
+                    completed = [dif]
+                else:
+                    completed.append(dif)
                 # the data frame must be the newly returned
                 pending = list(
                     check_all_completed(dif, expected_ids=pending, index_name=self.index_id)
@@ -307,7 +329,8 @@ class ConfigProblem:
 
         finally:
             try:
-                os.remove(db_path)
+                if checkpoint is None:
+                    os.remove(db_path)
             except PermissionError:
                 pass
             except FileNotFoundError:
@@ -418,7 +441,9 @@ def run_sensitivity(
         chunk_size: int = 100,
         grouping: None | list = None,
         tables: None | list = None,
-        total_chunks: int = 10
+        total_chunks: int = 10,
+        checkpoint: str | Path | CheckPoint | None = None,
+        resume: bool = False,
 ):
     """
     Run a complete sensitivity analysis.
@@ -528,6 +553,16 @@ def run_sensitivity(
         will raise a ValueError if tables are not provided.
     total_chunks : int, optional, default=10
         Relevant only when engine="python".
+    checkpoint : str | Path | CheckPoint | None, optional
+        Directory of a :class:`~apsimNGpy.durable.durable_utils.CheckPoint`. The sample matrix, the simulation
+        results database and the IDs of the finished simulations are kept there instead of in a temporary database.
+
+        .. versionadded:: 1.5.7
+    resume : bool, optional, default=False
+        Continue the run saved in ``checkpoint``: the saved samples are reused and finished simulations are not
+        run again. Without ``resume``, an existing checkpoint is cleared.
+
+        .. versionadded:: 1.5.7
     Examples
     ---------
 
@@ -674,8 +709,23 @@ def run_sensitivity(
 
     sample_options.setdefault('seed', seed)
     eva_data = []
-    X = generate_samples(configured_prob, N=N, method=method, **sample_options)
-    frames = evaluate(X)
+    checkpoint = CheckPoint.coerce(checkpoint)
+    if resume and checkpoint is None:
+        raise ValueError('resume=True requires a checkpoint')
+    names = list(configured_prob.problem.get('names'))
+    state = checkpoint.load() if resume else {}
+    if state:
+        if state['method'] != method or state['names'] != names:
+            raise ValueError(f"checkpoint {checkpoint.directory} holds a {state['method']} run of {state['names']}")
+        X = state['X']
+        logger.info(f'resuming sensitivity analysis from {checkpoint.directory}')
+    else:
+        X = generate_samples(configured_prob, N=N, method=method, **sample_options)
+        if checkpoint is not None:
+            checkpoint.clear()
+            checkpoint.save(X=X, method=method, names=names, N=N,
+                            db_path=str(checkpoint.directory / SENSITIVITY_DB))
+    frames = evaluate(X, checkpoint=checkpoint, resume=bool(state))
     from apsimNGpy.sensitivity.evaluate_salib import evaluate_sensitivity
     from apsimNGpy.sensitivity.fstr import format_salib_results
     try:
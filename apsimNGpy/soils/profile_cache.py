@@ -0,0 +1,443 @@
+"""
+Memoized soil profiles keyed by soil rather than by point.
+
+Neighbouring points usually fall on the same SSURGO map unit or SoilGrids cell, yet each point used to run the whole
+query-and-build pipeline again. :class:`SoilProfileCache` stores finished profiles on disk under a key made of the
+source, the soil identifier (``mukey`` and component, or SoilGrids cell), the layer thicknesses, the crops and the
+remaining profile parameters, bounded by a least-recently-used policy. :func:`soil_profiles_for_points` groups input
+points by that key first, so the number of profile builds equals the number of distinct soils.
+
+Example
+-------
+.. code-block:: python
+
+    from apsimNGpy.soils.profile_cache import SoilProfileCache, soil_profiles_for_points
+
+    cache = SoilProfileCache()
+    profiles = soil_profiles_for_points(lonlats, thickness_mm=[150, 150, 200, 200, 300, 400], source='ssurgo',
+                                        cache=cache)
+    cache.stats  # {'hits': ..., 'misses': ..., 'entries': ...}
+"""
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.logger import logger
+
+__all__ = ['SoilProfileCache', 'as_soil_profile_cache', 'profile_key', 'soilgrids_cell', 'localise_profile',
+           'ssurgo_mukeys', 'ssurgo_tables', 'soil_profiles_for_points']
+
+# SoilGrids is published at 250 m, about 0.0025 degrees at the equator
+SOILGRIDS_RESOLUTION = 0.0025
+CACHE_SUFFIX = '.pkl'
+# bump when the layout of cached profiles changes
+CACHE_VERSION = 2
+SDA_URL = "https://SDMDataAccess.nrcs.usda.gov/Tabular/SDMTabularService.asmx"
+SSURGO_COLUMNS = """
+    mu.mukey as mukey, co.cokey as cokey, ch.chkey as chkey, comppct_r as prcent, compkind as compkind_series,
+    wsatiated_r as wat_r, partdensity as pd, dbthirdbar_h as bb, musym as musymbol, compname as componentname,
+    muname as muname, slope_r, slope_h as slope, hzname, hzdept_r as topdepth, hzdepb_r as bottomdepth,
+    awc_r as PAW, ksat_l as KSAT, claytotal_r as clay, silttotal_r as silt, sandtotal_r as sand, texcl,
+    drainagecl, om_r as OM, iacornsr as CSR, dbthirdbar_r as BD, wfifteenbar_r as L15, wthirdbar_h as DUL,
+    ph1to1h2o_r as pH, ksat_r as sat_hidric_cond
+"""
+
+
+def _default_root() -> Path:
+    from apsimNGpy.settings import META_Dir
+
+    return META_Dir / 'soil_profiles'
+
+
+def profile_key(source: str, soil_id, thickness_mm: Sequence[float], crops=None, **params) -> str:
+    """
+    Cache key of a soil profile.
+
+    Parameters
+    ----------
+    source : str
+        ``'ssurgo'`` or ``'isric'``.
+    soil_id : hashable
+        ``(mukey, component)`` for SSURGO, the cell of :func:`soilgrids_cell` for SoilGrids.
+    thickness_mm : sequence of float
+        Layer thicknesses.
+    crops : dict or sequence of str, optional
+        Crops with a ``SoilCrop`` table.
+    **params
+        Any other argument the profile depends on, e.g., ``top_fom``.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest, stable across sessions.
+    """
+    if isinstance(crops, dict):
+        crops = sorted((k, tuple(v) if isinstance(v, (list, tuple)) else v) for k, v in crops.items())
+    elif crops is not None:
+        crops = sorted(crops)
+    thickness = tuple(float(t) for t in thickness_mm)
+    parts = (CACHE_VERSION, source.lower(), soil_id, thickness, crops, sorted(params.items()))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def soilgrids_cell(lonlat: Sequence[float], resolution: float = SOILGRIDS_RESOLUTION) -> tuple:
+    """
+    Approximate SoilGrids cell of ``lonlat``: the coordinates rounded to multiples of ``resolution``.
+
+    SoilGrids rasters are in the Interrupted Goode Homolosine projection, so this longitude/latitude grid does not
+    follow their cell boundaries, and its cells shrink in longitude towards the poles. Points sharing a key lie within
+    about half a raster cell of the key's coordinates, where the profile is queried, but may fall on a neighbouring
+    raster cell. Use a smaller ``resolution`` where that matters.
+    """
+    lon, lat = lonlat
+    return int(round(lon / resolution)), int(round(lat / resolution))
+
+
+def _cell_center(cell, resolution=SOILGRIDS_RESOLUTION):
+    return cell[0] * resolution, cell[1] * resolution
+
+
+class SoilProfileCache:
+    """
+    Least-recently-used store of soil profiles, in memory and on disk.
+
+    Profiles are pickled to ``root/<key>.pkl``; reading one refreshes its modification time, and the least recently
+    used files are removed once there are more than ``max_entries``. The most recent ``memory_entries`` profiles are
+    also kept in memory. Every read returns an independent copy, so callers may edit it.
+
+    The recency order is listed from the directory once, on first use, and then tracked in memory, so writes do not
+    scan the directory. Entries written by other processes afterwards are still read, but only evicted by an instance
+    that listed them.
+
+    Parameters
+    ----------
+    root : str or pathlib.Path, optional
+        Directory of the cache, defaults to ``soil_profiles`` in the apsimNGpy metadata directory.
+    max_entries : int, optional, default=20000
+        Profiles kept on disk.
+    memory_entries : int, optional, default=256
+        Profiles kept in memory.
+
+    .. versionadded:: 1.5.7
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None, *, max_entries: int = 20_000,
+                 memory_entries: int = 256):
+        if max_entries < 1:
+            raise ValueError(f'max_entries must be a positive integer got {max_entries}')
+        self.root = Path(root or _default_root()).expanduser().resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict = OrderedDict()
+        self._order: Optional[OrderedDict] = None  # every key on disk, least recently used first
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(root={str(self.root)!r}, max_entries={self.max_entries})"
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{CACHE_SUFFIX}"
+
+    def _files(self):
+        return list(self.root.glob(f"*{CACHE_SUFFIX}"))
+
+    def _entries(self) -> OrderedDict:
+        if self._order is None:
+            stamped = []
+            for path in self._files():
+                try:
+                    stamped.append((path.stat().st_mtime_ns, path.stem))
+                except OSError:
+                    continue
+            self._order = OrderedDict((key, None) for _, key in sorted(stamped))
+        return self._order
+
+    def _touch(self, key):
+        with self._lock:
+            entries = self._entries()
+            entries[key] = None
+            entries.move_to_end(key)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key: str):
+        return key in self._memory or self._path(key).is_file()
+
+    def _remember(self, key, payload):
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Profile stored under ``key``, or ``None``."""
+        payload = self._memory.get(key)
+        path = self._path(key)
+        if payload is None:
+            try:
+                payload = path.read_bytes()
+            except OSError:
+                self.misses += 1
+                return None
+        try:
+            os.utime(path)  # LRU order for other processes
+        except OSError:
+            pass
+        self._touch(key)
+        self._remember(key, payload)
+        self.hits += 1
+        return pickle.loads(payload)
+
+    def put(self, key: str, profile: dict) -> None:
+        """Stores ``profile`` under ``key``, evicting the least recently used profiles when full."""
+        payload = pickle.dumps(profile, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, temporary = tempfile.mkstemp(prefix='.profile.', dir=self.root)
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(payload)
+            os.replace(temporary, self._path(key))
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+        self._touch(key)
+        self._remember(key, payload)
+        self._evict()
+
+    def get_or_build(self, key: str, build: Callable[[], dict]) -> dict:
+        """Cached profile of ``key``, calling ``build()`` and storing its result on a miss."""
+        profile = self.get(key)
+        if profile is None:
+            profile = build()
+            self.put(key, profile)
+        return profile
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            stale = [entries.popitem(last=False)[0] for _ in range(len(entries) - self.max_entries)]
+            for key in stale:
+                self._memory.pop(key, None)
+        for key in stale:
+            self._path(key).unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self)}
+
+    def clear(self) -> None:
+        """Removes every cached profile."""
+        with self._lock:
+            self._memory.clear()
+            self._order = OrderedDict()
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+
+def as_soil_profile_cache(cache: Union[SoilProfileCache, str, Path, bool, None]) -> Optional[SoilProfileCache]:
+    """Interprets the ``cache`` argument of the soil download functions."""
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return SoilProfileCache()
+    if isinstance(cache, SoilProfileCache):
+        return cache
+    return SoilProfileCache(cache)
+
+
+def localise_profile(profile: dict, lonlat) -> dict:
+    """An independent copy of a shared profile, with the coordinates of the point it is used for."""
+    profile = copy.deepcopy(profile)
+    meta = profile.get('meta_info')
+    if isinstance(meta, dict) and 'Latitude' in meta:
+        meta.update(Longitude=lonlat[0], Latitude=lonlat[1])
+    return profile
+
+
+# ------------------------ SSURGO and SoilGrids queries ------------------------
+
+def _sda_query(sql: str) -> pd.DataFrame:
+    import requests
+    import xmltodict
+
+    headers = {
+        'Content-Type': 'text/xml; charset=utf-8',
+        'SOAPAction': 'http://SDMDataAccess.nrcs.usda.gov/Tabular/SDMTabularService.asmx/RunQuery'
+    }
+    body = f"""<?xml version="1.0" encoding="utf-8"?>
+    <soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:sdm="http://SDMDataAccess.nrcs.usda.gov/Tabular/SDMTabularService.asmx">
+       <soap:Header/>
+       <soap:Body><sdm:RunQuery><sdm:Query>{sql}</sdm:Query></sdm:RunQuery></soap:Body>
+    </soap:Envelope>"""
+    response = requests.post(SDA_URL, data=body, headers=headers, timeout=140)
+    response.raise_for_status()
+    result = xmltodict.parse(response.content)['soap:Envelope']['soap:Body']['RunQueryResponse']['RunQueryResult']
+    table = (result.get('diffgr:diffgram') or {}).get('NewDataSet') or {}
+    rows = table.get('Table', [])
+    return pd.DataFrame([rows] if isinstance(rows, dict) else rows)
+
+
+def ssurgo_mukeys(lonlats: Sequence[Sequence[float]], batch_size: int = 200) -> list:
+    """SSURGO map unit key of every point, ``None`` outside the survey, with one query per ``batch_size`` points."""
+    mukeys = [None] * len(lonlats)
+    for start in range(0, len(lonlats), batch_size):
+        chunk = lonlats[start:start + batch_size]
+        sql = ' UNION ALL '.join(
+            f"SELECT {start + i} AS point, mukey FROM SDA_Get_Mukey_from_intersection_with_WktWgs84"
+            f"('point({lon} {lat})')" for i, (lon, lat) in enumerate(chunk))
+        found = _sda_query(sql)
+        for point, mukey in zip(found.get('point', []), found.get('mukey', [])):
+            mukeys[int(point)] = str(mukey)
+    return mukeys
+
+
+def ssurgo_tables(mukeys: Sequence[str]) -> pd.DataFrame:
+    """Horizon tables of all components of ``mukeys`` in a single query."""
+    keys = ', '.join(f"'{int(k)}'" for k in mukeys)
+    sql = f"""SELECT {SSURGO_COLUMNS}
+             FROM sacatalog sc
+             FULL OUTER JOIN legend lg ON sc.areasymbol=lg.areasymbol
+             FULL OUTER JOIN mapunit mu ON lg.lkey=mu.lkey
+             FULL OUTER JOIN component co ON mu.mukey=co.mukey
+             FULL OUTER JOIN chorizon ch ON co.cokey=ch.cokey
+             WHERE mu.mukey IN ({keys}) AND sc.areasymbol != 'US'
+             ORDER BY mu.mukey, co.cokey, ch.chkey, topdepth"""
+    return _sda_query(sql)
+
+
+def _select_component(tables: pd.DataFrame, soil_series: Optional[str]) -> pd.DataFrame:
+    """Rows of ``soil_series`` in every map unit, or of the dominant component."""
+    if soil_series is not None:
+        return tables[tables['componentname'] == soil_series]
+    percent = pd.to_numeric(tables['prcent'], errors='coerce')
+    return tables[percent == percent.groupby(tables['mukey']).transform('max')]
+
+
+def _build_ssurgo(soil_ids, thickness_mm, crops, **params) -> dict:
+    from apsimNGpy.soils.batch import build_soil_profiles, ssurgo_layers
+
+    by_series = {}
+    for mukey, series in soil_ids:
+        by_series.setdefault(series, []).append(mukey)
+    profiles = {}
+    for series, mukeys in by_series.items():
+        tables = _select_component(ssurgo_tables(mukeys), series)
+        # one component per map unit, the first when several share the largest percentage
+        first = tables.drop_duplicates('mukey')[['mukey', 'cokey']]
+        tables = tables[tables['cokey'].isin(first['cokey'])]
+        batch = build_soil_profiles(ssurgo_layers(tables, key='mukey'), thickness_mm, crops=crops, **params)
+        names = tables.drop_duplicates('mukey').set_index('mukey')
+        for mukey in batch.keys:
+            profiles[(mukey, series)] = batch.profile(mukey, metadata={
+                'SoilType': names.at[mukey, 'muname'], 'LocalName': names.at[mukey, 'componentname'],
+                'RecordNumber': int(mukey), 'Latitude': 0.0, 'Longitude': 0.0,
+                'DataSource': 'SSURGO, built by apsimNGpy.soils.batch'})
+    return profiles
+
+
+def _build_soilgrids(soil_ids, thickness_mm, crops, **params) -> dict:
+    from itertools import chain
+    from apsimNGpy.soils.batch import build_soil_profiles, soilgrids_layers
+    from apsimNGpy.soils.soilgrid import get_soil_grid_by_lonlat, params as soilgrids_params
+
+    frames = []
+    for cell in soil_ids:
+        lon, lat = _cell_center(cell)
+        data, _ = get_soil_grid_by_lonlat(**{**soilgrids_params, 'lon': lon, 'lat': lat})
+        wide = pd.DataFrame(list(chain.from_iterable(data))).pivot(index='depth', columns='name', values='value')
+        frames.append(wide.reset_index().assign(key=[cell] * len(wide)))
+    batch = build_soil_profiles(soilgrids_layers(pd.concat(frames, ignore_index=True)), thickness_mm, crops=crops,
+                                **params)
+    return {cell: batch.profile(cell, metadata={'Latitude': 0.0, 'Longitude': 0.0,
+                                                'DataSource': 'SoilGrids, built by apsimNGpy.soils.batch'})
+            for cell in batch.keys}
+
+
+def soil_profiles_for_points(lonlats: Sequence[Sequence[float]], thickness_mm: Sequence[float], *,
+                             source: str = 'isric', soil_series: Optional[str] = None, crops: Optional[dict] = None,
+                             cache: Union[SoilProfileCache, str, Path, bool, None] = True,
+                             resolve: Optional[Callable] = None, build: Optional[Callable] = None,
+                             **params) -> list:
+    """
+    Soil profiles of many points, built once per distinct soil.
+
+    Points are mapped to soil identifiers first (SSURGO map unit and component, or SoilGrids cell), grouped, and only
+    identifiers missing from ``cache`` are downloaded, in one query for SSURGO, and built together with
+    :func:`~apsimNGpy.soils.batch.build_soil_profiles`.
+
+    Parameters
+    ----------
+    lonlats : sequence of (lon, lat)
+        Points.
+    thickness_mm : sequence of float
+        Layer thicknesses shared by all profiles.
+    source : {'isric', 'ssurgo'}, optional
+        Soil database.
+    soil_series : str, optional
+        SSURGO component to use in every map unit, the dominant one by default.
+    crops : dict, optional
+        ``{crop: (KL, XF)}`` passed to :func:`~apsimNGpy.soils.batch.build_soil_profiles`.
+    cache : SoilProfileCache, path or bool, optional
+        Profile cache; ``True`` uses the default location and ``False`` or ``None`` disables it.
+    resolve : callable, optional
+        ``resolve(lonlats)`` returning one soil identifier per point, replacing the database lookup.
+    build : callable, optional
+        ``build(soil_ids, thickness_mm, crops, **params)`` returning ``{soil_id: profile}``, replacing the download
+        and :mod:`~apsimNGpy.soils.batch` build.
+    **params
+        Profile parameters of :func:`~apsimNGpy.soils.batch.build_soil_profiles`, e.g., ``top_fom``.
+
+    Returns
+    -------
+    list of dict
+        One profile per point in the layout of :func:`~apsimNGpy.soils.soilgrid.get_soil_profile_soil_grid`, with
+        the point's coordinates in ``meta_info``. ``None`` for points without soil data. Every point gets its own copy
+        of the tables, so editing one profile leaves the others unchanged.
+
+    .. versionadded:: 1.5.7
+    """
+    source = source.lower()
+    if source not in ('isric', 'ssurgo'):
+        raise NotImplementedError(f' source `{source}` not supported. Please choose from `isric` or `ssurgo`')
+    if resolve is None:
+        if source == 'isric':
+            resolve = lambda points: [soilgrids_cell(p) for p in points]
+        else:
+            resolve = lambda points: [None if m is None else (m, soil_series) for m in ssurgo_mukeys(points)]
+    if build is None:
+        build = _build_soilgrids if source == 'isric' else _build_ssurgo
+    cache = as_soil_profile_cache(cache)
+
+    soil_ids = resolve(list(lonlats))
+    keys = {sid: profile_key(source, sid, thickness_mm, crops, **params) for sid in dict.fromkeys(soil_ids)
+            if sid is not None}
+    profiles = {}
+    missing = []
+    for sid, key in keys.items():
+        profile = cache.get(key) if cache is not None else None
+        if profile is None:
+            missing.append(sid)
+        else:
+            profiles[sid] = profile
+    if missing:
+        built = build(missing, thickness_mm, crops, **params)
+        for sid in missing:
+            if sid in built:
+                profiles[sid] = built[sid]
+                if cache is not None:
+                    cache.put(keys[sid], built[sid])
+    logger.info(f"{len(soil_ids)} points, {len(keys)} distinct soils, {len(missing)} built")
+    return [None if sid not in profiles else localise_profile(profiles[sid], point)
+            for sid, point in zip(soil_ids, lonlats)]
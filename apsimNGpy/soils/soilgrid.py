@@ -92,7 +92,7 @@ def get_soil_grid_by_lonlat(**_params):
 
 
 def base_soil_grid_data(reset_index=True, **_params, ):
-    data, meta = get_soil_grid_by_lonlat(**params)
+    data, meta = get_soil_grid_by_lonlat(**_params)
     data_chain: list = list(chain.from_iterable(data))
     df_long = pd.DataFrame(data_chain)
     wide = df_long.pivot(index="depth", columns="name", values="value")
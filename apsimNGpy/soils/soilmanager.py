@@ -32,7 +32,7 @@ class SoilsProfiles:
 
 
 @lru_cache(maxsize=5)
-def DownloadsurgoSoiltables(lonlat, select_componentname=None, summarytable=False):
+def DownloadsurgoSoiltables(lonlat, select_componentname=None, summarytable=False, mukey=None):
     '''
     Downloads SSURGO soil tables
 
@@ -41,9 +41,15 @@ def DownloadsurgoSoiltables(lonlat, select_componentname=None, summarytable=Fals
     :param lonlat: tuple of (longitude, latitude)
     :param select_componentname: specific component name within the map unit, default None
     :param summarytable: if True, prints summary table of component names and their percentages
+    :param mukey: map unit key of lonlat when already known, e.g., from ``profile_cache.ssurgo_mukeys``; skips the
+        spatial intersection
     '''
 
     lonLat = f"{lonlat[0]} {lonlat[1]}"
+    if mukey is None:
+        mukeys = f"SELECT * from SDA_Get_Mukey_from_intersection_with_WktWgs84('point({lonLat})')"
+    else:
+        mukeys = f"'{int(mukey)}'"
     url = "https://SDMDataAccess.nrcs.usda.gov/Tabular/SDMTabularService.asmx"
 
     # FIXED: Correct header name and value
@@ -74,7 +80,7 @@ def DownloadsurgoSoiltables(lonlat, select_componentname=None, summarytable=Fals
              FULL OUTER JOIN copmgrp pmg ON co.cokey=pmg.cokey
              FULL OUTER JOIN corestrictions rt ON co.cokey=rt.cokey
              WHERE mu.mukey IN (
-                 SELECT * from SDA_Get_Mukey_from_intersection_with_WktWgs84('point({lonLat})')
+                 {mukeys}
              ) 
              AND sc.areasymbol != 'US' 
              ORDER BY co.cokey, ch.chkey, prcent, topdepth, bottomdepth, muname
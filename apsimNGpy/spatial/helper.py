@@ -7,9 +7,17 @@ import pandas as pd
 ID = 'ID'
 
 
-def create_simulations(base_file: str | Path, pps: pd.DataFrame, base_simulation: str = None, index: str = 'index'):
+def create_simulations(base_file: str | Path, pps: pd.DataFrame, base_simulation: str = None, index: str = 'index',
+                       cache=None):
+    """
+    ``cache`` is passed to ``get_soil_from_web``: a SoilProfileCache, a directory for one, or ``True`` for the
+    default location. Neighbouring points mostly share a soil, but nothing is cached unless it is given.
+    """
     from apsimNGpy.core.model_tools import clone_simulation
 
+    from apsimNGpy.soils.profile_cache import as_soil_profile_cache
+
+    soil_cache = as_soil_profile_cache(cache)
     copy_pps = pps.copy()
     copy_pps[ID] = pps[index]
     grps = copy_pps.groupby(index)
@@ -41,7 +49,8 @@ def create_simulations(base_file: str | Path, pps: pd.DataFrame, base_simulation
                     model.get_soil_from_web(simulations=sim_name, lonlat=ll, source='ssurgo',
                                             top_fom=2010,
                                             top_urea=0.07, top_finert=0.05,
-                                            thickness_sequence=th, summer_date='1-Jun', winter_date='1-Nov')
+                                            thickness_sequence=th, summer_date='1-Jun', winter_date='1-Nov',
+                                            cache=soil_cache)
                     model.run(verbose=False)
 
                     df = model.results
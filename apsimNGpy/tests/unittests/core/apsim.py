@@ -351,6 +351,61 @@ class TestCoreModel(BaseTester):
             soil_node = False
         self.assertTrue(soil_node, 'missing soil node failed to be added and edited')
 
+    def _soil_profile(self, n_layers, bd, dul=0.3, sat=0.45):
+        import pandas as pd
+        physical = pd.DataFrame({'Thickness': [150.0] * n_layers, 'BD': [bd] * n_layers, 'AirDry': [0.05] * n_layers,
+                                 'LL15': [0.12] * n_layers, 'DUL': [dul] * n_layers, 'SAT': [sat] * n_layers})
+        soil_crop = pd.DataFrame({'LL': [0.12] * n_layers, 'KL': [0.06] * n_layers, 'XF': [1.0] * n_layers})
+        return {'physical': physical, 'soil_crop': soil_crop}
+
+    def test_inject_soil_profiles_over_simulations(self):
+        from apsimNGpy.core.soiler import index_soil_nodes
+        model = self.test_ap_sim
+        model.clone_simulation(rename='site_2', base_simulation='Simulation')
+        model.clone_simulation(rename='site_3', base_simulation='Simulation')
+        n = len(index_soil_nodes(model.Simulations)['Simulation'].physical.Thickness)
+        shared = self._soil_profile(n, bd=1.3)
+        model.inject_soil_profiles({'Simulation': self._soil_profile(n, bd=1.1), 'site_2': shared, 'site_3': shared},
+                                   sections=['physical'])
+        index = index_soil_nodes(model.Simulations)
+        self.assertEqual(list(index['Simulation'].physical.BD), [1.1] * n)
+        # a profile shared by two simulations is written to both
+        self.assertEqual(list(index['site_2'].physical.BD), [1.3] * n)
+        self.assertEqual(list(index['site_3'].physical.BD), [1.3] * n)
+        self.assertEqual(list(index['site_3'].physical.Thickness), [150.0] * n)
+
+    def test_inject_soil_profiles_additional_plants_and_dul(self):
+        from apsimNGpy.core.soiler import index_soil_nodes
+        model = self.test_ap_sim
+        n = len(index_soil_nodes(model.Simulations)['Simulation'].physical.Thickness)
+        # DUL above SAT is lowered below it when adjust_dul is set
+        profile = self._soil_profile(n, bd=1.2, dul=0.5, sat=0.45)
+        model.inject_soil_profiles({'Simulation': profile}, sections=['physical', 'soil_crop'],
+                                   additional_plants=['SoybeanSoil'])
+        nodes = index_soil_nodes(model.Simulations)['Simulation']
+        self.assertTrue(all(abs(v - 0.43) < 1e-9 for v in nodes.physical.DUL))
+        crops = {crop.Name: crop for crop in nodes.soil_crops}
+        self.assertIn('SoybeanSoil', crops)
+        self.assertEqual(list(crops['SoybeanSoil'].KL), [0.06] * n)
+
+        model.inject_soil_profiles({'Simulation': profile}, sections=['physical'], adjust_dul=False)
+        nodes = index_soil_nodes(model.Simulations)['Simulation']
+        self.assertEqual(list(nodes.physical.DUL), [0.5] * n)
+
+    def test_inject_soil_profiles_skips_missing_profiles(self):
+        from apsimNGpy.core.soiler import index_soil_nodes
+        model = self.test_ap_sim
+        model.clone_simulation(rename='no_soil_data', base_simulation='Simulation')
+        before = list(index_soil_nodes(model.Simulations)['no_soil_data'].physical.BD)
+        n = len(before)
+        # soil_profiles_for_points returns None for points without soil data
+        model.inject_soil_profiles({'Simulation': self._soil_profile(n, bd=1.4), 'no_soil_data': None})
+        index = index_soil_nodes(model.Simulations)
+        self.assertEqual(list(index['Simulation'].physical.BD), [1.4] * n)
+        self.assertEqual(list(index['no_soil_data'].physical.BD), before)
+        with self.assertRaises(ValueError):
+            model.inject_soil_profiles({'not_a_simulation': self._soil_profile(n, bd=1.4)})
+
     def tearDown(self):
         try:
             self.out_path.unlink(missing_ok=True)
@@ -87,6 +87,24 @@ class TestCoreModel(BaseTester):
             self.assertGreater(self.test_save_path.stat().st_size, 0, 'saving the model failed when reload =True')
             self.assertNotEqual(cp, maize_model.path)
 
+    def test_incremental_save(self):
+        fert = '.Simulations.Simulation.Field.Fertilise at sowing'
+        with apsim.ApsimModel('Maize', incremental_save=True) as model:
+            sims = model.Simulations
+            model.set_params({'path': fert, 'Amount': 17})
+            self.assertEqual(model.dirty_nodes, (fert,))
+            model.run()
+            # the edit was written without reloading the tree
+            self.assertIs(sims, model.Simulations)
+            self.assertEqual(model.dirty_nodes, ())
+            with apsim.ApsimModel(model.path) as saved:
+                params = saved.inspect_model_parameters_by_path(fert, parameters='Amount')
+                self.assertEqual(float(params['Amount']), 17)
+            # a full save still reloads
+            model.edit_model_by_path(fert, Amount=20)
+            model.save()
+            self.assertEqual(model.dirty_nodes, ())
+
     def test_out_path(self):
         """
         Test that we can provide an output path for the file name
@@ -176,6 +194,16 @@ class TestCoreModel(BaseTester):
             msg = f"expected pd.dataframe but received {type(repos)}"
             self.assertIsInstance(repos, pd.DataFrame, msg=msg)
 
+    def test_get_simulated_output_filter_on_missing_column(self):
+        with apsim.ApsimModel('Maize') as model:
+            model.run()
+            if not model.ran_ok:
+                raise unittest.SkipTest('skipping because model did not run successfully')
+            df = model.get_simulated_output(report_names='Report', columns=['Yield'], where={'NoSuchColumn': 'x'})
+            self.assertIsInstance(df, pd.DataFrame)
+            self.assertTrue(df.empty)
+            self.assertEqual(list(df.columns), ['Yield', 'source_table'])
+
     def test_get_reports(self):
         with apsim.ApsimModel('Maize') as maize_model:
             self.assertIsInstance(maize_model.inspect_model('Report'), list)
@@ -7,6 +7,7 @@ import unittest
 
 from apsimNGpy.core.mult_cores import MultiCoreManager as ParallelRunner
 from apsimNGpy.core.apsim import ApsimModel
+from apsimNGpy.parallel.warm_pool import WarmWorkerPool
 
 
 class TestParallelRunner(unittest.TestCase):
@@ -68,6 +69,20 @@ class TestParallelRunner(unittest.TestCase):
                         pass
                 time.sleep(1)
 
+    def test_warm_worker_pool_is_reused(self):
+        with TemporaryDirectory() as td, WarmWorkerPool(n_workers=2, max_jobs_per_worker=50) as pool:
+            db_path = Path(td) / 'warm.db'
+            jobs = [ApsimModel('Maize').path for _ in range(4)]
+            runner = ParallelRunner(db_path=str(db_path), agg_func='mean', worker_pool=pool)
+            for _ in range(2):
+                runner.run_all_jobs(jobs, n_cores=2, clear_db=True)
+                self.assertEqual(runner.get_simulated_output(axis=0).shape[0], 4)
+            # the same workers served both calls
+            self.assertTrue(pool.is_running)
+            self.assertEqual(pool.restarts, 0)
+            self.assertTrue(pool.health_check())
+            self.assertTrue(all(st['clr_loaded'] for st in pool.status()))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
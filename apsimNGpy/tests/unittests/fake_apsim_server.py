@@ -0,0 +1,139 @@
+"""
+A local stand-in for ``Models --server`` speaking the same ACK/FIN socket protocol.
+
+Runs are not simulated: the report of a run is built from the changes it received, so clients can be tested
+without APSIM binaries.
+"""
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+ACK, FIN = 'ACK', 'FIN'
+VALUE_READERS = {0: ('<i', 4), 1: ('<d', 8)}
+
+
+def _recv_exact(conn, n):
+    data = b''
+    while len(data) < n:
+        chunk = conn.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError('client closed')
+        data += chunk
+    return data
+
+
+def _read_string(conn):
+    size = struct.unpack('<i', _recv_exact(conn, 4))[0]
+    return _recv_exact(conn, size).decode()
+
+
+def _send(conn, payload):
+    if isinstance(payload, str):
+        payload = payload.encode()
+    conn.sendall(struct.pack('<i', len(payload)) + payload)
+
+
+class FakeApsimServer:
+    """
+    Serves one client connection at a time on ``127.0.0.1:port``.
+
+    Parameters
+    ----------
+    port : int, optional
+        Port to listen on, ``0`` picks a free one.
+    run_delay : float, optional
+        Seconds spent in each run.
+    reject : str, optional
+        Replacement path answered with an error message instead of ``ACK``.
+    """
+
+    def __init__(self, port=0, run_delay=0.0, reject=None):
+        self.listener = socket.create_server(('127.0.0.1', port))
+        self.port = self.listener.getsockname()[1]
+        self.run_delay = run_delay
+        self.reject = reject
+        self.runs = []
+        self.changes = []
+        self.hang = False
+        self.closed = False
+        self._conn = None
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self._conn = conn
+            with conn:
+                try:
+                    while True:
+                        self._handle(conn, _read_string(conn))
+                except (ConnectionError, OSError):
+                    continue
+
+    def _handle(self, conn, command):
+        _send(conn, ACK)
+        if command == 'RUN':
+            changes = {}
+            while (path := _read_string(conn)) != FIN:
+                _send(conn, 'Invalid path' if path == self.reject else ACK)
+                kind = struct.unpack('<i', _recv_exact(conn, 4))[0]
+                _send(conn, ACK)
+                if kind in VALUE_READERS:
+                    fmt, size = VALUE_READERS[kind]
+                    value = struct.unpack(fmt, _recv_exact(conn, size))[0]
+                else:
+                    value = _read_string(conn)
+                changes[path] = value
+                _send(conn, ACK)
+            _send(conn, ACK)
+            while self.hang:
+                time.sleep(0.05)
+            time.sleep(self.run_delay)
+            self.changes = changes
+            self.runs.append(changes)
+            _send(conn, FIN)
+        elif command == 'READ':
+            _read_string(conn)
+            _send(conn, ACK)
+            params = []
+            while (param := _read_string(conn)) != FIN:
+                params.append(param)
+                _send(conn, ACK)
+            _read_string(conn)
+            factor = sum(v for v in self.changes.values() if isinstance(v, (int, float))) or 1.0
+            for param in params:
+                if param == 'Clock.Today':
+                    column = np.arange(10, dtype='<i4').tobytes()
+                elif param == 'Zone':
+                    column = b'Field'
+                else:
+                    column = (np.arange(10, dtype='<f8') * factor).tobytes()
+                _send(conn, column)
+                _read_string(conn)
+
+    def close(self):
+        self.closed = True
+        self.hang = False
+        for s in (self._conn, self.listener):
+            if s is not None:
+                try:
+                    s.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                s.close()
+
+    # the subset of subprocess.Popen used to manage server processes
+    def poll(self):
+        return 0 if self.closed else None
+
+    def wait(self, timeout=None):
+        return 0
+
+    terminate = kill = close
@@ -0,0 +1,127 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.manager import weather_loader as wl
+
+
+def daily_weather(start='2000-01-01', end='2003-12-31'):
+    dates = pd.date_range(start, end)
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({'year': dates.year, 'day': dates.dayofyear, 'radn': rng.uniform(1, 30, len(dates)),
+                         'maxt': rng.uniform(20, 35, len(dates)), 'mint': rng.uniform(0, 15, len(dates)),
+                         'rain': rng.uniform(0, 20, len(dates))})
+
+
+class TestMetReadWrite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.df = daily_weather()
+        self.met = Path(wl.write_apsim_met(self.df, self.dir / 'site.met', (-93.0, 42.0), site='Ames'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        df = wl.read_apsim_met(self.met)
+        self.assertEqual(list(df.columns), list(wl.APSIM_COLUMNS))
+        self.assertEqual(df['year'].dtype, np.int64)
+        np.testing.assert_allclose(df['radn'], self.df['radn'], rtol=1e-5)
+        self.assertEqual(len(df), len(self.df))
+
+    def test_index_drop_counts_the_units_row(self):
+        # label 0 is the units row, as in earlier releases, so label 1 is the first day
+        full = wl.read_apsim_met(self.met)
+        dropped = wl.read_apsim_met(self.met, index_drop=[0, 1, 2])
+        pd.testing.assert_frame_equal(dropped, full.iloc[2:].reset_index(drop=True))
+        header = next(i for i, line in enumerate(self.met.read_text().splitlines()) if line.startswith('year'))
+        explicit = wl.read_apsim_met(self.met, skip=header, index_drop=[1, 2])
+        pd.testing.assert_frame_equal(explicit, dropped)
+
+    def test_without_units_row_and_missing_values(self):
+        path = self.dir / 'plain.met'
+        path.write_text('[weather.met.weatherfile]\ntav = 10\nyear day radn maxt mint rain\n'
+                        '2000 1 10.5 20 5 ?\n2000 2 11 21 6 0\n')
+        df = wl.read_apsim_met(path)
+        self.assertEqual(df['day'].tolist(), [1, 2])
+        self.assertTrue(np.isnan(df['rain'].iloc[0]))
+
+    def test_header_scan_is_bounded(self):
+        path = self.dir / 'long.met'
+        path.write_text('!comment\n' * (wl.HEADER_SCAN_LINES + 1) + 'year day radn maxt mint rain\n')
+        with self.assertRaises(wl.WeatherValidationError):
+            wl.read_apsim_met(path)
+
+    def test_sidecar_cache(self):
+        for cache, suffix in ((True, '.npz'), ('parquet', '.parquet')):
+            with self.subTest(cache=cache):
+                first = wl.read_apsim_met(self.met, cache=cache)
+                sidecar = self.met.with_name(self.met.name + suffix)
+                self.assertTrue(sidecar.is_file())
+                pd.testing.assert_frame_equal(wl.read_apsim_met(self.met, cache=cache), first)
+        # rewriting the station invalidates its sidecar
+        wl.write_apsim_met(self.df.iloc[:366], self.met, (-93.0, 42.0))
+        os.utime(self.met, ns=(0, os.stat(self.met).st_mtime_ns + 1_000_000))
+        self.assertEqual(len(wl.read_apsim_met(self.met, cache=True)), 366)
+        with self.assertRaises(ValueError):
+            wl.read_apsim_met(self.met, cache='csv')
+
+    def test_write_edited_met_keeps_header(self):
+        df = wl.read_apsim_met(self.met)
+        df['rain'] = 0.0
+        edited = wl.write_edited_met(self.met, df, filename='edited.met')
+        self.assertTrue(Path(edited).read_text().startswith('!site: Ames'))
+        self.assertEqual(wl.read_apsim_met(edited)['rain'].sum(), 0.0)
+
+
+class TestBatchValidation(unittest.TestCase):
+    def setUp(self):
+        self.frames = {'ok': daily_weather(), 'gaps': daily_weather().drop(index=range(10, 20))}
+        bad = daily_weather()
+        bad.loc[5, 'mint'] = 50.0
+        bad.loc[6, 'rain'] = -1.0
+        bad.loc[7, 'radn'] = 50.0
+        self.frames['bad'] = bad
+        self.frames['dup'] = pd.concat([daily_weather(), daily_weather().iloc[:3]], ignore_index=True)
+
+    def test_matches_single_site_validation(self):
+        report = wl.validate_many(self.frames)
+        self.assertEqual(list(report.index), list(self.frames))
+        for site, frame in self.frames.items():
+            self.assertEqual(report.loc[site, 'is_valid'], wl.validate_met(frame).is_valid, site)
+        self.assertEqual(report.loc['gaps', 'date_gaps'], 10)
+        self.assertEqual(report.loc['bad', ['negative_rain', 'temperature_order', 'high_radiation']].tolist(),
+                         [1, 1, 1])
+        self.assertEqual((report.loc['bad', 'errors'], report.loc['bad', 'warnings']), (2, 1))
+        self.assertEqual((report.loc['dup', 'duplicate_date'], report.loc['dup', 'date_order']), (6, 1))
+        with self.assertRaises(wl.WeatherValidationError):
+            wl.validate_many(self.frames, strict=True)
+
+    def test_long_frames_and_chunks(self):
+        long = pd.concat([frame.assign(cell=site) for site, frame in self.frames.items()])
+        whole = wl.validate_many(long, site='cell')
+        chunked = wl.validate_many((long[long.cell == s] for s in self.frames), site='cell')
+        pd.testing.assert_frame_equal(whole, chunked)
+
+    def test_tav_amp_many(self):
+        result = wl.tav_amp_many(self.frames)
+        for site, frame in self.frames.items():
+            self.assertEqual(tuple(result.loc[site]), wl.calculate_tav_amp(frame), site)
+
+    def test_no_sites(self):
+        for empty in ({}, [], pd.DataFrame(columns=['site', *wl.APSIM_COLUMNS])):
+            report = wl.validate_many(empty)
+            self.assertTrue(report.empty)
+            self.assertEqual(list(report.columns), list(wl.validate_many(self.frames).columns))
+            self.assertTrue(wl.validate_many(empty, strict=True).empty)
+            self.assertEqual(list(wl.tav_amp_many(empty).columns), ['tav', 'amp'])
+            self.assertTrue(wl.tav_amp_many(empty).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+
+from apsimNGpy.soils import soilgrid
+from apsimNGpy.soils.soilmanager import OrganiseSoilProfile
+from apsimNGpy.soils.batch import (SoilLayers, build_soil_profiles, fit_exponential_decay, interpolate_rows,
+                                   soilgrids_layers, ssurgo_layers)
+
+THICKNESS = [100, 100, 200, 200, 300, 300, 400, 500]
+
+
+def _soilgrids(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for key in range(n):
+        for j, depth in enumerate(["0-5cm", "5-15cm", "15-30cm", "30-60cm", "60-100cm"]):
+            rows.append(dict(key=key, depth=depth, soc=rng.uniform(50, 300) / (j + 1), clay=rng.uniform(100, 400),
+                             sand=rng.uniform(200, 500), silt=rng.uniform(200, 400), bdod=rng.uniform(110, 160),
+                             wv0033=rng.uniform(250, 350), wv1500=rng.uniform(100, 200), phh2o=rng.uniform(55, 75)))
+    return pd.DataFrame(rows)
+
+
+def _ssurgo(cokey, wat_r, l15, paw, bb):
+    """SSURGO rows at depths where OrganiseSoilProfile.variable_profile samples 200 mm layers exactly."""
+    bottom = [10, 30, 50, 70, 90, 110]
+    return pd.DataFrame(dict(
+        cokey=cokey, chkey=range(6), topdepth=[0] + bottom[:-1], bottomdepth=bottom, clay=25.0, sand=30.0, silt=45.0,
+        OM=[3.0, 2.5, 2.0, 1.5, 1.0, 0.5], bb=bb, DUL=0.0, L15=l15, PAW=paw, sat_hidric_cond=9.0, KSAT=9.0, pd=2.65,
+        wat_r=wat_r, pH=6.5, CSR=np.nan, muname='m', musymbol='m', slope_r=2, componentname='c', prcent=100))
+
+
+class TestSoilBatch(unittest.TestCase):
+    def test_matches_single_soilgrids_profiles(self):
+        data = _soilgrids(4)
+        batch = build_soil_profiles(soilgrids_layers(data), THICKNESS, top_finert=0.65)
+        for key in range(4):
+            single = data[data.key == key].drop(columns='key')
+            expected = soilgrid.aggregate_data(soilgrid.transform_soil_grid_data(single), thickness_mm=THICKNESS)
+            got = batch.profile(key)
+            for section in ('physical', 'organic', 'chemical', 'soil_crop', 'water', 'NO3'):
+                for column in expected[section].columns.unique().drop('Depth', errors='ignore'):
+                    np.testing.assert_allclose(got[section][column].to_numpy(float),
+                                               expected[section][column].to_numpy(float), err_msg=column)
+
+    def test_interpolate_ragged_rows(self):
+        x = np.array([[50, 150, 300, 600.], [400, 100, np.nan, np.nan], [10, 20, 30, 40.]])
+        y = np.array([[1, 2, 4, 3.], [0.5, 1.5, np.nan, np.nan], [1, np.nan, 3, 5.]])
+        x_new = np.array([0, 75, 250, 500, 900])
+        out = interpolate_rows(x, y, x_new)
+        for row in range(3):
+            valid = ~np.isnan(x[row]) & ~np.isnan(y[row])
+            expected = interp1d(x[row][valid], y[row][valid], fill_value='extrapolate')(x_new)
+            np.testing.assert_allclose(out[row], expected)
+        self.assertTrue(np.isnan(interpolate_rows(x[:1], np.full((1, 4), np.nan), x_new)).all())
+
+    def test_exponential_fit(self):
+        depth = np.tile(np.array([50, 150, 300, 600, 1000.]), (3, 1))
+        a, b = np.array([[2.0], [1.0], [3.5]]), np.array([[0.002], [0.001], [0.004]])
+        carbon = a * np.exp(-b * depth)
+        carbon[1, 3:] = np.nan
+        fit_a, fit_b = fit_exponential_decay(depth, carbon)
+        np.testing.assert_allclose(fit_a, a.ravel())
+        np.testing.assert_allclose(fit_b, b.ravel())
+        layers = SoilLayers(depth, {'carbon': carbon, 'clay': 20, 'sand': 40, 'silt': 40, 'bd': 1.3})
+        batch = build_soil_profiles(layers, THICKNESS, carbon_fit='exponential')
+        mid = np.cumsum(THICKNESS) - np.array(THICKNESS) / 2
+        np.testing.assert_allclose(batch.organic['Carbon'], a * np.exp(-b * mid))
+
+    def test_ssurgo_components(self):
+        rows = []
+        for cokey, n in (('c1', 3), ('c2', 5)):
+            for j in range(n):
+                rows.append(dict(cokey=cokey, topdepth=str(j * 30), bottomdepth=str((j + 1) * 30), clay='25',
+                                 sand='30', silt='45', OM=str(3 / (j + 1)), bb='1.35', L15='12', PAW='0.18',
+                                 sat_hidric_cond='9', wat_r=None, pH='6.5'))
+        batch = build_soil_profiles(ssurgo_layers(pd.DataFrame(rows)), THICKNESS)
+        self.assertEqual(list(batch.keys), ['c1', 'c2'])
+        np.testing.assert_allclose(batch.physical['LL15'], 0.12)
+        np.testing.assert_allclose(batch.physical['KS'], 9 * 86.4)
+        self.assertTrue((batch.physical['DUL'] < batch.physical['SAT']).all())
+        frame = batch.to_frame()
+        self.assertEqual(len(frame), 2 * len(THICKNESS))
+        self.assertEqual(batch.profile('c2')['physical'].shape[0], len(THICKNESS))
+
+    def test_matches_single_ssurgo_profiles(self):
+        tables = pd.concat([
+            # SAT from wat_r, unsorted, one layer below DUL and one in the dense band capped below 0.381
+            _ssurgo('wat', [45.0, 42.0, 28.0, 44.0, 38.12, 36.0], 12.0, 0.18, 1.35),
+            # SAT from bulk density, a layer raised above DUL
+            _ssurgo('bd', [None] * 6, [12.0, 14.0, 16.0, 20.0, 14.0, 12.0], 0.18, [1.3, 1.35, 1.4, 1.6, 1.5, 1.45])],
+            ignore_index=True)
+        thickness = [200] * 5
+        batch = build_soil_profiles(ssurgo_layers(tables), thickness, air_dry=(0.5, 0.9, 1.0))
+        for key in ('wat', 'bd'):
+            single = tables[tables.cokey == key].astype({'wat_r': object if key == 'bd' else float})
+            expected = OrganiseSoilProfile(single, thickness=200, thickness_values=thickness).create_soilprofile()
+            got = batch.profile(key)
+            for column, actual in (('BD', 'BD'), ('AirDry', 'AirDry'), ('LL15', 'LL15'), ('DUL', 'DUL'),
+                                   ('SAT', 'SAT'), ('KS', 'KS'), ('ParticleSizeClay', 'Clay')):
+                np.testing.assert_allclose(got['physical'][actual], expected[column], rtol=1e-3,
+                                           err_msg=f"{key} {column}")
+            np.testing.assert_allclose(got['organic']['Carbon'], expected['Carbon'], rtol=1e-3)
+            np.testing.assert_allclose(got['chemical']['PH'], expected['PH'])
+        self.assertTrue((batch.physical['DUL'] < batch.physical['SAT']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.soils.profile_cache import SoilProfileCache, profile_key, soil_profiles_for_points, soilgrids_cell
+
+THICKNESS = [150, 150, 200, 300, 400]
+
+
+def _soilgrids_response(**params):
+    """Raw layers of get_soil_grid_by_lonlat, varying with the requested point."""
+    layers = []
+    for name, scale in (('soc', 100), ('clay', 300), ('sand', 400), ('silt', 300), ('bdod', 130), ('wv0033', 300),
+                        ('wv1500', 150), ('phh2o', 65)):
+        layers.append([{'depth': d, 'value': scale * (1 + abs(params['lat']) % 1 / 10) / (i + 1) ** 0.2, 'name': name}
+                       for i, d in enumerate(params['depth'])])
+    return layers, {}
+
+
+class TestSoilProfileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_lru_eviction(self):
+        cache = SoilProfileCache(self.root, max_entries=2, memory_entries=1)
+        profile = {'physical': pd.DataFrame({'DUL': [0.3, 0.28]}), 'crops': ('Maize',)}
+        keys = [profile_key('isric', (i, 0), THICKNESS) for i in range(3)]
+        cache.put(keys[0], profile)
+        cache.put(keys[1], profile)
+        os.utime(cache._path(keys[1]), ns=(1, 1))  # keys[1] is now the least recently used
+        # a new instance lists the directory once, writes then follow the order in memory
+        cache = SoilProfileCache(self.root, max_entries=2, memory_entries=1)
+        listings = []
+        files = cache._files
+        cache._files = lambda: listings.append(1) or files()
+        got = cache.get(keys[0])
+        pd.testing.assert_frame_equal(got['physical'], profile['physical'])
+        got['physical'].loc[0, 'DUL'] = 0
+        self.assertEqual(cache.get(keys[0])['physical'].loc[0, 'DUL'], 0.3)
+        cache.put(keys[2], profile)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(keys[1], cache)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(len(listings), 1)
+        self.assertNotEqual(profile_key('isric', (0, 0), THICKNESS), profile_key('isric', (0, 0), THICKNESS[:-1]))
+
+    def test_points_are_built_once_per_soil(self):
+        built = []
+
+        def build(soil_ids, thickness_mm, crops, **params):
+            built.extend(soil_ids)
+            return {sid: {'meta_info': {'Latitude': 0.0, 'Longitude': 0.0, 'Soil': sid}} for sid in soil_ids}
+
+        points = [(-93.003 - i * 1e-4, 42.003) for i in range(6)] + [(-90.0, 40.0), (-90.0, 40.0)]
+        cache = SoilProfileCache(self.root)
+        profiles = soil_profiles_for_points(points, THICKNESS, cache=cache, build=build,
+                                            resolve=lambda pts: [soilgrids_cell(p, 0.01) for p in pts])
+        self.assertEqual(len(built), 2)
+        self.assertEqual(profiles[-1]['meta_info']['Latitude'], 40.0)
+        self.assertEqual(profiles[0]['meta_info']['Soil'], profiles[5]['meta_info']['Soil'])
+        soil_profiles_for_points(points, THICKNESS, cache=cache, build=build,
+                                 resolve=lambda pts: [soilgrids_cell(p, 0.01) for p in pts])
+        self.assertEqual(len(built), 2)
+        self.assertEqual(cache.stats['hits'], 2)
+
+    @mock.patch('apsimNGpy.soils.soilgrid.get_soil_grid_by_lonlat', side_effect=_soilgrids_response)
+    def test_soilgrids_pipeline(self, download):
+        points = [(-93.001, 42.001), (-93.0011, 42.0011), (-92.0, 41.5)]
+        profiles = soil_profiles_for_points(points, THICKNESS, source='isric', cache=False)
+        self.assertEqual(download.call_count, 2)
+        pd.testing.assert_frame_equal(profiles[0]['physical'], profiles[1]['physical'])
+        # points on one soil get independent tables
+        self.assertIsNot(profiles[0]['physical'], profiles[1]['physical'])
+        self.assertEqual(profiles[2]['physical'].shape[0], len(THICKNESS))
+        self.assertTrue(np.all(profiles[2]['physical'].DUL < profiles[2]['physical'].SAT))
+
+
+if __name__ == '__main__':
+    unittest.main()
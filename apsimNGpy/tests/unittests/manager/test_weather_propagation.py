@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.manager.weather_propagation import propagate_weather, propagate_weather_many
+
+
+def _stations(n=4, seed=1):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2001-01-01', '2008-12-31')
+    observed, gridded = [], []
+    for i in range(n):
+        season = 10 * np.sin(np.arange(len(dates)) * 2 * np.pi / 365.25)
+        maxt = 22 + season + rng.normal(0, 2, len(dates))
+        mint = maxt - 10 - rng.uniform(0, 3, len(dates))
+        grid = pd.DataFrame({'station': f's{i}', 'date': dates,
+                             'maxt': 0.9 * maxt + i + rng.normal(0, 0.5, len(dates)),
+                             'mint': 0.95 * mint + 0.5 + rng.normal(0, 0.3, len(dates)),
+                             'radn': rng.uniform(5, 25, len(dates)), 'rain': rng.exponential(2, len(dates))})
+        keep = dates.year <= 2005
+        obs = pd.DataFrame({'station': f's{i}', 'date': dates[keep], 'maxt': maxt[keep], 'mint': mint[keep]})
+        obs.loc[obs.sample(50, random_state=i).index, 'maxt'] = np.nan
+        observed.append(obs)
+        gridded.append(grid)
+    return pd.concat(observed, ignore_index=True), pd.concat(gridded, ignore_index=True)
+
+
+class TestPropagateWeatherMany(unittest.TestCase):
+    def setUp(self):
+        self.observed, self.gridded = _stations()
+
+    def assert_matches_single(self, result, **kwargs):
+        for station, propagated in result.items():
+            expected = propagate_weather(self.observed[self.observed.station == station].drop(columns='station'),
+                                         self.gridded[self.gridded.station == station].drop(columns='station'),
+                                         **kwargs)
+            pd.testing.assert_frame_equal(propagated.data, expected.data, check_dtype=False)
+            pd.testing.assert_frame_equal(propagated.statistics, expected.statistics, check_dtype=False,
+                                          rtol=1e-9)
+
+    def test_matches_per_station_propagation(self):
+        for calibration in ('annual', 'seasonal', 'monthly'):
+            result = propagate_weather_many(self.observed, self.gridded, calibration=calibration,
+                                            enforce_temperature_order=False, output='objects')
+            self.assertEqual(sorted(result), ['s0', 's1', 's2', 's3'])
+            self.assert_matches_single(result, calibration=calibration, enforce_temperature_order=False)
+
+    def test_long_output_and_overlap(self):
+        result = propagate_weather_many(self.observed, self.gridded, correct='always',
+                                        preserve_observed_overlap=True, enforce_temperature_order=False)
+        self.assertEqual(len(result.data), len(self.gridded))
+        self.assertEqual(list(result.statistics.columns[:3]), ['station', 'variable', 'period'])
+        self.assertTrue(result.statistics.corrected.all())
+        self.assert_matches_single(propagate_weather_many(self.observed, self.gridded, correct='always',
+                                                          preserve_observed_overlap=True,
+                                                          enforce_temperature_order=False, output='objects'),
+                                   correct='always', preserve_observed_overlap=True,
+                                   enforce_temperature_order=False)
+
+    def test_process_shards(self):
+        serial = propagate_weather_many(self.observed, self.gridded, enforce_temperature_order=False)
+        sharded = propagate_weather_many(self.observed, self.gridded, enforce_temperature_order=False, n_jobs=2)
+        pd.testing.assert_frame_equal(serial.data, sharded.data)
+        pd.testing.assert_frame_equal(serial.statistics, sharded.statistics)
+        empty = propagate_weather_many(self.observed.head(0), self.gridded, n_jobs=2, output='objects')
+        self.assertEqual(empty, {})
+        with self.assertRaisesRegex(ValueError, 'output'):
+            propagate_weather_many(self.observed, self.gridded, n_jobs=2, output='wide')
+        with self.assertRaisesRegex(ValueError, 'min_calibration_years'):
+            propagate_weather_many(self.observed, self.gridded, n_jobs=2, min_calibration_years=0)
+
+    def test_failing_station_is_named(self):
+        observed = self.observed[(self.observed.station != 's2') | (self.observed.date.dt.year < 2003)]
+        with self.assertRaisesRegex(ValueError, "s2"):
+            propagate_weather_many(observed, self.gridded)
+        with self.assertRaisesRegex(ValueError, 'duplicate'):
+            propagate_weather_many(pd.concat([self.observed, self.observed.head(1)]), self.gridded)
+
+
+if __name__ == '__main__':
+    unittest.main()
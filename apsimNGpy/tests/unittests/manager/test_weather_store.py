@@ -0,0 +1,78 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.manager import weather_loader as wl
+from apsimNGpy.manager.weather_store import WeatherStore
+
+AMES = (-93.62, 42.03)
+
+
+def daily(first, last):
+    dates = wl.daterange(first, last)
+    doy = dates.dayofyear.to_numpy()
+    return pd.DataFrame({'year': dates.year, 'day': doy, 'radn': 15 + 10 * np.sin(doy / 58), 'maxt': 25.0,
+                         'mint': 10.0, 'rain': dates.year - 1990.0})
+
+
+class TestWeatherStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.store = WeatherStore(Path(self.tmp.name) / 'tiles')
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def download(self, first, last):
+        self.calls.append((first, last))
+        return daily(first, last)
+
+    def test_only_missing_years_are_downloaded(self):
+        first = self.store.fetch(AMES, 1990, 1995, 'nasa', self.download)
+        self.assertEqual(len(first), len(wl.daterange(1990, 1995)))
+        # a nearby point in the same cell and overlapping years
+        again = self.store.fetch((AMES[0] + 0.1, AMES[1] - 0.1), 1992, 1997, 'nasapower', self.download)
+        self.assertEqual(self.calls, [(1990, 1995), (1996, 1997)])
+        pd.testing.assert_frame_equal(again.iloc[:366], first.iloc[730:1096].reset_index(drop=True),
+                                      check_dtype=False)
+        self.assertEqual(self.store.years(AMES, 'nasa'), list(range(1990, 1998)))
+
+    def test_each_gap_is_downloaded_separately(self):
+        self.store.put(AMES, daily(1992, 1993), 'nasa')
+        frame = self.store.fetch(AMES, 1990, 1995, 'nasa', self.download)
+        self.assertEqual(self.calls, [(1990, 1991), (1994, 1995)])
+        self.assertEqual(frame['year'].tolist(), wl.daterange(1990, 1995).year.tolist())
+
+    def test_incomplete_years_are_not_stored(self):
+        this_year = pd.Timestamp.today().year
+        partial = daily(1990, 1991).iloc[:-10]
+        self.assertEqual(self.store.put(AMES, partial, 'nasa'), 1)
+        self.assertEqual(self.store.put(AMES, daily(this_year, this_year), 'nasa'), 0)
+        self.assertEqual(self.store.years(AMES, 'nasa'), [1990])
+        frame = self.store.fetch(AMES, this_year - 1, this_year, 'nasa', self.download)
+        self.assertEqual(len(frame), len(wl.daterange(this_year - 1, this_year)))
+        self.store.fetch(AMES, this_year, this_year, 'nasa', self.download)
+        # the current year is downloaded again on every request
+        self.assertEqual(self.calls[-1], (this_year, this_year))
+
+    def test_cells_follow_source_resolution(self):
+        self.assertEqual(self.store.cell(AMES, 'nasa'), self.store.cell((-93.7, 42.2), 'nasa'))
+        self.assertNotEqual(self.store.cell(AMES, 'daymet'), self.store.cell((-93.7, 42.2), 'daymet'))
+        self.assertIsNone(self.store.get((10.0, 10.0), 1990, 1990, 'nasa'))
+
+    def test_offline_store_writes_met_files(self):
+        self.store.put(AMES, daily(2000, 2001), 'nasa')
+        offline = WeatherStore(self.store.root, offline=True)
+        met = wl.get_weather(AMES, 2000, 2001, source='nasa', filename=Path(self.tmp.name) / 'ames.met',
+                             store=offline)
+        self.assertEqual(len(wl.read_apsim_met(met)), 731)
+        with self.assertRaises(wl.WeatherDownloadError):
+            wl.get_met_nasa_power(AMES, 2000, 2002, fname=Path(self.tmp.name) / 'x.met', store=offline)
+
+
+if __name__ == '__main__':
+    unittest.main()
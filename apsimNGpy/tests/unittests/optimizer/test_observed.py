@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.optimizer.problems.observed import ObservedEvaluator, ObservedEvaluatorMixin, metric_direction
+from apsimNGpy.validation.evaluator import Validate
+
+
+def _merged(obs, pred, index):
+    obs, pred = obs.copy(), pred.copy()
+    obs[index] = obs[index].astype(str)
+    pred[index] = pred[index].astype(str)
+    data = pd.merge(obs[[*index, 'observed']], pred[[*index, 'Yield']], on=index, how='inner')
+    return data.dropna(subset=['observed', 'Yield'])
+
+
+class TestObservedEvaluator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.obs = pd.DataFrame({'year': np.tile(np.arange(1990, 2000), 2), 'site': np.repeat(['a', 'b'], 10),
+                                 'observed': rng.uniform(2000, 8000, 20)})
+        self.obs.loc[3, 'observed'] = np.nan
+        # predictions in another order, with unmatched years, a missing value and a repeated key
+        pred = self.obs.sample(frac=1, random_state=1).drop(columns='observed')
+        pred['Yield'] = rng.uniform(2000, 8000, len(pred))
+        extra = pd.DataFrame({'year': [1980, 1995], 'site': ['a', 'b'], 'Yield': [1.0, 5000.0]})
+        self.pred = pd.concat([pred, extra], ignore_index=True)
+        self.pred.loc[5, 'Yield'] = np.nan
+
+    def test_matches_merge_and_validate(self):
+        for index in (['year', 'site'], ['year']):
+            evaluator = ObservedEvaluator(self.obs, index, 'observed', 'Yield')
+            data = _merged(self.obs, self.pred, index)
+            expected = Validate(data['observed'], data['Yield']).evaluate_all()
+            got = evaluator.metrics(self.pred)
+            self.assertEqual(set(got), set(expected))
+            for name, value in expected.items():
+                self.assertAlmostEqual(got[name], value, places=8, msg=name)
+            actual, predicted, _ = evaluator.align(self.pred)
+            self.assertEqual(len(actual), len(data))
+            for method, sign in metric_direction.items():
+                value = sign * expected[method.upper()]
+                self.assertAlmostEqual(evaluator(self.pred, method), abs(value) if method == 'bias' else value,
+                                       places=8)
+
+    def test_expressions_and_errors(self):
+        evaluator = ObservedEvaluator(self.obs, 'year', 'observed', 'Yield')
+        data = _merged(self.obs, self.pred, ['year'])
+        data.eval('Yield = Yield / 2', inplace=True)
+        self.assertAlmostEqual(evaluator(self.pred, 'rmse', exp='Yield = Yield / 2'),
+                               Validate(data['observed'], data['Yield']).RMSE())
+        self.assertEqual(self.obs['year'].dtype.kind, 'i')
+        with self.assertRaises(ValueError):
+            evaluator(self.pred, 'nse')
+        with self.assertRaises(ValueError):
+            evaluator(self.pred.drop(columns='Yield'))
+        with self.assertRaises(ValueError):
+            evaluator(self.pred.assign(year=0))
+
+
+    def test_mixin_rebuilds_on_reassignment(self):
+        class Problem(ObservedEvaluatorMixin):
+            obs, index, obs_column, predicted_col = self.obs, 'year', 'observed', 'Yield'
+
+        problem = Problem()
+        evaluator = problem._observed_evaluator()
+        self.assertIs(problem._observed_evaluator(), evaluator)
+        self.assertEqual(evaluator.index, ['year'])
+        problem.index = ['year', 'site']
+        self.assertEqual(problem._observed_evaluator().index, ['year', 'site'])
+        problem.obs = self.obs.copy()
+        self.assertIsNot(problem._observed_evaluator(), evaluator)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from apsimNGpy.optimizer.problems.population import evaluate_population, unique_candidates
+
+
+class SimulationFailed(RuntimeError):
+    pass
+
+
+def _simulate(a, b, calls=None):
+    if calls is not None:
+        calls.append((a, b))
+    if a < 0:
+        raise SimulationFailed(f'cannot simulate {a}')
+    return {'yield': a * 10 + b}
+
+
+def _job(x):
+    return x[0], x[1]
+
+
+class TestEvaluatePopulation(unittest.TestCase):
+    def setUp(self):
+        self.population = [[1.0, 2.0], [3.0, 0.0], [1.0, 2.0], [-1.0, 0.0], [0.5, 4.0]]
+
+    def test_order_duplicates_and_failures(self):
+        calls, failed = [], []
+        fitness = evaluate_population(self.population, _simulate, lambda r: -r['yield'],
+                                      lambda x: (*_job(x), calls), errors=(SimulationFailed,),
+                                      on_error=lambda x, e: failed.append(x))
+        np.testing.assert_array_equal(fitness, [-12.0, -30.0, -12.0, np.inf, -9.0])
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(failed, [[-1.0, 0.0]])
+        with self.assertRaises(SimulationFailed):
+            evaluate_population(self.population, _simulate, lambda r: r['yield'], _job)
+
+    def test_process_and_pool_batches(self):
+        serial = evaluate_population(self.population, _simulate, lambda r: r['yield'], _job,
+                                     errors=(SimulationFailed,))
+        processes = evaluate_population(self.population, _simulate, lambda r: r['yield'], _job, n_jobs=2,
+                                        errors=(SimulationFailed,))
+        with ThreadPoolExecutor(2) as pool:
+            pooled = evaluate_population(self.population, _simulate, lambda r: r['yield'], _job, pool=pool,
+                                         errors=(SimulationFailed,))
+        np.testing.assert_array_equal(serial, processes)
+        np.testing.assert_array_equal(serial, pooled)
+
+    def test_vector_scores(self):
+        fitness = evaluate_population(self.population, _simulate, lambda r: [r['yield'], -r['yield']], _job,
+                                      errors=(SimulationFailed,), penalty=1e9)
+        self.assertEqual(fitness.shape, (5, 2))
+        np.testing.assert_array_equal(fitness[3], [1e9, 1e9])
+        np.testing.assert_array_equal(fitness[0], [12.0, -12.0])
+        self.assertEqual(evaluate_population([], _simulate, lambda r: r, _job).shape, (0,))
+        self.assertEqual(evaluate_population([], _simulate, lambda r: r, _job, shape=(2,)).shape, (0, 2))
+
+    def test_whole_generation_fails(self):
+        failing = [[-1.0, 0.0], [-2.0, 1.0], [-1.0, 0.0]]
+        fitness = evaluate_population(failing, _simulate, lambda r: [r['yield'], -r['yield']], _job,
+                                      errors=(SimulationFailed,), penalty=1e20, shape=(2,))
+        np.testing.assert_array_equal(fitness, np.full((3, 2), 1e20))
+
+    def test_unique_candidates(self):
+        unique, inverse = unique_candidates([np.array([1, 2]), ('a', 3), [1, 2], ('a', 3)])
+        self.assertEqual(len(unique), 2)
+        np.testing.assert_array_equal(inverse, [0, 1, 0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
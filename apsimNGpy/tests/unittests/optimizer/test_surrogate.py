@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from wrapdisc import Objective
+from wrapdisc.var import ChoiceVar, QrandintVar, UniformVar
+
+from apsimNGpy.optimizer.minimize.surrogate import (EvaluationArchive, GaussianProcess, expected_improvement,
+                                                    surrogate_minimize)
+
+
+def _branin(x):
+    x1, x2 = x
+    return ((x2 - 5.1 / (4 * np.pi ** 2) * x1 ** 2 + 5 / np.pi * x1 - 6) ** 2
+            + 10 * (1 - 1 / (8 * np.pi)) * np.cos(x1) + 10)
+
+
+class TestSurrogate(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def _evaluate(self, population):
+        self.calls += len(population)
+        return [_branin(x) for x in population]
+
+    def test_gaussian_process(self):
+        x = np.linspace(0, 1, 12)[:, None]
+        gp = GaussianProcess(rng=0).fit(x, np.sin(6 * x[:, 0]))
+        mean, std = gp.predict(x)
+        np.testing.assert_allclose(mean, np.sin(6 * x[:, 0]), atol=1e-2)
+        self.assertGreater(gp.predict([[0.5 / 11]])[1][0], std[0])
+        self.assertTrue(np.all(expected_improvement(mean, std, 0.0) >= 0))
+
+    def test_converges_with_few_evaluations(self):
+        result = surrogate_minimize(self._evaluate, [(-5, 10), (0, 15)], max_evaluations=40, batch_size=2, rng=1)
+        self.assertEqual(self.calls, 40)
+        self.assertEqual(result.nfev, 40)
+        self.assertLess(result.fun, 0.398 + 0.5)
+
+    def test_archive_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'runs' / 'archive.csv'
+            first = surrogate_minimize(self._evaluate, [(-5, 10), (0, 15)], var_names=['a', 'b'],
+                                       max_evaluations=12, archive=path, rng=2)
+            self.assertEqual(len(EvaluationArchive(path, 2, ['a', 'b'])), 12)
+            second = surrogate_minimize(self._evaluate, [(-5, 10), (0, 15)], var_names=['a', 'b'],
+                                        max_evaluations=20, archive=path, rng=3)
+            self.assertEqual(second.nfev, 8)
+            self.assertEqual(self.calls, 20)
+            self.assertLessEqual(second.fun, first.fun)
+            with self.assertRaises(ValueError):
+                EvaluationArchive(path, 3)
+
+    def test_mixed_variables(self):
+        wrapper = Objective(lambda x: 0, variables=[ChoiceVar(['low', 'high']), QrandintVar(0, 20, q=5),
+                                                    UniformVar(0, 1)])
+        seen = []
+
+        def evaluate(population):
+            seen.extend(population)
+            return [(0 if c == 'high' else 1) + abs(n - 10) / 10 + (u - 0.3) ** 2 for c, n, u in population]
+
+        result = surrogate_minimize(evaluate, wrapper.bounds, decode=wrapper.decode, max_evaluations=30, rng=4)
+        self.assertEqual(len({tuple(p) for p in seen}), len(seen))
+        best = wrapper.decode(result.x)
+        self.assertEqual(tuple(best[:2]), ('high', 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.core_utils import aggregation
+from apsimNGpy.core_utils.aggregation import ChunkAggregator, aggregate_chunks
+
+
+class TestChunkAggregator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        n = 2000
+        self.df = pd.DataFrame({'SimulationID': rng.integers(0, 6, n), 'source_table': rng.choice(['Report', 'soc'], n),
+                                'Yield': rng.normal(5000, 800, n), 'day': rng.integers(1, 366, n), 'Zone': 'Field'})
+        self.df.loc[::9, 'Yield'] = np.nan
+        self.chunks = [self.df.iloc[i:i + 97] for i in range(0, n, 97)]
+
+    def test_matches_pandas(self):
+        for agg_func in sorted(aggregation.AGGS):
+            for by in (['source_table'], ['SimulationID', 'source_table']):
+                with self.subTest(agg_func=agg_func, by=by):
+                    expected = self.df.groupby(by).agg(agg_func, numeric_only=True)
+                    pd.testing.assert_frame_equal(aggregate_chunks(self.chunks, agg_func, by=by), expected,
+                                                  check_dtype=False, rtol=1e-9)
+
+    def test_without_groups_and_compaction(self):
+        old, aggregation.COMPACT_EVERY = aggregation.COMPACT_EVERY, 2
+        try:
+            out = aggregate_chunks(self.chunks, 'std')
+        finally:
+            aggregation.COMPACT_EVERY = old
+        pd.testing.assert_series_equal(out, self.df.agg('std', numeric_only=True), check_names=False, rtol=1e-9)
+
+    def test_invalid_usage(self):
+        with self.assertRaises(ValueError):
+            ChunkAggregator('mode')
+        agg = ChunkAggregator('sum', by='ID')
+        with self.assertRaises(KeyError):
+            agg.update(self.df)
+        self.assertTrue(agg.result().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
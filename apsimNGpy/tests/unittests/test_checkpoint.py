@@ -0,0 +1,73 @@
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from apsimNGpy.durable.durable_utils import CheckPoint, atomic_write, job_key
+
+
+class TestCheckPoint(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name) / 'run'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_state_round_trip(self):
+        checkpoint = CheckPoint(self.directory, every=2)
+        self.assertFalse(checkpoint.exists)
+        self.assertEqual(checkpoint.load(), {})
+        rng = np.random.default_rng(3)
+        population = rng.random((6, 2))
+        self.assertFalse(checkpoint.maybe_save(population=population, nit=1))
+        self.assertTrue(checkpoint.maybe_save(population=population, nit=2, rng_state=rng.bit_generator.state))
+        expected = rng.random(3)
+
+        restored = CheckPoint(self.directory)
+        state = restored.load()
+        self.assertEqual(restored.epoch, 1)
+        self.assertEqual(state['nit'], 2)
+        np.testing.assert_array_equal(state['population'], population)
+        other = np.random.default_rng()
+        other.bit_generator.state = state['rng_state']
+        np.testing.assert_array_equal(other.random(3), expected)
+        self.assertEqual(os.listdir(self.directory), ['state.pkl'])
+
+    def test_completed_jobs_survive_a_cut_journal(self):
+        checkpoint = CheckPoint(self.directory)
+        jobs = ['a.apsimx', {'model': 'Maize', 'ID': 1}, {'model': 'Maize', 'inputs': [{'Amount': 5}]}]
+        checkpoint.mark_done(job_key(jobs[0]), job_key(jobs[1]))
+        with open(checkpoint.journal_path, 'a') as f:
+            f.write(job_key(jobs[2])[:5])  # killed while writing
+        resumed = CheckPoint(self.directory)
+        self.assertEqual(resumed.completed, {'a.apsimx', 'ID=1'})
+        self.assertEqual(list(resumed.pending(iter(jobs))), [jobs[2]])
+        self.assertEqual(job_key({'inputs': [{'Amount': 5}], 'model': 'Maize'}), job_key(jobs[2]))
+        resumed.mark_done('ID=2')
+        self.assertEqual(CheckPoint(self.directory).completed, {'a.apsimx', 'ID=1', 'ID=2'})
+
+        checkpoint.child('jobs').mark_done('x')
+        resumed.clear()
+        self.assertFalse(resumed.exists)
+        self.assertFalse((self.directory / 'jobs').exists())
+        self.assertEqual(resumed.completed, set())
+
+    def test_atomic_write_keeps_old_file_on_failure(self):
+        path = self.directory / 'state.pkl'
+        atomic_write(path, pickle.dumps({'nit': 1}))
+
+        class Unpicklable:
+            def __reduce__(self):
+                raise RuntimeError('boom')
+
+        with self.assertRaises(RuntimeError):
+            CheckPoint(self.directory).save(value=Unpicklable())
+        self.assertEqual(pickle.loads(path.read_bytes()), {'nit': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
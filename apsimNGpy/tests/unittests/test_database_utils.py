@@ -0,0 +1,157 @@
+import sqlite3
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pandas as pd
+
+from apsimNGpy.core_utils import database_utils as du
+
+
+class TestPooledReads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.db = Path(self.tmp.name) / 'results.db'
+        with sqlite3.connect(self.db) as con:
+            for i in range(3):
+                pd.DataFrame({'ID': [i, i], 'Yield': [1.0, 2.0]}).to_sql(f'Report{i}', con, index=False)
+            pd.DataFrame({'year': [1990]}).to_sql('soc', con, index=False)
+
+    def tearDown(self):
+        du.dispose_read_engine(self.db)
+        self.tmp.cleanup()
+
+    def test_engine_is_reused(self):
+        du.read_db_table(self.db, 'Report0')
+        du.read_db_table(self.db, 'Report1')
+        self.assertIs(du.get_read_engine(self.db), du.get_read_engine(str(self.db)))
+        du.dispose_read_engine(self.db)
+        self.assertFalse(any(k[0] == str(self.db.resolve()) for k in du._READ_ENGINES))
+
+    def test_least_recently_used_engines_are_disposed(self):
+        others = [Path(self.tmp.name) / f'other{i}.db' for i in range(2)]
+        for other in others:
+            sqlite3.connect(other).close()
+        with mock.patch.object(du, 'MAX_READ_ENGINES', len(du._READ_ENGINES) + 2):
+            first = du.get_read_engine(self.db)
+            du.get_read_engine(others[0])
+            self.assertIs(du.get_read_engine(self.db), first)
+            with mock.patch.object(type(first), 'dispose') as dispose:
+                du.get_read_engine(others[1])
+            dispose.assert_called_once()
+            self.assertIs(du.get_read_engine(self.db), first)
+            self.assertFalse(any(k[0] == str(others[0].resolve()) for k in du._READ_ENGINES))
+        for other in others:
+            du.dispose_read_engine(other)
+
+    def test_quoted_table_names(self):
+        with sqlite3.connect(self.db) as con:
+            pd.DataFrame({'a': [1]}).to_sql('odd "name', con, index=False)
+        self.assertEqual(du.read_db_tables(self.db, ['odd "name'])['odd "name'].shape, (1, 1))
+
+    def test_read_only(self):
+        with du.get_read_engine(self.db).connect() as con:
+            with self.assertRaises(Exception):
+                con.exec_driver_sql('CREATE TABLE forbidden (a INTEGER)')
+
+    def test_read_many_tables(self):
+        frames = du.read_db_tables(self.db, ['Report0', 'soc', 'missing'])
+        self.assertEqual(list(frames), ['Report0', 'soc'])
+        self.assertEqual(frames['Report0'].shape, (2, 2))
+
+    def test_union_all(self):
+        df = du.read_db_tables(self.db, ['Report0', 'Report1', 'Report2', 'soc'], union=True, label='source_table')
+        self.assertEqual(df.shape[0], 7)
+        self.assertEqual(set(df['source_table']), {'Report0', 'Report1', 'Report2', 'soc'})
+        self.assertEqual(df.loc[df.source_table == 'Report2', 'ID'].tolist(), [2, 2])
+
+    def test_missing_database_is_not_created(self):
+        missing = Path(self.tmp.name) / 'missing.db'
+        with self.assertRaises(FileNotFoundError):
+            du.read_db_tables(missing, ['Report'])
+        self.assertFalse(missing.exists())
+
+
+class TestPushdown(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.db = Path(self.tmp.name) / 'apsim.db'
+        with sqlite3.connect(self.db) as con:
+            pd.DataFrame({'ID': [1, 2], 'Name': ['wet', 'dry']}).to_sql('_Simulations', con, index=False)
+            pd.DataFrame({'SimulationID': [1, 1, 2, 2], 'year': [1990, 1991, 1990, 1991],
+                          'Yield': [100.0, 200.0, 300.0, 400.0], 'Zone': ['Field'] * 4}).to_sql('Report', con,
+                                                                                               index=False)
+            pd.DataFrame({'SimulationID': [1, 2], 'soc': [70.0, 80.0]}).to_sql('soc', con, index=False)
+
+    def tearDown(self):
+        du.dispose_read_engine(self.db)
+        self.tmp.cleanup()
+
+    def test_build_select(self):
+        sql, params, selected = du.build_select('Report', ['year', 'Yield', 'Zone'], columns=['Yield'],
+                                                where={'year': (1990, None), 'Zone': ['Field']})
+        self.assertEqual(selected, ('Yield',))
+        self.assertEqual(sql, 'SELECT "Yield" FROM "Report" WHERE "year" >= ? AND "Zone" IN (?)')
+        self.assertEqual(params, [1990, 'Field'])
+        # no requested column or a filtered column missing means no rows from that table
+        self.assertIsNone(du.build_select('Report', ['year'], columns=['Yield']))
+        self.assertIsNone(du.build_select('Report', ['year'], where={'Zone': 'Field'}))
+
+    def test_columns_and_range(self):
+        df = du.read_db_tables(self.db, ['Report'], columns=['year', 'Yield'], where={'year': (1991, 1991)})['Report']
+        self.assertEqual(list(df.columns), ['year', 'Yield'])
+        self.assertEqual(df.Yield.tolist(), [200.0, 400.0])
+
+    def test_simulation_names(self):
+        df = du.read_db_tables(self.db, ['Report', 'soc'], simulations=['dry'], union=True, label='source_table')
+        self.assertEqual(set(df.SimulationID), {2})
+        self.assertEqual(df.shape[0], 3)
+
+    def test_sql_expression_and_missing_filter_column(self):
+        frames = du.read_db_tables(self.db, ['Report', 'soc'], where={'Yield': [100.0, 300.0]})
+        self.assertEqual(list(frames), ['Report'])
+        df = du.read_db_tables(self.db, ['Report'], where='Yield > 250 AND year = 1991')['Report']
+        self.assertEqual(df.Yield.tolist(), [400.0])
+        with self.assertRaises(ValueError):
+            du.read_db_tables(self.db, ['Report'], columns=['nothing'])
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.db = Path(self.tmp.name) / 'daily.db'
+        with sqlite3.connect(self.db) as con:
+            con.execute('CREATE TABLE Report (SimulationID INTEGER, day INTEGER, Yield REAL, Zone TEXT)')
+            con.executemany('INSERT INTO Report VALUES (?, ?, ?, ?)',
+                            [(i % 3, i, None if i % 10 == 0 else float(i), 'Field') for i in range(1050)])
+            pd.DataFrame({'SimulationID': [0, 1], 'soc': [70.0, 80.0]}).to_sql('soc', con, index=False)
+
+    def tearDown(self):
+        du.dispose_read_engine(self.db)
+        self.tmp.cleanup()
+
+    def test_chunks_cover_all_rows(self):
+        chunks = list(du.iter_db_tables(self.db, ['Report', 'soc'], chunksize=100, label='source_table'))
+        self.assertEqual([len(c) for c in chunks], [100] * 10 + [50, 2])
+        expected = du.read_db_tables(self.db, ['Report', 'soc'], union=True, label='source_table')
+        self.assertEqual(sum(len(c) for c in chunks), len(expected))
+
+    def test_dtypes_are_stable(self):
+        dtypes = {tuple(c.dtypes) for c in du.iter_db_tables(self.db, ['Report'], chunksize=1, where='day < 20')}
+        self.assertEqual(len(dtypes), 1)
+        # the first row has a NULL Yield, its type still comes from the table declaration
+        first = next(du.iter_db_tables(self.db, ['Report'], chunksize=1, columns=['day', 'Yield']))
+        self.assertEqual((str(first['day'].dtype), str(first['Yield'].dtype)), ('Int64', 'float64'))
+
+    def test_projection_filters_and_arrow(self):
+        chunks = list(du.iter_db_tables(self.db, ['Report'], chunksize=500, columns=['Yield'],
+                                        where={'SimulationID': 1}, arrow=True))
+        self.assertEqual(chunks[0].column_names, ['Yield'])
+        self.assertEqual(sum(c.num_rows for c in chunks), 350)
+        with self.assertRaises(ValueError):
+            list(du.iter_db_tables(self.db, ['Report'], chunksize=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
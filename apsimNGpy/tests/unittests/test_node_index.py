@@ -0,0 +1,94 @@
+import unittest
+
+from apsimNGpy.core_utils.node_index import NodeIndex, type_key
+
+
+class _Type:
+    """Stands in for System.Type."""
+
+    def __init__(self, full_name, base=None, interfaces=()):
+        self.FullName, self.BaseType, self._interfaces = full_name, base, interfaces
+
+    def GetInterfaces(self):
+        return list(self._interfaces)
+
+
+MODEL = _Type('Models.Core.Model', _Type('System.Object'), (_Type('Models.Core.IModel'),))
+# GetInterfaces also returns the interfaces of base types
+TYPES = {name: _Type(name, MODEL, tuple(_Type(i) for i in ('Models.Core.IModel', *interfaces)))
+         for name, interfaces in (
+    ('Models.Core.Simulations', ()), ('Models.Core.Simulation', ()), ('Models.Core.Zone', ()),
+    ('Models.Clock', ()), ('Models.Manager', ()), ('Models.PMF.Plant', ('Models.Core.IPlant',)),
+    ('Models.Soils.Soil', ()), ('Models.Soils.Physical', ()))}
+
+
+class _Node:
+    def __init__(self, type_name, name, *children):
+        self.Name, self._type, self.Children, self.Parent = name, TYPES[type_name], list(children), None
+        for child in children:
+            child.Parent = self
+
+    def GetType(self):
+        return self._type
+
+    @property
+    def FullPath(self):
+        return f"{self.Parent.FullPath if self.Parent else ''}.{self.Name}"
+
+
+def _simulation(name):
+    return _Node('Models.Core.Simulation', name, _Node('Models.Clock', 'Clock'),
+                 _Node('Models.Core.Zone', 'Field', _Node('Models.Manager', 'Sow'), _Node('Models.PMF.Plant', 'Maize'),
+                       _Node('Models.Soils.Soil', 'Soil', _Node('Models.Soils.Physical', 'Physical'))))
+
+
+class TestNodeIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = _Node('Models.Core.Simulations', 'Simulations', *[_simulation(f'Sim{i}') for i in range(3)])
+        self.index = NodeIndex(self.root, cast=lambda node: ('cast', node))
+
+    def test_lookups_walk_once(self):
+        node = self.index.get('.Simulations.Sim1.Field.Soil.Physical')
+        self.assertEqual(node[0], 'cast')
+        self.assertEqual(node[1].FullPath, '.Simulations.Sim1.Field.Soil.Physical')
+        self.assertIs(self.index.get('.Simulations.Sim1.Field.Soil.Physical'), node)
+        self.assertIsNone(self.index.get('.Simulations.Sim9.Clock'))
+        self.assertEqual(self.index.paths('Models.Clock'), [f'.Simulations.Sim{i}.Clock' for i in range(3)])
+        self.assertEqual(self.index.paths('Models.Core.IPlant', scope='.Simulations.Sim2'),
+                         ['.Simulations.Sim2.Field.Maize'])
+        self.assertEqual(self.index.first('Models.Manager', 'Sow').FullPath, '.Simulations.Sim0.Field.Sow')
+        self.assertEqual(len(self.index.paths('Models.Core.IModel')), len(self.index) - 1)
+        self.assertEqual(self.index.stats['builds'], 1)
+
+    def test_remove_rename_and_stale_paths(self):
+        self.index.build()
+        sim = self.root.Children.pop(0)
+        self.index.remove(sim.FullPath)
+        self.assertEqual(self.index.paths('Models.Clock'), ['.Simulations.Sim1.Clock', '.Simulations.Sim2.Clock'])
+        field = self.root.Children[0].Children[1]
+        field.Name = 'Paddock'
+        self.index.rename('.Simulations.Sim1.Field', 'Paddock')
+        self.assertEqual(self.index.get('.Simulations.Sim1.Paddock.Sow')[1].Name, 'Sow')
+        self.assertEqual(self.index.paths('Models.Core.Zone', 'Paddock'), ['.Simulations.Sim1.Paddock'])
+        self.assertEqual(self.index.paths('Models.Manager', 'Sow'),
+                         ['.Simulations.Sim1.Paddock.Sow', '.Simulations.Sim2.Field.Sow'])
+        # renamed behind the index's back, the stale hit triggers a rebuild
+        self.root.Children[1].Name = 'Other'
+        self.assertIsNone(self.index.get('.Simulations.Sim2.Clock'))
+        self.assertEqual(self.index.stats['builds'], 2)
+        self.assertIsNotNone(self.index.get('.Simulations.Other.Clock'))
+        self.root.Children[0].Name = 'Renamed'
+        self.assertEqual(self.index.paths('Models.Clock'), ['.Simulations.Renamed.Clock', '.Simulations.Other.Clock'])
+        self.root.Children.pop(0).Parent = None
+        self.assertEqual([n.FullPath for n in self.index.find('Models.Manager')], ['.Simulations.Other.Field.Sow'])
+        self.assertEqual(self.index.first('Models.Core.Zone').FullPath, '.Simulations.Other.Field')
+        self.assertEqual(self.index.stats['builds'], 4)
+
+    def test_type_key(self):
+        self.assertEqual(type_key('Models.Clock'), 'Models.Clock')
+        self.assertEqual(type_key(TYPES['Models.Clock']), 'Models.Clock')
+        self.assertEqual(type_key(_Node), f'{__name__}._Node')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ModuleNotFoundError:
+    pyarrow = None
+
+from apsimNGpy.core_utils.parquet_sink import (write_fragment, read_dataset, iter_dataset, list_partitions,
+                                               clear_dataset, TMP_PREFIX)
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestParquetSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root = Path(self.tmp.name) / 'results.parquet'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def frame(self, i):
+        return pd.DataFrame({'ID': [i, i], 'Yield': [1.0 * i, 2.0 * i], 'source_table': ['Report', 'Report']})
+
+    def test_round_trip_both_formats(self):
+        for fmt in ('parquet', 'arrow'):
+            root = self.root.with_suffix(f'.{fmt}')
+            for i in range(4):
+                write_fragment(self.frame(i), root, partition='a', fmt=fmt)
+            df = read_dataset(root, fmt=fmt).sort_values(['ID', 'Yield'], ignore_index=True)
+            self.assertEqual(df.shape, (8, 3))
+            self.assertEqual(df['ID'].tolist(), [0, 0, 1, 1, 2, 2, 3, 3])
+
+    def test_concurrent_writers(self):
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda i: write_fragment(self.frame(i), self.root, partition='a'), range(20)))
+        self.assertEqual(len(read_dataset(self.root)), 40)
+
+    def test_column_pruning_and_partitions(self):
+        write_fragment(self.frame(1), self.root, partition='a')
+        write_fragment(pd.DataFrame({'ID': [9], 'Biomass': [3.5]}), self.root, partition='b')
+        self.assertEqual(list_partitions(self.root), ('schema=a', 'schema=b'))
+        df = read_dataset(self.root, columns=['ID', 'Biomass'])
+        self.assertEqual(sorted(df.columns), ['Biomass', 'ID'])
+        self.assertEqual(len(df), 3)
+        only_b = read_dataset(self.root, partitions=['schema=b'])
+        self.assertEqual(only_b['Biomass'].tolist(), [3.5])
+
+    def test_fragments_with_different_columns_in_one_partition(self):
+        # same dtypes, different column names, as partitions keyed on dtypes only used to mix them
+        write_fragment(pd.DataFrame({'ID': [1], 'Yield': [2.0]}), self.root, partition='a')
+        write_fragment(pd.DataFrame({'ID': [2], 'Biomass': [3.0]}), self.root, partition='a')
+        df = read_dataset(self.root).sort_values('ID', ignore_index=True)
+        self.assertEqual(sorted(df.columns), ['Biomass', 'ID', 'Yield'])
+        self.assertEqual(df['Yield'].tolist()[0], 2.0)
+        self.assertEqual(df['Biomass'].tolist()[1], 3.0)
+
+    def test_streamed_chunks(self):
+        write_fragment(pd.DataFrame({'ID': range(250), 'Yield': 1.0}), self.root, partition='a')
+        write_fragment(self.frame(1), self.root, partition='b')
+        chunks = list(iter_dataset(self.root, columns=['Yield'], chunksize=100))
+        self.assertLessEqual(max(len(c) for c in chunks), 100)
+        self.assertEqual(sum(len(c) for c in chunks), 252)
+        self.assertEqual(list(chunks[0].columns), ['Yield'])
+
+    def test_uncommitted_fragments_are_ignored(self):
+        write_fragment(self.frame(1), self.root, partition='a')
+        (self.root / 'schema=a' / f'{TMP_PREFIX}part-0.parquet').write_bytes(b'partial write')
+        self.assertEqual(len(read_dataset(self.root)), 2)
+
+    def test_clear_and_missing_dataset(self):
+        write_fragment(self.frame(1), self.root, partition='a')
+        clear_dataset(self.root)
+        self.assertEqual(list_partitions(self.root), ())
+        self.assertTrue(read_dataset(self.root, columns=['ID']).empty)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            write_fragment(self.frame(1), self.root, partition='a', fmt='csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
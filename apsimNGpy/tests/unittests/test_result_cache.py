@@ -0,0 +1,112 @@
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from apsimNGpy.core_utils.result_cache import ResultCache
+
+VERSION = '2025.8.7844.0'
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.met = self.dir / 'site.met'
+        self.met.write_text('[weather.met.weatherfile]\nyear day radn\n2020 1 10\n')
+        self.model = self.dir / 'maize.apsimx'
+        tree = {'$type': 'Models.Core.Simulations, Models',
+                'Children': [{'$type': 'Models.Climate.Weather, Models', 'FileName': 'site.met'}]}
+        self.model.write_text(json.dumps(tree))
+        self.cache = ResultCache(self.dir / 'cache')
+        self.edits = [{'path': '.Simulations.Simulation.Field.Fertilise at sowing', 'Amount': 150}]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def key(self, edits=None, **kwargs):
+        kwargs.setdefault('version', VERSION)
+        return self.cache.make_key(self.model, self.edits if edits is None else edits, **kwargs)
+
+    def test_key_is_canonical(self):
+        reordered = [{'Amount': np.int64(150), 'path': '.Simulations.Simulation.Field.Fertilise at sowing'}]
+        self.assertEqual(self.key(), self.key(reordered))
+        self.assertNotEqual(self.key(), self.key([{**self.edits[0], 'Amount': 160}]))
+        self.assertNotEqual(self.key(), self.key(version='2026.1.0.0'))
+        self.assertNotEqual(self.key(), self.key(table='Report'))
+        # consumers post-process results differently and never share entries
+        self.assertNotEqual(self.key(namespace='optimizer'), self.key(namespace='multi_core'))
+        self.assertIsNone(self.cache.make_key(object(), version=VERSION))
+
+    def test_key_covers_every_row_of_frame_edits(self):
+        dul = pd.DataFrame({'Thickness': np.full(100, 100.0), 'DUL': np.linspace(0.2, 0.4, 100)})
+        edited = dul.copy()
+        edited.loc[50, 'DUL'] += 0.01
+        soil = '.Simulations.Simulation.Field.Soil.Physical'
+        self.assertNotEqual(self.key([{'path': soil, 'DUL': dul}]), self.key([{'path': soil, 'DUL': edited}]))
+        self.assertEqual(self.key([{'path': soil, 'DUL': dul}]), self.key([{'path': soil, 'DUL': dul.copy()}]))
+        self.assertNotEqual(self.key([{'path': soil, 'DUL': dul['DUL']}]),
+                            self.key([{'path': soil, 'DUL': edited['DUL']}]))
+        # no canonical form, the run is not cached rather than keyed on a lossy repr
+        self.assertIsNone(self.key([{'path': soil, 'DUL': object()}]))
+
+    def test_key_follows_model_and_weather_content(self):
+        before = self.key()
+        self.met.write_text('[weather.met.weatherfile]\nyear day radn\n2020 1 12\n')
+        os.utime(self.met, ns=(0, os.stat(self.met).st_mtime_ns + 10_000_000))
+        after_weather = self.key()
+        self.assertNotEqual(before, after_weather)
+        self.model.write_text(self.model.read_text() + ' ')
+        self.assertNotEqual(after_weather, self.key())
+
+    def test_put_get_and_stats(self):
+        key = self.key()
+        self.assertIsNone(self.cache.get(key))
+        df = pd.DataFrame({'Yield': [1.0, 2.0], 'source_table': ['Report', 'Report']})
+        self.cache.put(key, df)
+        self.assertIn(key, self.cache)
+        pd.testing.assert_frame_equal(self.cache.get(key), df)
+        stats = self.cache.stats
+        self.assertEqual((stats['hits'], stats['misses'], stats['writes'], stats['entries']), (1, 1, 1, 1))
+        # another process sees the same entries
+        self.assertIsNotNone(ResultCache(self.cache.cache_dir).get(key))
+
+    def test_size_based_eviction(self):
+        df = pd.DataFrame({'Yield': np.arange(1000, dtype=float)})
+        keys = [self.key([{'path': '.x', 'Amount': i}]) for i in range(4)]
+        for k in keys:
+            self.cache.put(k, df)
+        size = self.cache.stats['bytes'] // 4
+        small = ResultCache(self.cache.cache_dir, max_bytes=size * 2)
+        os.utime(small._path(keys[0]), ns=(0, 1))
+        small.evict()
+        self.assertEqual(small.stats['entries'], 2)
+        self.assertNotIn(keys[0], small)
+        self.assertIn(keys[3], small)
+        small.clear()
+        self.assertEqual(small.stats['entries'], 0)
+
+    def test_writes_scan_only_when_over_budget(self):
+        df = pd.DataFrame({'Yield': np.arange(1000, dtype=float)})
+        self.cache.put(self.key([{'path': '.x', 'Amount': -1}]), df)
+        size = self.cache.stats['bytes']
+        small = ResultCache(self.dir / 'small', max_bytes=size * 3)
+        scans = []
+        entries = small._entries
+        small._entries = lambda: scans.append(1) or entries()
+        for i in range(3):
+            small.put(self.key([{'path': '.x', 'Amount': i}]), df)
+        # the first write reads the size once, the next ones fit the budget
+        self.assertEqual(len(scans), 1)
+        small.put(self.key([{'path': '.x', 'Amount': 3}]), df)
+        self.assertEqual(len(scans), 2)
+        self.assertEqual(small.evictions, 2)
+        self.assertLessEqual(sum(size for _, size, _ in entries()), size * 3 * 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
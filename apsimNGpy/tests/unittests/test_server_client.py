@@ -0,0 +1,49 @@
+import unittest
+from ctypes import c_double, c_int32, c_char
+
+import numpy as np
+
+from apsimNGpy._server import utils
+from apsimNGpy._server.utils import (run_with_changes, read_output, connect_to_remote_server, ApsimProtocolError,
+                                     PROPERTY_TYPE_DOUBLE, PROPERTY_TYPE_INT, PROPERTY_TYPE_STRING)
+from apsimNGpy.tests.unittests.fake_apsim_server import FakeApsimServer
+
+
+class TestPipelinedClient(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeApsimServer(reject='[Bad].Path')
+        self.sock = connect_to_remote_server('127.0.0.1', self.server.port)
+
+    def tearDown(self):
+        self.sock.close()
+        self.server.close()
+
+    def test_run_and_read_numpy_columns(self):
+        changes = [{'path': '[Leaf].RUE', 'value': 1.5, 'paramtype': PROPERTY_TYPE_DOUBLE},
+                   {'path': '[Sow].Population', 'value': np.int64(8), 'paramtype': PROPERTY_TYPE_INT},
+                   {'path': '[Sow].Cultivar', 'value': 'B_110', 'paramtype': PROPERTY_TYPE_STRING}]
+        run_with_changes(self.sock, changes)
+        self.assertEqual(self.server.changes, {'[Leaf].RUE': 1.5, '[Sow].Population': 8, '[Sow].Cultivar': 'B_110'})
+        out = read_output(self.sock, 'Report', {'Yield': c_double, 'Clock.Today': c_int32, 'Zone': c_char})
+        self.assertIsInstance(out['Yield'], np.ndarray)
+        np.testing.assert_allclose(out['Yield'], np.arange(10) * 9.5)
+        self.assertEqual(out['Clock.Today'].dtype, np.dtype('<i4'))
+        self.assertEqual(out['Zone'], 'Field')
+
+    def test_changes_beyond_pipeline_depth(self):
+        old, utils.PIPELINE_DEPTH = utils.PIPELINE_DEPTH, 4
+        try:
+            changes = [{'path': f'[P{i}].x', 'value': 1.0, 'paramtype': PROPERTY_TYPE_DOUBLE} for i in range(10)]
+            run_with_changes(self.sock, changes)
+            run_with_changes(self.sock, [])
+        finally:
+            utils.PIPELINE_DEPTH = old
+        self.assertEqual([len(r) for r in self.server.runs], [10, 0])
+
+    def test_rejected_change(self):
+        with self.assertRaises(ApsimProtocolError):
+            run_with_changes(self.sock, [{'path': '[Bad].Path', 'value': 1.0, 'paramtype': PROPERTY_TYPE_DOUBLE}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from apsimNGpy._server.pool import ServerPool
+from apsimNGpy._server.utils import PROPERTY_TYPE_DOUBLE, ApsimProtocolError
+from apsimNGpy.tests.unittests.fake_apsim_server import FakeApsimServer
+
+
+def rue(value):
+    return [{'path': '[Leaf].RUE', 'value': float(value), 'paramtype': PROPERTY_TYPE_DOUBLE}]
+
+
+class TestServerPool(unittest.TestCase):
+    def setUp(self):
+        self.launched = []
+
+    def launcher(self, port):
+        server = FakeApsimServer(port=port, run_delay=0.05)
+        self.launched.append(server)
+        return server
+
+    def test_runs_are_spread_over_idle_servers(self):
+        with ServerPool(n_servers=3, launcher=self.launcher) as pool:
+            async def calibrate():
+                return await asyncio.gather(*(pool.submit(rue(i), ['Yield']) for i in range(1, 13)))
+
+            frames = asyncio.run(calibrate())
+            self.assertEqual([df['Yield'].iloc[1] for df in frames], [float(i) for i in range(1, 13)])
+            self.assertEqual(sum(s['runs'] for s in pool.stats), 12)
+            self.assertTrue(all(s['runs'] > 0 for s in pool.stats))
+        self.assertEqual(len(self.launched), 3)
+        self.assertTrue(all(server.closed for server in self.launched))
+
+    def test_crashed_and_hung_servers_are_restarted(self):
+        with ServerPool(n_servers=1, launcher=self.launcher, run_timeout=1) as pool:
+            self.launched[0].close()
+            self.assertEqual(pool.run(rue(2), ['Yield'])['Yield'].iloc[1], 2.0)
+            self.launched[1].hang = True
+            self.assertEqual(pool.run(rue(3), ['Yield'])['Yield'].iloc[1], 3.0)
+            self.assertEqual(pool.stats[0]['runs'], 2)
+            self.assertEqual(len(self.launched), 3)
+
+    def test_rejected_jobs_are_raised_without_restart(self):
+        def strict(port):
+            server = self.launcher(port)
+            server.reject = '[Leaf].Invalid'
+            return server
+
+        with ServerPool(n_servers=1, launcher=strict, max_restarts=0) as pool:
+            for _ in range(3):
+                with self.assertRaises(ApsimProtocolError):
+                    pool.run([{'path': '[Leaf].Invalid', 'value': 1.0, 'paramtype': PROPERTY_TYPE_DOUBLE}])
+            self.assertEqual(pool.run(rue(2), ['Yield'])['Yield'].iloc[1], 2.0)
+            self.assertEqual(pool.stats[0]['restarts'], 0)
+        self.assertEqual(len(self.launched), 1)
+
+    def test_restarts_are_reset_by_successful_runs(self):
+        with ServerPool(n_servers=1, launcher=self.launcher, max_restarts=1) as pool:
+            for value in range(1, 4):
+                self.launched[-1].close()
+                self.assertEqual(pool.run(rue(value), ['Yield'])['Yield'].iloc[1], float(value))
+                self.assertEqual(pool.stats[0]['restarts'], 0)
+        self.assertEqual(len(self.launched), 4)
+
+    def test_gives_up_after_max_restarts(self):
+        def crashing(port):
+            server = self.launcher(port)
+            if len(self.launched) > 1:
+                server.close()
+            return server
+
+        with ServerPool(n_servers=1, launcher=crashing, max_restarts=1) as pool:
+            self.launched[0].close()
+            with self.assertRaises(RuntimeError):
+                pool.run(rue(1))
+            with self.assertRaisesRegex(RuntimeError, 'no APSIM server left'):
+                pool.run(rue(1))
+
+if __name__ == '__main__':
+    unittest.main()
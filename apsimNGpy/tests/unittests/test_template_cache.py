@@ -0,0 +1,85 @@
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from apsimNGpy.core_utils.template_cache import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.file = self.write('base.apsimx', {'$type': 'Models.Core.Simulations, Models', 'Children': []})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = self.dir / name
+        path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        return path
+
+    def test_hits_and_misses(self):
+        cache = TemplateCache()
+        first = cache.get(self.file, version='1')
+        second = cache.get(self.file, version='1')
+        self.assertIs(first, second)
+        self.assertEqual(json.loads(first)['Children'], [])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # another APSIM version must not reuse the template
+        cache.get(self.file, version='2')
+        self.assertEqual(cache.misses, 2)
+
+    def test_modified_file_is_reloaded(self):
+        cache = TemplateCache()
+        cache.get(self.file)
+        self.write('base.apsimx', {'Name': 'edited', 'Children': [1]})
+        st = os.stat(self.file)
+        os.utime(self.file, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        self.assertEqual(json.loads(cache.get(self.file))['Name'], 'edited')
+        self.assertEqual(cache.misses, 2)
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        files = [self.write(f'f{i}.apsimx', {'Name': f'f{i}'}) for i in range(3)]
+        cache = TemplateCache(max_entries=2)
+        for f in files:
+            cache.get(f)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        cache.get(files[0])
+        self.assertEqual(cache.misses, 4)
+
+        size = len(json.dumps({'Name': 'f0'}))
+        cache = TemplateCache(max_bytes=size * 2)
+        for f in files:
+            cache.get(f)
+        self.assertLessEqual(cache.stats['bytes'], size * 2)
+        self.assertEqual(cache.stats['entries'], 2)
+
+    def test_budget_counts_utf8_bytes(self):
+        path = self.write('sol.apsimx', {'Name': 'Sol \u00e0 \u00e9t\u00e9 \u2013 Mal\u00ed'})
+        cache = TemplateCache()
+        text = cache.get(path)
+        self.assertEqual(cache.stats['bytes'], len(text.encode('utf-8')))
+        cache.invalidate(path)
+        self.assertEqual(cache.stats['bytes'], 0)
+
+    def test_oversized_template_is_not_cached(self):
+        cache = TemplateCache(max_bytes=5)
+        cache.get(self.file)
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled_and_clear(self):
+        cache = TemplateCache()
+        cache.get(self.file)
+        cache.clear()
+        self.assertEqual(cache.stats, {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'bytes': 0})
+        cache.enabled = False
+        cache.get(self.file)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()